@@ -12,7 +12,7 @@ import json
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import click
 from rich.console import Console
@@ -31,6 +31,8 @@ ProgressReporter = LazyLoader("configurator.core.reporter", "ProgressReporter")
 InteractiveWizard = LazyLoader("configurator.wizard", "InteractiveWizard")
 PluginManager = LazyLoader("configurator.plugins.loader", "PluginManager")
 PackageCacheManager = LazyLoader("configurator.core.package_cache", "PackageCacheManager")
+ArtifactCacheManager = LazyLoader("configurator.core.artifact_cache", "ArtifactCacheManager")
+GitMirrorCache = LazyLoader("configurator.core.git_cache", "GitMirrorCache")
 SecretsManager = LazyLoader("configurator.core.secrets", "SecretsManager")
 AuditEventType = LazyLoader("configurator.core.audit", "AuditEventType")
 AuditLogger = LazyLoader("configurator.core.audit", "AuditLogger")
@@ -123,6 +125,28 @@ def main(ctx: click.Context, verbose: bool, quiet: bool):
     default=3,
     help="Number of workers for parallel execution",
 )
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Run all modules, even those unchanged since their last successful run",
+)
+@click.option(
+    "--trace",
+    "trace_run",
+    is_flag=True,
+    help="Record a trace of the run (view with 'vps-configurator trace')",
+)
+@click.option(
+    "--profile-commands",
+    is_flag=True,
+    help="Profile commands (view with 'vps-configurator monitoring commands')",
+)
+@click.option(
+    "--metrics-port",
+    type=int,
+    default=None,
+    help="Serve metrics for Prometheus on this port during the install",
+)
 @click.option(
     "--verbose",
     "-v",
@@ -139,6 +163,10 @@ def install(
     dry_run: bool,
     no_parallel: bool,
     parallel_workers: int,
+    force: bool,
+    trace_run: bool,
+    profile_commands: bool,
+    metrics_port: Optional[int],
     verbose: bool,
 ):
     """
@@ -196,6 +224,16 @@ def install(
         if parallel_workers:
             config_manager.set("performance.max_workers", parallel_workers)
 
+        if trace_run:
+            config_manager.set("observability.tracing.enabled", True)
+
+        if profile_commands:
+            config_manager.set("observability.profiling.enabled", True)
+
+        if metrics_port is not None:
+            config_manager.set("observability.exporter.enabled", True)
+            config_manager.set("observability.exporter.port", metrics_port)
+
         # Validate configuration
         config_manager.validate()
 
@@ -219,6 +257,7 @@ def install(
         skip_validation=skip_validation,
         dry_run=dry_run,
         parallel=not no_parallel,
+        force=force,
     )
 
     sys.exit(0 if success else 1)
@@ -332,6 +371,100 @@ def dashboard(ctx: click.Context, demo: bool):
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--file",
+    "-f",
+    "trace_file",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Trace file to read (default: observability.tracing.path)",
+)
+@click.option(
+    "--config",
+    "-c",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="Path to configuration file used for installation",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="Export the trace as Chrome Trace / Perfetto JSON",
+)
+@click.option("--top", "-n", type=int, default=15, help="Number of slowest spans to show")
+def trace(
+    trace_file: Optional[Path], config: Optional[Path], output: Optional[Path], top: int
+) -> None:
+    """
+    Show where time went in a traced installation.
+
+    Record a trace with 'vps-configurator install --trace', then export it
+    and open it in chrome://tracing or https://ui.perfetto.dev.
+
+    Examples:
+
+      vps-configurator trace
+
+      vps-configurator trace -o install-trace.json
+    """
+    import shutil
+
+    from rich.table import Table
+
+    from configurator.observability.tracing import DEFAULT_TRACE_FILE, load_chrome_trace
+
+    if trace_file is None:
+        path = ConfigManager(config_file=config).get("observability.tracing.path", None)
+        trace_file = Path(path) if isinstance(path, str) and path else DEFAULT_TRACE_FILE
+    if not trace_file.exists():
+        console.print(f"[yellow]No trace found at {trace_file}[/yellow]")
+        console.print("Record one with: vps-configurator install --trace")
+        sys.exit(1)
+
+    try:
+        events = load_chrome_trace(trace_file)
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Could not read trace {trace_file}: {e}[/red]")
+        sys.exit(1)
+
+    # Time per span category
+    totals: Dict[str, Tuple[int, float]] = {}
+    for event in events:
+        count, total = totals.get(event.get("cat", ""), (0, 0.0))
+        totals[event.get("cat", "")] = (count + 1, total + event.get("dur", 0) / 1e6)
+
+    table = Table(title=f"Trace: {trace_file}")
+    table.add_column("Category", style="cyan")
+    table.add_column("Spans", justify="right")
+    table.add_column("Total", justify="right")
+    for category, (count, total) in sorted(totals.items(), key=lambda x: -x[1][1]):
+        table.add_row(category or "-", str(count), f"{total:.2f}s")
+    console.print(table)
+
+    slowest = Table(title=f"Slowest {top} spans")
+    slowest.add_column("Span", style="cyan", overflow="fold")
+    slowest.add_column("Category")
+    slowest.add_column("Module")
+    slowest.add_column("Duration", justify="right")
+    for event in sorted(events, key=lambda e: -e.get("dur", 0))[:top]:
+        slowest.add_row(
+            str(event.get("name", "")),
+            event.get("cat", ""),
+            str(event.get("args", {}).get("module", "")),
+            f"{event.get('dur', 0) / 1e6:.2f}s",
+        )
+    console.print(slowest)
+
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(trace_file, output)
+        console.print(f"[green]✓[/green] Trace exported to {output}")
+        console.print("Open it in chrome://tracing or https://ui.perfetto.dev")
+
+
 @main.command()
 @click.option(
     "--profile",
@@ -793,7 +926,7 @@ def plugin_disable(name: str):
 
 @main.group()
 def cache():
-    """Manage package cache."""
+    """Manage package and artifact caches."""
 
 
 @cache.command("stats")
@@ -821,6 +954,28 @@ def cache_stats():
         console.print(f"Cache Hits: {stats['total_cache_hits']}")
         console.print(f"Hit Rate: [green]{stats['cache_hit_rate'] * 100:.1f}%[/green]")
         console.print(f"Bandwidth Saved: [green]{stats['total_mb_saved']:.2f} MB[/green]")
+
+        # Downloads outside APT (tarballs, binaries, fonts)
+        artifacts = ArtifactCacheManager().get_stats()
+        console.print("\n[bold]Artifact Cache[/bold]")
+        console.print(f"Cache Directory: [cyan]{artifacts['cache_dir']}[/cyan]")
+        console.print(f"Total Artifacts: [green]{artifacts['total_artifacts']}[/green]")
+        console.print(
+            f"Size: [yellow]{artifacts['total_size_mb']:.2f} MB[/yellow] / {artifacts['max_size_mb']:.0f} MB"
+        )
+        console.print(
+            f"Hits: {artifacts['hits']} ({artifacts['revalidated']} revalidated), "
+            f"Downloads: {artifacts['misses']}"
+        )
+        console.print(f"Hit Rate: [green]{artifacts['hit_rate'] * 100:.1f}%[/green]")
+        console.print(f"Bandwidth Saved: [green]{artifacts['total_mb_saved']:.2f} MB[/green]")
+
+        # Bare mirrors that git clones are served from
+        git_cache = GitMirrorCache()
+        console.print("\n[bold]Git Mirrors[/bold]")
+        console.print(f"Cache Directory: [cyan]{git_cache.cache_dir}[/cyan]")
+        console.print(f"Total Mirrors: [green]{len(git_cache.list_mirrors())}[/green]")
+        console.print(f"Size: [yellow]{git_cache.get_size() / 1024 / 1024:.2f} MB[/yellow]")
         console.print()
 
     except Exception as e:
@@ -879,12 +1034,24 @@ def cache_list(limit: int, sort: str):
 
 @cache.command("clear")
 @click.option("--days", type=int, help="Clear packages older than N days")
+@click.option("--artifacts", is_flag=True, help="Clear the artifact cache instead")
+@click.option("--git", "git_mirrors", is_flag=True, help="Clear the git mirrors instead")
 @click.confirmation_option(prompt="Are you sure you want to clear the cache?")
-def cache_clear(days: Optional[int]):
+def cache_clear(days: Optional[int], artifacts: bool, git_mirrors: bool):
     """Clear package cache."""
     # PackageCacheManager already lazy imported
 
     try:
+        if artifacts:
+            removed = ArtifactCacheManager().clear()
+            console.print(f"[green]✓ Artifact cache cleared ({removed} artifacts removed).[/green]")
+            return
+
+        if git_mirrors:
+            removed = GitMirrorCache().clear()
+            console.print(f"[green]✓ Git cache cleared ({removed} mirrors removed).[/green]")
+            return
+
         manager = PackageCacheManager()
 
         if days is not None:
@@ -901,6 +1068,28 @@ def cache_clear(days: Optional[int]):
         sys.exit(1)
 
 
+@cache.command("verify")
+@click.option("--days", type=int, default=0, help="Only verify packages not verified for N days")
+def cache_verify(days: int) -> None:
+    """Re-verify cached packages against their SHA256 hashes."""
+    from datetime import timedelta
+
+    # PackageCacheManager already lazy imported
+
+    try:
+        manager = PackageCacheManager()
+        removed = manager.scrub(max_age=timedelta(days=days))
+
+        if removed:
+            console.print(f"[yellow]Removed {removed} corrupt packages from the cache.[/yellow]")
+        else:
+            console.print("[green]✓ All verified packages are intact.[/green]")
+
+    except Exception as e:
+        console.print(f"[red]Error verifying cache: {e}[/red]")
+        sys.exit(1)
+
+
 @main.group()
 def status():
     """Check system status."""
@@ -5,12 +5,14 @@ Adds commands:
 - vps-configurator monitoring status
 - vps-configurator monitoring metrics
 - vps-configurator monitoring logs
+- vps-configurator monitoring commands
 - vps-configurator monitoring alerts
 - vps-configurator monitoring circuit-breakers
 """
 
 import json
 from pathlib import Path
+from typing import Optional
 
 import click
 from rich import box
@@ -114,7 +116,7 @@ def status_command(output_json):
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["prometheus", "json"]),
+    type=click.Choice(["prometheus", "openmetrics", "json"]),
     default="prometheus",
     help="Output format",
 )
@@ -125,6 +127,7 @@ def metrics_command(output_format, output):
 
     Formats:
     - prometheus: Prometheus text format
+    - openmetrics: OpenMetrics text format
     - json: JSON format
     """
     try:
@@ -135,6 +138,8 @@ def metrics_command(output_format, output):
 
         if output_format == "prometheus":
             content = metrics.export_prometheus()
+        elif output_format == "openmetrics":
+            content = metrics.export_openmetrics()
         else:
             content = metrics.export_json()
 
@@ -226,26 +231,30 @@ def logs_command(tail, log_file):
             console.print(f"[yellow]Log file not found: {log_file}[/yellow]")
             return
 
+        from itertools import islice
+
+        from configurator.observability.log_store import read_lines_reversed
+
         console.print(f"\n[dim]Last {tail} lines from {log_file}:[/dim]\n")
 
-        with open(log_file, "r") as f:
-            lines = f.readlines()
-            for line in lines[-tail:]:
-                try:
-                    entry = json.loads(line)
-                    level_colors = {
-                        "DEBUG": "dim",
-                        "INFO": "cyan",
-                        "WARNING": "yellow",
-                        "ERROR": "red",
-                        "CRITICAL": "bold red",
-                    }
-                    color = level_colors.get(entry.get("level"), "white")
-                    console.print(
-                        f"[{color}]{entry.get('timestamp')} [{entry.get('level')}] {entry.get('message')}[/{color}]"
-                    )
-                except json.JSONDecodeError:
-                    console.print(line.strip())
+        # Read only the tail, backwards from the end of the file
+        lines = list(islice(read_lines_reversed(Path(log_file)), tail))
+        for line in reversed(lines):
+            try:
+                entry = json.loads(line)
+                level_colors = {
+                    "DEBUG": "dim",
+                    "INFO": "cyan",
+                    "WARNING": "yellow",
+                    "ERROR": "red",
+                    "CRITICAL": "bold red",
+                }
+                color = level_colors.get(entry.get("level"), "white")
+                console.print(
+                    f"[{color}]{entry.get('timestamp')} [{entry.get('level')}] {entry.get('message')}[/{color}]"
+                )
+            except json.JSONDecodeError:
+                console.print(line.strip())
 
         console.print()
 
@@ -253,6 +262,79 @@ def logs_command(tail, log_file):
         console.print(f"[red]Error: {e}[/red]")
 
 
+@monitoring_group.command(name="commands")
+@click.option(
+    "--file",
+    "-f",
+    "profile_file",
+    type=click.Path(),
+    default=None,
+    help="Command profile to read (default: the last profiled install)",
+)
+@click.option("--top", "-n", type=int, default=15, help="Number of entries to show")
+def commands_command(profile_file: Optional[str], top: int) -> None:
+    """Show the slowest commands of the last profiled install."""
+    from configurator.observability.profiling import DEFAULT_PROFILE_FILE
+
+    path = Path(profile_file) if profile_file else DEFAULT_PROFILE_FILE
+    if not path.exists():
+        console.print(f"[yellow]No command profile found at {path}[/yellow]")
+        console.print("[dim]Record one with 'vps-configurator install --profile-commands'[/dim]")
+        raise SystemExit(1)
+
+    try:
+        with open(path) as f:
+            report = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        console.print(f"[red]Error: Could not read command profile {path}: {e}[/red]")
+        raise SystemExit(1)
+
+    console.print(
+        f"\n[bold]{report.get('commands', 0)} commands, "
+        f"{report.get('total_seconds', 0.0):.1f}s total[/bold]\n"
+    )
+
+    programs = Table(title="Time by Program", box=box.ROUNDED)
+    programs.add_column("Program", style="cyan")
+    programs.add_column("Module")
+    programs.add_column("Runs", justify="right")
+    programs.add_column("Failed", justify="right")
+    programs.add_column("Total", justify="right")
+    programs.add_column("Mean", justify="right")
+    programs.add_column("p95", justify="right")
+    programs.add_column("Max", justify="right")
+
+    for stats in report.get("programs", [])[:top]:
+        failures = stats["failures"]
+        programs.add_row(
+            stats["program"],
+            stats["module"],
+            str(stats["count"]),
+            f"[red]{failures}[/red]" if failures else "0",
+            f"{stats['total_seconds']:.2f}s",
+            f"{stats['mean_seconds']:.2f}s",
+            f"{stats['p95_seconds']:.2f}s" if stats.get("p95_seconds") is not None else "-",
+            f"{stats['max_seconds']:.2f}s",
+        )
+    console.print(programs)
+
+    slowest = Table(title="Slowest Commands", box=box.ROUNDED)
+    slowest.add_column("Duration", justify="right")
+    slowest.add_column("Module")
+    slowest.add_column("Exit", justify="right")
+    slowest.add_column("Command", overflow="fold")
+
+    for sample in report.get("slowest", [])[:top]:
+        code = sample["return_code"]
+        slowest.add_row(
+            f"{sample['duration_seconds']:.2f}s",
+            sample["module"],
+            "timeout" if code is None else str(code),
+            sample["command"],
+        )
+    console.print(slowest)
+
+
 @monitoring_group.command(name="alerts")
 @click.option(
     "--severity",
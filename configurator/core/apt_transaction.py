@@ -0,0 +1,218 @@
+"""
+Coalesced APT transactions.
+
+Collects the archive packages that modules plan to install and installs
+them in one ``apt-get install`` before module execution starts. This
+replaces one dependency solve and index reload per module with a single
+one. Modules then skip packages the transaction already installed and
+proceed with their post-install steps.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from configurator.core.execution.resources import ResourceClass, get_resource_pool
+from configurator.core.rollback import RollbackManager
+from configurator.utils.apt_update import AptUpdateTracker, get_apt_update_tracker
+from configurator.utils.command import CommandResult, run_command
+from configurator.utils.deb_prefetch import DebPrefetcher
+
+_POLICY_HEADER = re.compile(r"^(\S+):$")
+_POLICY_CANDIDATE = re.compile(r"^\s+Candidate:\s*(\S+)")
+
+
+@dataclass
+class PackageTransaction:
+    """A planned batch installation with per-module package ownership."""
+
+    packages: List[str] = field(default_factory=list)
+    owners: Dict[str, str] = field(default_factory=dict)  # package -> module
+    installed: bool = False
+
+    def packages_for(self, module_name: str) -> List[str]:
+        """Get the packages attributed to a module."""
+        return [p for p in self.packages if self.owners.get(p) == module_name]
+
+
+class AptTransactionPlanner:
+    """
+    Plans and runs one APT transaction for a whole schedule.
+
+    Discovery asks every module for its planned_packages() declaration.
+    Packages without an install candidate (e.g. from repositories a module
+    adds during configure) are left to the owning module.
+    """
+
+    def __init__(
+        self,
+        rollback_manager: Optional[RollbackManager] = None,
+        logger: Optional[logging.Logger] = None,
+        apt_update_tracker: Optional[AptUpdateTracker] = None,
+        prefetcher: Optional[DebPrefetcher] = None,
+    ):
+        """
+        Initialize planner.
+
+        Args:
+            rollback_manager: Rollback manager receiving per-module removals
+            logger: Logger instance
+            apt_update_tracker: Tracker skipping updates of fresh package lists
+            prefetcher: Parallel downloader for the transaction's archives
+        """
+        self.rollback_manager = rollback_manager or RollbackManager()
+        self.logger = logger or logging.getLogger(__name__)
+        self.apt_update_tracker = apt_update_tracker
+        self.prefetcher = prefetcher
+        self.transaction: Optional[PackageTransaction] = None
+
+    def discover(self, modules: Dict[str, Any]) -> Dict[str, List[str]]:
+        """
+        Collect the package sets declared by modules.
+
+        Args:
+            modules: Module instances keyed by registry name, in execution order
+
+        Returns:
+            Dict mapping each module's display name to its declared packages
+        """
+        package_sets: Dict[str, List[str]] = {}
+
+        for key, module in modules.items():
+            name = module.name if isinstance(getattr(module, "name", None), str) else key
+            planned = getattr(module, "planned_packages", None)
+            if not callable(planned):
+                continue
+
+            try:
+                packages = planned()
+            except Exception as e:
+                self.logger.debug(f"Could not discover packages for {name}: {e}")
+                continue
+
+            if isinstance(packages, (list, tuple)) and packages:
+                package_sets[name] = [p for p in packages if isinstance(p, str)]
+
+        return package_sets
+
+    def plan(self, package_sets: Dict[str, List[str]]) -> PackageTransaction:
+        """
+        Merge module package sets into one transaction.
+
+        A package declared by several modules is attributed to the first.
+        """
+        transaction = PackageTransaction()
+
+        for module_name, packages in package_sets.items():
+            for package in packages:
+                if package not in transaction.owners:
+                    transaction.owners[package] = module_name
+                    transaction.packages.append(package)
+
+        self.transaction = transaction
+        return transaction
+
+    def execute(self, transaction: Optional[PackageTransaction] = None) -> bool:
+        """
+        Install a planned transaction.
+
+        Runs one ``apt-get update`` (skipped while the package lists are
+        fresh), prefetches all archives (in parallel if a prefetcher is set,
+        then ``--download-only`` for anything missing) and installs them with
+        a single ``apt-get install``. On failure the transaction is
+        dropped and modules fall back to installing their own packages.
+
+        Returns:
+            True if the transaction was installed
+        """
+        transaction = transaction or self.transaction
+        if not transaction or not transaction.packages:
+            return False
+
+        pool = get_resource_pool()
+        env = os.environ.copy()
+        env["DEBIAN_FRONTEND"] = "noninteractive"
+
+        with pool.acquire(ResourceClass.DPKG):
+            tracker = self.apt_update_tracker or get_apt_update_tracker()
+            tracker.update(lambda: self._run("apt-get update", env).success)
+
+            available = self._installable(transaction.packages, env)
+            skipped = [p for p in transaction.packages if p not in available]
+            if skipped:
+                self.logger.debug(f"Leaving packages to their modules: {', '.join(skipped)}")
+                for package in skipped:
+                    transaction.owners.pop(package, None)
+                transaction.packages = [p for p in transaction.packages if p in available]
+
+            if not transaction.packages:
+                self.transaction = None
+                return False
+
+            packages_str = " ".join(transaction.packages)
+            self.logger.info(
+                f"Installing {len(transaction.packages)} packages in one APT transaction"
+            )
+
+            if self.prefetcher:
+                self.prefetcher.prefetch(transaction.packages)
+
+            with pool.acquire(ResourceClass.NETWORK):
+                prefetch = self._run(f"apt-get install -y --download-only {packages_str}", env)
+            if not prefetch.success:
+                self.logger.warning("APT prefetch failed, modules will install individually")
+                self.transaction = None
+                return False
+
+            result = self._run(f"apt-get install -y {packages_str}", env)
+
+        if not result.success:
+            self.logger.warning(
+                f"APT transaction failed, modules will install individually: {result.stderr}"
+            )
+            self.transaction = None
+            return False
+
+        transaction.installed = True
+        self._register_rollback(transaction)
+        return True
+
+    def covered(self, packages: Iterable[str]) -> List[str]:
+        """Get the packages already installed by the transaction."""
+        transaction = self.transaction
+        if not transaction or not transaction.installed:
+            return []
+        return [p for p in packages if p in transaction.owners]
+
+    def _register_rollback(self, transaction: PackageTransaction) -> None:
+        """Register package removal per owning module."""
+        for module_name in dict.fromkeys(transaction.owners.values()):
+            packages = transaction.packages_for(module_name)
+            self.rollback_manager.add_package_remove(
+                packages,
+                description=f"Remove {module_name} packages: {', '.join(packages)}",
+                module=module_name,
+            )
+
+    def _installable(self, packages: List[str], env: Dict[str, str]) -> List[str]:
+        """Filter packages to those with an install candidate in the APT indexes."""
+        result = self._run(f"apt-cache policy {' '.join(packages)}", env)
+
+        available = set()
+        current = None
+        for line in result.stdout.splitlines():
+            header = _POLICY_HEADER.match(line)
+            if header:
+                current = header.group(1)
+                continue
+            candidate = _POLICY_CANDIDATE.match(line)
+            if candidate and current and candidate.group(1) != "(none)":
+                available.add(current)
+
+        return [p for p in packages if p in available]
+
+    def _run(self, command: str, env: Dict[str, str]) -> CommandResult:
+        self.logger.debug(f"Running: {command}")
+        return run_command(command, check=False, env=env)
@@ -0,0 +1,537 @@
+"""
+Artifact cache for downloads outside APT.
+
+Go tarballs, Neovim releases, fonts and installer scripts used to be
+fetched again on every install. The cache keeps them keyed by URL and
+expected SHA256, so re-installs and rebuilt machines sharing a cache
+directory reuse earlier downloads.
+
+- Entries are evicted least recently used first once the cache outgrows
+  its size limit.
+- Artifacts pinned to an expected SHA256 never change and are served
+  without contacting the origin. Unpinned artifacts are revalidated with a
+  conditional request (If-None-Match / If-Modified-Since) once they are
+  older than revalidate_after, and only downloaded again if they changed.
+- Each entry records the (inode, size, mtime_ns) fingerprint of its file
+  when it was hashed; hits are only rehashed when the fingerprint changed.
+  Downloads are hashed while they stream, and the hash is handed to the
+  SupplyChainValidator, so a verified artifact is hashed exactly once.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import requests
+
+from configurator.core.execution.resources import ResourceClass, get_resource_pool
+from configurator.core.package_cache import file_fingerprint
+from configurator.utils.download import NotModified, download
+from configurator.utils.file import link_or_copy
+from configurator.utils.retry import retry
+
+if TYPE_CHECKING:
+    from configurator.security.supply_chain import SupplyChainValidator
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactVerificationError(ValueError):
+    """Raised when a downloaded artifact fails checksum or supply chain checks."""
+
+
+@dataclass
+class CachedArtifact:
+    """A cached download."""
+
+    key: str
+    url: str
+    filename: str
+    size_bytes: int
+    hash_sha256: str
+    cached_at: datetime
+    last_accessed: datetime
+    # Last time the origin confirmed (or served) this content
+    validated_at: datetime
+    expected_sha256: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    access_count: int = 0
+    # Stat fingerprint of the cached file when its hash was last verified
+    inode: int = 0
+    mtime_ns: int = 0
+
+    @property
+    def fingerprint(self) -> Tuple[int, int, int]:
+        """(inode, size, mtime_ns) recorded at the last hash verification"""
+        return (self.inode, self.size_bytes, self.mtime_ns)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to dictionary"""
+        return {
+            "key": self.key,
+            "url": self.url,
+            "filename": self.filename,
+            "size_bytes": self.size_bytes,
+            "hash_sha256": self.hash_sha256,
+            "cached_at": self.cached_at.isoformat(),
+            "last_accessed": self.last_accessed.isoformat(),
+            "validated_at": self.validated_at.isoformat(),
+            "expected_sha256": self.expected_sha256,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "access_count": self.access_count,
+            "inode": self.inode,
+            "mtime_ns": self.mtime_ns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CachedArtifact":
+        """Deserialize from dictionary"""
+        return cls(
+            key=data["key"],
+            url=data["url"],
+            filename=data["filename"],
+            size_bytes=data["size_bytes"],
+            hash_sha256=data["hash_sha256"],
+            cached_at=datetime.fromisoformat(data["cached_at"]),
+            last_accessed=datetime.fromisoformat(data["last_accessed"]),
+            validated_at=datetime.fromisoformat(data["validated_at"]),
+            expected_sha256=data.get("expected_sha256"),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            access_count=data.get("access_count", 0),
+            inode=data.get("inode", 0),
+            mtime_ns=data.get("mtime_ns", 0),
+        )
+
+
+def artifact_key(url: str, expected_sha256: Optional[str] = None) -> str:
+    """Cache key of a download: the URL plus the checksum it is pinned to"""
+    pinned = (expected_sha256 or "").lower()
+    return hashlib.sha256(f"{url}\n{pinned}".encode("utf-8")).hexdigest()
+
+
+class ArtifactCacheManager:
+    """
+    Caches non-APT downloads (tarballs, binaries, fonts, scripts).
+
+    Usage:
+        cache = ArtifactCacheManager()
+        cache.fetch("https://go.dev/dl/go1.21.5.linux-amd64.tar.gz", Path("/tmp/go.tar.gz"))
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/artifacts")
+    DEFAULT_MAX_SIZE_GB = 5.0
+    DEFAULT_REVALIDATE_AFTER = timedelta(hours=24)
+    INDEX_FILE = "artifact_index.json"
+    FILES_DIR = "files"
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_size_gb: float = DEFAULT_MAX_SIZE_GB,
+        revalidate_after: timedelta = DEFAULT_REVALIDATE_AFTER,
+        timeout: int = 600,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize artifact cache.
+
+        Args:
+            cache_dir: Directory for cached artifacts
+            max_size_gb: Maximum cache size in GB
+            revalidate_after: Age after which unpinned artifacts are revalidated
+            timeout: Timeout per download in seconds
+            logger: Logger instance
+        """
+        self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
+        self.max_size_bytes = int(max_size_gb * 1024 * 1024 * 1024)
+        self.revalidate_after = revalidate_after
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        # Least recently used first
+        self._index: "OrderedDict[str, CachedArtifact]" = OrderedDict()
+        self._total_size = 0
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "bytes_saved": 0}
+
+        self._ensure_cache_dir()
+        self._load_index()
+
+    def _ensure_cache_dir(self) -> None:
+        """Create cache directory if it doesn't exist"""
+        try:
+            (self.cache_dir / self.FILES_DIR).mkdir(parents=True, exist_ok=True, mode=0o755)
+        except Exception as e:
+            self.logger.debug(f"Could not create system artifact cache directory: {e}")
+            # Fallback to user cache
+            self.cache_dir = Path.home() / ".cache/debian-vps-configurator/artifacts"
+            (self.cache_dir / self.FILES_DIR).mkdir(parents=True, exist_ok=True)
+            self.logger.info(f"Using fallback artifact cache directory: {self.cache_dir}")
+
+    def _load_index(self) -> None:
+        """Load the index from disk in LRU order"""
+        index_file = self.cache_dir / self.INDEX_FILE
+        if not index_file.exists():
+            return
+
+        try:
+            with open(index_file, "r") as f:
+                data = json.load(f)
+
+            artifacts = [CachedArtifact.from_dict(item) for item in data.get("artifacts", [])]
+            artifacts.sort(key=lambda artifact: artifact.last_accessed)
+            for artifact in artifacts:
+                self._index[artifact.key] = artifact
+                self._total_size += artifact.size_bytes
+            self._stats.update(data.get("stats", {}))
+
+            self.logger.debug(f"Loaded artifact cache index: {len(self._index)} artifacts")
+        except Exception as e:
+            self.logger.warning(f"Failed to load artifact cache index, starting fresh: {e}")
+            self._index = OrderedDict()
+            self._total_size = 0
+
+    def _save_index(self) -> None:
+        """Write the index via a temporary file so readers never see a partial file"""
+        index_file = self.cache_dir / self.INDEX_FILE
+        tmp_path = index_file.with_name(f".{index_file.name}.tmp")
+        data = {
+            "artifacts": [artifact.to_dict() for artifact in self._index.values()],
+            "stats": self._stats,
+        }
+
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, index_file)
+        except Exception as e:
+            self.logger.error(f"Failed to save artifact cache index: {e}")
+
+    def _file_path(self, artifact: CachedArtifact) -> Path:
+        return self.cache_dir / self.FILES_DIR / artifact.filename
+
+    def fetch(
+        self,
+        url: str,
+        destination: Optional[Path] = None,
+        expected_sha256: Optional[str] = None,
+        validator: Optional["SupplyChainValidator"] = None,
+    ) -> Path:
+        """
+        Get an artifact from the cache, downloading it if needed.
+
+        Args:
+            url: Download URL
+            destination: Where to place the artifact (linked from the cache
+                where possible); None returns the cached file itself, which
+                must not be modified
+            expected_sha256: SHA256 the artifact must have
+            validator: Supply chain validator checking the URL and checksum
+
+        Returns:
+            Path to the artifact (destination, or the cached file)
+
+        Raises:
+            ArtifactVerificationError: If the artifact fails verification
+            OSError: If the download fails
+        """
+        key = artifact_key(url, expected_sha256)
+        artifact = self._lookup(key)
+        downloaded = False
+
+        if artifact is None:
+            artifact, downloaded = self._download(key, url, expected_sha256, validator), True
+        elif not expected_sha256 and self._is_stale(artifact):
+            artifact, downloaded = self._revalidate(artifact, validator)
+        else:
+            with self._lock:
+                self._record_hit(artifact)
+
+        if validator is not None and not downloaded:
+            # Verified when downloaded; the validator reuses the recorded hash
+            self._validate(validator, url, self._file_path(artifact), artifact, expected_sha256)
+
+        path = self._file_path(artifact)
+        if destination is None:
+            return path
+
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        link_or_copy(path, destination)
+        return destination
+
+    def _lookup(self, key: str) -> Optional[CachedArtifact]:
+        """Return a cached artifact whose file is intact, dropping broken entries"""
+        with self._lock:
+            artifact = self._index.get(key)
+            if artifact is None:
+                return None
+
+            path = self._file_path(artifact)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self.logger.warning(f"Cached artifact missing: {artifact.url}")
+                self._remove(key)
+                self._save_index()
+                return None
+
+            # Rehash only if the file changed since it was last verified
+            if file_fingerprint(stat) != artifact.fingerprint:
+                if self._hash_file(path) != artifact.hash_sha256:
+                    self.logger.error(f"Hash mismatch for cached {artifact.url}, removing")
+                    self._remove(key)
+                    self._save_index()
+                    return None
+                artifact.inode, artifact.mtime_ns = stat.st_ino, stat.st_mtime_ns
+
+            return artifact
+
+    def _is_stale(self, artifact: CachedArtifact) -> bool:
+        return datetime.now() - artifact.validated_at >= self.revalidate_after
+
+    def _record_hit(self, artifact: CachedArtifact) -> None:
+        """Mark an artifact as used (caller holds the lock)"""
+        artifact.last_accessed = datetime.now()
+        artifact.access_count += 1
+        self._index.move_to_end(artifact.key)
+        self._stats["hits"] += 1
+        self._stats["bytes_saved"] += artifact.size_bytes
+        self._save_index()
+        self.logger.info(
+            f"✅ Artifact cache HIT: {artifact.url} ({artifact.size_bytes / 1024 / 1024:.1f}MB saved)"
+        )
+
+    def _revalidate(
+        self, artifact: CachedArtifact, validator: Optional["SupplyChainValidator"]
+    ) -> Tuple[CachedArtifact, bool]:
+        """
+        Ask the origin whether an unpinned artifact changed.
+
+        Returns:
+            (artifact, True if it was downloaded again)
+        """
+        headers = {}
+        if artifact.etag:
+            headers["If-None-Match"] = artifact.etag
+        if artifact.last_modified:
+            headers["If-Modified-Since"] = artifact.last_modified
+        if not headers:
+            return self._download(artifact.key, artifact.url, None, validator), True
+
+        try:
+            # A changed artifact comes back in full and replaces the cached one
+            return (
+                self._fetch_into_cache(artifact.key, artifact.url, None, validator, headers),
+                True,
+            )
+        except NotModified:
+            with self._lock:
+                artifact.validated_at = datetime.now()
+                self._stats["revalidated"] += 1
+                self._record_hit(artifact)
+            self.logger.debug(f"Artifact not modified: {artifact.url}")
+        except requests.HTTPError:
+            raise
+        except OSError as e:
+            # Serve the cached copy while the origin is unreachable
+            self.logger.warning(f"Could not revalidate {artifact.url}, using cached copy: {e}")
+            with self._lock:
+                self._record_hit(artifact)
+        return artifact, False
+
+    @retry(max_retries=3, base_delay=2.0, exceptions=(OSError,))
+    def _download(
+        self,
+        key: str,
+        url: str,
+        expected_sha256: Optional[str],
+        validator: Optional["SupplyChainValidator"],
+    ) -> CachedArtifact:
+        """Download an artifact into the cache, retrying transient failures"""
+        return self._fetch_into_cache(key, url, expected_sha256, validator)
+
+    def _fetch_into_cache(
+        self,
+        key: str,
+        url: str,
+        expected_sha256: Optional[str],
+        validator: Optional["SupplyChainValidator"],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> CachedArtifact:
+        """Download an artifact into the cache, hashing it as it streams"""
+        if validator is not None and not validator.validate_url(url):
+            raise ArtifactVerificationError(f"URL not allowed by supply chain policy: {url}")
+
+        # Interrupted downloads leave .<key>.download.part behind and resume
+        tmp_path = self.cache_dir / self.FILES_DIR / f".{key}.download"
+
+        try:
+            with get_resource_pool().acquire(ResourceClass.NETWORK):
+                self.logger.info(f"Downloading {url}")
+                result = download(url, tmp_path, timeout=self.timeout, headers=headers)
+
+            actual = result.sha256
+            if expected_sha256 and actual != expected_sha256.lower():
+                raise ArtifactVerificationError(
+                    f"Checksum mismatch for {url}: expected {expected_sha256}, got {actual}"
+                )
+
+            now = datetime.now()
+            artifact = CachedArtifact(
+                key=key,
+                url=url,
+                filename=key,
+                size_bytes=result.size_bytes,
+                hash_sha256=actual,
+                cached_at=now,
+                last_accessed=now,
+                validated_at=now,
+                expected_sha256=expected_sha256,
+                etag=result.etag,
+                last_modified=result.last_modified,
+            )
+            if validator is not None:
+                self._validate(validator, url, tmp_path, artifact, expected_sha256)
+
+            with self._lock:
+                self._store(artifact, tmp_path)
+            return artifact
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _validate(
+        self,
+        validator: "SupplyChainValidator",
+        url: str,
+        path: Path,
+        artifact: CachedArtifact,
+        expected_sha256: Optional[str],
+    ) -> None:
+        """Run supply chain validation with the already known hash"""
+        if not validator.validate_download(
+            url, path, expected_sha256, actual_checksum=artifact.hash_sha256
+        ):
+            raise ArtifactVerificationError(f"Supply chain validation failed for {url}")
+
+    def _store(self, artifact: CachedArtifact, tmp_path: Path) -> None:
+        """Move a downloaded file into the cache and index it (caller holds the lock)"""
+        self._remove(artifact.key)
+
+        required = self._total_size + artifact.size_bytes - self.max_size_bytes
+        if required > 0:
+            self._evict(required)
+
+        path = self._file_path(artifact)
+        os.replace(tmp_path, path)
+        stat = path.stat()
+        artifact.inode, artifact.mtime_ns = stat.st_ino, stat.st_mtime_ns
+
+        self._index[artifact.key] = artifact
+        self._total_size += artifact.size_bytes
+        self._stats["misses"] += 1
+        self._save_index()
+
+        self.logger.info(
+            f"✅ Cached artifact: {artifact.url} ({artifact.size_bytes / 1024 / 1024:.1f}MB)"
+        )
+
+    def _remove(self, key: str) -> Optional[CachedArtifact]:
+        """Drop an entry and its file (caller holds the lock)"""
+        artifact = self._index.pop(key, None)
+        if artifact is not None:
+            self._total_size -= artifact.size_bytes
+            try:
+                self._file_path(artifact).unlink(missing_ok=True)
+            except OSError as e:
+                self.logger.warning(f"Failed to remove cached artifact {artifact.url}: {e}")
+        return artifact
+
+    def _evict(self, required_space: int) -> None:
+        """Evict least recently used artifacts to free space (caller holds the lock)"""
+        freed = 0
+        evicted = []
+        for key, artifact in self._index.items():
+            if freed >= required_space:
+                break
+            evicted.append(key)
+            freed += artifact.size_bytes
+
+        for key in evicted:
+            removed = self._remove(key)
+            if removed is not None:
+                self.logger.debug(f"Evicted artifact: {removed.url}")
+
+        if evicted:
+            self.logger.info(
+                f"Evicted {len(evicted)} artifacts to free {freed / 1024 / 1024:.1f}MB"
+            )
+
+    def _hash_file(self, path: Path) -> str:
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def clear(self) -> int:
+        """
+        Remove every cached artifact.
+
+        Returns:
+            Number of artifacts removed
+        """
+        with self._lock:
+            keys = list(self._index)
+            for key in keys:
+                self._remove(key)
+            self._save_index()
+
+            # Partial downloads kept for resuming
+            for partial in (self.cache_dir / self.FILES_DIR).glob(".*.download.part*"):
+                partial.unlink(missing_ok=True)
+
+        self.logger.info(f"Cleared artifact cache: {len(keys)} artifacts removed")
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        with self._lock:
+            requests = self._stats["hits"] + self._stats["misses"]
+            return {
+                "cache_dir": str(self.cache_dir),
+                "total_artifacts": len(self._index),
+                "total_size_bytes": self._total_size,
+                "total_size_mb": self._total_size / 1024 / 1024,
+                "max_size_mb": self.max_size_bytes / 1024 / 1024,
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "revalidated": self._stats["revalidated"],
+                "total_mb_saved": self._stats["bytes_saved"] / 1024 / 1024,
+                "hit_rate": self._stats["hits"] / requests if requests else 0.0,
+            }
+
+    def list_artifacts(self) -> List[CachedArtifact]:
+        """
+        List cached artifacts, least recently used first.
+
+        Returns:
+            List of CachedArtifact objects
+        """
+        with self._lock:
+            return list(self._index.values())
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 from datetime import datetime, timezone
@@ -6,7 +5,9 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from configurator.core.audit_writer import get_audit_writer
 from configurator.exceptions import ConfiguratorError
+from configurator.observability.log_store import LogStore
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +36,11 @@ class AuditLogger:
     Immutable, append-only security audit logger.
 
     Logs sensitive system events (installation, user creation, firewall changes)
-    to a method-only JSON Lines file used for security auditing.
+    to a method-only JSON Lines file used for security auditing. The file is
+    sealed into an indexed segment every day (see LogStore), so queries read
+    recent events backwards and jump to matching event types in old segments.
+    Segments are never deleted. Events are written durably (fsynced) through
+    the shared audit writer.
 
     Attributes:
         DEFAULT_LOG_PATH: Default location /var/log/debian-vps-configurator/audit.jsonl
@@ -75,6 +80,8 @@ class AuditLogger:
             except OSError:
                 pass
 
+        self._store = LogStore(self.log_path, indexed_fields=("event_type",), file_mode=0o600)
+
     def log_event(
         self,
         event_type: AuditEventType,
@@ -103,8 +110,7 @@ class AuditLogger:
         }
 
         try:
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(event) + "\n")
+            get_audit_writer().write(self._store, event, durable=True)
         except OSError as e:
             logger.error(f"Failed to write audit log: {e}")
 
@@ -121,29 +127,10 @@ class AuditLogger:
         Returns:
             List of event dictionaries
         """
-        events = []
-        if not self.log_path.exists():
-            return []
-
         try:
-            with open(self.log_path, "r") as f:
-                # Read all lines (efficient enough for typical usage,
-                # but could use reverse reading for huge logs)
-                lines = f.readlines()
-
-            for line in reversed(lines):
-                if len(events) >= limit:
-                    break
-
-                try:
-                    event = json.loads(line)
-                    if event_type and event.get("event_type") != event_type.value:
-                        continue
-                    events.append(event)
-                except json.JSONDecodeError:
-                    continue
-
-            return events
+            return self._store.query(
+                limit=limit, event_type=event_type.value if event_type else None
+            )
         except OSError as e:
             logger.error(f"Failed to read audit log: {e}")
             return []
@@ -0,0 +1,314 @@
+"""
+Shared background writer for audit logs.
+
+Audit and activity trails are JSON Lines files written one event at a time.
+Instead of opening, appending and closing the file per event, callers hand
+entries to one background thread, which batches them per file and writes
+each batch with a single open/write/close.
+
+Durability policy:
+- write(..., durable=False) queues the entry and returns at once. Queued
+  entries are written when batch_lines accumulate, flush_interval passes,
+  flush() is called, or the process exits.
+- write(..., durable=True) is for security-relevant events (revoked or
+  elevated access, security audit entries). It returns only once the entry
+  and everything queued before it is written and fsynced. Concurrent
+  durable writers share one write and fsync (group commit).
+- flush() writes and fsyncs everything queued so far.
+
+The queue is bounded: when it is full, writers block rather than drop
+events.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# Entries queued before writers block
+DEFAULT_MAX_PENDING = 10000
+
+# Write a batch once this many lines are pending...
+DEFAULT_BATCH_LINES = 512
+
+# ...or once the oldest pending line is this old (seconds)
+DEFAULT_FLUSH_INTERVAL = 0.2
+
+
+class LineSink(Protocol):
+    """Destination of batched lines (a file, or a LogStore)."""
+
+    def write_lines(self, lines: List[str], fsync: bool = False) -> None: ...
+
+
+class FileSink:
+    """Appends lines to a plain file."""
+
+    def __init__(self, path: Path, mode: Optional[int] = None):
+        """
+        Initialize sink.
+
+        Args:
+            path: File to append to
+            mode: Permissions for the file when it is created
+        """
+        self.path = Path(path)
+        self.mode = mode
+
+    def write_lines(self, lines: List[str], fsync: bool = False) -> None:
+        """
+        Append lines with one open and write.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        created = not self.path.exists()
+        with open(self.path, "a") as f:
+            f.write("".join(lines))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if created and self.mode is not None:
+            os.chmod(self.path, self.mode)
+
+    def __repr__(self) -> str:
+        return str(self.path)
+
+
+class _Item:
+    """A queued line, or a flush request when sink is None."""
+
+    __slots__ = ("sink", "line", "durable", "done", "error")
+
+    def __init__(
+        self,
+        sink: Optional[LineSink],
+        line: Optional[str],
+        durable: bool,
+        done: Optional[threading.Event],
+    ):
+        self.sink = sink
+        self.line = line
+        self.durable = durable
+        self.done = done
+        self.error: Optional[Exception] = None
+
+
+_STOP = object()
+
+
+class AuditWriter:
+    """
+    Background writer batching audit lines per file.
+
+    Usage:
+        writer = get_audit_writer()
+        writer.write(Path("/var/log/team-audit.log"), {"action": "add_member"})
+        writer.write(Path("/var/log/team-audit.log"), {"action": "delete_team"}, durable=True)
+    """
+
+    def __init__(
+        self,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        batch_lines: int = DEFAULT_BATCH_LINES,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        Initialize writer.
+
+        Args:
+            max_pending: Queued entries before writers block
+            batch_lines: Pending lines that trigger a write
+            flush_interval: Maximum seconds a line waits before being written
+        """
+        self.batch_lines = batch_lines
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        self._sinks: Dict[Path, FileSink] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(
+        self,
+        target: Union[Path, str, LineSink],
+        entry: Union[Dict[str, Any], str],
+        durable: bool = False,
+        mode: Optional[int] = None,
+    ) -> None:
+        """
+        Queue an entry for writing.
+
+        Args:
+            target: File path, or a sink such as a LogStore
+            entry: JSON-serializable entry, or a line of text
+            durable: Wait until the entry is written and fsynced
+            mode: Permissions for a target file created by this write
+
+        Raises:
+            OSError: If a durable entry could not be written
+        """
+        line = entry if isinstance(entry, str) else json.dumps(entry)
+        if not line.endswith("\n"):
+            line += "\n"
+
+        sink = self._sink(target, mode)
+        done = threading.Event() if durable else None
+        item = _Item(sink, line, durable, done)
+
+        self._ensure_started()
+        self._queue.put(item)
+        if done is not None:
+            done.wait()
+            if item.error is not None:
+                raise item.error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write and fsync everything queued so far.
+
+        Args:
+            timeout: Seconds to wait (None waits until done)
+
+        Returns:
+            True if everything was written in time
+        """
+        if not self.running:
+            return True
+        done = threading.Event()
+        self._queue.put(_Item(None, None, True, done))
+        return done.wait(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def close(self) -> None:
+        """Flush and stop the background thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join()
+
+    def _sink(self, target: Union[Path, str, LineSink], mode: Optional[int]) -> LineSink:
+        if not isinstance(target, (str, Path)):
+            return target
+        path = Path(target)
+        with self._lock:
+            sink = self._sinks.get(path)
+            if sink is None:
+                sink = self._sinks[path] = FileSink(path, mode)
+            return sink
+
+    def _ensure_started(self) -> None:
+        if self.running:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Writer loop: batch lines per sink, write on thresholds or requests."""
+        pending: Dict[LineSink, List[_Item]] = {}
+        unsynced: Set[LineSink] = set()
+        waiters: List[threading.Event] = []
+        count = 0
+        deadline: Optional[float] = None
+
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            # Take whatever else is already queued, so concurrent durable
+            # writers share one write and fsync
+            batch = [] if item is None or stop else [item]
+            while not stop and count + len(batch) < self.batch_lines:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is _STOP:
+                    stop = True
+                else:
+                    batch.append(extra)
+
+            sync_all = False
+            for queued in batch:
+                if queued.sink is None:
+                    sync_all = True
+                else:
+                    pending.setdefault(queued.sink, []).append(queued)
+                    count += 1
+                if queued.done is not None:
+                    waiters.append(queued.done)
+            if pending and deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if stop or waiters or due or count >= self.batch_lines:
+                self._write_pending(pending, unsynced, sync_all or stop)
+                for waiter in waiters:
+                    waiter.set()
+                pending, waiters, count, deadline = {}, [], 0, None
+
+            if stop:
+                return
+
+    def _write_pending(
+        self, pending: Dict[LineSink, List[_Item]], unsynced: Set[LineSink], sync_all: bool
+    ) -> None:
+        """Write each sink's lines; fsync sinks with durable lines (or all on flush)."""
+        for sink, items in pending.items():
+            fsync = sync_all or any(item.durable for item in items)
+            try:
+                sink.write_lines(
+                    [item.line for item in items if item.line is not None], fsync=fsync
+                )
+            except Exception as e:
+                logger.error(f"Failed to write audit log {sink}: {e}")
+                for item in items:
+                    item.error = e if isinstance(e, OSError) else OSError(str(e))
+                continue
+            if fsync:
+                unsynced.discard(sink)
+            else:
+                unsynced.add(sink)
+
+        if sync_all:
+            # Lines written by earlier, non-durable batches
+            for sink in list(unsynced):
+                try:
+                    sink.write_lines([], fsync=True)
+                    unsynced.discard(sink)
+                except Exception as e:
+                    logger.error(f"Failed to sync audit log {sink}: {e}")
+
+
+# Global writer instance
+_writer: Optional[AuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter:
+    """Get the global audit writer (flushed at interpreter exit)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditWriter()
+                atexit.register(_writer.close)
+    return _writer
@@ -0,0 +1,162 @@
+"""
+Convergence fingerprints for idempotent re-runs.
+
+After a module runs successfully, a fingerprint of what it converged is
+stored: its configuration, the installed versions of its packages and the
+contents of the files it manages. A later run recomputes the fingerprint
+over the same packages and files; when nothing changed and the module's
+verify() still passes, configure() is skipped.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from configurator.__version__ import __version__
+from configurator.core.state.manager import StateManager
+from configurator.utils.command import run_command
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def installed_versions(packages: Iterable[str]) -> Dict[str, str]:
+    """
+    Get installed versions of packages in one dpkg-query call.
+
+    Packages that are not installed are missing from the result.
+    """
+    packages = sorted(set(packages))
+    if not packages:
+        return {}
+
+    result = run_command(
+        ["dpkg-query", "-W", "-f=${Package} ${Version} ${db:Status-Status}\\n"] + packages,
+        check=False,
+    )
+
+    versions = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "installed":
+            versions[parts[0]] = parts[1]
+    return versions
+
+
+def file_digest(path: str) -> str:
+    """SHA256 of a file's content, or a marker if it does not exist."""
+    file_path = Path(path)
+    if not file_path.is_file():
+        return "missing"
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConvergenceTracker:
+    """
+    Decides whether a module is already converged and can be skipped.
+
+    Modules provide their convergence inputs via
+    ConfigurationModule.convergence_inputs(); fingerprints are kept in the
+    StateManager between runs.
+    """
+
+    def __init__(self, state_manager: StateManager, logger: Optional[logging.Logger] = None):
+        """
+        Initialize tracker.
+
+        Args:
+            state_manager: State store holding fingerprints between runs
+            logger: Logger instance
+        """
+        self.state_manager = state_manager
+        self.logger = logger or logging.getLogger(__name__)
+
+    def fingerprint(self, config: Any, packages: List[str], files: List[str]) -> str:
+        """
+        Compute the fingerprint of a module's converged state.
+
+        Args:
+            config: Module configuration
+            packages: Packages the module installs
+            files: Files the module manages
+
+        Returns:
+            Hex digest over the configuration, package versions and file contents
+        """
+        state = {
+            "configurator": __version__,
+            "config": config,
+            "packages": installed_versions(packages),
+            "files": {path: file_digest(path) for path in sorted(set(files))},
+        }
+        encoded = json.dumps(state, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def is_converged(self, module_name: str, module: Any) -> bool:
+        """
+        Check if a module's state matches its last successful run.
+
+        The module's verify() must also pass, so drift the fingerprint
+        does not cover (e.g. a stopped service) still triggers a run.
+
+        Args:
+            module_name: Module registry name
+            module: Module instance
+
+        Returns:
+            True if configure() can be skipped
+        """
+        if getattr(module, "idempotent", False) is not True:
+            return False
+
+        try:
+            record = self.state_manager.get_fingerprint(module_name)
+            if not record:
+                return False
+
+            current = self.fingerprint(module.config, record["packages"], record["files"])
+            if current != record["fingerprint"]:
+                self.logger.debug(f"{module_name} changed since its last run")
+                return False
+
+            if not module.verify():
+                self.logger.info(f"{module_name} is unchanged but failed verification")
+                return False
+        except Exception as e:
+            self.logger.debug(f"Could not check convergence of {module_name}: {e}")
+            return False
+
+        return True
+
+    def record(self, module_name: str, module: Any) -> None:
+        """
+        Store the fingerprint of a module after a successful run.
+
+        Args:
+            module_name: Module registry name
+            module: Module instance that just ran
+        """
+        if getattr(module, "idempotent", False) is not True:
+            return
+
+        try:
+            inputs = module.convergence_inputs()
+            fingerprint = self.fingerprint(inputs["config"], inputs["packages"], inputs["files"])
+            self.state_manager.save_fingerprint(
+                module_name, fingerprint, inputs["packages"], inputs["files"]
+            )
+        except Exception as e:
+            self.logger.debug(f"Could not record fingerprint of {module_name}: {e}")
+
+    def forget(self, module_name: str) -> None:
+        """Forget a module's fingerprint so its next run executes configure()."""
+        try:
+            self.state_manager.clear_fingerprint(module_name)
+        except Exception as e:
+            self.logger.debug(f"Could not clear fingerprint of {module_name}: {e}")
@@ -13,6 +13,7 @@ class ModuleDependency:
     depends_on: List[str] = field(default_factory=list)
     priority: int = 100
     force_sequential: bool = False  # Heavy modules run alone
+    resource_classes: List[str] = field(default_factory=list)  # Scheduling hint
 
 
 class DependencyGraph:
@@ -26,7 +27,11 @@ class DependencyGraph:
         self.module_info: Dict[str, ModuleDependency] = {}
 
     def add_module(
-        self, name: str, depends_on: List[str] = None, force_sequential: bool = False
+        self,
+        name: str,
+        depends_on: List[str] = None,
+        force_sequential: bool = False,
+        resource_classes: Optional[List[str]] = None,
     ) -> None:
         """
         Add module to dependency graph.
@@ -35,12 +40,16 @@ class DependencyGraph:
             name: Module identifier
             depends_on: List of module names this depends on
             force_sequential: If True, module runs in its own batch
+            resource_classes: Resource classes the module mostly uses
         """
         self.graph.add_node(name)
 
         # Store module info
         self.module_info[name] = ModuleDependency(
-            name=name, depends_on=depends_on or [], force_sequential=force_sequential
+            name=name,
+            depends_on=depends_on or [],
+            force_sequential=force_sequential,
+            resource_classes=resource_classes or [],
         )
 
         # Add edges for dependencies
@@ -10,6 +10,7 @@ from .base import (
 from .hybrid import HybridExecutor as HybridExecutor
 from .parallel import ParallelExecutor as ParallelExecutor
 from .pipeline import PipelineExecutor as PipelineExecutor
+from .scheduler import StreamingScheduler as StreamingScheduler
 
 __all__ = [
     "ExecutionContext",
@@ -18,4 +19,5 @@ __all__ = [
     "HybridExecutor",
     "ParallelExecutor",
     "PipelineExecutor",
+    "StreamingScheduler",
 ]
@@ -1,9 +1,10 @@
 import logging
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from configurator.core.execution.base import ExecutionContext, ExecutionResult, ExecutorInterface
 from configurator.core.execution.parallel import ParallelExecutor
 from configurator.core.execution.pipeline import PipelineExecutor
+from configurator.core.execution.resources import ResourceSpec, configure_resource_pool
 
 
 class HybridExecutor(ExecutorInterface):
@@ -13,14 +14,27 @@ class HybridExecutor(ExecutorInterface):
     Intelligently routes module execution to optimal executor:
     - ParallelExecutor: For independent modules
     - PipelineExecutor: For large sequential modules
+
+    Concurrency between modules is bounded per resource class (dpkg,
+    network, disk, cpu) rather than by a single global APT lock; the
+    capacities configure the process-wide ResourcePool used by modules.
     """
 
-    def __init__(self, max_workers: int = 4, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        logger: Optional[logging.Logger] = None,
+        resource_capacities: Optional[Dict[ResourceSpec, int]] = None,
+        state_manager: Any = None,
+    ):
         self.logger = logger or logging.getLogger(__name__)
+        self.resource_pool = configure_resource_pool(resource_capacities)
 
         # Initialize sub-executors
-        self.parallel_executor = ParallelExecutor(max_workers=max_workers, logger=self.logger)
-        self.pipeline_executor = PipelineExecutor(logger=self.logger)
+        self.parallel_executor = ParallelExecutor(
+            max_workers=max_workers, logger=self.logger, resource_pool=self.resource_pool
+        )
+        self.pipeline_executor = PipelineExecutor(logger=self.logger, state_manager=state_manager)
 
     def get_name(self) -> str:
         return "HybridExecutor"
@@ -71,6 +85,19 @@ class HybridExecutor(ExecutorInterface):
 
         return results
 
+    def execute_one(
+        self, context: ExecutionContext, callback: Optional[Callable[..., Any]] = None
+    ) -> ExecutionResult:
+        """
+        Execute a single module on the calling thread.
+
+        Used by StreamingScheduler, which manages concurrency itself and
+        only needs the per-module routing of this executor.
+        """
+        if self._should_use_pipeline(context):
+            return self.pipeline_executor._execute_pipeline(context, callback)
+        return self.parallel_executor._execute_module(context, callback)
+
     def _should_use_pipeline(self, context: ExecutionContext) -> bool:
         """Determine if context should use pipeline executor."""
         module = context.module_instance
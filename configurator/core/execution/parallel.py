@@ -1,10 +1,19 @@
 import logging
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from configurator.core.execution.base import ExecutionContext, ExecutionResult, ExecutorInterface
+from configurator.core.execution.resources import (
+    ResourceClass,
+    ResourcePool,
+    declared_resources,
+    get_resource_pool,
+)
+from configurator.observability.metrics import get_metrics
+from configurator.observability.profiling import module_context
+from configurator.observability.tracing import get_tracer
 
 
 class ParallelExecutor(ExecutorInterface):
@@ -12,11 +21,22 @@ class ParallelExecutor(ExecutorInterface):
     Parallel executor using ThreadPoolExecutor.
 
     Best for: Independent modules with no sequential dependencies.
+
+    Modules are launched in order, except that a module whose declared
+    resource classes are saturated by running modules is passed over in
+    favour of one that can make progress (e.g. a download-heavy module
+    while another module holds dpkg).
     """
 
-    def __init__(self, max_workers: int = 4, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        max_workers: int = 4,
+        logger: Optional[logging.Logger] = None,
+        resource_pool: Optional[ResourcePool] = None,
+    ):
         self.max_workers = max_workers
         self.logger = logger or logging.getLogger(__name__)
+        self.resource_pool = resource_pool or get_resource_pool()
 
     def get_name(self) -> str:
         return "ParallelExecutor"
@@ -49,41 +69,75 @@ class ParallelExecutor(ExecutorInterface):
         )
 
         results = {}
+        pending = list(contexts)
+        running: Dict[Future[ExecutionResult], ExecutionContext] = {}
+        reserved: Dict[ResourceClass, int] = {}
 
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit all tasks
-            future_to_context = {
-                executor.submit(self._execute_module, context, callback): context
-                for context in contexts
-            }
-
-            # Collect results as they complete
-            for future in as_completed(future_to_context):
-                context = future_to_context[future]
-
-                try:
-                    result = future.result()
-                    results[context.module_name] = result
-                except Exception as e:
-                    self.logger.error(
-                        f"Unexpected error executing {context.module_name}: {e}", exc_info=True
-                    )
-                    results[context.module_name] = ExecutionResult(
-                        module_name=context.module_name,
-                        success=False,
-                        started_at=datetime.now(),
-                        completed_at=datetime.now(),
-                        duration_seconds=0,
-                        error=e,
-                    )
+            while pending or running:
+                # Launch modules while workers are free
+                while pending and len(running) < self.max_workers:
+                    context = self._next_context(pending, reserved)
+                    pending.remove(context)
+                    for resource in declared_resources(context.module_instance):
+                        reserved[resource] = reserved.get(resource, 0) + 1
+                    running[executor.submit(self._execute_module, context, callback)] = context
+
+                # Collect results as they complete
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    context = running.pop(future)
+                    for resource in declared_resources(context.module_instance):
+                        reserved[resource] -= 1
+
+                    try:
+                        result = future.result()
+                        results[context.module_name] = result
+                    except Exception as e:
+                        self.logger.error(
+                            f"Unexpected error executing {context.module_name}: {e}",
+                            exc_info=True,
+                        )
+                        results[context.module_name] = ExecutionResult(
+                            module_name=context.module_name,
+                            success=False,
+                            started_at=datetime.now(),
+                            completed_at=datetime.now(),
+                            duration_seconds=0,
+                            error=e,
+                        )
 
         return results
 
+    def _next_context(
+        self, pending: List[ExecutionContext], reserved: Dict[ResourceClass, int]
+    ) -> ExecutionContext:
+        """Pick the first pending module whose declared resources are not saturated."""
+        for context in pending:
+            if self.resource_pool.fits(declared_resources(context.module_instance), reserved):
+                return context
+        return pending[0]
+
     def _execute_module(
         self, context: ExecutionContext, callback: Optional[Callable]
     ) -> ExecutionResult:
         """Execute a single module."""
+        with (
+            module_context(context.module_name),
+            get_tracer().span(context.module_name, "module", executor=self.get_name()) as span,
+        ):
+            result = self._run_stages(context, callback)
+            span.set(success=result.success)
+        get_metrics().record_module(result.duration_seconds, result.success)
+        return result
+
+    def _run_stages(
+        self, context: ExecutionContext, callback: Optional[Callable[..., Any]]
+    ) -> ExecutionResult:
+        """Validate, configure and verify a module."""
         module = context.module_instance
+        tracer = get_tracer()
         started_at = datetime.now()
         thread_name = threading.current_thread().name
 
@@ -102,7 +156,9 @@ class ParallelExecutor(ExecutorInterface):
                 callback(context.module_name, "validating", {})
 
             if hasattr(module, "validate"):
-                if not module.validate():
+                with tracer.span("validate", "stage", module=context.module_name):
+                    valid = module.validate()
+                if not valid:
                     raise Exception(f"Validation failed for {context.module_name}")
             else:
                 self.logger.debug(
@@ -118,7 +174,9 @@ class ParallelExecutor(ExecutorInterface):
                 # If dry_run is passed in context, maybe we should pass it to module?
                 # For now assuming module.configure() does the right thing or we are running it.
                 # If the module doesn't accept args, we just call it.
-                if not module.configure():
+                with tracer.span("configure", "stage", module=context.module_name):
+                    configured = module.configure()
+                if not configured:
                     raise Exception(f"Configuration failed for {context.module_name}")
             else:
                 self.logger.debug(
@@ -130,7 +188,9 @@ class ParallelExecutor(ExecutorInterface):
                 callback(context.module_name, "verifying", {})
 
             if hasattr(module, "verify"):
-                if not module.verify():
+                with tracer.span("verify", "stage", module=context.module_name):
+                    verified = module.verify()
+                if not verified:
                     self.logger.warning(
                         f"[{thread_name}] Verification warnings for {context.module_name}"
                     )
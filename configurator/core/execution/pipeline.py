@@ -1,8 +1,23 @@
+import hashlib
+import json
 import logging
 from datetime import datetime
-from typing import Callable, Dict, Generator, List, Optional, Tuple
+from typing import Any, Callable, Dict, Generator, List, Optional, Set, Tuple
 
 from configurator.core.execution.base import ExecutionContext, ExecutionResult, ExecutorInterface
+from configurator.observability.metrics import get_metrics
+from configurator.observability.profiling import module_context
+from configurator.observability.tracing import get_tracer
+
+
+def module_steps(module: Any) -> List[Any]:
+    """Get the steps a module declares, or an empty list."""
+    steps_method = getattr(module, "steps", None)
+    if not callable(steps_method) or not hasattr(module, "run_steps"):
+        return []
+
+    steps = steps_method()
+    return steps if isinstance(steps, list) else []
 
 
 class PipelineExecutor(ExecutorInterface):
@@ -13,10 +28,15 @@ class PipelineExecutor(ExecutorInterface):
     - Large modules with many sequential steps (e.g., desktop)
     - Modules with force_sequential=True
     - Modules with heavy resource usage
+
+    Modules declaring steps() run step by step. With a state manager,
+    completed steps are recorded so a failed module resumes from its first
+    incomplete step on the next run.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, state_manager: Any = None):
         self.logger = logger or logging.getLogger(__name__)
+        self.state_manager = state_manager
 
     def get_name(self) -> str:
         return "PipelineExecutor"
@@ -52,7 +72,19 @@ class PipelineExecutor(ExecutorInterface):
         self, context: ExecutionContext, callback: Optional[Callable]
     ) -> ExecutionResult:
         """Execute single module via pipeline."""
-        module = context.module_instance
+        with (
+            module_context(context.module_name),
+            get_tracer().span(context.module_name, "module", executor=self.get_name()) as span,
+        ):
+            result = self._run_pipeline(context, callback)
+            span.set(success=result.success)
+        get_metrics().record_module(result.duration_seconds, result.success)
+        return result
+
+    def _run_pipeline(
+        self, context: ExecutionContext, callback: Optional[Callable[..., Any]]
+    ) -> ExecutionResult:
+        """Run the pipeline stages of a module."""
         started_at = datetime.now()
 
         try:
@@ -71,6 +103,9 @@ class PipelineExecutor(ExecutorInterface):
             completed_at = datetime.now()
             duration = (completed_at - started_at).total_seconds()
 
+            if self._tracks_steps(context):
+                self._clear_steps(context)
+
             if callback:
                 callback(context.module_name, "completed", {"duration": duration})
 
@@ -108,29 +143,83 @@ class PipelineExecutor(ExecutorInterface):
             (stage_name, success, metadata) tuples
         """
         module = context.module_instance
+        tracer = get_tracer()
+
+        def traced(stage: str, func: Callable[..., bool], *args: Any, **kwargs: Any) -> bool:
+            # Each stage runs inside its span; the yield happens outside it
+            with tracer.span(stage, "stage", module=context.module_name):
+                return func(*args, **kwargs)
 
         # Stage 1: Validate
         if hasattr(module, "validate"):
-            yield ("validating", module.validate(), {})
+            yield ("validating", traced("validate", module.validate), {})
         else:
             yield ("validating", True, {"skipped": True})
 
         # Stage 2: Pre-configure hooks (if exists)
         if hasattr(module, "pre_configure"):
-            yield ("pre_configure", module.pre_configure(), {})
+            yield ("pre_configure", traced("pre_configure", module.pre_configure), {})
 
         # Stage 3: Configure (main installation)
-        if hasattr(module, "configure"):
-            yield ("configuring", module.configure(), {})
+        if self._tracks_steps(context):
+            completed = self._completed_steps(context)
+            if completed:
+                self.logger.info(
+                    f"Resuming {context.module_name} after {len(completed)} completed step(s)"
+                )
+            success = traced(
+                "configure",
+                module.run_steps,
+                skip=completed,
+                on_complete=lambda step: self._complete_step(context, step.name),
+            )
+            yield ("configuring", success, {"resumed_steps": sorted(completed)})
+        elif hasattr(module, "configure"):
+            yield ("configuring", traced("configure", module.configure), {})
         else:
             yield ("configuring", True, {"skipped": True})
 
         # Stage 4: Post-configure hooks (if exists)
         if hasattr(module, "post_configure"):
-            yield ("post_configure", module.post_configure(), {})
+            yield ("post_configure", traced("post_configure", module.post_configure), {})
 
         # Stage 5: Verify
         if hasattr(module, "verify"):
-            yield ("verifying", module.verify(), {})
+            yield ("verifying", traced("verify", module.verify), {})
         else:
             yield ("verifying", True, {"skipped": True})
+
+    def _tracks_steps(self, context: ExecutionContext) -> bool:
+        """Check if a module runs as recorded steps."""
+        if self.state_manager is None or context.dry_run:
+            return False
+
+        return bool(module_steps(context.module_instance))
+
+    def _config_hash(self, context: ExecutionContext) -> str:
+        encoded = json.dumps(context.config, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _completed_steps(self, context: ExecutionContext) -> Set[str]:
+        try:
+            completed: Set[str] = self.state_manager.get_completed_steps(
+                context.module_name, self._config_hash(context)
+            )
+            return completed
+        except Exception as e:
+            self.logger.debug(f"No step checkpoints for {context.module_name}: {e}")
+            return set()
+
+    def _complete_step(self, context: ExecutionContext, step_name: str) -> None:
+        try:
+            self.state_manager.complete_step(
+                context.module_name, step_name, self._config_hash(context)
+            )
+        except Exception as e:
+            self.logger.debug(f"Failed to record step {step_name} of {context.module_name}: {e}")
+
+    def _clear_steps(self, context: ExecutionContext) -> None:
+        try:
+            self.state_manager.clear_steps(context.module_name)
+        except Exception as e:
+            self.logger.debug(f"Failed to clear steps of {context.module_name}: {e}")
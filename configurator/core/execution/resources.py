@@ -0,0 +1,221 @@
+"""
+Resource-class aware concurrency control.
+
+Replaces the single global APT lock with per-class semaphores so that
+network-, disk- and CPU-bound work of one module can overlap with dpkg work
+of another.
+
+- Steps acquire classes around individual commands
+  (ConfigurationModule.resource and ConfigurationModule.run).
+- Modules declare the classes they mostly use
+  (ConfigurationModule.resource_classes); executors use the declaration to
+  prefer launching modules whose classes still have spare capacity.
+"""
+
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+
+class ResourceClass(Enum):
+    """
+    Shared resources that limit how much work can overlap.
+
+    Declaration order is the acquisition order: a thread holding a class
+    may only acquire classes declared after it.
+    """
+
+    DPKG = "dpkg"
+    NETWORK = "network"
+    DISK = "disk"
+    CPU = "cpu"
+
+
+ResourceSpec = Union[ResourceClass, str]
+
+# dpkg and apt take an exclusive lock on the package database
+DEFAULT_CAPACITIES: Dict[ResourceClass, int] = {
+    ResourceClass.DPKG: 1,
+    ResourceClass.NETWORK: 4,
+    ResourceClass.DISK: 2,
+    ResourceClass.CPU: os.cpu_count() or 2,
+}
+
+_DPKG_PATTERN = re.compile(
+    r"\b(apt-get|apt|aptitude|dpkg|add-apt-repository|apt-key)\b|\|\s*(sudo\s+)?(ba)?sh\b"
+)
+_NETWORK_PATTERN = re.compile(
+    r"\b(curl|wget|git\s+(clone|fetch|pull)|pip3?\s+install|npm\s+install|"
+    r"cargo\s+install|go\s+install|rustup)\b"
+)
+_DISK_PATTERN = re.compile(r"\b(tar|unzip|rsync|fc-cache)\b|\bcp\s+-[a-zA-Z]*[rR]")
+_CPU_PATTERN = re.compile(r"\b(cargo\s+(install|build)|make|go\s+build|gcc|g\+\+)\b")
+
+
+def classify_command(command: Union[str, List[str]]) -> List[ResourceClass]:
+    """
+    Infer the resource classes a shell command needs.
+
+    Piped installer scripts (``curl ... | bash``) usually call apt themselves,
+    so they are treated as dpkg users as well as network users.
+
+    Args:
+        command: Command string or argument list
+
+    Returns:
+        Resource classes in acquisition order
+    """
+    text = command if isinstance(command, str) else " ".join(command)
+    patterns = [
+        (ResourceClass.DPKG, _DPKG_PATTERN),
+        (ResourceClass.NETWORK, _NETWORK_PATTERN),
+        (ResourceClass.DISK, _DISK_PATTERN),
+        (ResourceClass.CPU, _CPU_PATTERN),
+    ]
+    return [resource for resource, pattern in patterns if pattern.search(text)]
+
+
+def declared_resources(module: Any) -> List[ResourceClass]:
+    """
+    Get the resource classes a module declares via ``resource_classes``.
+
+    Returns an empty list for objects without a proper declaration.
+    """
+    resources = getattr(module, "resource_classes", None)
+    if not isinstance(resources, (list, tuple, set, frozenset)):
+        return []
+    return _normalize(resources)
+
+
+def _normalize(resources: Iterable[ResourceSpec]) -> List[ResourceClass]:
+    """Convert names to ResourceClass, deduplicate and sort by acquisition order."""
+    classes = {ResourceClass(r) if isinstance(r, str) else r for r in resources}
+    order = list(ResourceClass)
+    return sorted(classes, key=order.index)
+
+
+class ResourcePool:
+    """
+    Per-class semaphores with configurable capacities.
+
+    Acquisition is re-entrant per thread, so a step holding ``dpkg`` (e.g.
+    install_packages) can run commands that acquire ``dpkg`` again.
+    """
+
+    def __init__(
+        self,
+        capacities: Optional[Dict[ResourceSpec, int]] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize resource pool.
+
+        Args:
+            capacities: Concurrent holders allowed per class (defaults per class)
+            logger: Logger instance
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.capacities: Dict[ResourceClass, int] = dict(DEFAULT_CAPACITIES)
+
+        for resource, capacity in (capacities or {}).items():
+            try:
+                resource = ResourceClass(resource) if isinstance(resource, str) else resource
+            except ValueError:
+                self.logger.warning(f"Ignoring capacity for unknown resource class: {resource}")
+                continue
+            self.capacities[resource] = max(1, int(capacity))
+
+        self._semaphores = {
+            resource: threading.BoundedSemaphore(capacity)
+            for resource, capacity in self.capacities.items()
+        }
+        self._held = threading.local()
+
+    def _held_counts(self) -> Dict[ResourceClass, int]:
+        counts: Optional[Dict[ResourceClass, int]] = getattr(self._held, "counts", None)
+        if counts is None:
+            counts = self._held.counts = {}
+        return counts
+
+    def holds(self, resource: ResourceSpec) -> bool:
+        """Check whether the current thread holds a resource class."""
+        resource = ResourceClass(resource) if isinstance(resource, str) else resource
+        return self._held_counts().get(resource, 0) > 0
+
+    @contextmanager
+    def acquire(self, *resources: ResourceSpec) -> Iterator[None]:
+        """
+        Hold the given resource classes for the duration of the block.
+
+        Classes are acquired in ResourceClass order and released in reverse.
+        Classes already held by the current thread are not acquired again.
+        """
+        counts = self._held_counts()
+        entered: List[ResourceClass] = []
+        acquired: List[ResourceClass] = []
+
+        try:
+            for resource in _normalize(resources):
+                if counts.get(resource, 0) == 0:
+                    if self._out_of_order(resource, counts):
+                        self.logger.warning(
+                            f"Acquiring '{resource.value}' while holding later resource "
+                            "classes; nested acquisition should follow ResourceClass order"
+                        )
+                    self._semaphores[resource].acquire()
+                    acquired.append(resource)
+                counts[resource] = counts.get(resource, 0) + 1
+                entered.append(resource)
+            yield
+        finally:
+            for resource in reversed(entered):
+                counts[resource] -= 1
+            for resource in reversed(acquired):
+                self._semaphores[resource].release()
+
+    def _out_of_order(self, resource: ResourceClass, counts: Dict[ResourceClass, int]) -> bool:
+        """Check whether the thread already holds a class ordered after resource."""
+        order = list(ResourceClass)
+        return any(n and order.index(r) > order.index(resource) for r, n in counts.items())
+
+    def fits(self, resources: Iterable[ResourceSpec], reserved: Dict[ResourceClass, int]) -> bool:
+        """
+        Check whether more work on the given classes fits under the capacities.
+
+        Args:
+            resources: Resource classes the work declares
+            reserved: Number of running units already declaring each class
+
+        Returns:
+            True if no declared class is at capacity
+        """
+        return all(reserved.get(r, 0) < self.capacities[r] for r in _normalize(resources))
+
+
+_resource_pool: Optional[ResourcePool] = None
+_resource_pool_lock = threading.Lock()
+
+
+def get_resource_pool() -> ResourcePool:
+    """Get global resource pool."""
+    global _resource_pool
+    with _resource_pool_lock:
+        if _resource_pool is None:
+            _resource_pool = ResourcePool()
+        return _resource_pool
+
+
+def configure_resource_pool(capacities: Optional[Dict[ResourceSpec, int]] = None) -> ResourcePool:
+    """
+    Replace the global resource pool with one using the given capacities.
+
+    Must be called before modules start executing.
+    """
+    global _resource_pool
+    with _resource_pool_lock:
+        _resource_pool = ResourcePool(capacities)
+        return _resource_pool
@@ -0,0 +1,243 @@
+"""
+Dependency-driven streaming scheduler.
+
+Replaces level-synchronous batch execution: every module is launched the
+moment all of its dependencies have completed, so one slow module no longer
+stalls unrelated modules in the next dependency level.
+"""
+
+import heapq
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import networkx as nx
+
+from configurator.core.dependency import DependencyGraph, ModuleDependency
+from configurator.core.execution.base import ExecutionContext, ExecutionResult
+from configurator.core.execution.resources import (
+    ResourceClass,
+    ResourcePool,
+    declared_resources,
+    get_resource_pool,
+)
+
+# Runs one module on the calling thread: (context, callback) -> result
+ModuleRunner = Callable[[ExecutionContext, Optional[Callable[..., Any]]], ExecutionResult]
+
+
+class StreamingScheduler:
+    """
+    Ready-queue scheduler for module dependency graphs.
+
+    Modules enter the ready queue as soon as their last predecessor
+    completes. The ready queue is ordered critical-path-first: the module
+    with the longest chain of expected durations still ahead of it is
+    launched first. Expected durations come from previous runs (see
+    StateManager.get_module_durations); unknown modules use a default.
+
+    Among ready modules, those whose declared resource classes are already
+    saturated by running modules are passed over for one that can make
+    progress.
+
+    Modules with force_sequential=True keep their batch-model semantics and
+    run alone: the scheduler drains running modules, runs the sequential
+    module, then resumes.
+    """
+
+    DEFAULT_DURATION = 60.0
+
+    def __init__(
+        self,
+        runner: ModuleRunner,
+        max_workers: int = 4,
+        durations: Optional[Dict[str, float]] = None,
+        default_duration: float = DEFAULT_DURATION,
+        logger: Optional[logging.Logger] = None,
+        resource_pool: Optional[ResourcePool] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            runner: Callable executing a single module and returning its result
+            max_workers: Maximum number of modules running concurrently
+            durations: Historical module durations in seconds, keyed by module name
+            default_duration: Duration assumed for modules without history
+            logger: Logger instance
+            resource_pool: Pool providing resource class capacities
+        """
+        self.runner = runner
+        self.max_workers = max(1, max_workers)
+        self.durations = durations or {}
+        self.default_duration = default_duration
+        self.logger = logger or logging.getLogger(__name__)
+        self.resource_pool = resource_pool or get_resource_pool()
+
+    def get_name(self) -> str:
+        return "StreamingScheduler"
+
+    def compute_priorities(self, graph: DependencyGraph) -> Dict[str, float]:
+        """
+        Compute critical-path length for every module.
+
+        The priority of a module is its own expected duration plus the
+        longest priority among its dependents, i.e. the minimum time still
+        needed to finish everything that waits on it.
+
+        Returns:
+            Dict mapping module name to critical-path length in seconds
+
+        Raises:
+            ValueError: If the graph contains a cycle
+        """
+        try:
+            order = list(nx.topological_sort(graph.graph))
+        except nx.NetworkXUnfeasible:
+            raise ValueError(
+                f"Circular dependency detected among: {list(graph.graph.nodes())}\n"
+                "Please check module dependencies for cycles."
+            )
+
+        priorities: Dict[str, float] = {}
+        for node in reversed(order):
+            downstream = max((priorities[s] for s in graph.graph.successors(node)), default=0.0)
+            priorities[node] = self.durations.get(node, self.default_duration) + downstream
+
+        return priorities
+
+    def execute(
+        self,
+        graph: DependencyGraph,
+        context_factory: Callable[[str], ExecutionContext],
+        callback: Optional[Callable[..., Any]] = None,
+        stop_on_failure: bool = True,
+    ) -> Dict[str, ExecutionResult]:
+        """
+        Execute all modules of a dependency graph.
+
+        Args:
+            graph: Dependency graph of modules to execute
+            context_factory: Builds the ExecutionContext for a module name
+            callback: Optional progress callback(module_name, event, data)
+            stop_on_failure: Stop launching new modules after the first failure
+
+        Returns:
+            Dict mapping module names to execution results. Modules that never
+            started (failed dependency or stopped run) are not included.
+        """
+        priorities = self.compute_priorities(graph)
+        in_degree = dict(graph.graph.in_degree())
+
+        ready: List[Tuple[float, str]] = []
+        for node, degree in in_degree.items():
+            if degree == 0:
+                heapq.heappush(ready, (-priorities[node], node))
+
+        self.logger.info(
+            f"StreamingScheduler: Executing {len(in_degree)} modules "
+            f"with {self.max_workers} workers"
+        )
+
+        results: Dict[str, ExecutionResult] = {}
+        running: Dict[Future[ExecutionResult], str] = {}
+        reserved: Dict[ResourceClass, int] = {}
+        exclusive_running = False
+        halted = False
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="scheduler"
+        ) as executor:
+            while ready or running:
+                # Launch as many ready modules as capacity allows
+                while (
+                    ready
+                    and not halted
+                    and not exclusive_running
+                    and len(running) < self.max_workers
+                ):
+                    name = self._peek_ready(graph, ready, reserved)
+                    sequential = self._is_sequential(graph, name)
+                    if sequential and running:
+                        # Wait for running modules to drain before the exclusive one
+                        break
+
+                    ready.remove((-priorities[name], name))
+                    heapq.heapify(ready)
+                    for resource in self._resources(graph, name):
+                        reserved[resource] = reserved.get(resource, 0) + 1
+                    context = context_factory(name)
+                    self.logger.debug(f"Launching {name} (critical path {priorities[name]:.1f}s)")
+                    running[executor.submit(self.runner, context, callback)] = name
+
+                    if sequential:
+                        exclusive_running = True
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    result = self._collect(future, name)
+                    results[name] = result
+                    for resource in self._resources(graph, name):
+                        reserved[resource] -= 1
+
+                    if self._is_sequential(graph, name):
+                        exclusive_running = False
+
+                    if not result.success:
+                        self.logger.error(f"Module {name} failed")
+                        if stop_on_failure:
+                            halted = True
+                        continue
+
+                    for successor in graph.graph.successors(name):
+                        in_degree[successor] -= 1
+                        if in_degree[successor] == 0:
+                            heapq.heappush(ready, (-priorities[successor], successor))
+
+        skipped = [node for node in in_degree if node not in results]
+        if skipped:
+            self.logger.warning(f"Not executed due to earlier failures: {', '.join(skipped)}")
+
+        return results
+
+    def _peek_ready(
+        self,
+        graph: DependencyGraph,
+        ready: List[Tuple[float, str]],
+        reserved: Dict[ResourceClass, int],
+    ) -> str:
+        """Return the highest-priority ready module whose resources are not saturated."""
+        for _, name in sorted(ready):
+            if self.resource_pool.fits(self._resources(graph, name), reserved):
+                return name
+        return ready[0][1]
+
+    def _resources(self, graph: DependencyGraph, name: str) -> List[ResourceClass]:
+        """Get the resource classes a module declared in the graph."""
+        return declared_resources(graph.module_info.get(name, ModuleDependency(name)))
+
+    def _is_sequential(self, graph: DependencyGraph, name: str) -> bool:
+        """Check whether a module must run alone."""
+        return bool(graph.module_info.get(name, ModuleDependency(name)).force_sequential)
+
+    def _collect(self, future: Future[ExecutionResult], name: str) -> ExecutionResult:
+        """Get a module result, converting unexpected runner errors to failures."""
+        try:
+            return future.result()
+        except Exception as e:
+            self.logger.error(f"Unexpected error executing {name}: {e}", exc_info=True)
+            now = datetime.now()
+            return ExecutionResult(
+                module_name=name,
+                success=False,
+                started_at=now,
+                completed_at=now,
+                duration_seconds=0,
+                error=e,
+            )
@@ -0,0 +1,170 @@
+"""
+Module steps.
+
+Large modules declare their configure() work as named steps. The
+PipelineExecutor records each completed step in the state database, so a
+module that failed late resumes from its first incomplete step instead of
+starting over.
+
+Steps form a dependency graph: a step starts once the steps it depends on
+have finished, and independent steps run concurrently up to a worker
+limit. Commands inside steps still hold their resource classes (see
+ConfigurationModule.run), so network-bound steps overlap while apt/dpkg
+work stays serialized. A step graph must not be started while holding a
+resource class, since its steps run on other threads.
+"""
+
+import contextvars
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Collection, Dict, List, Optional
+
+from configurator.observability.tracing import get_tracer
+
+
+@dataclass
+class ModuleStep:
+    """A named unit of a module's configure() work."""
+
+    name: str
+    run: Callable[[], bool]
+    # Failure of a critical step fails the module; others only log a warning
+    critical: bool = True
+    description: str = ""
+    # Steps that must finish first; None means the previous step in the list
+    depends_on: Optional[List[str]] = None
+
+    @property
+    def label(self) -> str:
+        return self.description or self.name
+
+    def execute(self, logger: logging.Logger) -> bool:
+        """
+        Run the step.
+
+        Returns:
+            True if the step succeeded
+        """
+        try:
+            with get_tracer().span(self.name, "step"):
+                return bool(self.run())
+        except Exception as e:
+            logger.error(f"{self.label} failed: {e}", exc_info=True)
+            return False
+
+
+def step_dependencies(steps: List[ModuleStep]) -> Dict[str, List[str]]:
+    """
+    Resolve the dependencies of each step.
+
+    Raises:
+        ValueError: If a step depends on an unknown step
+    """
+    names = {step.name for step in steps}
+    dependencies: Dict[str, List[str]] = {}
+
+    previous: Optional[str] = None
+    for step in steps:
+        if step.depends_on is None:
+            deps = [previous] if previous else []
+        else:
+            deps = list(step.depends_on)
+
+        unknown = [d for d in deps if d not in names]
+        if unknown:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps: {', '.join(unknown)}")
+
+        dependencies[step.name] = deps
+        previous = step.name
+
+    return dependencies
+
+
+def run_step_graph(
+    steps: List[ModuleStep],
+    logger: logging.Logger,
+    max_workers: int = 1,
+    skip: Collection[str] = (),
+    on_complete: Optional[Callable[[ModuleStep], None]] = None,
+) -> Dict[str, bool]:
+    """
+    Run steps in dependency order, independent steps concurrently.
+
+    Dependencies only order steps: a step also runs if a non-critical step
+    it depends on failed. After a critical failure no further steps start.
+
+    Args:
+        steps: Steps in declaration order
+        logger: Logger for step failures
+        max_workers: Maximum steps running at the same time
+        skip: Names of steps completed in an earlier run (count as succeeded)
+        on_complete: Called after each successful step, on the calling thread
+
+    Returns:
+        Dict mapping each finished or skipped step to whether it succeeded
+
+    Raises:
+        ValueError: If dependencies are unknown or cyclic
+    """
+    dependencies = step_dependencies(steps)
+    results: Dict[str, bool] = {}
+    pending: List[ModuleStep] = []
+
+    for step in steps:
+        if step.name in skip:
+            logger.info(f"Skipping completed step: {step.label}")
+            results[step.name] = True
+        else:
+            pending.append(step)
+
+    aborted = False
+
+    def ready() -> List[ModuleStep]:
+        return [s for s in pending if all(d in results for d in dependencies[s.name])]
+
+    def finish(step: ModuleStep, success: bool) -> None:
+        nonlocal aborted
+        results[step.name] = success
+        if success:
+            if on_complete:
+                on_complete(step)
+        elif step.critical:
+            logger.error(f"{step.label} failed")
+            aborted = True
+        else:
+            logger.warning(f"{step.label} failed (non-critical)")
+
+    if max_workers <= 1:
+        while pending and not aborted:
+            runnable = ready()
+            if not runnable:
+                break
+            step = runnable[0]
+            pending.remove(step)
+            finish(step, step.execute(logger))
+    else:
+        running: Dict[Future[bool], ModuleStep] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="step") as executor:
+            while True:
+                if not aborted:
+                    for step in ready():
+                        if len(running) >= max_workers:
+                            break
+                        pending.remove(step)
+                        # Steps keep the caller's context (e.g. the running module)
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, step.execute, logger)] = step
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    finish(step, future.result())
+
+    if pending and not aborted:
+        raise ValueError(f"Cyclic step dependencies: {', '.join(s.name for s in pending)}")
+
+    return results
@@ -0,0 +1,280 @@
+"""
+Local mirror cache for git clones.
+
+Themes, icon packs and zsh plugins used to be cloned from scratch on every
+run. The cache keeps a bare mirror per repository URL and clones from it
+locally, so repeated installs only fetch the commits that are new upstream.
+
+- A mirror is created with the depth of the first clone (shallow mirrors
+  for --depth=1 clones) and fetched incrementally afterwards. Fetches
+  advertise the commits the mirror already has, so only new objects are
+  transferred.
+- Each mirror is fetched at most once per run; further clones of the same
+  repository, e.g. a plugin cloned for every user, are served locally.
+- Mirrors hold every branch, so clones of a non-default branch are served
+  from the same mirror.
+- Clones from a full mirror hardlink its objects. Clones handed to another
+  user are copied instead, so the user cannot modify shared objects.
+"""
+
+import hashlib
+import logging
+import os
+import pwd
+import re
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+from configurator.core.execution.resources import ResourceClass, get_resource_pool
+from configurator.utils.file_lock import file_lock
+
+
+class GitCacheError(Exception):
+    """Raised when a mirror cannot be updated or cloned from."""
+
+
+class GitMirrorCache:
+    """
+    Bare git mirrors used as the source of local clones.
+
+    Usage:
+        cache = GitMirrorCache()
+        cache.clone("https://github.com/dracula/gtk.git", "/tmp/dracula-theme")
+    """
+
+    DEFAULT_CACHE_DIR = Path("/var/cache/debian-vps-configurator/git")
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        timeout: int = 600,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize git mirror cache.
+
+        Args:
+            cache_dir: Directory for bare mirrors
+            timeout: Timeout per git command in seconds
+            logger: Logger instance
+        """
+        self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        # Mirrors fetched by this instance (one fetch per run)
+        self._fetched: Set[str] = set()
+
+        self._ensure_cache_dir()
+
+    def _ensure_cache_dir(self) -> None:
+        """Create cache directory if it doesn't exist"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True, mode=0o755)
+        except Exception as e:
+            self.logger.debug(f"Could not create system git cache directory: {e}")
+            # Fallback to user cache
+            self.cache_dir = Path.home() / ".cache/debian-vps-configurator/git"
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.logger.info(f"Using fallback git cache directory: {self.cache_dir}")
+
+    def mirror_path(self, url: str) -> Path:
+        """Location of the mirror of a repository URL"""
+        name = url.rstrip("/").rsplit("/", 1)[-1]
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", name[:-4] if name.endswith(".git") else name)
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+        return self.cache_dir / f"{name}-{digest}.git"
+
+    def _git(self, *args: str, cwd: Optional[Path] = None) -> str:
+        """Run git without prompting for credentials"""
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=cwd,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise GitCacheError(f"git {args[0]} failed: {e}") from e
+
+        if result.returncode != 0:
+            raise GitCacheError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def _has_commit(self, path: Path, commit: str) -> bool:
+        try:
+            self._git("-C", str(path), "cat-file", "-e", f"{commit}^{{commit}}")
+            return True
+        except GitCacheError:
+            return False
+
+    def update(self, url: str, depth: Optional[int] = 1, commit: Optional[str] = None) -> Path:
+        """
+        Create or fetch the mirror of a repository.
+
+        Args:
+            url: Repository URL
+            depth: History depth for new or shallow mirrors (None for full history)
+            commit: Commit that must be present in the mirror
+
+        Returns:
+            Path to the bare mirror
+
+        Raises:
+            GitCacheError: If the mirror cannot be created or fetched
+        """
+        with self._lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+
+        path = self.mirror_path(url)
+        with url_lock, file_lock(str(path)):
+            exists = (path / "HEAD").exists()
+            shallow = (path / "shallow").exists()
+            unshallow = shallow and not depth
+
+            if not exists:
+                self._create(url, path, depth)
+            elif url not in self._fetched or unshallow:
+                self._fetch(url, path, depth if shallow else None, unshallow)
+            self._fetched.add(url)
+
+            if commit and not self._has_commit(path, commit):
+                self.logger.debug(f"Fetching pinned commit {commit[:8]} into mirror")
+                with get_resource_pool().acquire(ResourceClass.NETWORK):
+                    self._git("-C", str(path), "fetch", "--depth=1", "origin", commit)
+                # Keep the commit referenced so it survives gc and clones see it
+                self._git("-C", str(path), "update-ref", f"refs/pinned/{commit}", commit)
+
+        return path
+
+    def _create(self, url: str, path: Path, depth: Optional[int]) -> None:
+        """Clone a new bare mirror next to its final location, then move it in place"""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+        args = ["clone", "--bare", "--no-tags"]
+        if depth:
+            # --depth implies --single-branch; mirrors serve every branch
+            args.extend([f"--depth={depth}", "--no-single-branch"])
+
+        self.logger.info(f"Creating git mirror of {url}")
+        try:
+            with get_resource_pool().acquire(ResourceClass.NETWORK):
+                self._git(*args, url, str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def _fetch(self, url: str, path: Path, depth: Optional[int], unshallow: bool) -> None:
+        """Fetch new commits of all branches into an existing mirror"""
+        args = ["-C", str(path), "fetch", "--no-tags", "--prune"]
+        if unshallow:
+            args.append("--unshallow")
+        elif depth:
+            args.append(f"--depth={depth}")
+        args.extend(["origin", "+refs/heads/*:refs/heads/*"])
+
+        self.logger.debug(f"Updating git mirror of {url}")
+        with get_resource_pool().acquire(ResourceClass.NETWORK):
+            self._git(*args)
+
+    def clone(
+        self,
+        url: str,
+        dest: Union[str, Path],
+        depth: Optional[int] = 1,
+        branch: Optional[str] = None,
+        commit: Optional[str] = None,
+        owner: Optional[str] = None,
+    ) -> Path:
+        """
+        Clone a repository through its mirror.
+
+        The clone's origin points at url, as if it was cloned from there.
+
+        Args:
+            url: Repository URL
+            dest: Directory to clone into (must not exist)
+            depth: History depth (None for full history)
+            branch: Branch to check out (default branch if None)
+            commit: Commit to check out
+            owner: User to hand the clone to (its files are copied, not hardlinked)
+
+        Returns:
+            Path to the clone
+
+        Raises:
+            GitCacheError: If the mirror cannot be updated or cloned from
+        """
+        dest_path = Path(dest)
+        if owner:
+            try:
+                user = pwd.getpwnam(owner)
+            except KeyError as e:
+                raise GitCacheError(f"Unknown user: {owner}") from e
+        mirror = self.update(url, depth, commit)
+
+        args = ["clone", "--quiet"]
+        if owner:
+            args.append("--no-hardlinks")
+        if branch:
+            args.extend(["--branch", branch])
+        self._git(*args, str(mirror), str(dest_path))
+        self._git("-C", str(dest_path), "remote", "set-url", "origin", url)
+
+        if commit:
+            if not self._has_commit(dest_path, commit):
+                self._git("-C", str(dest_path), "fetch", "--quiet", str(mirror), commit)
+            self._git("-C", str(dest_path), "checkout", "--quiet", commit)
+
+        if owner:
+            # Never follow symlinks: the repository controls where they point
+            os.chown(dest_path, user.pw_uid, user.pw_gid, follow_symlinks=False)
+            for root, dirs, files in os.walk(dest_path):
+                for name in dirs + files:
+                    os.chown(
+                        os.path.join(root, name),
+                        user.pw_uid,
+                        user.pw_gid,
+                        follow_symlinks=False,
+                    )
+
+        self.logger.debug(f"Cloned {url} to {dest_path} from local mirror")
+        return dest_path
+
+    def list_mirrors(self) -> List[Path]:
+        """List mirrors in the cache"""
+        return sorted(p for p in self.cache_dir.glob("*.git") if (p / "HEAD").exists())
+
+    def get_size(self) -> int:
+        """Total size of all mirrors in bytes"""
+        return sum(
+            f.stat().st_size
+            for mirror in self.list_mirrors()
+            for f in mirror.rglob("*")
+            if f.is_file()
+        )
+
+    def clear(self) -> int:
+        """
+        Remove every mirror.
+
+        Returns:
+            Number of mirrors removed
+        """
+        mirrors = self.list_mirrors()
+        for mirror in mirrors:
+            shutil.rmtree(mirror, ignore_errors=True)
+        with self._lock:
+            self._fetched.clear()
+
+        self.logger.info(f"Cleared git cache: {len(mirrors)} mirrors removed")
+        return len(mirrors)
@@ -7,6 +7,7 @@ status dashboard.
 
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -126,13 +127,15 @@ class HealthCheckService:
         Returns:
             Dictionary of service name to HealthCheck
         """
-        results = {}
-
-        for service, url in self.services.items():
-            result = self.check_service(service, url)
-            results[service] = result
-            self.last_results[service] = result
-
+        # Services are checked concurrently, so slow ones do not add up
+        with ThreadPoolExecutor(max_workers=max(1, len(self.services))) as executor:
+            checks = {
+                service: executor.submit(self.check_service, service, url)
+                for service, url in self.services.items()
+            }
+            results = {service: future.result() for service, future in checks.items()}
+
+        self.last_results.update(results)
         return results
 
     def get_summary(self) -> dict:
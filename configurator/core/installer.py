@@ -5,25 +5,37 @@ Manages the execution order of modules and handles errors.
 """
 
 import logging
-from typing import Any, Dict, Optional
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
 
 from configurator.config import ConfigManager
+from configurator.core.apt_transaction import AptTransactionPlanner
 from configurator.core.container import Container
+from configurator.core.convergence import ConvergenceTracker
 from configurator.core.dependency import DependencyGraph
 from configurator.core.dryrun import DryRunManager
-from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.base import ExecutionContext, ExecutionResult
 
 # Sprint 2 Components
 from configurator.core.execution.hybrid import HybridExecutor
+from configurator.core.execution.scheduler import StreamingScheduler
 from configurator.core.hooks.events import HookContext, HookEvent
 from configurator.core.hooks.manager import HooksManager
 from configurator.core.reporter.base import ReporterInterface
 from configurator.core.reporter.console import ConsoleReporter
 from configurator.core.rollback import RollbackManager
+from configurator.core.state.history import EtaEstimator
 from configurator.core.state.manager import StateManager
+from configurator.core.state.models import ModuleStatus
 from configurator.core.validator import SystemValidator
+from configurator.observability.exporter import DEFAULT_HOST, DEFAULT_PORT, MetricsExporter
+from configurator.observability.profiling import DEFAULT_PROFILE_FILE, get_command_profiler
+from configurator.observability.tracing import DEFAULT_CAPACITY, DEFAULT_TRACE_FILE, get_tracer
 from configurator.plugins.loader import PluginManager
+from configurator.utils.apt_update import configure_apt_update_tracker
 from configurator.utils.circuit_breaker import CircuitBreakerManager
+from configurator.utils.deb_prefetch import DebPrefetcher
 from configurator.validators.orchestrator import ValidationOrchestrator
 
 # Fallback to rich reporter if available, else console
@@ -65,14 +77,52 @@ class Installer:
 
         # Sprint 2 Components
         self.hooks_manager = HooksManager()
+        self.state_manager = StateManager(logger=self.logger)
+        resource_capacities = self.config.get("performance.resources", None)
         self.hybrid_executor = HybridExecutor(
-            max_workers=self.config.get("performance.max_workers", 4), logger=self.logger
+            max_workers=self.config.get("performance.max_workers", 4),
+            logger=self.logger,
+            resource_capacities=(
+                resource_capacities if isinstance(resource_capacities, dict) else None
+            ),
+            state_manager=self.state_manager,
         )
-        self.state_manager = StateManager(logger=self.logger)
+        self.convergence_tracker = ConvergenceTracker(self.state_manager, self.logger)
         self.validator_orchestrator = ValidationOrchestrator(logger=self.logger)
 
         self.logger.info("Installer initialized with Sprint 2 components")
 
+        # Switch to the fastest APT mirror before the first apt-get update
+        self.mirror_selector = None
+        if self.config.get("performance.mirror_selection.enabled", True) is True:
+            try:
+                from configurator.core.mirrors import MirrorSelector
+
+                candidates = self.config.get("performance.mirror_selection.candidates", None)
+                ttl_hours = self.config.get("performance.mirror_selection.ttl_hours", 24)
+                if not isinstance(ttl_hours, (int, float)):
+                    ttl_hours = 24
+                self.mirror_selector = MirrorSelector(
+                    candidates=candidates if isinstance(candidates, list) else None,
+                    ttl_seconds=ttl_hours * 3600,
+                    logger=self.logger,
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to initialize mirror selection: {e}")
+
+        # Skip apt-get update while package lists are fresh
+        apt_update_ttl = self.config.get("performance.apt_update.ttl_seconds", 3600)
+        if not isinstance(apt_update_ttl, (int, float)) or isinstance(apt_update_ttl, bool):
+            apt_update_ttl = 3600
+        prepare_sources: Optional[Callable[[], None]] = None
+        selector = self.mirror_selector
+        if selector is not None:
+
+            def prepare_sources() -> None:
+                selector.apply(self.rollback_manager)
+
+        configure_apt_update_tracker(ttl=apt_update_ttl, prepare_sources=prepare_sources)
+
         # Initialize Package Cache (Phase 3)
         self.package_cache_manager = None
         if self.config.get("performance.package_cache.enabled", True):
@@ -80,14 +130,69 @@ class Installer:
                 from configurator.core.package_cache import PackageCacheManager
 
                 max_size_gb = self.config.get("performance.package_cache.max_size_gb", 10.0)
+                verify_policy = self.config.get("performance.package_cache.verify", "fingerprint")
+                if not isinstance(verify_policy, str):
+                    verify_policy = PackageCacheManager.VERIFY_FINGERPRINT
                 self.package_cache_manager = PackageCacheManager(
-                    max_size_gb=max_size_gb, logger=self.logger
+                    max_size_gb=max_size_gb, logger=self.logger, verify_policy=verify_policy
                 )
+
+                scrub_hours = self.config.get("performance.package_cache.scrub_interval_hours", 0)
+                if isinstance(scrub_hours, (int, float)) and scrub_hours > 0:
+                    self.package_cache_manager.start_scrubber(interval_hours=scrub_hours)
             except ImportError:
                 pass
             except Exception as e:
                 self.logger.warning(f"Failed to initialize package cache: {e}")
 
+        # Cache for downloads outside APT (tarballs, binaries, fonts)
+        self.artifact_cache = None
+        if self.config.get("performance.artifact_cache.enabled", True) is not False:
+            try:
+                from datetime import timedelta
+
+                from configurator.core.artifact_cache import ArtifactCacheManager
+
+                max_size_gb = self.config.get("performance.artifact_cache.max_size_gb", 5.0)
+                if not isinstance(max_size_gb, (int, float)):
+                    max_size_gb = ArtifactCacheManager.DEFAULT_MAX_SIZE_GB
+                revalidate_hours = self.config.get(
+                    "performance.artifact_cache.revalidate_after_hours", 24
+                )
+                if not isinstance(revalidate_hours, (int, float)):
+                    revalidate_hours = 24
+                self.artifact_cache = ArtifactCacheManager(
+                    max_size_gb=max_size_gb,
+                    revalidate_after=timedelta(hours=revalidate_hours),
+                    logger=self.logger,
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to initialize artifact cache: {e}")
+
+        # Local mirrors that git clones (themes, zsh plugins) are served from
+        self.git_cache = None
+        if self.config.get("performance.git_cache.enabled", True) is not False:
+            try:
+                from configurator.core.git_cache import GitMirrorCache
+
+                self.git_cache = GitMirrorCache(logger=self.logger)
+            except Exception as e:
+                self.logger.warning(f"Failed to initialize git cache: {e}")
+
+        # Parallel .deb downloads ahead of apt-get install
+        self.prefetcher = None
+        if self.config.get("performance.prefetch.enabled", True):
+            prefetch_workers = self.config.get("performance.prefetch.max_workers", 4)
+            self.prefetcher = DebPrefetcher(
+                cache_manager=self.package_cache_manager,
+                max_workers=prefetch_workers if isinstance(prefetch_workers, int) else 4,
+                logger=self.logger,
+            )
+
+        self.apt_transaction_planner = AptTransactionPlanner(
+            self.rollback_manager, self.logger, prefetcher=self.prefetcher
+        )
+
         # Register services
         self._register_services()
 
@@ -110,6 +215,10 @@ class Installer:
             "dry_run_manager": lambda: self.dry_run_manager,
             "circuit_breaker_manager": lambda: self.circuit_breaker_manager,
             "package_cache_manager": lambda: self.package_cache_manager,
+            "apt_transaction_planner": lambda: self.apt_transaction_planner,
+            "prefetcher": lambda: self.prefetcher,
+            "artifact_cache": lambda: self.artifact_cache,
+            "git_cache": lambda: self.git_cache,
             "state_manager": lambda: self.state_manager,
         }
         for name, factory in services.items():
@@ -198,13 +307,57 @@ class Installer:
                     dry_run_manager=c.get("dry_run_manager"),
                     circuit_breaker_manager=c.get("circuit_breaker_manager"),
                     package_cache_manager=c.get("package_cache_manager"),
+                    apt_transaction_planner=c.get("apt_transaction_planner"),
+                    prefetcher=c.get("prefetcher"),
+                    artifact_cache=c.get("artifact_cache"),
+                    git_cache=c.get("git_cache"),
                 ),
             )
 
     def install(
-        self, skip_validation: bool = False, dry_run: bool = False, parallel: bool = True
+        self,
+        skip_validation: bool = False,
+        dry_run: bool = False,
+        parallel: bool = True,
+        force: bool = False,
+    ) -> bool:
+        """
+        Run the full installation.
+
+        Modules whose convergence fingerprint matches their last successful
+        run are only verified, unless force is set or
+        performance.skip_converged is disabled.
+
+        With observability.tracing enabled, a trace of the run is saved
+        for 'vps-configurator trace'. With observability.profiling enabled,
+        a report of the slowest commands is saved for
+        'vps-configurator monitoring commands'. With observability.exporter
+        enabled, metrics are served for Prometheus while the install runs.
+        """
+        tracing = self._start_tracing()
+        profiling = self._start_command_profiling()
+        exporter = self._start_metrics_exporter()
+        try:
+            with get_tracer().span("install", "phase", profile=self._profile_name()):
+                return self._install(skip_validation, dry_run, parallel, force)
+        finally:
+            if exporter:
+                exporter.stop()
+            if tracing:
+                self._save_trace()
+            if profiling:
+                self._save_command_profile()
+
+    def _install(
+        self,
+        skip_validation: bool,
+        dry_run: bool,
+        parallel: bool,
+        force: bool,
     ) -> bool:
-        """Run the full installation."""
+        """Run the installation phases."""
+        tracer = get_tracer()
+        force = force or self.config.get("performance.skip_converged", True) is False
         try:
             if dry_run:
                 self.dry_run_manager.enable()
@@ -216,19 +369,24 @@ class Installer:
             if not skip_validation:
                 self.reporter.start_phase("System Validation")
                 is_interactive = self.config.get("interactive", True)
-                success, _ = self.validator_orchestrator.run_validation(interactive=is_interactive)
+                with tracer.span("validation", "phase"):
+                    success, _ = self.validator_orchestrator.run_validation(
+                        interactive=is_interactive
+                    )
                 if not success:
                     self.reporter.error("System validation failed")
                     return False
                 self.reporter.complete_phase(True)
 
             # 2. Load Plugins & Hooks
-            self.plugin_manager.load_plugins()
-            self.hooks_manager.execute(HookEvent.BEFORE_INSTALLATION)
+            with tracer.span("plugins", "phase"):
+                self.plugin_manager.load_plugins()
+                self.hooks_manager.execute(HookEvent.BEFORE_INSTALLATION)
 
             # 3. Build Graph
             enabled_modules = self.config.get_enabled_modules()
             graph = DependencyGraph(self.logger)
+            modules: Dict[str, Any] = {}
 
             # Populate graph
             from configurator.core.dependencies import COMPLETE_MODULE_DEPENDENCIES
@@ -242,26 +400,46 @@ class Installer:
                 # Creating instance is cheap (DI) as long as we don't run it
                 config = self._get_module_config(module_name)
                 module = self.container.make(module_name, config=config)
+                modules[module_name] = module
 
                 depends_on = getattr(module, "depends_on", []) or COMPLETE_MODULE_DEPENDENCIES.get(
                     module_name, []
                 )
                 force_sequential = getattr(module, "force_sequential", False)
-
-                graph.add_module(module_name, depends_on, force_sequential)
+                resource_classes = getattr(module, "resource_classes", None)
+
+                graph.add_module(
+                    module_name,
+                    depends_on,
+                    force_sequential,
+                    resource_classes=(
+                        resource_classes if isinstance(resource_classes, list) else None
+                    ),
+                )
 
             graph.validate()
-            batches = graph.get_execution_batches()
 
-            # 4. Execute Batches
-            execution_results = {}
+            durations = self._expected_durations()
+            eta = self._create_eta_estimator(graph, durations)
 
+            if not dry_run and self.config.get("performance.apt_transaction.enabled", True):
+                with tracer.span("apt_transaction", "phase"):
+                    self._install_package_transaction(modules)
+
+            # 4. Execute Modules
             def execution_callback(module_name: str, stage: str, data: Dict):
                 """Bridge between Executor, Hooks, and Reporter."""
                 context = HookContext(
                     event=HookEvent.BEFORE_MODULE_CONFIGURE, module_name=module_name, data=data
                 )  # Default event
 
+                self._record_module_state(module_name, stage)
+
+                if stage == "started":
+                    eta.start(module_name)
+                elif stage in ("completed", "failed", "skipped"):
+                    eta.finish(module_name)
+
                 if stage == "started":
                     self.reporter.start_phase(f"Installing {module_name}")
 
@@ -284,39 +462,44 @@ class Installer:
                     self.hooks_manager.execute(HookEvent.ON_MODULE_ERROR, context)
                     self.reporter.complete_phase(False)
 
-            total_batches = len(batches)
-            self.logger.info(f"Starting execution of {total_batches} batches")
-
-            for i, batch in enumerate(batches, 1):
-                self.logger.info(f"Batch {i}/{total_batches}: {', '.join(batch)}")
+                elif stage == "skipped":
+                    self.reporter.update(f"{module_name} is up to date")
+                    self.reporter.complete_phase(True)
 
-                contexts = []
-                for module_name in batch:
-                    config = self._get_module_config(module_name)
-                    module = self.container.make(module_name, config=config)
+                self.reporter.show_eta(
+                    eta.total_remaining(), module_name, eta.module_remaining(module_name)
+                )
 
-                    ctx = ExecutionContext(
-                        module_name=module_name,
-                        module_instance=module,
-                        config=config,
-                        dry_run=dry_run,
-                    )
-                    contexts.append(ctx)
+            def make_context(module_name: str) -> ExecutionContext:
+                config = self._get_module_config(module_name)
+                module = self.container.make(module_name, config=config)
+                return ExecutionContext(
+                    module_name=module_name,
+                    module_instance=module,
+                    config=config,
+                    dry_run=dry_run,
+                    force=force,
+                )
 
-                # Execute batch
-                results = self.hybrid_executor.execute(contexts, callback=execution_callback)
-                execution_results.update(results)
+            if not dry_run:
+                self._start_state_tracking()
 
-                # Check for critical failures in batch
-                if any(not r.success for r in results.values()):
-                    self.logger.error("Batch failed. Stopping.")
-                    break
+            with tracer.span("modules", "phase", modules=len(modules)):
+                if self.config.get("performance.scheduler", "streaming") == "batch":
+                    execution_results = self._execute_batches(
+                        graph, make_context, execution_callback
+                    )
+                else:
+                    execution_results = self._execute_streaming(
+                        graph, make_context, execution_callback, durations
+                    )
 
             # 5. Summary
             summary_results = {name: res.success for name, res in execution_results.items()}
             self.reporter.show_summary(summary_results)
 
             success = all(r.success for r in execution_results.values())
+            self._complete_state_tracking(success)
 
             if success:
                 self.hooks_manager.execute(HookEvent.AFTER_INSTALLATION)
@@ -332,6 +515,272 @@ class Installer:
             self.hooks_manager.execute(HookEvent.ON_INSTALLATION_ERROR, error=str(e))
             return False
 
+    def _install_package_transaction(self, modules: Dict[str, Any]) -> None:
+        """Install the archive packages of all modules in one APT transaction."""
+        planner = self.apt_transaction_planner
+        package_sets = planner.discover(modules)
+        if not package_sets:
+            return
+
+        self.reporter.start_phase("Installing Packages")
+        try:
+            transaction = planner.plan(package_sets)
+            success = planner.execute(transaction)
+        except Exception as e:
+            self.logger.warning(f"APT transaction failed, modules will install individually: {e}")
+            planner.transaction = None
+            success = False
+        self.reporter.complete_phase(success)
+
+    def _execute_batches(
+        self,
+        graph: DependencyGraph,
+        make_context: Callable[[str], ExecutionContext],
+        callback: Callable[..., Any],
+    ) -> Dict[str, ExecutionResult]:
+        """Execute modules level by level, waiting for each batch to finish."""
+        execution_results: Dict[str, ExecutionResult] = {}
+        batches = graph.get_execution_batches()
+
+        total_batches = len(batches)
+        self.logger.info(f"Starting execution of {total_batches} batches")
+
+        for i, batch in enumerate(batches, 1):
+            self.logger.info(f"Batch {i}/{total_batches}: {', '.join(batch)}")
+
+            contexts = [make_context(module_name) for module_name in batch]
+
+            # Converged modules are only verified
+            results: Dict[str, ExecutionResult] = {}
+            pending = []
+            for context in contexts:
+                if self._is_converged(context):
+                    results[context.module_name] = self._skip_converged(context, callback)
+                else:
+                    pending.append(context)
+
+            # Execute batch
+            if pending:
+                with get_tracer().span(f"batch {i}", "batch", modules=batch):
+                    results.update(self.hybrid_executor.execute(pending, callback=callback))
+            for context in pending:
+                self._record_convergence(context, results.get(context.module_name))
+            execution_results.update(results)
+
+            # Check for critical failures in batch
+            if any(not r.success for r in results.values()):
+                self.logger.error("Batch failed. Stopping.")
+                break
+
+        return execution_results
+
+    def _execute_streaming(
+        self,
+        graph: DependencyGraph,
+        make_context: Callable[[str], ExecutionContext],
+        callback: Callable[..., Any],
+        durations: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, ExecutionResult]:
+        """Execute modules as soon as their dependencies complete."""
+        if durations is None:
+            durations = self._expected_durations()
+
+        scheduler = StreamingScheduler(
+            runner=self._run_module,
+            max_workers=self.config.get("performance.max_workers", 4),
+            durations=durations,
+            logger=self.logger,
+            resource_pool=self.hybrid_executor.resource_pool,
+        )
+        return scheduler.execute(graph, make_context, callback=callback)
+
+    def _run_module(
+        self, context: ExecutionContext, callback: Optional[Callable[..., Any]] = None
+    ) -> ExecutionResult:
+        """Execute one module, or only verify it if it is already converged."""
+        if self._is_converged(context):
+            return self._skip_converged(context, callback)
+
+        result = self.hybrid_executor.execute_one(context, callback)
+        self._record_convergence(context, result)
+        return result
+
+    def _is_converged(self, context: ExecutionContext) -> bool:
+        """Check if a module can skip configure() on this run."""
+        if context.dry_run or context.force:
+            return False
+        return self.convergence_tracker.is_converged(context.module_name, context.module_instance)
+
+    def _skip_converged(
+        self, context: ExecutionContext, callback: Optional[Callable[..., Any]] = None
+    ) -> ExecutionResult:
+        """Report a converged module as done without running it."""
+        started_at = datetime.now()
+        self.logger.info(f"{context.module_name} is unchanged since its last run, skipping")
+
+        if callback:
+            callback(context.module_name, "started", {})
+            callback(context.module_name, "skipped", {})
+
+        completed_at = datetime.now()
+        return ExecutionResult(
+            module_name=context.module_name,
+            success=True,
+            started_at=started_at,
+            completed_at=completed_at,
+            duration_seconds=(completed_at - started_at).total_seconds(),
+            metadata={"skipped": True},
+        )
+
+    def _record_convergence(
+        self, context: ExecutionContext, result: Optional[ExecutionResult]
+    ) -> None:
+        """Store or clear a module's convergence fingerprint after it ran."""
+        if context.dry_run or result is None:
+            return
+
+        if result.success:
+            self.convergence_tracker.record(context.module_name, context.module_instance)
+        else:
+            self.convergence_tracker.forget(context.module_name)
+
+    def _start_tracing(self) -> bool:
+        """Start recording trace spans if observability.tracing is enabled."""
+        if self.config.get("observability.tracing.enabled", False) is not True:
+            return False
+
+        capacity = self.config.get("observability.tracing.capacity", DEFAULT_CAPACITY)
+        if not isinstance(capacity, int) or capacity <= 0:
+            capacity = DEFAULT_CAPACITY
+        get_tracer().enable(capacity)
+        return True
+
+    def _save_trace(self) -> None:
+        """Stop tracing and save the trace of this run."""
+        tracer = get_tracer()
+        tracer.disable()
+
+        path = self.config.get("observability.tracing.path", None)
+        trace_file = Path(path) if isinstance(path, str) and path else DEFAULT_TRACE_FILE
+        try:
+            tracer.export_chrome(trace_file)
+            self.logger.info(f"Trace saved to {trace_file} (view with 'vps-configurator trace')")
+        except OSError as e:
+            self.logger.warning(f"Could not save trace to {trace_file}: {e}")
+
+    def _start_metrics_exporter(self) -> Optional[MetricsExporter]:
+        """Serve metrics over HTTP if observability.exporter is enabled."""
+        if self.config.get("observability.exporter.enabled", False) is not True:
+            return None
+
+        host = self.config.get("observability.exporter.host", DEFAULT_HOST)
+        port = self.config.get("observability.exporter.port", DEFAULT_PORT)
+        exporter = MetricsExporter(
+            host=host if isinstance(host, str) and host else DEFAULT_HOST,
+            port=port if isinstance(port, int) and port >= 0 else DEFAULT_PORT,
+            logger=self.logger,
+        )
+        try:
+            exporter.start()
+        except OSError as e:
+            # Metrics are optional; never fail an install over a busy port
+            self.logger.warning(f"Could not serve metrics on {exporter.url}: {e}")
+            return None
+        return exporter
+
+    def _start_command_profiling(self) -> bool:
+        """Start profiling commands if observability.profiling is enabled."""
+        if self.config.get("observability.profiling.enabled", False) is not True:
+            return False
+
+        get_command_profiler().enable()
+        return True
+
+    def _save_command_profile(self) -> None:
+        """Stop profiling commands, log the slowest ones and save the report."""
+        profiler = get_command_profiler()
+        profiler.disable()
+
+        report = profiler.report(top=5)
+        if report["programs"]:
+            summary = ", ".join(
+                f"{s['program']} ({s['module']}) {s['total_seconds']:.1f}s"
+                for s in report["programs"]
+            )
+            self.logger.info(f"Most time spent in commands: {summary}")
+
+        path = self.config.get("observability.profiling.path", None)
+        profile_file = Path(path) if isinstance(path, str) and path else DEFAULT_PROFILE_FILE
+        try:
+            profiler.save(profile_file)
+            self.logger.info(
+                f"Command profile saved to {profile_file} "
+                "(view with 'vps-configurator monitoring commands')"
+            )
+        except OSError as e:
+            self.logger.warning(f"Could not save command profile to {profile_file}: {e}")
+
+    def _profile_name(self) -> str:
+        """Name of the installation profile module durations are recorded under."""
+        profile = getattr(self.config, "profile", None)
+        return profile if isinstance(profile, str) and profile else "custom"
+
+    def _expected_durations(self) -> Dict[str, float]:
+        """Expected module durations from previous runs on this profile and host class."""
+        try:
+            return self.state_manager.get_module_durations(profile=self._profile_name())
+        except Exception as e:
+            self.logger.debug(f"No module duration history available: {e}")
+            return {}
+
+    def _create_eta_estimator(
+        self, graph: DependencyGraph, durations: Dict[str, float]
+    ) -> EtaEstimator:
+        """Create the remaining-time estimator for the modules in graph."""
+        max_workers = self.config.get("performance.max_workers", 4)
+        return EtaEstimator(
+            modules=list(graph.graph.nodes),
+            expected=durations,
+            dependencies={
+                module: list(graph.graph.predecessors(module)) for module in graph.graph.nodes
+            },
+            workers=max_workers if isinstance(max_workers, int) else 4,
+        )
+
+    def _start_state_tracking(self) -> None:
+        """Open an installation record so module durations are kept for later runs."""
+        try:
+            self.state_manager.start_installation(profile=self._profile_name())
+        except Exception as e:
+            self.logger.debug(f"State tracking disabled: {e}")
+
+    def _record_module_state(self, module_name: str, stage: str) -> None:
+        """Persist module status transitions reported by the executors."""
+        status = {
+            "started": ModuleStatus.RUNNING,
+            "completed": ModuleStatus.COMPLETED,
+            "failed": ModuleStatus.FAILED,
+            "skipped": ModuleStatus.SKIPPED,
+        }.get(stage)
+
+        if status is None or not self.state_manager.current_state:
+            return
+
+        try:
+            self.state_manager.update_module(module_name, status=status)
+        except Exception as e:
+            self.logger.debug(f"Failed to record state for {module_name}: {e}")
+
+    def _complete_state_tracking(self, success: bool) -> None:
+        """Close the installation record opened by _start_state_tracking."""
+        if not self.state_manager.current_state:
+            return
+
+        try:
+            self.state_manager.complete_installation(success)
+        except Exception as e:
+            self.logger.debug(f"Failed to complete state tracking: {e}")
+
     def _get_module_config(self, module_name: str) -> Dict[str, Any]:
         """Get configuration for a specific module."""
         paths = [
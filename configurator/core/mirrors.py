@@ -0,0 +1,376 @@
+"""
+Fastest APT mirror selection.
+
+The mirror a VPS image ships with is often not the fastest one reachable
+from it. Before the first ``apt-get update`` the selector probes the
+configured candidate mirrors and the mirror currently in use, and points
+the APT sources at the fastest healthy one.
+
+- Mirrors are probed concurrently: TCP connect time to the host, then the
+  throughput of fetching the suite's Release file.
+- Rankings are cached for a TTL, so runs shortly after each other do not
+  probe again.
+- Only archive entries are rewritten (URIs ending in /debian or /ubuntu
+  and entries naming a candidate). Security and third-party repositories
+  are left alone. Every changed file is backed up and its restore is
+  registered with the rollback manager.
+"""
+
+import json
+import logging
+import os
+import re
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+from configurator.core.rollback import RollbackManager
+from configurator.utils.file import backup_file
+from configurator.utils.file_lock import file_lock
+
+DEFAULT_CANDIDATES = [
+    "http://deb.debian.org/debian",
+    "http://ftp.us.debian.org/debian",
+    "http://ftp.de.debian.org/debian",
+    "http://ftp.nl.debian.org/debian",
+    "http://mirrors.kernel.org/debian",
+]
+
+# Archive paths of the distributions whose mirrors can be swapped
+ARCHIVE_PATHS = ("/debian", "/ubuntu")
+
+# The Release file is read up to this size to measure throughput
+PROBE_MAX_BYTES = 512 * 1024
+
+# A mirror must be this much faster than the current one to switch
+SWITCH_MARGIN = 1.2
+
+_DEB_LINE = re.compile(r"^(\s*deb(?:-src)?\s+(?:\[[^\]]*\]\s+)?)(\S+)(\s+(\S+).*)$")
+_URIS_FIELD = re.compile(r"^(URIs:\s*)(.*)$", re.IGNORECASE)
+_SUITES_FIELD = re.compile(r"^Suites:\s*(\S+)", re.IGNORECASE)
+
+
+@dataclass
+class MirrorProbe:
+    """Measured speed of one mirror."""
+
+    url: str
+    connect_ms: Optional[float] = None
+    throughput_bps: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        return self.error is None and bool(self.throughput_bps)
+
+
+def normalize_mirror(url: str) -> str:
+    """Mirror URL without trailing slash, for comparisons."""
+    return url.strip().rstrip("/")
+
+
+def _archive_path(url: str) -> str:
+    return urlparse(url).path.rstrip("/")
+
+
+class MirrorSelector:
+    """
+    Ranks APT mirrors by speed and switches the APT sources to the fastest.
+
+    Usage:
+        selector = MirrorSelector(candidates=["http://ftp.de.debian.org/debian"])
+        selector.apply(rollback_manager)
+    """
+
+    DEFAULT_CACHE_FILE = Path("/var/cache/debian-vps-configurator/mirrors.json")
+    DEFAULT_SOURCES = [Path("/etc/apt/sources.list"), Path("/etc/apt/sources.list.d")]
+
+    def __init__(
+        self,
+        candidates: Optional[List[str]] = None,
+        ttl_seconds: float = 86400,
+        timeout: float = 3.0,
+        cache_file: Optional[Path] = None,
+        sources: Optional[List[Path]] = None,
+        backup_dir: Optional[Path] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize mirror selector.
+
+        Args:
+            candidates: Mirror base URLs (e.g. http://deb.debian.org/debian)
+            ttl_seconds: How long a ranking is reused (0 probes every time)
+            timeout: Connect and read timeout per probe in seconds
+            cache_file: File persisting the last ranking
+            sources: APT source files and directories to rewrite
+            backup_dir: Directory for backups of rewritten files
+            logger: Logger instance
+        """
+        self.candidates = [
+            normalize_mirror(url) for url in (candidates or DEFAULT_CANDIDATES) if url
+        ]
+        self.ttl_seconds = ttl_seconds
+        self.timeout = timeout
+        self.cache_file = cache_file or self.DEFAULT_CACHE_FILE
+        self.sources = sources if sources is not None else list(self.DEFAULT_SOURCES)
+        self.backup_dir = backup_dir
+        self.logger = logger or logging.getLogger(__name__)
+
+    def probe(self, url: str, probe_path: str) -> MirrorProbe:
+        """
+        Measure connect time and throughput of one mirror.
+
+        Args:
+            url: Mirror base URL
+            probe_path: Object to fetch, relative to the mirror
+
+        Returns:
+            MirrorProbe; error is set if the mirror is unreachable or broken
+        """
+        result = MirrorProbe(url=url)
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+
+        try:
+            start = time.monotonic()
+            with socket.create_connection((parsed.hostname, port), timeout=self.timeout):
+                result.connect_ms = (time.monotonic() - start) * 1000
+
+            start = time.monotonic()
+            received = 0
+            with requests.get(
+                f"{url}/{probe_path}", stream=True, timeout=self.timeout, allow_redirects=True
+            ) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    received += len(chunk)
+                    if received >= PROBE_MAX_BYTES:
+                        break
+            elapsed = max(time.monotonic() - start, 1e-6)
+
+            if not received:
+                result.error = f"empty response for {probe_path}"
+            else:
+                result.throughput_bps = received / elapsed
+        except (OSError, requests.RequestException) as e:
+            result.error = str(e) or type(e).__name__
+
+        return result
+
+    def rank(self, mirrors: List[str], probe_path: str, force: bool = False) -> List[MirrorProbe]:
+        """
+        Probe mirrors concurrently, fastest healthy mirror first.
+
+        A cached ranking of the same mirrors is reused within the TTL.
+
+        Args:
+            mirrors: Mirror base URLs
+            probe_path: Object to fetch from each mirror
+            force: Probe even if a fresh ranking is cached
+
+        Returns:
+            Probe results, healthy mirrors by throughput, then unhealthy ones
+        """
+        mirrors = list(dict.fromkeys(normalize_mirror(url) for url in mirrors))
+        if not mirrors:
+            return []
+
+        if not force:
+            cached = self._load_ranking(mirrors, probe_path)
+            if cached is not None:
+                self.logger.debug("Using cached mirror ranking")
+                return cached
+
+        self.logger.info(f"Probing {len(mirrors)} APT mirrors...")
+        with ThreadPoolExecutor(max_workers=len(mirrors)) as executor:
+            results = list(executor.map(lambda url: self.probe(url, probe_path), mirrors))
+
+        results.sort(
+            key=lambda r: (not r.healthy, -(r.throughput_bps or 0), r.connect_ms or float("inf"))
+        )
+        self._save_ranking(results, probe_path)
+        return results
+
+    def apply(self, rollback_manager: Optional[RollbackManager] = None) -> Optional[str]:
+        """
+        Point the archive entries of the APT sources at the fastest mirror.
+
+        Args:
+            rollback_manager: Registers restores of the changed files
+
+        Returns:
+            The mirror switched to, or None if the sources were left unchanged
+        """
+        current, suite = self._current_archive()
+        if not current:
+            self.logger.debug("No Debian or Ubuntu archive found in APT sources")
+            return None
+
+        # Candidates for another distribution would break the sources
+        family = _archive_path(current[0]).rsplit("/", 1)[-1]
+        candidates = [
+            url for url in self.candidates if _archive_path(url).rsplit("/", 1)[-1] == family
+        ]
+        ranking = self.rank(current + candidates, f"dists/{suite}/Release")
+        fastest = next((r for r in ranking if r.healthy), None)
+        if fastest is None:
+            self.logger.warning("No APT mirror responded, keeping current sources")
+            return None
+
+        in_use = [r for r in ranking if r.url in current]
+        best_current = max((r.throughput_bps or 0 for r in in_use if r.healthy), default=0)
+        fastest_bps = fastest.throughput_bps or 0.0
+        if fastest.url in current or fastest_bps < best_current * SWITCH_MARGIN:
+            self.logger.debug(f"Current APT mirror is fast enough ({', '.join(current)})")
+            return None
+
+        changed = self._rewrite_sources(fastest.url, rollback_manager)
+        if not changed:
+            return None
+        self.logger.info(
+            f"Switched APT mirror to {fastest.url} "
+            f"({fastest_bps / 1024:.0f} KB/s, {fastest.connect_ms:.0f}ms connect)"
+        )
+        return fastest.url
+
+    def _source_files(self) -> List[Path]:
+        files = []
+        for source in self.sources:
+            if source.is_dir():
+                files.extend(
+                    sorted(
+                        p
+                        for p in source.iterdir()
+                        if p.is_file() and p.suffix in (".list", ".sources")
+                    )
+                )
+            elif source.is_file():
+                files.append(source)
+        return files
+
+    def _is_archive(self, uri: str) -> bool:
+        uri = normalize_mirror(uri)
+        if uri in self.candidates:
+            return True
+        parsed = urlparse(uri)
+        return (
+            parsed.scheme in ("http", "https")
+            and parsed.path.rstrip("/") in ARCHIVE_PATHS
+            and "security" not in (parsed.hostname or "")
+        )
+
+    def _current_archive(self) -> Tuple[List[str], str]:
+        """Archive mirrors in the APT sources and the first suite using them"""
+        mirrors: List[str] = []
+        suite = None
+        for path in self._source_files():
+            try:
+                content = path.read_text(encoding="utf-8")
+            except OSError:
+                continue
+
+            if path.suffix == ".sources":
+                for stanza in content.split("\n\n"):
+                    fields = stanza.splitlines()
+                    uris = next((m for m in map(_URIS_FIELD.match, fields) if m), None)
+                    suites = next((m for m in map(_SUITES_FIELD.match, fields) if m), None)
+                    for uri in uris.group(2).split() if uris else []:
+                        if self._is_archive(uri):
+                            mirrors.append(normalize_mirror(uri))
+                            suite = suite or (suites.group(1) if suites else None)
+            else:
+                for line in content.splitlines():
+                    match = _DEB_LINE.match(line)
+                    if match and self._is_archive(match.group(2)):
+                        mirrors.append(normalize_mirror(match.group(2)))
+                        suite = suite or match.group(4)
+
+        return list(dict.fromkeys(mirrors)), suite or "stable"
+
+    def _rewrite_sources(
+        self, mirror: str, rollback_manager: Optional[RollbackManager] = None
+    ) -> List[Path]:
+        """Replace archive URIs with the mirror; returns the files changed"""
+        changed = []
+        for path in self._source_files():
+            with file_lock(str(path)):
+                try:
+                    content = path.read_text(encoding="utf-8")
+                except OSError:
+                    continue
+
+                rewritten = "\n".join(
+                    self._rewrite_line(line, mirror, path.suffix == ".sources")
+                    for line in content.split("\n")
+                )
+                if rewritten == content:
+                    continue
+
+                backup = backup_file(
+                    path,
+                    backup_dir=self.backup_dir,
+                    suffix=f"{time.strftime('%Y%m%d_%H%M%S')}.mirror",
+                )
+                tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                try:
+                    tmp_path.write_text(rewritten, encoding="utf-8")
+                    os.chmod(tmp_path, path.stat().st_mode & 0o777)
+                    os.replace(tmp_path, path)
+                finally:
+                    tmp_path.unlink(missing_ok=True)
+
+            if rollback_manager and backup:
+                rollback_manager.add_file_restore(
+                    str(backup), str(path), description=f"Restore APT mirror in {path}"
+                )
+            changed.append(path)
+        return changed
+
+    def _rewrite_line(self, line: str, mirror: str, deb822: bool) -> str:
+        if deb822:
+            match = _URIS_FIELD.match(line)
+            if not match:
+                return line
+            uris = [mirror if self._is_archive(uri) else uri for uri in match.group(2).split()]
+            return match.group(1) + " ".join(dict.fromkeys(uris))
+
+        match = _DEB_LINE.match(line)
+        if not match or not self._is_archive(match.group(2)):
+            return line
+        return match.group(1) + mirror + match.group(3)
+
+    def _load_ranking(self, mirrors: List[str], probe_path: str) -> Optional[List[MirrorProbe]]:
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            data = json.loads(self.cache_file.read_text())
+            if time.time() - data["probed_at"] >= self.ttl_seconds:
+                return None
+            if data["probe_path"] != probe_path:
+                return None
+            results = [MirrorProbe(**entry) for entry in data["results"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        if sorted(r.url for r in results) != sorted(mirrors):
+            return None
+        return results
+
+    def _save_ranking(self, results: List[MirrorProbe], probe_path: str) -> None:
+        data: Dict[str, Any] = {
+            "probed_at": time.time(),
+            "probe_path": probe_path,
+            "results": [asdict(r) for r in results],
+        }
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps(data, indent=2))
+        except OSError as e:
+            self.logger.debug(f"Failed to save mirror ranking: {e}")
@@ -12,10 +12,14 @@ import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Callable, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, List, Optional
 
+from configurator.utils.apt_update import AptUpdateTracker
 from configurator.utils.circuit_breaker import CircuitBreaker, CircuitBreakerError
 
+if TYPE_CHECKING:
+    from configurator.core.git_cache import GitMirrorCache
+
 
 class NetworkOperationType(Enum):
     """Types of network operations."""
@@ -76,7 +80,12 @@ class NetworkOperationWrapper:
     """
 
     def __init__(
-        self, config: dict, logger: logging.Logger, retry_config: Optional[RetryConfig] = None
+        self,
+        config: dict,
+        logger: logging.Logger,
+        retry_config: Optional[RetryConfig] = None,
+        apt_update_tracker: Optional[AptUpdateTracker] = None,
+        git_cache: Optional["GitMirrorCache"] = None,
     ):
         """
         Initialize network wrapper.
@@ -85,10 +94,14 @@ class NetworkOperationWrapper:
             config: Configuration dictionary
             logger: Logger instance
             retry_config: Optional retry configuration
+            apt_update_tracker: Skips apt-get update while package lists are fresh
+            git_cache: Local mirrors that git clones are served from
         """
         self.config = config
         self.logger = logger
         self.retry_config = retry_config or RetryConfig()
+        self.apt_update_tracker = apt_update_tracker
+        self.git_cache = git_cache
 
         # Circuit breaker configuration
         cb_config = config.get("performance", {}).get("circuit_breaker", {})
@@ -221,7 +234,6 @@ class NetworkOperationWrapper:
         Returns:
             True if successful
         """
-        self.logger.info("Updating APT package lists (with retry protection)...")
 
         def apt_update():
             result = subprocess.run(
@@ -236,14 +248,21 @@ class NetworkOperationWrapper:
 
             return True
 
-        try:
-            self.execute_with_retry(apt_update, NetworkOperationType.APT_UPDATE)
-            self.logger.info("✅ APT update successful")
-            return True
+        def run_update() -> bool:
+            self.logger.info("Updating APT package lists (with retry protection)...")
+            try:
+                self.execute_with_retry(apt_update, NetworkOperationType.APT_UPDATE)
+                self.logger.info("✅ APT update successful")
+                return True
 
-        except Exception as e:
-            self.logger.error(f"❌ APT update failed after retries: {e}")
-            return False
+            except Exception as e:
+                self.logger.error(f"❌ APT update failed after retries: {e}")
+                return False
+
+        # The tracker serializes callers, skips fresh lists and prepares sources
+        if self.apt_update_tracker:
+            return self.apt_update_tracker.update(run_update)
+        return run_update()
 
     def apt_install_with_retry(self, packages: List[str], update_cache: bool = True) -> bool:
         """
@@ -371,6 +390,10 @@ class NetworkOperationWrapper:
         self.logger.info(f"Cloning: {url}")
 
         def git_clone():
+            if self.git_cache is not None:
+                self.git_cache.clone(url, dest_path, depth=depth or None, branch=branch)
+                return True
+
             cmd = ["git", "clone"]
 
             if depth:
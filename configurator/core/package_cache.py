@@ -2,17 +2,53 @@
 Package Cache Manager for optimizing bandwidth and installation speed.
 
 Handles storage, indexing, retrieval, and eviction of cached packages.
+
+The index is kept in memory in LRU order with a running size total. Changes
+are appended to a journal next to the index snapshot, and the snapshot is
+only rewritten when the journal is compacted, so cache hits and additions
+cost constant I/O regardless of cache size.
+
+Package contents are stored once per SHA256 under ``blobs/`` and each cache
+entry is a hardlink to its blob. Files move into and out of the cache as
+hardlinks (or reflinks) and are only copied across filesystems.
 """
 
 import hashlib
 import json
 import logging
+import mmap
+import os
 import shutil
 import threading
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+from configurator.utils.file import link_or_copy
+
+
+def parse_deb_filename(filename: str) -> Optional[Tuple[str, str, str]]:
+    """
+    Split an archive filename into (name, version, arch).
+
+    APT names archives ``name_version_arch.deb`` with the epoch colon
+    URL-encoded, e.g. ``git_1%3a2.39.2-1.1_amd64.deb`` is git 1:2.39.2-1.1.
+
+    Returns:
+        (name, version, arch), or None if the filename does not follow this scheme
+    """
+    if not filename.endswith(".deb"):
+        return None
+
+    parts = filename[: -len(".deb")].split("_")
+    if len(parts) != 3 or not all(parts):
+        return None
+
+    name, version, arch = parts
+    return name, unquote(version), arch
 
 
 @dataclass
@@ -29,6 +65,17 @@ class CachedPackage:
     cached_at: datetime
     last_accessed: datetime
     access_count: int = 0
+    # Stat fingerprint of the cached file when its hash was last verified
+    inode: int = 0
+    mtime_ns: int = 0
+    verified_at: Optional[datetime] = None
+    # Architecture from the archive filename ("" if unknown)
+    arch: str = ""
+
+    @property
+    def fingerprint(self) -> Tuple[int, int, int]:
+        """(inode, size, mtime_ns) recorded at the last hash verification"""
+        return (self.inode, self.size_bytes, self.mtime_ns)
 
     def to_dict(self) -> Dict:
         """Serialize to dictionary"""
@@ -43,11 +90,18 @@ class CachedPackage:
             "cached_at": self.cached_at.isoformat(),
             "last_accessed": self.last_accessed.isoformat(),
             "access_count": self.access_count,
+            "inode": self.inode,
+            "mtime_ns": self.mtime_ns,
+            "verified_at": self.verified_at.isoformat() if self.verified_at else None,
+            "arch": self.arch,
         }
 
     @classmethod
     def from_dict(cls, data: Dict) -> "CachedPackage":
         """Deserialize from dictionary"""
+        # Entries cached before arch was recorded get it from their archive name
+        parsed = parse_deb_filename(data.get("original_filename", data["filename"]))
+
         return cls(
             name=data["name"],
             version=data["version"],
@@ -61,18 +115,32 @@ class CachedPackage:
             cached_at=datetime.fromisoformat(data["cached_at"]),
             last_accessed=datetime.fromisoformat(data["last_accessed"]),
             access_count=data.get("access_count", 0),
+            inode=data.get("inode", 0),
+            mtime_ns=data.get("mtime_ns", 0),
+            verified_at=(
+                datetime.fromisoformat(data["verified_at"]) if data.get("verified_at") else None
+            ),
+            arch=data.get("arch") or (parsed[2] if parsed else ""),
         )
 
 
+def file_fingerprint(stat: os.stat_result) -> Tuple[int, int, int]:
+    """(inode, size, mtime_ns) of a file; any rewrite or replacement changes it"""
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
 class PackageCacheManager:
     """
     Manages package cache for faster installations.
 
     Features:
     - Automatic caching of downloaded .deb files
+    - Content-addressed storage, identical archives are stored once
     - Cache size management (configurable limit)
     - LRU (Least Recently Used) eviction
-    - SHA256 verification
+    - Journaled index persistence with periodic compaction
+    - SHA256 verification, repeated only when the file's stat fingerprint changes
+    - Optional background scrubber re-verifying cold entries
     - Cache statistics and reporting
     - Thread-safe operations
     """
@@ -81,12 +149,22 @@ class PackageCacheManager:
     DEFAULT_MAX_SIZE_GB = 10.0
     INDEX_FILE = "cache_index.json"
     STATS_FILE = "cache_stats.json"
+    JOURNAL_FILE = "cache_index.journal"
+    BLOBS_DIR = "blobs"
+    # Compact once the journal outgrows both this and the number of indexed packages
+    COMPACT_MIN_ENTRIES = 1000
+
+    # Verification policies for cache hits
+    VERIFY_FINGERPRINT = "fingerprint"  # Rehash only if (inode, size, mtime_ns) changed
+    VERIFY_ALWAYS = "always"  # Rehash on every hit
+    HASH_BUFFER_SIZE = 1024 * 1024
 
     def __init__(
         self,
         cache_dir: Optional[Path] = None,
         max_size_gb: float = DEFAULT_MAX_SIZE_GB,
         logger: Optional[logging.Logger] = None,
+        verify_policy: str = VERIFY_FINGERPRINT,
     ):
         """
         Initialize package cache manager.
@@ -95,26 +173,41 @@ class PackageCacheManager:
             cache_dir: Directory for cached packages
             max_size_gb: Maximum cache size in GB
             logger: Logger instance
+            verify_policy: When cache hits are rehashed ("fingerprint" or "always")
         """
         self.cache_dir = cache_dir or self.DEFAULT_CACHE_DIR
         self.max_size_bytes = int(max_size_gb * 1024 * 1024 * 1024)
         self.logger = logger or logging.getLogger(__name__)
+        self.verify_policy = verify_policy
 
         # Thread safety
         self._lock = threading.Lock()
 
+        # Background scrubber
+        self._scrub_thread: Optional[threading.Thread] = None
+        self._scrub_stop = threading.Event()
+
         # Initialize cache
         self._ensure_cache_dir()
-        self._index: Dict[str, CachedPackage] = {}
+        # Least recently used first
+        self._index: "OrderedDict[str, CachedPackage]" = OrderedDict()
+        # Entries referencing each blob; the size total counts every blob once
+        self._blob_refs: Counter[str] = Counter()
+        # name -> (version, arch) -> key
+        self._by_name: Dict[str, Dict[Tuple[str, str], str]] = {}
+        self._total_size = 0
+        self._journal_entries = 0
         self._load_index()
         self._stats = self._load_stats()
+        self._replay_journal()
 
         # Ensure persistence files exist
-        if not (self.cache_dir / self.INDEX_FILE).exists():
-            self._save_index()
-
-        if not (self.cache_dir / self.STATS_FILE).exists():
-            self._save_stats()
+        if (
+            not (self.cache_dir / self.INDEX_FILE).exists()
+            or not (self.cache_dir / self.STATS_FILE).exists()
+            or (self.cache_dir / self.JOURNAL_FILE).exists()
+        ):
+            self._compact()
 
     def _ensure_cache_dir(self) -> None:
         """Create cache directory if it doesn't exist"""
@@ -140,23 +233,29 @@ class PackageCacheManager:
             with open(index_file, "r") as f:
                 data = json.load(f)
 
-            self._index = {key: CachedPackage.from_dict(pkg_data) for key, pkg_data in data.items()}
+            packages = [(key, CachedPackage.from_dict(pkg_data)) for key, pkg_data in data.items()]
+            # Snapshots are written in LRU order, so this is a linear pass for them
+            packages.sort(key=lambda item: item[1].last_accessed)
+
+            for key, pkg in packages:
+                self._add_entry(key, pkg)
 
             self.logger.info(f"Loaded cache index: {len(self._index)} packages")
 
         except Exception as e:
             self.logger.warning(f"Failed to load cache index, starting fresh: {e}")
-            self._index = {}
+            self._index = OrderedDict()
+            self._blob_refs.clear()
+            self._by_name.clear()
+            self._total_size = 0
 
     def _save_index(self) -> None:
-        """Save cache index to disk"""
+        """Save cache index snapshot to disk"""
         index_file = self.cache_dir / self.INDEX_FILE
 
         try:
             data = {key: pkg.to_dict() for key, pkg in self._index.items()}
-
-            with open(index_file, "w") as f:
-                json.dump(data, f, indent=2)
+            self._write_atomic(index_file, data)
 
         except Exception as e:
             self.logger.error(f"Failed to save cache index: {e}")
@@ -165,51 +264,216 @@ class PackageCacheManager:
         """Load cache statistics"""
         stats_file = self.cache_dir / self.STATS_FILE
 
+        stats = {
+            "total_downloads": 0,
+            "total_cache_hits": 0,
+            "total_bytes_saved": 0,
+            "cache_created_at": datetime.now().isoformat(),
+            "journal_generation": 0,
+        }
+
         if not stats_file.exists():
-            return {
-                "total_downloads": 0,
-                "total_cache_hits": 0,
-                "total_bytes_saved": 0,
-                "cache_created_at": datetime.now().isoformat(),
-            }
+            return stats
 
         try:
             with open(stats_file, "r") as f:
-                return json.load(f)
+                stats.update(json.load(f))
         except Exception as e:
             self.logger.warning(f"Failed to load stats, resetting: {e}")
-            return {}
+
+        return stats
 
     def _save_stats(self) -> None:
-        """Save cache statistics"""
+        """Save cache statistics snapshot"""
         stats_file = self.cache_dir / self.STATS_FILE
 
         try:
-            with open(stats_file, "w") as f:
-                json.dump(self._stats, f, indent=2)
+            self._write_atomic(stats_file, self._stats)
         except Exception as e:
             self.logger.error(f"Failed to save stats: {e}")
 
-    def _make_cache_key(self, package_name: str, version: str) -> str:
+    def _write_atomic(self, path: Path, data: Dict[str, Any]) -> None:
+        """Write JSON via a temporary file so readers never see a partial file"""
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _replay_journal(self) -> None:
+        """
+        Apply journaled changes on top of the loaded snapshots.
+
+        The journal starts with the generation of the snapshot it belongs
+        to. A journal from an older generation was already folded into the
+        snapshots by an interrupted compaction and is ignored.
+        """
+        journal_file = self.cache_dir / self.JOURNAL_FILE
+
+        if not journal_file.exists():
+            return
+
+        try:
+            with open(journal_file, "r") as f:
+                lines = f.read().splitlines()
+        except Exception as e:
+            self.logger.warning(f"Failed to read cache journal: {e}")
+            return
+
+        generation = self._stats.get("journal_generation", 0)
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Torn write at the end of the journal
+                continue
+
+            if entry.get("op") == "generation":
+                if entry.get("generation") != generation:
+                    self.logger.debug("Ignoring cache journal from an older generation")
+                    return
+                continue
+
+            try:
+                self._apply(entry)
+            except Exception as e:
+                self.logger.debug(f"Skipping invalid cache journal entry: {e}")
+                continue
+            self._journal_entries += 1
+
+        if self._journal_entries:
+            self.logger.debug(f"Replayed {self._journal_entries} cache journal entries")
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply a journal entry to the in-memory index and stats"""
+        op = entry["op"]
+        key = entry["key"]
+
+        if op == "put":
+            self._remove_entry(key)
+            self._add_entry(key, CachedPackage.from_dict(entry["package"]))
+            self._stats["total_downloads"] += 1
+
+        elif op == "hit":
+            pkg = self._index[key]
+            pkg.last_accessed = datetime.fromisoformat(entry["at"])
+            pkg.access_count += 1
+            self._index.move_to_end(key)
+            self._stats["total_cache_hits"] += 1
+            self._stats["total_bytes_saved"] += pkg.size_bytes
+
+        elif op == "verify":
+            pkg = self._index[key]
+            pkg.inode = entry["inode"]
+            pkg.mtime_ns = entry["mtime_ns"]
+            pkg.verified_at = datetime.fromisoformat(entry["at"])
+
+        elif op == "remove":
+            self._remove_entry(key)
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        """Apply a change and append it to the journal"""
+        self._apply(entry)
+
+        journal_file = self.cache_dir / self.JOURNAL_FILE
+        try:
+            with open(journal_file, "a") as f:
+                if f.tell() == 0:
+                    generation = self._stats.get("journal_generation", 0)
+                    f.write(json.dumps({"op": "generation", "generation": generation}) + "\n")
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._journal_entries += 1
+        except Exception as e:
+            self.logger.error(f"Failed to write cache journal: {e}")
+
+        if self._journal_entries > max(self.COMPACT_MIN_ENTRIES, len(self._index)):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Fold the journal into new index and stats snapshots"""
+        self._stats["journal_generation"] = self._stats.get("journal_generation", 0) + 1
+
+        # The stats snapshot carries the generation and commits the compaction
+        self._save_index()
+        self._save_stats()
+
+        journal_file = self.cache_dir / self.JOURNAL_FILE
+        try:
+            journal_file.unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.error(f"Failed to truncate cache journal: {e}")
+        self._journal_entries = 0
+
+    def _add_entry(self, key: str, pkg: CachedPackage) -> None:
+        """Add a package to the in-memory index as most recently used"""
+        self._index[key] = pkg
+        self._by_name.setdefault(pkg.name, {})[(pkg.version, pkg.arch)] = key
+        if self._blob_refs[pkg.hash_sha256] == 0:
+            self._total_size += pkg.size_bytes
+        self._blob_refs[pkg.hash_sha256] += 1
+
+    def _remove_entry(self, key: str) -> Optional[CachedPackage]:
+        """Drop a package from the in-memory index"""
+        pkg = self._index.pop(key, None)
+        if pkg is not None:
+            variants = self._by_name.get(pkg.name, {})
+            if variants.get((pkg.version, pkg.arch)) == key:
+                del variants[(pkg.version, pkg.arch)]
+                if not variants:
+                    del self._by_name[pkg.name]
+
+            self._blob_refs[pkg.hash_sha256] -= 1
+            if self._blob_refs[pkg.hash_sha256] <= 0:
+                del self._blob_refs[pkg.hash_sha256]
+                self._total_size -= pkg.size_bytes
+        return pkg
+
+    def _blob_path(self, file_hash: str) -> Path:
+        """Content-addressed location of a package archive"""
+        return self.cache_dir / self.BLOBS_DIR / file_hash[:2] / file_hash
+
+    def _delete_package_files(self, pkg: CachedPackage) -> None:
+        """Remove a dropped entry's file, and its blob once no entry references it"""
+        try:
+            (self.cache_dir / pkg.filename).unlink(missing_ok=True)
+            if pkg.hash_sha256 not in self._blob_refs:
+                self._blob_path(pkg.hash_sha256).unlink(missing_ok=True)
+        except Exception as e:
+            self.logger.warning(f"Failed to remove {pkg.filename}: {e}")
+
+    def _make_cache_key(self, package_name: str, version: str, arch: str = "") -> str:
         """Generate cache key for package"""
-        return f"{package_name}_{version}"
+        key = f"{package_name}_{version}"
+        return f"{key}_{arch}" if arch else key
+
+    def _lookup_key(self, package_name: str, version: str, arch: str = "") -> Optional[str]:
+        """Find the key of a cached package; without arch any architecture matches"""
+        variants = self._by_name.get(package_name, {})
+        if arch:
+            return variants.get((version, arch))
+
+        for (cached_version, _), key in variants.items():
+            if cached_version == version:
+                return key
+        return None
 
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of file"""
         sha256 = hashlib.sha256()
 
         with open(file_path, "rb") as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
+            size = os.fstat(f.fileno()).st_size
+            if size > self.HASH_BUFFER_SIZE:
+                # Hash straight from the page cache without copying chunks
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    sha256.update(mapped)
+            else:
+                sha256.update(f.read())
 
         return sha256.hexdigest()
 
     def _get_cache_size(self) -> int:
         """Get total size of cache in bytes"""
-        total = 0
-        for pkg in self._index.values():
-            total += pkg.size_bytes
-        return total
+        return self._total_size
 
     def _evict_lru_packages(self, required_space: int) -> None:
         """
@@ -218,64 +482,46 @@ class PackageCacheManager:
         Args:
             required_space: Bytes needed to free
         """
-        if not self._index:
-            return
-
-        # Sort by last_accessed (oldest first)
-        sorted_packages = sorted(self._index.values(), key=lambda p: p.last_accessed)
-
         freed = 0
         evicted = []
+        dropped_refs: Counter[str] = Counter()
 
-        for pkg in sorted_packages:
+        # The index is kept in LRU order, oldest first. A blob is only freed
+        # once every entry referencing it is evicted.
+        for key, pkg in self._index.items():
             if freed >= required_space:
                 break
 
-            # Remove package file
-            pkg_path = self.cache_dir / pkg.filename
-            try:
-                if pkg_path.exists():
-                    pkg_path.unlink()
-
-                # Even if file didn't exist, we count it as freed from our tracking
+            evicted.append(key)
+            dropped_refs[pkg.hash_sha256] += 1
+            if dropped_refs[pkg.hash_sha256] == self._blob_refs[pkg.hash_sha256]:
                 freed += pkg.size_bytes
-                evicted.append(pkg.name)
-                self.logger.debug(f"Evicted: {pkg.name} ({pkg.size_bytes / 1024 / 1024:.1f}MB)")
-            except Exception as e:
-                self.logger.warning(f"Failed to evict {pkg.name}: {e}")
-
-        # Remove from index
-        for pkg_name in evicted:
-            # We need to find the key for this package name (a bit inefficient but safe)
-            # Actually we iterated over values, we should have kept keys or looked them up
-            keys_to_remove = []
-            for k, v in self._index.items():
-                if v.name == pkg_name:
-                    keys_to_remove.append(k)
-                    break
 
-            for k in keys_to_remove:
-                del self._index[k]
+        for key in evicted:
+            pkg = self._index[key]
+            self._record({"op": "remove", "key": key})
+            self._delete_package_files(pkg)
+            self.logger.debug(f"Evicted: {pkg.name} ({pkg.size_bytes / 1024 / 1024:.1f}MB)")
 
         if evicted:
             self.logger.info(f"Evicted {len(evicted)} packages to free {freed / 1024 / 1024:.1f}MB")
-            self._save_index()
 
-    def has_package(self, package_name: str, version: str) -> bool:
+    def has_package(self, package_name: str, version: str, arch: str = "") -> bool:
         """
         Check if package is in cache.
 
         Args:
             package_name: Name of package
             version: Version string
+            arch: Architecture (any if empty)
 
         Returns:
             True if package is cached
         """
         with self._lock:
-            key = self._make_cache_key(package_name, version)
+            key = self._lookup_key(package_name, version, arch)
 
-            if key not in self._index:
+            if key is None:
                 return False
 
             # Verify file exists
@@ -284,55 +530,55 @@ class PackageCacheManager:
 
             if not pkg_path.exists():
                 self.logger.warning(f"Cache entry exists but file missing: {pkg.filename}")
-                del self._index[key]
-                self._save_index()
+                self._record({"op": "remove", "key": key})
+                self._delete_package_files(pkg)
                 return False
 
             return True
 
-    def get_package(self, package_name: str, version: str) -> Optional[Path]:
+    def get_package(self, package_name: str, version: str, arch: str = "") -> Optional[Path]:
         """
         Get cached package path.
 
         Args:
             package_name: Name of package
             version: Version string
+            arch: Architecture (any if empty)
 
         Returns:
             Path to cached package file, or None if not cached
         """
         with self._lock:
-            key = self._make_cache_key(package_name, version)
+            key = self._lookup_key(package_name, version, arch)
 
-            if key not in self._index:
+            if key is None:
                 return None
 
             pkg = self._index[key]
             pkg_path = self.cache_dir / pkg.filename
 
-            if not pkg_path.exists():
+            try:
+                stat = pkg_path.stat()
+            except FileNotFoundError:
                 self.logger.warning(f"Cached file missing: {pkg.filename}")
-                del self._index[key]
-                self._save_index()
-                return None
-
-            # Verify hash
-            if not self._verify_hash(pkg_path, pkg.hash_sha256):
-                self.logger.error(f"Hash mismatch for {pkg.filename}, removing from cache")
-                pkg_path.unlink()
-                del self._index[key]
-                self._save_index()
+                self._record({"op": "remove", "key": key})
+                self._delete_package_files(pkg)
                 return None
 
-            # Update access info
-            pkg.last_accessed = datetime.now()
-            pkg.access_count += 1
-            self._save_index()
-
-            # Update stats
-            self._stats["total_cache_hits"] += 1
-            self._stats["total_bytes_saved"] += pkg.size_bytes
-            self._save_stats()
+            # Verify hash, unless the file is unchanged since it was last hashed
+            if (
+                self.verify_policy == self.VERIFY_ALWAYS
+                or file_fingerprint(stat) != pkg.fingerprint
+            ):
+                if not self._verify_hash(pkg_path, pkg.hash_sha256):
+                    self.logger.error(f"Hash mismatch for {pkg.filename}, removing from cache")
+                    self._record({"op": "remove", "key": key})
+                    self._delete_package_files(pkg)
+                    return None
+                self._record_verified(key, stat)
+
+            # Update access info and stats
+            self._record({"op": "hit", "key": key, "at": datetime.now().isoformat()})
 
             self.logger.info(
                 f"✅ Cache HIT: {package_name} {version} "
@@ -341,6 +587,18 @@ class PackageCacheManager:
 
             return pkg_path
 
+    def _record_verified(self, key: str, stat: os.stat_result) -> None:
+        """Remember the fingerprint of a file whose hash was just verified"""
+        self._record(
+            {
+                "op": "verify",
+                "key": key,
+                "inode": stat.st_ino,
+                "mtime_ns": stat.st_mtime_ns,
+                "at": datetime.now().isoformat(),
+            }
+        )
+
     def _verify_hash(self, file_path: Path, expected_hash: str) -> bool:
         """Verify file hash matches expected"""
         try:
@@ -350,8 +608,41 @@ class PackageCacheManager:
             self.logger.error(f"Hash verification failed: {e}")
             return False
 
+    def missing_packages(
+        self, packages: Iterable[Tuple[str, str, str]]
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Filter (name, version, arch) triples down to those not in the cache.
+
+        Checks the whole batch under one lock acquisition. Entries whose
+        file disappeared are dropped and reported as missing.
+        """
+        with self._lock:
+            missing = []
+
+            for name, version, arch in packages:
+                key = self._lookup_key(name, version, arch)
+                if key is not None:
+                    pkg = self._index[key]
+                    if (self.cache_dir / pkg.filename).exists():
+                        continue
+
+                    self.logger.warning(f"Cache entry exists but file missing: {pkg.filename}")
+                    self._record({"op": "remove", "key": key})
+                    self._delete_package_files(pkg)
+
+                missing.append((name, version, arch))
+
+            return missing
+
     def add_package(
-        self, package_name: str, version: str, file_path: Path, download_url: str
+        self,
+        package_name: str,
+        version: str,
+        file_path: Path,
+        download_url: str,
+        arch: Optional[str] = None,
+        file_hash: Optional[str] = None,
     ) -> bool:
         """
         Add package to cache.
@@ -361,6 +652,8 @@ class PackageCacheManager:
             version: Version string
             file_path: Path to downloaded package file
             download_url: Original download URL
+            arch: Architecture (taken from the archive filename if not given)
+            file_hash: SHA256 of the file if already known (skips hashing)
 
         Returns:
             True if successfully cached
@@ -372,30 +665,47 @@ class PackageCacheManager:
 
             # Get file info
             file_size = file_path.stat().st_size
-            file_hash = self._calculate_file_hash(file_path)
+            file_hash = file_hash or self._calculate_file_hash(file_path)
             filename = f"{package_name}_{version}_{file_path.name}"
 
-            # Check if cache size limit would be exceeded
-            current_size = self._get_cache_size()
-            if current_size + file_size > self.max_size_bytes:
-                required_space = (current_size + file_size) - self.max_size_bytes
-                self.logger.info(f"Cache full, evicting {required_space / 1024 / 1024:.1f}MB")
-                self._evict_lru_packages(required_space)
-
-            # Copy to cache
+            if arch is None:
+                parsed = parse_deb_filename(file_path.name)
+                arch = parsed[2] if parsed and parsed[0] == package_name else ""
+
+            key = self._lookup_key(package_name, version, arch) if arch else None
+            key = key or self._make_cache_key(package_name, version, arch)
+            replaced = self._index.get(key)
+            blob_path = self._blob_path(file_hash)
+            new_blob = file_hash not in self._blob_refs
+
+            # Check if cache size limit would be exceeded (identical content is stored once)
+            if new_blob:
+                current_size = self._get_cache_size()
+                if replaced and self._blob_refs[replaced.hash_sha256] == 1:
+                    current_size -= replaced.size_bytes
+                if current_size + file_size > self.max_size_bytes:
+                    required_space = (current_size + file_size) - self.max_size_bytes
+                    self.logger.info(f"Cache full, evicting {required_space / 1024 / 1024:.1f}MB")
+                    self._evict_lru_packages(required_space)
+                    replaced = self._index.get(key)
+
+            # Store the content once, then link the entry name to it
             cache_path = self.cache_dir / filename
             try:
-                shutil.copy2(file_path, cache_path)
-                self.logger.debug(f"Copied to cache: {cache_path}")
+                if new_blob or not blob_path.exists():
+                    blob_path.parent.mkdir(parents=True, exist_ok=True)
+                    method = link_or_copy(file_path, blob_path)
+                    self.logger.debug(f"Stored in cache ({method}): {blob_path.name}")
+                link_or_copy(blob_path, cache_path)
+                cache_stat = cache_path.stat()
             except Exception as e:
                 self.logger.error(f"Failed to copy to cache: {e}")
                 return False
 
             # Add to index
-            key = self._make_cache_key(package_name, version)
             now = datetime.now()
 
-            self._index[key] = CachedPackage(
+            pkg = CachedPackage(
                 name=package_name,
                 version=version,
                 filename=filename,
@@ -406,13 +716,17 @@ class PackageCacheManager:
                 cached_at=now,
                 last_accessed=now,
                 access_count=0,
+                inode=cache_stat.st_ino,
+                mtime_ns=cache_stat.st_mtime_ns,
+                verified_at=now,
+                arch=arch,
             )
+            self._record({"op": "put", "key": key, "package": pkg.to_dict()})
 
-            self._save_index()
-
-            # Update stats
-            self._stats["total_downloads"] += 1
-            self._save_stats()
+            if replaced and replaced.hash_sha256 not in self._blob_refs:
+                self._blob_path(replaced.hash_sha256).unlink(missing_ok=True)
+            if replaced and replaced.filename != filename:
+                (self.cache_dir / replaced.filename).unlink(missing_ok=True)
 
             self.logger.info(
                 f"✅ Cached: {package_name} {version} ({file_size / 1024 / 1024:.1f}MB)"
@@ -444,7 +758,11 @@ class PackageCacheManager:
                         self.logger.warning(f"Failed to remove {pkg.filename}: {e}")
 
                 self._index.clear()
-                self._save_index()
+                self._blob_refs.clear()
+                self._by_name.clear()
+                self._total_size = 0
+                shutil.rmtree(self.cache_dir / self.BLOBS_DIR, ignore_errors=True)
+                self._compact()
 
                 self.logger.info(f"Cleared entire cache: {removed} packages removed")
                 return removed
@@ -456,18 +774,12 @@ class PackageCacheManager:
 
                 for key, pkg in self._index.items():
                     if pkg.last_accessed < cutoff:
-                        pkg_path = self.cache_dir / pkg.filename
-                        try:
-                            if pkg_path.exists():
-                                pkg_path.unlink()
-                            to_remove.append(key)
-                        except Exception as e:
-                            self.logger.warning(f"Failed to remove {pkg.filename}: {e}")
+                        to_remove.append(key)
 
                 for key in to_remove:
-                    del self._index[key]
-
-                self._save_index()
+                    pkg = self._index[key]
+                    self._record({"op": "remove", "key": key})
+                    self._delete_package_files(pkg)
 
                 self.logger.info(
                     f"Cleared packages older than {older_than_days} days: "
@@ -476,6 +788,106 @@ class PackageCacheManager:
 
                 return len(to_remove)
 
+    def scrub(self, max_age: timedelta = timedelta(days=7), limit: Optional[int] = None) -> int:
+        """
+        Rehash entries that were not verified within max_age.
+
+        Hashing runs outside the lock so cache hits are not blocked.
+        Corrupt entries are removed from the cache.
+
+        Args:
+            max_age: Re-verify entries last verified longer ago than this
+            limit: Maximum number of entries to verify in this pass
+
+        Returns:
+            Number of corrupt entries removed
+        """
+        cutoff = datetime.now() - max_age
+
+        with self._lock:
+            candidates = [
+                (pkg.verified_at or datetime.min, key, pkg.filename, pkg.hash_sha256)
+                for key, pkg in self._index.items()
+                if pkg.verified_at is None or pkg.verified_at < cutoff
+            ]
+        # Least recently verified first
+        candidates.sort()
+        if limit is not None:
+            candidates = candidates[:limit]
+
+        removed = 0
+        for _, key, filename, expected_hash in candidates:
+            if self._scrub_stop.is_set():
+                break
+
+            pkg_path = self.cache_dir / filename
+            stat: Optional[os.stat_result]
+            try:
+                stat = pkg_path.stat()
+                valid = self._calculate_file_hash(pkg_path) == expected_hash
+            except OSError:
+                stat, valid = None, False
+
+            with self._lock:
+                pkg = self._index.get(key)
+                # Skip entries replaced or removed while hashing
+                if pkg is None or pkg.filename != filename or pkg.hash_sha256 != expected_hash:
+                    continue
+
+                if valid and stat is not None:
+                    self._record_verified(key, stat)
+                    continue
+
+                self.logger.error(f"Scrub: {filename} is missing or corrupt, removing from cache")
+                self._record({"op": "remove", "key": key})
+                self._delete_package_files(pkg)
+                removed += 1
+
+        self._remove_orphan_blobs()
+
+        if candidates:
+            self.logger.debug(f"Scrubbed {len(candidates)} cached packages, {removed} removed")
+        return removed
+
+    def _remove_orphan_blobs(self) -> None:
+        """Delete blobs no entry references, e.g. left by an interrupted add"""
+        blobs_dir = self.cache_dir / self.BLOBS_DIR
+        if not blobs_dir.exists():
+            return
+
+        for blob in blobs_dir.glob("*/*"):
+            with self._lock:
+                if blob.name not in self._blob_refs:
+                    blob.unlink(missing_ok=True)
+
+    def start_scrubber(
+        self, interval_hours: float = 24.0, max_age: timedelta = timedelta(days=7)
+    ) -> None:
+        """Re-verify cold entries in a background thread every interval_hours"""
+        if self._scrub_thread and self._scrub_thread.is_alive():
+            return
+
+        self._scrub_stop.clear()
+
+        def scrub_loop() -> None:
+            while not self._scrub_stop.wait(interval_hours * 3600):
+                try:
+                    self.scrub(max_age=max_age)
+                except Exception as e:
+                    self.logger.warning(f"Cache scrub failed: {e}")
+
+        self._scrub_thread = threading.Thread(
+            target=scrub_loop, name="package-cache-scrubber", daemon=True
+        )
+        self._scrub_thread.start()
+
+    def stop_scrubber(self) -> None:
+        """Stop the background scrubber"""
+        self._scrub_stop.set()
+        if self._scrub_thread:
+            self._scrub_thread.join(timeout=2.0)
+            self._scrub_thread = None
+
     def get_stats(self) -> Dict:
         """
         Get cache statistics.
@@ -56,3 +56,13 @@ class ReporterInterface(ABC):
     def show_next_steps(self, reboot_required: bool = False, **kwargs):
         """Display next steps after installation."""
         pass
+
+    @abstractmethod
+    def show_eta(
+        self,
+        total_remaining: float,
+        module_name: Optional[str] = None,
+        module_remaining: Optional[float] = None,
+    ) -> None:
+        """Display estimated remaining time."""
+        pass
@@ -1,11 +1,15 @@
 from typing import Dict, Optional
 
 from configurator.core.reporter.base import ReporterInterface
+from configurator.core.state.history import format_eta
 
 
 class ConsoleReporter(ReporterInterface):
     """Simple console reporter implementation."""
 
+    # Module the ETA was last printed for
+    _eta_module: Optional[str] = None
+
     def start(self, title: str = "Installation"):
         print(f"=== {title} ===")
 
@@ -40,6 +44,18 @@ class ConsoleReporter(ReporterInterface):
     def info(self, message: str):
         print(f"INFO: {message}")
 
+    def show_eta(
+        self,
+        total_remaining: float,
+        module_name: Optional[str] = None,
+        module_remaining: Optional[float] = None,
+    ) -> None:
+        # Once per module, the estimate changes with every progress update
+        if module_name == self._eta_module:
+            return
+        self._eta_module = module_name
+        print(f"  ETA {format_eta(total_remaining)}")
+
     def show_next_steps(self, reboot_required: bool = False, **kwargs):
         print("\nNext Steps:")
         if reboot_required:
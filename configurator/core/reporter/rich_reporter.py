@@ -16,6 +16,7 @@ from rich.progress import (
 from rich.table import Table
 
 from configurator.core.reporter.base import ReporterInterface
+from configurator.core.state.history import format_eta
 
 
 class RichProgressReporter(ReporterInterface):
@@ -119,6 +120,24 @@ class RichProgressReporter(ReporterInterface):
             msg = "Done" if success else "Failed"
             self.progress.update(self.module_task, completed=100, status=f"{icon} {msg}")
 
+    def show_eta(
+        self,
+        total_remaining: float,
+        module_name: Optional[str] = None,
+        module_remaining: Optional[float] = None,
+    ) -> None:
+        """Show estimated remaining time of the installation."""
+        status = f"ETA {format_eta(total_remaining)}"
+        if module_name and module_remaining:
+            status += f" ({module_name}: {format_eta(module_remaining)})"
+
+        if self.overall_task is None:
+            self.overall_task = self.progress.add_task(
+                "[bold]Overall[/bold]", total=None, status=status
+            )
+        else:
+            self.progress.update(self.overall_task, status=status)
+
     def show_summary(self, results: Dict[str, bool]):
         """Display installation summary."""
         # Stop progress display
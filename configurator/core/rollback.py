@@ -6,6 +6,7 @@ Tracks changes made during installation and can undo them if needed.
 
 import json
 import logging
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -65,6 +66,8 @@ class RollbackManager:
         self.logger = logger or logging.getLogger(__name__)
         self.actions: List[RollbackAction] = []
         self.state_file = ROLLBACK_STATE_FILE
+        # Module steps register actions from several threads
+        self._lock = threading.RLock()
 
     def add_command(self, rollback_command: str, description: str = "") -> None:
         """
@@ -102,18 +105,25 @@ class RollbackManager:
         self.actions.append(action)
         self._save_state()
 
-    def add_package_remove(self, packages: List[str], description: str = "") -> None:
+    def add_package_remove(
+        self, packages: List[str], description: str = "", module: Optional[str] = None
+    ) -> None:
         """
         Add packages to be removed during rollback.
 
         Args:
             packages: List of package names
             description: Human-readable description
+            module: Name of the module that owns the packages
         """
+        data: Dict[str, Any] = {"packages": packages}
+        if module:
+            data["module"] = module
+
         action = RollbackAction(
             action_type="package_remove",
             description=description or f"Remove packages: {', '.join(packages)}",
-            data={"packages": packages},
+            data=data,
         )
         self.actions.append(action)
         self._save_state()
@@ -200,13 +210,14 @@ class RollbackManager:
         try:
             self.state_file.parent.mkdir(parents=True, exist_ok=True)
 
-            state = {
-                "actions": [a.to_dict() for a in self.actions],
-                "saved_at": datetime.now().isoformat(),
-            }
+            with self._lock:
+                state = {
+                    "actions": [a.to_dict() for a in self.actions],
+                    "saved_at": datetime.now().isoformat(),
+                }
 
-            with open(self.state_file, "w") as f:
-                json.dump(state, f, indent=2)
+                with open(self.state_file, "w") as f:
+                    json.dump(state, f, indent=2)
 
         except Exception as e:
             self.logger.debug(f"Could not save rollback state: {e}")
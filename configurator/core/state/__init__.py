@@ -9,8 +9,11 @@ Exports:
     ModuleState: State of a single module
     InstallationState: Overall installation state
     StateManager: SQLite-backed state persistence
+    DurationStats: Rolling statistics of a module's run durations
+    EtaEstimator: Remaining-time estimation for an installation
 """
 
+from configurator.core.state.history import DurationStats, EtaEstimator
 from configurator.core.state.manager import StateManager
 from configurator.core.state.models import (
     InstallationState,
@@ -23,4 +26,6 @@ __all__ = [
     "ModuleState",
     "InstallationState",
     "StateManager",
+    "DurationStats",
+    "EtaEstimator",
 ]
@@ -0,0 +1,189 @@
+"""
+Module duration history and ETA estimation.
+
+Durations of module runs are recorded per module, profile and host class.
+Rolling percentiles over the most recent successful runs give the expected
+duration of each module, which drives critical-path scheduling and the
+ETAs shown while an installation runs.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from configurator.utils.system import get_cpu_count, get_ram_gb
+
+# Most recent successful runs that statistics are computed over
+HISTORY_WINDOW = 20
+
+# Runs kept per (module, profile, host class)
+HISTORY_RETAIN = 100
+
+# Expected duration of modules without history, in seconds
+DEFAULT_MODULE_DURATION = 60.0
+
+
+def host_class() -> str:
+    """
+    Coarse hardware class of this machine, e.g. ``4cpu-8gb``.
+
+    RAM is rounded to a power of two so small differences in reported
+    memory map to the same class.
+    """
+    ram_gb = get_ram_gb()
+    ram_class = 2 ** max(0, round(math.log2(ram_gb))) if ram_gb > 0 else 0
+    return f"{get_cpu_count()}cpu-{ram_class}gb"
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile (0-100) of an ascending list."""
+    if not sorted_values:
+        return 0.0
+
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def format_eta(seconds: float) -> str:
+    """Format a remaining duration for display, e.g. ``3m 20s``."""
+    seconds = max(0, int(round(seconds)))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+@dataclass
+class DurationStats:
+    """Rolling statistics of a module's recent successful run durations."""
+
+    module_name: str
+    samples: int
+    mean: float
+    p50: float
+    p90: float
+    last: float
+    # History the statistics come from: "exact", "host", "profile" or "all"
+    scope: str = "exact"
+
+    @classmethod
+    def from_durations(
+        cls, module_name: str, durations: List[float], scope: str = "exact"
+    ) -> "DurationStats":
+        """
+        Compute statistics from durations, most recent first.
+
+        Args:
+            module_name: Module name
+            durations: Run durations in seconds, most recent first
+            scope: History the durations were selected from
+        """
+        ordered = sorted(durations)
+        return cls(
+            module_name=module_name,
+            samples=len(durations),
+            mean=sum(durations) / len(durations),
+            p50=percentile(ordered, 50),
+            p90=percentile(ordered, 90),
+            last=durations[0],
+            scope=scope,
+        )
+
+    @property
+    def expected(self) -> float:
+        """Expected duration of the next run."""
+        return self.p50
+
+
+class EtaEstimator:
+    """
+    Estimates remaining time of an installation from expected durations.
+
+    The total is the larger of the longest remaining dependency chain and
+    the remaining work spread over the available workers. Running modules
+    count with their expected duration minus the time already spent.
+    """
+
+    def __init__(
+        self,
+        modules: Iterable[str],
+        expected: Dict[str, float],
+        dependencies: Optional[Dict[str, List[str]]] = None,
+        workers: int = 1,
+        default_duration: float = DEFAULT_MODULE_DURATION,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize estimator.
+
+        Args:
+            modules: Modules of the installation
+            expected: Expected duration in seconds per module
+            dependencies: Modules each module waits for
+            workers: Modules that can run at the same time
+            default_duration: Expected duration of modules missing from expected
+            clock: Time source in seconds
+        """
+        self.modules = list(modules)
+        self.expected = {m: expected.get(m, default_duration) for m in self.modules}
+        self.dependencies = dependencies or {}
+        self.workers = max(1, workers)
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._started: Dict[str, float] = {}
+        self._finished: Set[str] = set()
+
+    def start(self, module_name: str) -> None:
+        """Record that a module started."""
+        with self._lock:
+            self._started.setdefault(module_name, self.clock())
+
+    def finish(self, module_name: str) -> None:
+        """Record that a module finished (successfully or not)."""
+        with self._lock:
+            self._finished.add(module_name)
+
+    def module_remaining(self, module_name: str) -> float:
+        """Expected remaining seconds of one module."""
+        with self._lock:
+            return self._remaining(module_name, self.clock())
+
+    def total_remaining(self) -> float:
+        """Expected remaining seconds until all modules have finished."""
+        with self._lock:
+            now = self.clock()
+            remaining = {m: self._remaining(m, now) for m in self.modules}
+
+            # Longest chain: a module finishes after its slowest dependency
+            chain: Dict[str, float] = {}
+
+            def finish_time(module_name: str, visiting: FrozenSet[str] = frozenset()) -> float:
+                if module_name not in chain:
+                    deps = [
+                        d
+                        for d in self.dependencies.get(module_name, [])
+                        if d in remaining and d not in visiting
+                    ]
+                    chain[module_name] = remaining[module_name] + max(
+                        (finish_time(d, visiting | {module_name}) for d in deps), default=0.0
+                    )
+                return chain[module_name]
+
+            critical_path = max((finish_time(m) for m in self.modules), default=0.0)
+            return max(critical_path, sum(remaining.values()) / self.workers)
+
+    def _remaining(self, module_name: str, now: float) -> float:
+        if module_name in self._finished:
+            return 0.0
+
+        expected = self.expected.get(module_name, 0.0)
+        started = self._started.get(module_name)
+        if started is None:
+            return expected
+        return max(0.0, expected - (now - started))
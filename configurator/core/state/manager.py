@@ -10,13 +10,20 @@ import sqlite3
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, ContextManager, Dict, List, Optional, Set
 
+from configurator.core.state.history import (
+    HISTORY_RETAIN,
+    HISTORY_WINDOW,
+    DurationStats,
+    host_class,
+)
 from configurator.core.state.models import (
     InstallationState,
     ModuleState,
     ModuleStatus,
 )
+from configurator.core.state.pool import ConnectionPool
 
 
 class StateManager:
@@ -28,6 +35,7 @@ class StateManager:
     - Checkpoint creation and restore
     - Resume capability after crashes
     - Installation history
+    - Module duration history for scheduling and ETAs
     """
 
     def __init__(
@@ -61,8 +69,8 @@ class StateManager:
             is_memory = db_path == ":memory:"
             self.db_path = Path(db_path) if not is_path_obj and not is_memory else db_path
 
-        # For in-memory databases, keep persistent connection
-        self._in_memory_conn: Optional[sqlite3.Connection] = None
+        # Per-thread connections (one shared connection for :memory:)
+        self._pool = ConnectionPool(self.db_path, logger=self.logger)
 
         # Create database directory if needed
         if self.db_path != ":memory:" and isinstance(self.db_path, Path):
@@ -74,6 +82,9 @@ class StateManager:
         # Current installation state (in-memory)
         self.current_state: Optional[InstallationState] = None
 
+        # Hardware class module durations are recorded under
+        self.host_class = host_class()
+
     def _can_create_dir(self, path: Path) -> bool:
         """
         Check if directory can be created.
@@ -92,41 +103,54 @@ class StateManager:
 
     def _get_connection(self) -> sqlite3.Connection:
         """
-        Get database connection.
+        Get the calling thread's database connection.
 
         Returns:
             SQLite connection
         """
-        # For in-memory databases, reuse the same connection
-        if self.db_path == ":memory:":
-            if self._in_memory_conn is None:
-                self._in_memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
-                self._in_memory_conn.row_factory = sqlite3.Row
-            return self._in_memory_conn
+        return self._pool.connection()
+
+    def _transaction(self) -> ContextManager[sqlite3.Connection]:
+        """Transaction on the calling thread's connection, committed on success."""
+        return self._pool.transaction()
+
+    def batch(self) -> ContextManager[sqlite3.Connection]:
+        """
+        Group state writes into one commit.
 
-        # For file-based databases, create new connection each time
-        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        return conn
+        Writes made by the calling thread inside the block are committed
+        together when it exits, or rolled back on error. Other threads see
+        them only after the commit.
+
+        Example:
+            with state_manager.batch():
+                state_manager.update_module("docker", progress=50)
+                state_manager.create_checkpoint("docker", "images")
+        """
+        return self._pool.transaction()
+
+    def close(self) -> None:
+        """Close the database connections."""
+        self._pool.close()
 
     def _init_db(self) -> None:
         """Initialize database schema."""
         # Handle migration file path
-        migration_file = Path(__file__).parent / "migrations" / "v1_initial.sql"
+        migrations_dir = Path(__file__).parent / "migrations"
+        migration_file = migrations_dir / "v1_initial.sql"
 
         if not migration_file.exists():
             raise FileNotFoundError(f"Migration file not found: {migration_file}")
 
-        conn = self._get_connection()
-        try:
+        # Migrations only create missing objects, so all of them run every time
+        migration_files = sorted(
+            migrations_dir.glob("v*.sql"), key=lambda path: int(path.name[1:].split("_")[0])
+        )
+
+        with self._transaction() as conn:
             cursor = conn.cursor()
-            sql = migration_file.read_text()
-            cursor.executescript(sql)
-            conn.commit()
-        finally:
-            # Only close if it's not the persistent in-memory connection
-            if self.db_path != ":memory:":
-                conn.close()
+            for migration in migration_files:
+                cursor.executescript(migration.read_text())
 
         self.logger.debug("Database initialized")
 
@@ -154,7 +178,7 @@ class StateManager:
         )
 
         # Persist to database
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -171,7 +195,6 @@ class StateManager:
                     json.dumps(state.metadata),
                 ),
             )
-            conn.commit()
 
         self.current_state = state
         self.logger.info(f"Started installation {installation_id} with profile {profile}")
@@ -204,6 +227,7 @@ class StateManager:
             self.current_state.modules[module_name] = ModuleState(name=module_name)
 
         module_state = self.current_state.modules[module_name]
+        duration: Optional[float] = None
 
         # Update fields
         if status is not None:
@@ -214,7 +238,8 @@ class StateManager:
                 module_state.completed_at = datetime.now()
                 if module_state.started_at:
                     delta = module_state.completed_at - module_state.started_at
-                    module_state.duration_seconds = delta.total_seconds()
+                    duration = delta.total_seconds()
+                    module_state.duration_seconds = duration
 
         if progress is not None:
             module_state.progress_percent = min(100, max(0, progress))
@@ -225,8 +250,15 @@ class StateManager:
         if error is not None:
             module_state.error_message = error
 
-        # Persist to database
-        self._persist_module_state(module_name, module_state)
+        # Persist to database, with the duration of a finished module in the same commit
+        with self.batch():
+            self._persist_module_state(module_name, module_state)
+            if duration is not None:
+                self.record_duration(
+                    module_name,
+                    duration,
+                    success=status == ModuleStatus.COMPLETED,
+                )
 
         self.logger.debug(f"Updated module {module_name}: {status}")
 
@@ -241,7 +273,7 @@ class StateManager:
         if not self.current_state:
             return
 
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -265,7 +297,6 @@ class StateManager:
                     json.dumps(state.rollback_actions),
                 ),
             )
-            conn.commit()
 
     def create_checkpoint(self, module_name: str, checkpoint_name: str) -> None:
         """
@@ -285,11 +316,11 @@ class StateManager:
         module_state = self.current_state.modules[module_name]
         module_state.checkpoint = checkpoint_name
 
-        # Update module state in database to persist checkpoint
-        self._persist_module_state(module_name, module_state)
+        with self._transaction() as conn:
+            # Update module state in database to persist checkpoint
+            self._persist_module_state(module_name, module_state)
 
-        # Save checkpoint snapshot to database
-        with self._get_connection() as conn:
+            # Save checkpoint snapshot to database
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -305,10 +336,68 @@ class StateManager:
                     json.dumps(module_state.to_dict()),
                 ),
             )
-            conn.commit()
 
         self.logger.info(f"Created checkpoint '{checkpoint_name}' for {module_name}")
 
+    def complete_step(self, module_name: str, step_name: str, config_hash: str = "") -> None:
+        """
+        Record that a module step completed.
+
+        Also sets the step as the module's checkpoint in the current installation.
+
+        Args:
+            module_name: Module name
+            step_name: Step name
+            config_hash: Hash of the module config the step ran with
+        """
+        installation_id = self.current_state.installation_id if self.current_state else None
+
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO module_steps
+                (module_name, step_name, config_hash, installation_id, completed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (module_name, step_name, config_hash, installation_id, datetime.now().isoformat()),
+            )
+
+            if self.current_state and module_name in self.current_state.modules:
+                self.create_checkpoint(module_name, step_name)
+
+    def get_completed_steps(self, module_name: str, config_hash: str = "") -> Set[str]:
+        """
+        Get the steps a module completed since its last successful run.
+
+        Steps completed with a different module config are not returned.
+
+        Args:
+            module_name: Module name
+            config_hash: Hash of the current module config
+
+        Returns:
+            Set of step names
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT step_name FROM module_steps WHERE module_name = ? AND config_hash = ?",
+                (module_name, config_hash),
+            )
+            return {row["step_name"] for row in cursor.fetchall()}
+
+    def clear_steps(self, module_name: str) -> None:
+        """
+        Forget a module's completed steps (after it completed successfully).
+
+        Args:
+            module_name: Module name
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM module_steps WHERE module_name = ?", (module_name,))
+
     def can_resume(self) -> bool:
         """
         Check if there is an incomplete installation that can be resumed.
@@ -316,7 +405,7 @@ class StateManager:
         Returns:
             True if resumable installation exists
         """
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -336,7 +425,7 @@ class StateManager:
         Returns:
             InstallationState if found, None otherwise
         """
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
 
             # Get most recent incomplete installation
@@ -411,7 +500,7 @@ class StateManager:
         self.current_state.completed_at = datetime.now()
         self.current_state.overall_status = "success" if success else "failed"
 
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -425,13 +514,85 @@ class StateManager:
                     self.current_state.installation_id,
                 ),
             )
-            conn.commit()
 
         self.logger.info(
             f"Installation {self.current_state.installation_id} "
             f"completed with status: {self.current_state.overall_status}"
         )
 
+    def get_fingerprint(self, module_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the fingerprint of a module's last successful run.
+
+        Args:
+            module_name: Module name
+
+        Returns:
+            Dictionary with fingerprint, packages and files, or None
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT fingerprint, inputs FROM module_fingerprints WHERE module_name = ?",
+                (module_name,),
+            )
+            row = cursor.fetchone()
+
+        if not row:
+            return None
+
+        inputs = json.loads(row["inputs"]) if row["inputs"] else {}
+        return {
+            "fingerprint": row["fingerprint"],
+            "packages": inputs.get("packages", []),
+            "files": inputs.get("files", []),
+        }
+
+    def save_fingerprint(
+        self,
+        module_name: str,
+        fingerprint: str,
+        packages: Optional[List[str]] = None,
+        files: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Store the fingerprint of a module's successful run.
+
+        Args:
+            module_name: Module name
+            fingerprint: Convergence fingerprint
+            packages: Packages the fingerprint covers
+            files: Files the fingerprint covers
+        """
+        inputs = {"packages": packages or [], "files": files or []}
+
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO module_fingerprints
+                (module_name, fingerprint, inputs, recorded_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (module_name, fingerprint, json.dumps(inputs), datetime.now().isoformat()),
+            )
+
+    def clear_fingerprint(self, module_name: Optional[str] = None) -> None:
+        """
+        Forget module fingerprints so the modules run again.
+
+        Args:
+            module_name: Module name (all modules if None)
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            if module_name is None:
+                cursor.execute("DELETE FROM module_fingerprints")
+            else:
+                cursor.execute(
+                    "DELETE FROM module_fingerprints WHERE module_name = ?", (module_name,)
+                )
+
     def get_installation_history(self, limit: int = 10) -> List[InstallationState]:
         """
         Get installation history.
@@ -444,7 +605,7 @@ class StateManager:
         """
         history: List[InstallationState] = []
 
-        with self._get_connection() as conn:
+        with self._transaction() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -471,3 +632,156 @@ class StateManager:
                 history.append(state)
 
         return history
+
+    def record_duration(
+        self,
+        module_name: str,
+        duration_seconds: float,
+        success: bool = True,
+        profile: Optional[str] = None,
+    ) -> None:
+        """
+        Add a module run to the duration history.
+
+        Only the most recent HISTORY_RETAIN runs are kept per module,
+        profile and host class.
+
+        Args:
+            module_name: Module name
+            duration_seconds: Run duration in seconds
+            success: Whether the run succeeded (failed runs are not used for estimates)
+            profile: Installation profile (defaults to the current installation's)
+        """
+        if profile is None:
+            profile = self.current_state.profile if self.current_state else "custom"
+        installation_id = self.current_state.installation_id if self.current_state else None
+
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO module_durations (
+                    module_name, profile, host_class, duration_seconds, success, installation_id
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    module_name,
+                    profile,
+                    self.host_class,
+                    duration_seconds,
+                    int(success),
+                    installation_id,
+                ),
+            )
+            cursor.execute(
+                """
+                DELETE FROM module_durations
+                WHERE module_name = ? AND profile = ? AND host_class = ? AND id NOT IN (
+                    SELECT id FROM module_durations
+                    WHERE module_name = ? AND profile = ? AND host_class = ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                )
+                """,
+                (module_name, profile, self.host_class) * 2 + (HISTORY_RETAIN,),
+            )
+
+    def get_duration_stats(
+        self,
+        profile: Optional[str] = None,
+        host: Optional[str] = None,
+        window: int = HISTORY_WINDOW,
+    ) -> Dict[str, DurationStats]:
+        """
+        Get rolling statistics of recent successful module durations.
+
+        For each module the most specific history with samples is used:
+        same profile and host class, then same host class, then same
+        profile, then all runs.
+
+        Args:
+            profile: Installation profile (defaults to the current installation's)
+            host: Host class (defaults to this machine's)
+            window: Most recent runs to compute statistics over
+
+        Returns:
+            Dictionary mapping module name to DurationStats
+        """
+        if profile is None and self.current_state:
+            profile = self.current_state.profile
+        host = host or self.host_class
+
+        # module -> scope -> durations, most recent first
+        samples: Dict[str, Dict[str, List[float]]] = {}
+
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT module_name, profile, host_class, duration_seconds
+                FROM module_durations
+                WHERE success = 1
+                ORDER BY id DESC
+                """
+            )
+
+            for row in cursor.fetchall():
+                same_profile = row["profile"] == profile
+                same_host = row["host_class"] == host
+                scopes = samples.setdefault(row["module_name"], {})
+
+                for scope, matches in (
+                    ("exact", same_profile and same_host),
+                    ("host", same_host),
+                    ("profile", same_profile),
+                    ("all", True),
+                ):
+                    durations = scopes.setdefault(scope, [])
+                    if matches and len(durations) < window:
+                        durations.append(row["duration_seconds"])
+
+        stats: Dict[str, DurationStats] = {}
+        for module_name, scopes in samples.items():
+            for scope in ("exact", "host", "profile", "all"):
+                if scopes[scope]:
+                    stats[module_name] = DurationStats.from_durations(
+                        module_name, scopes[scope], scope=scope
+                    )
+                    break
+
+        return stats
+
+    def get_module_durations(
+        self, profile: Optional[str] = None, host: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Get the expected (median recent) duration of each module.
+
+        Modules without duration history fall back to the average of their
+        completed runs in earlier installations.
+
+        Args:
+            profile: Installation profile (defaults to the current installation's)
+            host: Host class (defaults to this machine's)
+
+        Returns:
+            Dictionary mapping module name to expected duration in seconds
+        """
+        with self._transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT module_name, AVG(duration_seconds) AS avg_duration
+                FROM modules
+                WHERE status = 'completed' AND duration_seconds IS NOT NULL
+                GROUP BY module_name
+                """
+            )
+
+            durations = {row["module_name"]: row["avg_duration"] for row in cursor.fetchall()}
+
+        for module_name, stats in self.get_duration_stats(profile, host).items():
+            durations[module_name] = stats.expected
+
+        return durations
@@ -0,0 +1,20 @@
+-- Module duration history
+-- Version: 2.0
+-- Created: 2026-10-17
+
+-- Module durations table
+-- One row per finished module run, kept across installations so expected
+-- durations can be estimated per module, profile and host class
+CREATE TABLE IF NOT EXISTS module_durations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    module_name TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    host_class TEXT NOT NULL,
+    duration_seconds REAL NOT NULL,
+    success INTEGER NOT NULL DEFAULT 1,
+    installation_id TEXT,
+    recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_module_durations_key
+    ON module_durations(module_name, profile, host_class, id DESC);
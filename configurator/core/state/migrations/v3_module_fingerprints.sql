@@ -0,0 +1,13 @@
+-- Module convergence fingerprints
+-- Version: 3.0
+-- Created: 2026-10-17
+
+-- Module fingerprints table
+-- Fingerprint of each module's last successful run, with the packages and
+-- files it was computed over, so re-runs can skip converged modules
+CREATE TABLE IF NOT EXISTS module_fingerprints (
+    module_name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    inputs TEXT,  -- JSON: {"packages": [...], "files": [...]}
+    recorded_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,15 @@
+-- Module step checkpoints
+-- Version: 4.0
+-- Created: 2026-10-17
+
+-- Module steps table
+-- Steps a module completed since its last successful run, so a failed
+-- module resumes from its first incomplete step
+CREATE TABLE IF NOT EXISTS module_steps (
+    module_name TEXT NOT NULL,
+    step_name TEXT NOT NULL,
+    config_hash TEXT NOT NULL,  -- Module config the step ran with
+    installation_id TEXT,
+    completed_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (module_name, step_name)
+);
@@ -0,0 +1,144 @@
+"""
+SQLite connection pool for the state database.
+
+Each thread keeps one open connection to the database file, so state
+updates from parallel modules neither reconnect per operation nor share a
+connection. File databases use WAL journaling with synchronous=NORMAL:
+readers never block the writer and commits append to the log instead of
+syncing the database file each time. sqlite3 caches prepared statements
+per connection, which persistent connections make effective.
+
+Transactions nest: only the outermost transaction on a thread commits, so
+related writes can be batched into a single commit.
+"""
+
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+# Seconds a writer waits for another connection's write transaction
+BUSY_TIMEOUT = 10.0
+# Prepared statements kept per connection
+CACHED_STATEMENTS = 256
+
+
+class ConnectionPool:
+    """Per-thread SQLite connections to one database."""
+
+    def __init__(
+        self,
+        db_path: Union[Path, str],
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            db_path: Database file, or ":memory:" for a single shared in-memory database
+            logger: Logger instance
+        """
+        self.db_path = db_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.in_memory = db_path == ":memory:"
+
+        self._local = threading.local()
+        self._connections: List[Tuple[threading.Thread, sqlite3.Connection]] = []
+        self._lock = threading.Lock()
+
+        # An in-memory database exists only in its one connection, which all
+        # threads share; transactions on it are serialized
+        self._shared: Optional[sqlite3.Connection] = None
+        self._shared_lock = threading.RLock()
+
+    def connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it on first use.
+
+        Returns:
+            SQLite connection
+        """
+        if self.in_memory:
+            with self._lock:
+                if self._shared is None:
+                    self._shared = self._connect()
+                return self._shared
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._close_finished()
+                self._connections.append((threading.current_thread(), conn))
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run statements in a transaction on the calling thread's connection.
+
+        Nested transactions join the outermost one, which commits on
+        success and rolls back on error.
+
+        Yields:
+            SQLite connection
+        """
+        with self._shared_lock if self.in_memory else nullcontext():
+            conn = self.connection()
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                yield conn
+            except BaseException:
+                if depth == 0:
+                    conn.rollback()
+                raise
+            else:
+                if depth == 0:
+                    conn.commit()
+            finally:
+                self._local.depth = depth
+
+    def close(self) -> None:
+        """Close all connections."""
+        with self._lock:
+            for _, conn in self._connections:
+                conn.close()
+            self._connections = []
+            if self._shared is not None:
+                self._shared.close()
+                self._shared = None
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent use."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+
+        if not self.in_memory:
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError as e:
+                # e.g. filesystems without shared memory support
+                self.logger.debug(f"Could not enable WAL mode for {self.db_path}: {e}")
+
+        return conn
+
+    def _close_finished(self) -> None:
+        """Close connections of threads that have exited (e.g. finished workers)."""
+        alive = []
+        for thread, conn in self._connections:
+            if thread.is_alive():
+                alive.append((thread, conn))
+            else:
+                conn.close()
+        self._connections = alive
@@ -6,20 +6,34 @@ Provides the interface that all modules must implement.
 
 import logging
 import os
-import threading
+import shlex
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, Collection, ContextManager, Dict, List, Optional
 
+from configurator.core.apt_transaction import AptTransactionPlanner
+from configurator.core.artifact_cache import ArtifactCacheManager
 from configurator.core.dryrun import DryRunManager
+from configurator.core.execution.resources import (
+    ResourceClass,
+    ResourceSpec,
+    classify_command,
+    get_resource_pool,
+)
+from configurator.core.execution.steps import ModuleStep, run_step_graph
+from configurator.core.git_cache import GitCacheError, GitMirrorCache
 from configurator.core.network import NetworkOperationWrapper
 from configurator.core.package_cache import PackageCacheManager
 from configurator.core.rollback import RollbackManager
 from configurator.exceptions import ModuleExecutionError
 from configurator.observability.metrics import get_metrics
 from configurator.observability.structured_logging import StructuredLogger
+from configurator.observability.tracing import get_tracer
 from configurator.utils.apt_cache import AptCacheIntegration
+from configurator.utils.apt_update import get_apt_update_tracker
 from configurator.utils.circuit_breaker import CircuitBreakerError, CircuitBreakerManager
 from configurator.utils.command import CommandResult, run_command
+from configurator.utils.deb_prefetch import DebPrefetcher
 from configurator.utils.retry import retry
 
 
@@ -28,9 +42,6 @@ class ConfigurationModule(ABC):
     Abstract base class for all configuration modules.
     """
 
-    # Global lock for APT operations to prevent parallel execution failures
-    _APT_LOCK = threading.Lock()
-
     # Module metadata - override in subclasses
     name: str = "Base Module"
     description: str = "Base configuration module"
@@ -38,6 +49,11 @@ class ConfigurationModule(ABC):
     depends_on: List[str] = []
     force_sequential: bool = False  # If True, runs alone in a batch
     mandatory: bool = False  # If True, installation stops on failure
+    resource_classes: List[str] = []  # Resource classes mostly used (scheduling hint)
+    # If True, re-runs skip configure() while converged. Only set it when every
+    # file configure() changes goes through write_file() or managed_paths()
+    idempotent: bool = False
+    step_workers: int = 1  # Independent steps() run concurrently up to this many
 
     def __init__(
         self,
@@ -47,6 +63,10 @@ class ConfigurationModule(ABC):
         dry_run_manager: Optional["DryRunManager"] = None,
         circuit_breaker_manager: Optional[CircuitBreakerManager] = None,
         package_cache_manager: Optional[PackageCacheManager] = None,
+        apt_transaction_planner: Optional[AptTransactionPlanner] = None,
+        prefetcher: Optional[DebPrefetcher] = None,
+        artifact_cache: Optional[ArtifactCacheManager] = None,
+        git_cache: Optional[GitMirrorCache] = None,
     ):
         """
         Initialize the module.
@@ -58,6 +78,10 @@ class ConfigurationModule(ABC):
             dry_run_manager: Manager for dry-run recording
             circuit_breaker_manager: Manager for circuit breakers
             package_cache_manager: Manager for package caching
+            apt_transaction_planner: Planner of the coalesced APT transaction
+            prefetcher: Parallel downloader for package archives
+            artifact_cache: Cache for downloads outside APT (tarballs, binaries, fonts)
+            git_cache: Local mirrors that git clones are served from
         """
         self.config = config
         self.logger = logger or logging.getLogger(self.__class__.__name__)
@@ -65,6 +89,10 @@ class ConfigurationModule(ABC):
         self.dry_run_manager = dry_run_manager
         self.circuit_breaker_manager = circuit_breaker_manager or CircuitBreakerManager()
         self.package_cache_manager = package_cache_manager
+        self.apt_transaction_planner = apt_transaction_planner
+        self.prefetcher = prefetcher
+        self.artifact_cache = artifact_cache
+        self.git_cache = git_cache
 
         # Initialize APT Cache Integration if manager is available
         self.apt_cache_integration = None
@@ -74,7 +102,12 @@ class ConfigurationModule(ABC):
             )
 
         # Initialize network wrapper for resilient operations
-        self.network = NetworkOperationWrapper(config=config, logger=self.logger)
+        self.network = NetworkOperationWrapper(
+            config=config,
+            logger=self.logger,
+            apt_update_tracker=get_apt_update_tracker(),
+            git_cache=git_cache,
+        )
 
         # Dry run state
         self.dry_run = dry_run_manager.is_enabled if dry_run_manager else False
@@ -83,6 +116,7 @@ class ConfigurationModule(ABC):
         self.state: Dict[str, Any] = {}
         self.installed_packages: List[str] = []
         self.started_services: List[str] = []
+        self.managed_files: List[str] = []
 
         # Observability
         self.metrics = get_metrics()
@@ -144,8 +178,94 @@ class ConfigurationModule(ABC):
         """
         return self.rollback_manager.rollback()
 
+    def planned_packages(self) -> List[str]:
+        """
+        Get the archive packages configure() will install.
+
+        Used by AptTransactionPlanner to install the packages of all modules
+        in one APT transaction before modules run. Only list packages from
+        the system's Debian repositories; packages from repositories the
+        module adds itself are installed by the module as usual.
+
+        Returns:
+            List of package names (none by default)
+        """
+        return []
+
+    def steps(self) -> List[ModuleStep]:
+        """
+        Get the steps of configure().
+
+        Steps run after the previous step unless they declare depends_on.
+        Modules that declare steps implement configure() with run_steps().
+        The PipelineExecutor then records completed steps so a failed
+        module resumes from its first incomplete step.
+
+        Returns:
+            List of steps (none by default)
+        """
+        return []
+
+    def run_steps(
+        self,
+        skip: Collection[str] = (),
+        on_complete: Optional[Callable[[ModuleStep], None]] = None,
+    ) -> bool:
+        """
+        Run the module's steps in dependency order.
+
+        Up to step_workers independent steps run at the same time.
+
+        Args:
+            skip: Names of steps completed in an earlier run
+            on_complete: Called after each successful step
+
+        Returns:
+            True unless a critical step failed
+        """
+        steps = self.steps()
+        results = run_step_graph(steps, self.logger, self.step_workers, skip, on_complete)
+        return all(results.get(step.name, False) or not step.critical for step in steps)
+
+    def managed_paths(self) -> List[str]:
+        """
+        Get files configure() manages besides those written via write_file().
+
+        Changes to these files make the module run again on the next
+        installation instead of being skipped as converged.
+
+        Returns:
+            List of file paths (none by default)
+        """
+        return []
+
+    def convergence_inputs(self) -> Dict[str, Any]:
+        """
+        Get what the module's convergence fingerprint is computed over.
+
+        Called after a successful configure(); see ConvergenceTracker.
+
+        Returns:
+            Dictionary with the module config, packages and managed files
+        """
+        return {
+            "config": self.config,
+            "packages": sorted(set(self.planned_packages()) | set(self.installed_packages)),
+            "files": sorted(set(self.managed_files) | set(self.managed_paths())),
+        }
+
     # Utility methods for subclasses
 
+    def resource(self, *resources: ResourceSpec) -> ContextManager[None]:
+        """
+        Hold resource classes (dpkg, network, disk, cpu) for a step.
+
+        Use around steps that run several commands against one resource,
+        e.g. ``with self.resource(ResourceClass.DPKG): ...``. Single commands
+        run through run() acquire their classes automatically.
+        """
+        return get_resource_pool().acquire(*resources)
+
     def run(
         self,
         command: str,
@@ -181,7 +301,10 @@ class ConfigurationModule(ABC):
         if "shell" not in kwargs:
             kwargs["shell"] = True
 
-        result = run_command(command, check=check, **kwargs)
+        with self.resource(*classify_command(command)):
+            with get_tracer().span(description or command, "command", command=command) as span:
+                result = run_command(command, check=check, **kwargs)
+                span.set(return_code=result.return_code)
 
         if rollback_command and result.success:
             self.rollback_manager.add_command(
@@ -190,6 +313,148 @@ class ConfigurationModule(ABC):
 
         return result
 
+    def download(self, url: str, destination: str, sha256: Optional[str] = None) -> None:
+        """
+        Download a file, reusing the artifact cache.
+
+        Without an artifact cache (or in dry-run mode) this runs curl.
+
+        Args:
+            url: Download URL
+            destination: File to create
+            sha256: Expected SHA256 of the file
+
+        Raises:
+            ModuleExecutionError: If the download or its verification fails
+        """
+        if self.artifact_cache is None or self.dry_run:
+            self.run(f"curl -fsSL {shlex.quote(url)} -o {shlex.quote(destination)}", check=True)
+            return
+
+        try:
+            with get_tracer().span(f"download {url}", "command", url=url):
+                self.artifact_cache.fetch(url, Path(destination), expected_sha256=sha256)
+        except (OSError, ValueError) as e:
+            raise ModuleExecutionError(
+                what=f"Download failed: {url}",
+                why=str(e),
+                how="""Check your internet connection and retry. If the checksum does not match:
+1. Check the URL and expected checksum in the configuration
+2. Clear the cache: vps-configurator cache clear --artifacts""",
+            )
+
+    def git_clone(
+        self,
+        url: str,
+        dest: str,
+        commit: Optional[str] = None,
+        owner: Optional[str] = None,
+    ) -> CommandResult:
+        """
+        Shallow-clone a repository, reusing the git mirror cache.
+
+        Without a git cache (or in dry-run mode) this runs git clone.
+
+        Args:
+            url: Repository URL
+            dest: Directory to clone into
+            commit: Commit to check out
+            owner: User the clone belongs to
+
+        Returns:
+            CommandResult of the clone
+        """
+        if self.git_cache is None or self.dry_run:
+            command = f"git clone --depth=1 {shlex.quote(url)} {shlex.quote(dest)}"
+            if commit:
+                command += (
+                    f" && cd {shlex.quote(dest)} && git fetch --depth=1 origin {commit}"
+                    f" && git checkout {commit}"
+                )
+            if owner:
+                command = f"su - {owner} -c {shlex.quote(command)}"
+            return self.run(command, check=False)
+
+        command = f"git clone {url} {dest}"
+        try:
+            with get_tracer().span(command, "command", command=command):
+                self.git_cache.clone(url, dest, commit=commit, owner=owner)
+        except (GitCacheError, OSError, LookupError) as e:
+            return CommandResult(command=command, return_code=1, stdout="", stderr=str(e))
+        return CommandResult(command=command, return_code=0, stdout="", stderr="")
+
+    def _skip_transaction_packages(self, packages: List[str]) -> List[str]:
+        """Drop packages the coalesced APT transaction already installed."""
+        if not self.apt_transaction_planner:
+            return packages
+
+        covered = self.apt_transaction_planner.covered(packages)
+        if covered:
+            self.logger.debug(f"Installed by APT transaction: {', '.join(covered)}")
+            self.installed_packages.extend(covered)
+
+        return [p for p in packages if p not in covered]
+
+    def update_package_lists(self, check: bool = False, force: bool = False) -> bool:
+        """
+        Run apt-get update unless the package lists are still fresh.
+
+        The update is skipped if the lists were refreshed within the configured
+        TTL and no APT source was added or changed since (see AptUpdateTracker).
+
+        Args:
+            check: Raise ModuleExecutionError if the update fails
+            force: Update even if the package lists are fresh
+
+        Returns:
+            True if the package lists are fresh or the update succeeded
+        """
+        if self.dry_run:
+            return self.run("apt-get update", check=False).success
+
+        def _update() -> bool:
+            # Retry apt-get update if another process has the lock
+            for retry_attempt in range(3):
+                result = self.run("apt-get update", check=False)
+                if result.return_code == 0:
+                    return True
+                if "Could not get lock" in result.stderr or "Could not get lock" in result.stdout:
+                    if retry_attempt < 2:
+                        self.logger.debug(
+                            f"APT lock busy, waiting... (attempt {retry_attempt + 1}/3)"
+                        )
+                        import time
+
+                        time.sleep(5)
+                    else:
+                        self.logger.warning("APT lock still busy after retries, continuing anyway")
+                else:
+                    break
+
+            if check:
+                raise ModuleExecutionError(
+                    what="Command failed: apt-get update",
+                    why=f"Exit code: {result.return_code}\n{result.stderr.strip()}",
+                    how="""Check your APT sources and internet connection:
+1. cat /etc/apt/sources.list /etc/apt/sources.list.d/*
+2. ping -c 3 deb.debian.org""",
+                )
+            return False
+
+        # dpkg before the tracker lock, like every other caller
+        with self.resource(ResourceClass.DPKG):
+            return get_apt_update_tracker().update(_update, force=force)
+
+    def _prefetch_packages(self, packages: List[str]) -> None:
+        """Download package archives in parallel before apt-get installs them."""
+        if not self.prefetcher:
+            return
+
+        try:
+            self.prefetcher.prefetch(packages)
+        except Exception as e:
+            self.logger.warning(f"Failed to prefetch packages: {e}")
+
     def install_packages_resilient(self, packages: List[str], update_cache: bool = True) -> bool:
         """
         Install packages with network resilience.
@@ -215,14 +480,28 @@ class ConfigurationModule(ABC):
                 self.dry_run_manager.record_package_install(packages)
             return True
 
+        packages = self._skip_transaction_packages(packages)
+        if not packages:
+            return True
+
+        if update_cache:
+            with self.resource(ResourceClass.DPKG):
+                if not self.network.apt_update_with_retry():
+                    return False
+
+        # Download archives in parallel without holding dpkg
+        self._prefetch_packages(packages)
+
         # Use network wrapper for resilient installation
-        with self._APT_LOCK:
-            success = self.network.apt_install_with_retry(packages, update_cache)
+        with self.resource(ResourceClass.DPKG):
+            success = self.network.apt_install_with_retry(packages, update_cache=False)
 
             if success:
                 # Register for rollback
                 self.rollback_manager.add_package_remove(
-                    packages, description=f"Remove packages: {', '.join(packages)}"
+                    packages,
+                    description=f"Remove packages: {', '.join(packages)}",
+                    module=self.name,
                 )
 
                 self.installed_packages.extend(packages)
@@ -255,30 +534,18 @@ class ConfigurationModule(ABC):
                 self.dry_run_manager.record_package_install(packages)
             return True
 
-        # Acquire lock to prevent parallel APT operations
-        with self._APT_LOCK:
-            if update_cache:
-                # Retry apt-get update if another process has the lock
-                for retry_attempt in range(3):
-                    result = self.run("apt-get update", check=False)
-                    if result.return_code == 0:
-                        break
-                    if (
-                        "Could not get lock" in result.stderr
-                        or "Could not get lock" in result.stdout
-                    ):
-                        if retry < 2:
-                            self.logger.debug(f"APT lock busy, waiting... (attempt {retry + 1}/3)")
-                            import time
+        packages = self._skip_transaction_packages(packages)
+        if not packages:
+            return True
 
-                            time.sleep(5)
-                        else:
-                            self.logger.warning(
-                                "APT lock still busy after retries, continuing anyway"
-                            )
-                    else:
-                        break
+        if update_cache:
+            self.update_package_lists()
+
+        # Download archives in parallel without holding dpkg
+        self._prefetch_packages(packages)
 
+        # Hold dpkg to prevent parallel APT operations
+        with self.resource(ResourceClass.DPKG):
             # Pre-populate APT cache from our local cache
             if self.apt_cache_integration and not self.dry_run:
                 try:
@@ -459,7 +726,7 @@ class ConfigurationModule(ABC):
 
             try:
                 # Execute through circuit breaker
-                result = breaker.call(_install)
+                result: CommandResult = breaker.call(_install)
             except CircuitBreakerError as e:
                 self.logger.debug(f"Circuit breaker open for apt: {e}")
 
@@ -501,6 +768,7 @@ Try these steps:
                 self.rollback_manager.add_package_remove(
                     packages,
                     description=f"Remove packages: {', '.join(packages)}",
+                    module=self.name,
                 )
 
                 # Capture downloaded packages to our local cache
@@ -637,6 +905,7 @@ Try these steps:
         from configurator.utils.file import write_file as utils_write_file
 
         utils_write_file(path, content, mode=mode, backup=backup, **kwargs)
+        self.managed_files.append(str(path))
 
     def get_config(self, key: str, default: Any = None) -> Any:
         """
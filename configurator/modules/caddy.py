@@ -25,6 +25,7 @@ class CaddyModule(ConfigurationModule):
     depends_on = ["system", "security"]
     priority = 71
     mandatory = False
+    resource_classes = ["dpkg"]
 
     def validate(self) -> bool:
         """Validate Caddy prerequisites."""
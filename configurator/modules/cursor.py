@@ -10,6 +10,7 @@ Handles:
 import os
 from pathlib import Path
 
+from configurator.core.execution.resources import ResourceClass
 from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.command import command_exists
@@ -27,6 +28,7 @@ class CursorModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 61
     mandatory = False
+    resource_classes = ["network", "dpkg"]
 
     def validate(self) -> bool:
         """Validate Cursor prerequisites."""
@@ -101,8 +103,8 @@ class CursorModule(ConfigurationModule):
             env = os.environ.copy()
             env["DEBIAN_FRONTEND"] = "noninteractive"
 
-            # Acquire global APT lock to prevent parallel execution failures
-            with self._APT_LOCK:
+            # Hold dpkg to prevent parallel execution failures
+            with self.resource(ResourceClass.DPKG):
                 self.run(
                     f"apt-get install -y {temp_deb}",
                     check=True,
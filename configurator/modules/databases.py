@@ -8,6 +8,8 @@ Handles:
 - MongoDB tools
 """
 
+from typing import List
+
 from configurator.modules.base import ConfigurationModule
 
 
@@ -24,11 +26,25 @@ class DatabasesModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 52
     mandatory = False
+    resource_classes = ["dpkg"]
 
     def validate(self) -> bool:
         """Validate prerequisites."""
         return True
 
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
+        packages = []
+        if self.get_config("postgresql", True):
+            packages.extend(["postgresql-client", "libpq-dev"])
+        if self.get_config("mysql", True):
+            packages.extend(["default-mysql-client", "libmysqlclient-dev"])
+        if self.get_config("redis", True):
+            packages.append("redis-tools")
+        if self.get_config("sqlite", True):
+            packages.extend(["sqlite3", "libsqlite3-dev"])
+        return packages
+
     def configure(self) -> bool:
         """Install database clients."""
         self.logger.info("Installing database clients...")
@@ -136,7 +152,7 @@ class DatabasesModule(ConfigurationModule):
             check=False,
         )
 
-        self.run("apt-get update", check=False)
+        self.update_package_lists()
         self.install_packages(["mongodb-mongosh", "mongodb-database-tools"], update_cache=False)
 
         self.logger.info("✓ MongoDB tools installed")
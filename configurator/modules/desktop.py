@@ -1,9 +1,13 @@
+import functools
 import os
 import pwd
 import shutil
 import time
 from pathlib import Path
+from typing import Callable, List, Optional
 
+from configurator.core.execution.steps import ModuleStep, run_step_graph
+from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
 from configurator.security.supply_chain import SecureDownloader, SecurityError, SupplyChainValidator
 from configurator.utils.file import backup_file
@@ -28,6 +32,11 @@ class DesktopModule(ConfigurationModule):
     depends_on = ["system", "security"]  # Requires system setup and firewall rules
     priority = 30
     mandatory = False
+    resource_classes = ["dpkg", "network"]
+    # Runs via the PipelineExecutor, which resumes from the first incomplete step
+    large_module = True
+    # Theme, icon, font, zsh and terminal tool downloads overlap
+    step_workers = 4
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -44,57 +53,95 @@ class DesktopModule(ConfigurationModule):
 
         self.logger.info("Configuring desktop environment...")
 
-        try:
-            # Phase 1: XRDP Optimization
-            if not self._optimize_xrdp_performance():
-                self.logger.error("XRDP optimization failed")
-                return False
+        if not self.run_steps():
+            return False
 
-            # Phase 2: Compositor Configuration
-            if not self._optimize_xfce_compositor():
-                self.logger.error("Compositor configuration failed")
-                return False
+        self.logger.info("✓ Desktop environment configured successfully")
+        return True
 
-            # Phase 2: Polkit Rules
-            if not self._configure_polkit_rules():
-                self.logger.warning("Polkit configuration failed (non-critical)")
+    def steps(self) -> List[ModuleStep]:
+        """Desktop configuration phases, resumable per step."""
+        if not self.get_config("enabled", True):
+            return []
 
+        steps = [
+            # Phase 1: XRDP Optimization
+            ModuleStep(
+                "xrdp",
+                self._optimize_xrdp_performance,
+                description="XRDP optimization",
+                depends_on=[],
+            ),
+            # Phase 2: Compositor and Polkit
+            ModuleStep(
+                "compositor",
+                self._optimize_xfce_compositor,
+                description="Compositor configuration",
+                depends_on=["xrdp"],
+            ),
+            ModuleStep(
+                "polkit",
+                self._configure_polkit_rules,
+                critical=False,
+                description="Polkit configuration",
+                depends_on=["compositor"],
+            ),
             # Phase 3: Themes, Icons, Fonts
-            if not self._install_themes():
-                self.logger.warning("Theme installation failed (non-critical)")
-
-            if not self._install_icons():
-                self.logger.warning("Icon installation failed (non-critical)")
+            ModuleStep(
+                "themes",
+                self._install_themes,
+                critical=False,
+                description="Theme installation",
+                depends_on=["compositor"],
+            ),
+            ModuleStep(
+                "icons",
+                self._install_icons,
+                critical=False,
+                description="Icon installation",
+                depends_on=["compositor"],
+            ),
+            ModuleStep(
+                "fonts",
+                self._configure_fonts,
+                critical=False,
+                description="Font configuration",
+                depends_on=["compositor"],
+            ),
+            # Phase 4: Zsh Environment
+            ModuleStep(
+                "zsh",
+                self._configure_zsh,
+                critical=False,
+                description="Zsh configuration",
+                depends_on=["compositor"],
+            ),
+        ]
 
-            if not self._configure_fonts():
-                self.logger.warning("Font configuration failed (non-critical)")
+        # Phase 5: Terminal Tools, if any tool is enabled
+        tools_enabled = any(
+            [
+                self.get_config("terminal_tools.bat.enabled", True),
+                self.get_config("terminal_tools.exa.enabled", True),
+                self.get_config("terminal_tools.zoxide.enabled", True),
+                self.get_config("terminal_tools.fzf.enabled", True),
+                self.get_config("terminal_tools.ripgrep.enabled", True),
+            ]
+        )
 
-            # Phase 4: Zsh Environment
-            if not self._configure_zsh():
-                self.logger.warning("Zsh configuration failed (non-critical)")
-
-            # Phase 5: Terminal Tools
-            # Check if any tool is enabled
-            tools_enabled = any(
-                [
-                    self.get_config("terminal_tools.bat.enabled", True),
-                    self.get_config("terminal_tools.exa.enabled", True),
-                    self.get_config("terminal_tools.zoxide.enabled", True),
-                    self.get_config("terminal_tools.fzf.enabled", True),
-                    self.get_config("terminal_tools.ripgrep.enabled", True),
-                ]
+        if tools_enabled:
+            # Updates the .zshrc written by the zsh step
+            steps.append(
+                ModuleStep(
+                    "terminal_tools",
+                    self._configure_terminal_tools,
+                    critical=False,
+                    description="Terminal tools configuration",
+                    depends_on=["zsh"],
+                )
             )
 
-            if tools_enabled:
-                if not self._configure_terminal_tools():
-                    self.logger.warning("Terminal tools configuration failed (non-critical)")
-
-            self.logger.info("✓ Desktop environment configured successfully")
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Desktop configuration failed: {e}", exc_info=True)
-            return False
+        return steps
 
     def verify(self) -> bool:
         """Verify desktop environment installation."""
@@ -857,12 +904,6 @@ ResultActive=yes
         self.logger.info(f"Installing {len(themes_to_install)} theme(s)...")
 
         try:
-            # Install dependencies first
-            if not self._install_theme_dependencies():
-                self.logger.error("Failed to install theme dependencies")
-                return False
-
-            # Install each theme
             theme_methods = {
                 "nordic": self._install_nordic_theme,
                 "arc": self._install_arc_theme,
@@ -870,19 +911,36 @@ ResultActive=yes
                 "dracula": self._install_dracula_theme,
             }
 
-            installed_count = 0
+            # Install dependencies first, then the themes concurrently
+            steps = [
+                ModuleStep(
+                    "dependencies",
+                    self._install_theme_dependencies,
+                    description="Theme dependency installation",
+                    depends_on=[],
+                )
+            ]
             for theme_name in themes_to_install:
                 theme_lower = theme_name.lower()
 
-                if theme_lower in theme_methods:
-                    self.logger.info(f"Installing {theme_name} theme...")
-                    if theme_methods[theme_lower]():
-                        installed_count += 1
-                        self.logger.info(f"✓ {theme_name} theme installed")
-                    else:
-                        self.logger.warning(f"Failed to install {theme_name} theme")
-                else:
+                if theme_lower not in theme_methods:
                     self.logger.warning(f"Unknown theme: {theme_name}")
+                elif theme_lower not in [step.name for step in steps]:
+                    steps.append(
+                        ModuleStep(
+                            theme_lower,
+                            theme_methods[theme_lower],
+                            critical=False,
+                            description=f"{theme_name} theme installation",
+                            depends_on=["dependencies"],
+                        )
+                    )
+
+            results = run_step_graph(steps, self.logger, self.step_workers)
+            if not results.get("dependencies"):
+                return False
+
+            installed_count = sum(1 for step in steps[1:] if results.get(step.name))
 
             if installed_count == 0:
                 self.logger.error("No themes installed successfully")
@@ -933,8 +991,7 @@ ResultActive=yes
 
             # Clone repository
             self.logger.debug("Cloning Nordic theme repository...")
-            clone_cmd = f"git clone --depth=1 https://github.com/EliverLara/Nordic.git {theme_dir}"
-            result = self.run(clone_cmd, check=False)
+            result = self.git_clone("https://github.com/EliverLara/Nordic.git", theme_dir)
 
             if not result.success:
                 self.logger.error(f"Failed to clone Nordic theme: {result.stderr}")
@@ -1012,8 +1069,9 @@ ResultActive=yes
             theme_dir = "/tmp/whitesur-theme"
 
             # Clone repository
-            clone_cmd = f"git clone --depth=1 https://github.com/vinceliuice/WhiteSur-gtk-theme.git {theme_dir}"
-            result = self.run(clone_cmd, check=False)
+            result = self.git_clone(
+                "https://github.com/vinceliuice/WhiteSur-gtk-theme.git", theme_dir
+            )
 
             if not result.success:
                 return False
@@ -1049,8 +1107,7 @@ ResultActive=yes
             install_dir = "/usr/share/themes/Dracula"
 
             # Clone repository
-            clone_cmd = f"git clone --depth=1 https://github.com/dracula/gtk.git {theme_dir}"
-            result = self.run(clone_cmd, check=False)
+            result = self.git_clone("https://github.com/dracula/gtk.git", theme_dir)
 
             if not result.success:
                 return False
@@ -1094,19 +1151,26 @@ ResultActive=yes
                 "numix": self._install_numix_icons,
             }
 
-            installed_count = 0
+            # Icon packs install concurrently
+            steps: List[ModuleStep] = []
             for icon_name in icons_to_install:
                 icon_lower = icon_name.lower()
 
-                if icon_lower in icon_methods:
-                    self.logger.info(f"Installing {icon_name} icons...")
-                    if icon_methods[icon_lower]():
-                        installed_count += 1
-                        self.logger.info(f"✓ {icon_name} icons installed")
-                    else:
-                        self.logger.warning(f"Failed to install {icon_name} icons")
-                else:
+                if icon_lower not in icon_methods:
                     self.logger.warning(f"Unknown icon theme: {icon_name}")
+                elif icon_lower not in [step.name for step in steps]:
+                    steps.append(
+                        ModuleStep(
+                            icon_lower,
+                            icon_methods[icon_lower],
+                            critical=False,
+                            description=f"{icon_name} icons installation",
+                            depends_on=[],
+                        )
+                    )
+
+            results = run_step_graph(steps, self.logger, self.step_workers)
+            installed_count = sum(1 for ok in results.values() if ok)
 
             if installed_count == 0:
                 self.logger.error("No icon themes installed")
@@ -1153,8 +1217,7 @@ ResultActive=yes
             theme_dir = "/tmp/tela-icons"
 
             # Clone repository
-            clone_cmd = f"git clone --depth=1 https://github.com/vinceliuice/Tela-icon-theme.git {theme_dir}"
-            result = self.run(clone_cmd, check=False)
+            result = self.git_clone("https://github.com/vinceliuice/Tela-icon-theme.git", theme_dir)
 
             if not result.success:
                 return False
@@ -1396,29 +1459,66 @@ ResultActive=yes
 
         try:
             # Step 1: Install Zsh
-            if not self._install_zsh_package():
-                self.logger.error("Failed to install Zsh package")
-                return False
+            steps = [
+                ModuleStep(
+                    "package",
+                    self._install_zsh_package,
+                    description="Zsh package installation",
+                    depends_on=[],
+                )
+            ]
+            framework = ["package"]
 
             # Step 2: Install Oh My Zsh
             if self.get_config("desktop.zsh.oh_my_zsh.enabled", True):
-                if not self._install_oh_my_zsh():
-                    self.logger.error("Failed to install Oh My Zsh")
-                    return False
+                steps.append(
+                    ModuleStep(
+                        "oh_my_zsh",
+                        self._install_oh_my_zsh,
+                        description="Oh My Zsh installation",
+                        depends_on=["package"],
+                    )
+                )
+                framework = ["oh_my_zsh"]
 
             # Step 3: Install Powerlevel10k
             p10k_theme = self.get_config("desktop.zsh.oh_my_zsh.theme", "powerlevel10k")
             if p10k_theme == "powerlevel10k":
-                if not self._install_powerlevel10k():
-                    self.logger.warning("Failed to install Powerlevel10k (using default theme)")
+                steps.append(
+                    ModuleStep(
+                        "powerlevel10k",
+                        self._install_powerlevel10k,
+                        critical=False,
+                        description="Powerlevel10k installation (using default theme)",
+                        depends_on=framework,
+                    )
+                )
 
             # Step 4: Install Zsh plugins
-            if not self._install_zsh_plugins():
-                self.logger.warning("Failed to install some Zsh plugins (non-critical)")
+            steps.append(
+                ModuleStep(
+                    "plugins",
+                    self._install_zsh_plugins,
+                    critical=False,
+                    description="Zsh plugin installation",
+                    depends_on=framework,
+                )
+            )
 
-            # Step 5: Install Meslo Nerd Font
-            if not self._install_meslo_nerd_font():
-                self.logger.warning("Failed to install Meslo Nerd Font (icons may not display)")
+            # Step 5: Install Meslo Nerd Font, which does not need zsh
+            steps.append(
+                ModuleStep(
+                    "meslo_font",
+                    self._install_meslo_nerd_font,
+                    critical=False,
+                    description="Meslo Nerd Font installation (icons may not display)",
+                    depends_on=[],
+                )
+            )
+
+            results = run_step_graph(steps, self.logger, self.step_workers)
+            if not all(results.get(step.name) for step in steps if step.critical):
+                return False
 
             # Step 6: Apply Zsh to all users
             if not self._apply_zsh_to_all_users():
@@ -1468,7 +1568,9 @@ ResultActive=yes
 
             # Initialize secure downloader
             validator = SupplyChainValidator(self.config, self.logger)
-            downloader = SecureDownloader(validator, self.logger)
+            downloader = SecureDownloader(
+                validator, self.logger, self.artifact_cache, self.git_cache
+            )
 
             # Get checksum from database
             checksums = validator.checksums.get("oh_my_zsh", {})
@@ -1566,7 +1668,9 @@ ResultActive=yes
 
             # Initialize secure downloader
             validator = SupplyChainValidator(self.config, self.logger)
-            downloader = SecureDownloader(validator, self.logger)
+            downloader = SecureDownloader(
+                validator, self.logger, self.artifact_cache, self.git_cache
+            )
 
             # Get pinned commit from database
             p10k_data = validator.checksums.get("powerlevel10k", {}).get("git_commit", {})
@@ -1596,13 +1700,10 @@ ResultActive=yes
                 if not self.dry_run:
                     try:
                         # Use secure git clone with commit verification
-                        # Note: Need to run as user
-                        if pinned_commit:
-                            clone_cmd = f"su - {user.pw_name} -c 'git clone --depth=1 {p10k_repo} {p10k_dir} && cd {p10k_dir} && git fetch --depth=1 origin {pinned_commit} && git checkout {pinned_commit}'"
-                        else:
-                            clone_cmd = f"su - {user.pw_name} -c 'git clone --depth=1 {p10k_repo} {p10k_dir}'"
-
-                        result = self.run(clone_cmd, check=False)
+                        # Note: The clone belongs to the user
+                        result = self.git_clone(
+                            p10k_repo, p10k_dir, commit=pinned_commit, owner=user.pw_name
+                        )
 
                         if result.success:
                             # Verify commit if pinned
@@ -1647,10 +1748,21 @@ ResultActive=yes
         """Install essential Zsh plugins."""
         self.logger.info("Installing Zsh plugins...")
         try:
-            if self._install_zsh_autosuggestions():
-                pass
-            if self._install_zsh_syntax_highlighting():
-                pass
+            steps = [
+                ModuleStep(
+                    "zsh-autosuggestions",
+                    self._install_zsh_autosuggestions,
+                    critical=False,
+                    depends_on=[],
+                ),
+                ModuleStep(
+                    "zsh-syntax-highlighting",
+                    self._install_zsh_syntax_highlighting,
+                    critical=False,
+                    depends_on=[],
+                ),
+            ]
+            run_step_graph(steps, self.logger, self.step_workers)
             return True
         except Exception as e:
             self.logger.error(f"Zsh plugins installation failed: {e}", exc_info=True)
@@ -1675,10 +1787,7 @@ ResultActive=yes
                     installed_count += 1
                     continue
 
-                clone_cmd = (
-                    f"su - {user.pw_name} -c 'git clone --depth=1 {plugin_repo} {plugin_dir}'"
-                )
-                self.run(clone_cmd, check=False)
+                self.git_clone(plugin_repo, plugin_dir, owner=user.pw_name)
                 installed_count += 1
 
             return installed_count > 0
@@ -1704,10 +1813,7 @@ ResultActive=yes
                     installed_count += 1
                     continue
 
-                clone_cmd = (
-                    f"su - {user.pw_name} -c 'git clone --depth=1 {plugin_repo} {plugin_dir}'"
-                )
-                self.run(clone_cmd, check=False)
+                self.git_clone(plugin_repo, plugin_dir, owner=user.pw_name)
                 installed_count += 1
 
             return installed_count > 0
@@ -1741,9 +1847,11 @@ ResultActive=yes
 
                 font_url = f"{font_base_url}/{font_file.replace(' ', '%20')}"
                 if not self.dry_run:
-                    cmd = f"curl -fsSL '{font_url}' -o '{font_path}'"
-                    if self.run(cmd, check=False).success:
+                    try:
+                        self.download(font_url, font_path)
                         downloaded += 1
+                    except ModuleExecutionError as e:
+                        self.logger.warning(f"Failed to download {font_file}: {e.what}")
                 else:
                     self.logger.info(f"MOCKED RUN: Download {font_file}")
                     downloaded += 1
@@ -1907,40 +2015,50 @@ fi
         self.logger.info("Configuring terminal tools...")
 
         try:
-            installed_tools = []
-
-            # Install bat
-            if self.get_config("terminal_tools.bat.enabled", True):
-                if self._install_bat():
-                    installed_tools.append("bat")
-                    if not self._configure_bat_advanced():
-                        self.logger.warning("Failed to configure bat (non-critical)")
-
-            # Install eza
-            if self.get_config("terminal_tools.eza.enabled", True):
-                if self._install_eza():
-                    installed_tools.append("eza")
-                    if not self._configure_eza_aliases():
-                        self.logger.warning("Failed to configure eza aliases")
-
-            # Install zoxide
-            if self.get_config("terminal_tools.zoxide.enabled", True):
-                if self._install_zoxide():
-                    installed_tools.append("zoxide")
-                    if not self._configure_zoxide_integration():
-                        self.logger.warning("Failed to configure zoxide integration")
-
-            # Install fzf
-            if self.get_config("terminal_tools.fzf.enabled", True):
-                if self._install_fzf():
-                    installed_tools.append("fzf")
-                    if not self._configure_fzf_keybindings():
-                        self.logger.warning("Failed to configure fzf keybindings")
-
-            # Install ripgrep
-            if self.get_config("terminal_tools.ripgrep.enabled", True):
-                if self._install_ripgrep():
-                    installed_tools.append("ripgrep")
+            # (name, install, configure, warning if configure fails)
+            tools = [
+                (
+                    "bat",
+                    self._install_bat,
+                    self._configure_bat_advanced,
+                    "Failed to configure bat (non-critical)",
+                ),
+                (
+                    "eza",
+                    self._install_eza,
+                    self._configure_eza_aliases,
+                    "Failed to configure eza aliases",
+                ),
+                (
+                    "zoxide",
+                    self._install_zoxide,
+                    self._configure_zoxide_integration,
+                    "Failed to configure zoxide integration",
+                ),
+                (
+                    "fzf",
+                    self._install_fzf,
+                    self._configure_fzf_keybindings,
+                    "Failed to configure fzf keybindings",
+                ),
+                ("ripgrep", self._install_ripgrep, None, None),
+            ]
+
+            # Tools install concurrently
+            steps = [
+                ModuleStep(
+                    name,
+                    functools.partial(self._install_terminal_tool, install, configure, warning),
+                    critical=False,
+                    description=f"{name} installation",
+                    depends_on=[],
+                )
+                for name, install, configure, warning in tools
+                if self.get_config(f"terminal_tools.{name}.enabled", True)
+            ]
+
+            results = run_step_graph(steps, self.logger, self.step_workers)
+            installed_tools = [step.name for step in steps if results.get(step.name)]
 
             if not installed_tools:
                 self.logger.warning("No terminal tools installed")
@@ -1966,6 +2084,20 @@ fi
             self.logger.error(f"Terminal tools configuration failed: {e}", exc_info=True)
             return False
 
+    def _install_terminal_tool(
+        self,
+        install: Callable[[], bool],
+        configure: Optional[Callable[[], bool]],
+        warning: Optional[str],
+    ) -> bool:
+        """Install one terminal tool and apply its configuration."""
+        if not install():
+            return False
+
+        if configure and not configure():
+            self.logger.warning(warning)
+        return True
+
     def _install_bat(self) -> bool:
         """
         Install bat - a cat clone with syntax highlighting.
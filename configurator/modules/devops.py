@@ -27,6 +27,7 @@ class DevOpsModule(ConfigurationModule):
     depends_on = ["system", "docker"]
     priority = 53
     mandatory = False
+    resource_classes = ["network"]
 
     def validate(self) -> bool:
         """Validate prerequisites."""
@@ -124,7 +125,7 @@ class DevOpsModule(ConfigurationModule):
             check=True,
         )
 
-        self.run("apt-get update", check=True)
+        self.update_package_lists(check=True)
         self.install_packages(["terraform"], update_cache=False)
 
         self.logger.info("✓ Terraform installed")
@@ -13,7 +13,6 @@ import os
 
 from configurator.modules.base import ConfigurationModule
 from configurator.security.supply_chain import SecurityError, SupplyChainValidator
-from configurator.utils.file import write_file
 
 
 class DockerModule(ConfigurationModule):
@@ -29,6 +28,7 @@ class DockerModule(ConfigurationModule):
     depends_on = ["system", "security"]
     priority = 50
     mandatory = False
+    resource_classes = ["dpkg", "network"]
 
     def validate(self) -> bool:
         """Validate Docker prerequisites."""
@@ -188,7 +188,7 @@ class DockerModule(ConfigurationModule):
             "Signed-By: /etc/apt/keyrings/docker.asc\n"
         )
 
-        write_file("/etc/apt/sources.list.d/docker.sources", repo_content)
+        self.write_file("/etc/apt/sources.list.d/docker.sources", repo_content, backup=True)
 
         # Update package lists - handled by install_packages safely
         # self.run("apt-get update", check=True)
@@ -228,7 +228,7 @@ class DockerModule(ConfigurationModule):
 
         # Write daemon.json
         config_json = json.dumps(daemon_config, indent=2)
-        write_file("/etc/docker/daemon.json", config_json)
+        self.write_file("/etc/docker/daemon.json", config_json, backup=True)
 
         self.logger.info("✓ Docker daemon configured")
 
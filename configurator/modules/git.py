@@ -6,8 +6,10 @@ Handles:
 - GitHub CLI installation
 """
 
+import os
+from typing import List
+
 from configurator.modules.base import ConfigurationModule
-from configurator.utils.file import write_file
 
 
 class GitModule(ConfigurationModule):
@@ -20,6 +22,8 @@ class GitModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 51
     mandatory = False
+    resource_classes = ["dpkg"]
+    idempotent = True
 
     def validate(self) -> bool:
         """Validate Git prerequisites."""
@@ -29,6 +33,18 @@ class GitModule(ConfigurationModule):
 
         return True
 
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
+        return ["git", "git-lfs"]
+
+    def managed_paths(self) -> List[str]:
+        """Get the files changed by git config, git lfs and the GitHub CLI key download."""
+        return [
+            "/etc/gitconfig",
+            "/usr/share/keyrings/githubcli-archive-keyring.gpg",
+            os.path.expanduser("~/.gitconfig"),
+        ]
+
     def configure(self) -> bool:
         """Install and configure Git."""
         self.logger.info("Setting up Git...")
@@ -99,10 +115,10 @@ class GitModule(ConfigurationModule):
             "https://cli.github.com/packages stable main"
         )
 
-        write_file("/etc/apt/sources.list.d/github-cli.list", repo_line + "\n")
+        self.write_file("/etc/apt/sources.list.d/github-cli.list", repo_line + "\n", backup=True)
 
         # Install
-        self.run("apt-get update", check=False)
+        self.update_package_lists()
         self.install_packages(["gh"], update_cache=False)
 
         self.logger.info("✓ GitHub CLI installed")
@@ -153,7 +169,7 @@ __pycache__/
 venv/
 """
 
-        write_file("/etc/gitignore", gitignore_global)
+        self.write_file("/etc/gitignore", gitignore_global, backup=True)
         self.run("git config --system core.excludesFile /etc/gitignore", check=False)
 
         self.logger.info("✓ Git configured with sensible defaults")
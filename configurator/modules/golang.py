@@ -25,6 +25,7 @@ class GolangModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 42
     mandatory = False
+    resource_classes = ["network", "disk"]
 
     # Default Go version
     DEFAULT_VERSION = "1.22.0"
@@ -104,7 +105,7 @@ class GolangModule(ConfigurationModule):
 
         self.logger.info(f"Downloading Go {version}...")
 
-        self.run(f"curl -fsSL {go_url} -o {go_tarball}", check=True)
+        self.download(go_url, go_tarball, sha256=self.get_config("sha256"))
 
         # Remove old installation
         self.run("rm -rf /usr/local/go", check=False)
@@ -22,6 +22,7 @@ class JavaModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 44
     mandatory = False
+    resource_classes = ["dpkg"]
 
     def validate(self) -> bool:
         """Validate Java prerequisites."""
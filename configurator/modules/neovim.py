@@ -25,6 +25,7 @@ class NeovimModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 62
     mandatory = False
+    resource_classes = ["network"]
 
     def validate(self) -> bool:
         """Validate Neovim prerequisites."""
@@ -86,7 +87,7 @@ class NeovimModule(ConfigurationModule):
         # Download AppImage
         url = f"https://github.com/neovim/neovim/releases/download/{version}/nvim.appimage"
 
-        self.run(f"curl -fsSL {url} -o /usr/local/bin/nvim", check=True)
+        self.download(url, "/usr/local/bin/nvim", sha256=self.get_config("sha256"))
         self.run("chmod +x /usr/local/bin/nvim", check=True)
 
     def _install_dependencies(self):
@@ -23,6 +23,7 @@ class NetdataModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 80
     mandatory = False
+    resource_classes = ["network", "dpkg"]
     force_sequential = True
 
     def validate(self) -> bool:
@@ -26,6 +26,7 @@ class NodeJSModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 41
     mandatory = False
+    resource_classes = ["network"]
 
     # nvm version to install
     NVM_VERSION = "0.40.1"
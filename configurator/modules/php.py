@@ -20,6 +20,7 @@ class PHPModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 45
     mandatory = False
+    resource_classes = ["dpkg"]
 
     # Common PHP extensions
     PHP_EXTENSIONS = [
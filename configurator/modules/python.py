@@ -7,6 +7,8 @@ Handles:
 - Development tools (black, pylint, mypy, etc.)
 """
 
+from typing import List
+
 from configurator.modules.base import ConfigurationModule
 
 
@@ -23,6 +25,7 @@ class PythonModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 40
     mandatory = False
+    resource_classes = ["dpkg", "network"]
 
     # System packages for Python development
     SYSTEM_PACKAGES = [
@@ -68,6 +71,10 @@ class PythonModule(ConfigurationModule):
 
         return True
 
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
+        return list(self.SYSTEM_PACKAGES)
+
     def configure(self) -> bool:
         """Configure Python development environment."""
         self.logger.info("Setting up Python development environment...")
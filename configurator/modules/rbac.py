@@ -81,6 +81,7 @@ class RBACModule(ConfigurationModule):
     depends_on = ["system", "security"]
     priority = 25  # After security, before desktop
     mandatory = False
+    resource_classes = ["disk"]
 
     def __init__(self, config: Dict[str, Any], *args: Any, **kwargs: Any):
         super().__init__(config, *args, **kwargs)
@@ -24,6 +24,7 @@ class RustModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 43
     mandatory = False
+    resource_classes = ["network", "cpu"]
 
     # Rust tools to install
     RUST_TOOLS = [
@@ -12,10 +12,11 @@ Handles:
 """
 
 import os
+from typing import List
 
 from configurator.exceptions import ModuleExecutionError
 from configurator.modules.base import ConfigurationModule
-from configurator.utils.file import backup_file, write_file
+from configurator.utils.file import backup_file
 
 
 class SecurityModule(ConfigurationModule):
@@ -31,6 +32,7 @@ class SecurityModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 20
     mandatory = True
+    resource_classes = ["dpkg"]
 
     def validate(self) -> bool:
         """Validate security prerequisites."""
@@ -45,6 +47,14 @@ class SecurityModule(ConfigurationModule):
 
         return True
 
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
+        packages = ["ufw", "fail2ban"]
+        # unattended-upgrades stays with the module: it is preseeded before install
+        if self.get_config("auto_updates", True):
+            packages.append("debconf-utils")
+        return packages
+
     def configure(self) -> bool:
         """Configure security settings."""
         self.logger.info(
@@ -225,8 +235,7 @@ maxretry = {max_retry}
 bantime = {ban_time}
 """
 
-        backup_file("/etc/fail2ban/jail.local")
-        write_file("/etc/fail2ban/jail.local", jail_config)
+        self.write_file("/etc/fail2ban/jail.local", jail_config, backup=True)
 
         # Enable and start fail2ban
         self.enable_service("fail2ban")
@@ -408,9 +417,10 @@ APT::Periodic::Unattended-Upgrade "1";
 APT::Periodic::AutocleanInterval "7";
 """
 
-        write_file(
+        self.write_file(
             "/etc/apt/apt.conf.d/20auto-upgrades",
             auto_upgrades_config,
+            backup=True,
         )
 
         # Enable the service
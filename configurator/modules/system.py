@@ -12,6 +12,7 @@ Handles:
 
 import os
 import re
+from typing import List
 
 from configurator.exceptions import ModuleExecutionError, PrerequisiteError
 from configurator.modules.base import ConfigurationModule
@@ -37,6 +38,9 @@ class SystemModule(ConfigurationModule):
     depends_on = []
     priority = 10
     mandatory = True
+    resource_classes = ["dpkg"]
+    # Upgrades packages on every run, so it is never skipped as converged
+    idempotent = False
 
     # Essential packages to install
     ESSENTIAL_PACKAGES = [
@@ -82,6 +86,10 @@ class SystemModule(ConfigurationModule):
         self.logger.info(f"✓ Detected: {os_info.pretty_name}")
         return True
 
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
+        return list(self.ESSENTIAL_PACKAGES)
+
     def configure(self) -> bool:
         """Configure the system."""
         self.logger.info("Configuring base system...")
@@ -165,7 +173,7 @@ class SystemModule(ConfigurationModule):
     def _update_packages(self):
         """Update package lists."""
         self.logger.info("Updating package lists...")
-        self.run("apt-get update", check=True)
+        self.update_package_lists(check=True)
 
         # Upgrade existing packages
         env = os.environ.copy()
@@ -7,6 +7,8 @@ Handles:
 - Network utilities
 """
 
+from typing import List
+
 from configurator.modules.base import ConfigurationModule
 
 
@@ -22,6 +24,7 @@ class UtilitiesModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 54
     mandatory = False
+    resource_classes = ["dpkg"]
 
     # Default utilities to install
     SYSTEM_UTILS = [
@@ -81,10 +84,8 @@ class UtilitiesModule(ConfigurationModule):
         """Validate prerequisites."""
         return True
 
-    def configure(self) -> bool:
-        """Install utilities."""
-        self.logger.info("Installing CLI utilities...")
-
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
         packages = []
 
         # System utilities
@@ -105,7 +106,13 @@ class UtilitiesModule(ConfigurationModule):
             packages.extend(custom)
 
         # Remove duplicates
-        packages = list(set(packages))
+        return list(set(packages))
+
+    def configure(self) -> bool:
+        """Install utilities."""
+        self.logger.info("Installing CLI utilities...")
+
+        packages = self.planned_packages()
 
         self.logger.info(f"Installing {len(packages)} utilities...")
         self.install_packages(packages)
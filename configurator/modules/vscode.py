@@ -23,6 +23,7 @@ class VSCodeModule(ConfigurationModule):
     depends_on = ["system"]
     priority = 60
     mandatory = False
+    resource_classes = ["dpkg", "network"]
 
     # Recommended extensions
     EXTENSIONS = [
@@ -9,6 +9,7 @@ Handles:
 """
 
 from pathlib import Path
+from typing import List
 
 from configurator.modules.base import ConfigurationModule
 from configurator.utils.network import get_public_ip
@@ -26,6 +27,7 @@ class WireGuardModule(ConfigurationModule):
     depends_on = ["system", "security"]
     priority = 70
     mandatory = False
+    resource_classes = ["dpkg"]
 
     def validate(self) -> bool:
         """Validate WireGuard prerequisites."""
@@ -36,6 +38,10 @@ class WireGuardModule(ConfigurationModule):
 
         return True
 
+    def planned_packages(self) -> List[str]:
+        """Get the archive packages installed by configure()."""
+        return ["wireguard", "wireguard-tools"]
+
     def configure(self) -> bool:
         """Install and configure WireGuard."""
         self.logger.info("Installing WireGuard VPN...")
@@ -25,6 +25,11 @@ except ImportError:
     InstallationDashboard = None
     SimpleProgressReporter = None
 
+# Import metrics exporter, command profiling and tracing
+from configurator.observability.exporter import MetricsExporter
+from configurator.observability.profiling import CommandProfiler, get_command_profiler
+from configurator.observability.tracing import Tracer, get_tracer
+
 # Import alerting (to be created)
 try:
     from configurator.observability.alerting import Alert, AlertManager, AlertSeverity
@@ -36,10 +41,15 @@ except ImportError:
 __all__ = [
     "MetricsCollector",
     "get_metrics",
+    "MetricsExporter",
     "StructuredLogger",
     "CorrelationContext",
     "InstallationDashboard",
     "SimpleProgressReporter",
+    "Tracer",
+    "get_tracer",
+    "CommandProfiler",
+    "get_command_profiler",
     "AlertManager",
     "AlertSeverity",
     "Alert",
@@ -8,6 +8,8 @@ import time
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from configurator.core.state.history import EtaEstimator, format_eta
+
 try:
     from rich.console import Console
     from rich.layout import Layout
@@ -40,6 +42,7 @@ class InstallationDashboard:
         self.modules: Dict[str, Dict[str, Any]] = {}
         self.circuit_breakers: Dict[str, Dict[str, Any]] = {}
         self.metrics: Dict[str, float] = {}
+        self.eta: Optional[float] = None
         self.start_time = time.time()
 
     def start(self):
@@ -68,6 +71,7 @@ class InstallationDashboard:
         status: str,
         progress: int = 0,
         duration: Optional[float] = None,
+        eta: Optional[float] = None,
     ):
         """
         Update module status.
@@ -77,15 +81,29 @@ class InstallationDashboard:
             status: Status (running, success, failed)
             progress: Progress percentage (0-100)
             duration: Duration in seconds
+            eta: Estimated remaining seconds of the module
         """
         self.modules[name] = {
             "status": status,
             "progress": progress,
             "duration": duration,
+            "eta": eta,
             "updated": datetime.now(),
         }
         self._refresh()
 
+    def set_eta(self, seconds: Optional[float]):
+        """Set estimated remaining seconds of the whole installation."""
+        self.eta = seconds
+        self._refresh()
+
+    def update_eta(self, estimator: EtaEstimator):
+        """Take the total and per-module ETAs from the installation's estimator."""
+        for name, info in self.modules.items():
+            if name in estimator.expected:
+                info["eta"] = estimator.module_remaining(name)
+        self.set_eta(estimator.total_remaining())
+
     def update_circuit_breaker(self, name: str, state: str, failures: int):
         """Update circuit breaker status."""
         self.circuit_breakers[name] = {
@@ -107,12 +125,10 @@ class InstallationDashboard:
 
         # Update header
         elapsed = time.time() - self.start_time
-        self.layout["header"].update(
-            Panel(
-                f"VPS Configurator - Installation Progress | Elapsed: {elapsed:.1f}s",
-                style="bold cyan",
-            )
-        )
+        header = f"VPS Configurator - Installation Progress | Elapsed: {elapsed:.1f}s"
+        if self.eta is not None:
+            header += f" | ETA: {format_eta(self.eta)}"
+        self.layout["header"].update(Panel(header, style="bold cyan"))
 
         # Update modules section
         self.layout["modules"].update(self._render_modules())
@@ -144,6 +160,7 @@ class InstallationDashboard:
         table.add_column("Status", style="magenta")
         table.add_column("Progress", justify="right")
         table.add_column("Duration", justify="right")
+        table.add_column("ETA", justify="right")
 
         for name, info in self.modules.items():
             # Status icon
@@ -163,7 +180,12 @@ class InstallationDashboard:
             if info["duration"]:
                 duration_str = f"{info['duration']:.1f}s"
 
-            table.add_row(name, f"{icon} {info['status']}", progress, duration_str)
+            # Estimated remaining time, only while the module has not finished
+            eta_str = "-"
+            if info.get("eta") is not None and info["status"] in ("waiting", "running"):
+                eta_str = format_eta(info["eta"])
+
+            table.add_row(name, f"{icon} {info['status']}", progress, duration_str, eta_str)
 
         return Panel(table, title="Installation Progress")
 
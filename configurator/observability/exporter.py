@@ -0,0 +1,164 @@
+"""
+HTTP exporter for Prometheus scraping.
+
+Serves the metrics collector at /metrics from a background thread, so
+Prometheus can scrape an install while it runs ('install --metrics-port').
+
+Scrapers that accept OpenMetrics (Prometheus sends it in its Accept
+header) get OpenMetrics 1.0; others get the Prometheus 0.0.4 text format.
+Rendering reuses the collector's cached text for unchanged families.
+
+Usage:
+    exporter = MetricsExporter(port=9101)
+    exporter.start()
+    ...  # install
+    exporter.stop()
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple
+
+from configurator.observability.metrics import MetricsCollector, get_metrics
+
+# Listen on loopback only unless configured otherwise
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9101
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _accepts_openmetrics(accept: Optional[str]) -> bool:
+    """Check whether an Accept header asks for OpenMetrics."""
+    return accept is not None and "application/openmetrics-text" in accept
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Request handler serving /metrics."""
+
+    # Set on the subclass created for each exporter
+    exporter: "MetricsExporter"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        path = self.path.split("?", 1)[0]
+
+        if path == "/metrics":
+            openmetrics = _accepts_openmetrics(self.headers.get("Accept"))
+            try:
+                body = self.exporter.render(openmetrics).encode("utf-8")
+            except Exception as e:
+                self.exporter.logger.error(f"Failed to render metrics: {e}", exc_info=True)
+                self.send_error(500, "Failed to render metrics")
+                return
+            content_type = OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE
+            self._send(200, content_type, body)
+        elif path == "/":
+            self._send(
+                200,
+                "text/html; charset=utf-8",
+                b'<html><body><a href="/metrics">VPS Configurator metrics</a></body></html>',
+            )
+        else:
+            self.send_error(404, "Not Found")
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Scrapes every few seconds would flood stderr
+        self.exporter.logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class MetricsExporter:
+    """Serves a MetricsCollector over HTTP from a daemon thread."""
+
+    def __init__(
+        self,
+        collector: Optional[MetricsCollector] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        refresh_resources: bool = True,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize exporter.
+
+        Args:
+            collector: Metrics to serve (defaults to the global collector)
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port)
+            refresh_resources: Update memory and CPU gauges on each scrape
+            logger: Logger instance
+        """
+        self.collector = collector or get_metrics()
+        self.host = host
+        self.port = port
+        self.refresh_resources = refresh_resources
+        self.logger = logger or logging.getLogger(__name__)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address being served (with the actual port once started)."""
+        if self._server:
+            host, port = self._server.server_address[:2]
+            return (str(host), port)
+        return (self.host, self.port)
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}/metrics"
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Render the metrics for one scrape."""
+        if self.refresh_resources:
+            self.collector.update_resource_metrics()
+        return self.collector.render(openmetrics=openmetrics)
+
+    def start(self) -> None:
+        """
+        Start serving in a daemon thread.
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        if self.running:
+            return
+
+        handler = type("MetricsHandler", (_MetricsHandler,), {"exporter": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-exporter", daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"Serving metrics at {self.url}")
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "MetricsExporter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
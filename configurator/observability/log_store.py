@@ -0,0 +1,535 @@
+"""
+Indexed, segmented JSON Lines log store.
+
+Audit and structured logs are JSON Lines files that grow for months. Queries
+on them ("last 20 audit events", "errors in the last 24 hours", "everything
+for correlation id X") should not read the whole history, so:
+
+- The active file is read backwards in blocks, newest line first.
+- The active file is sealed into a segment when its time bucket (a day by
+  default) ends or it grows too large: it is renamed to
+  <name>.<first timestamp> and a sidecar <segment>.idx is written.
+- The index records the segment's time range, a sparse timestamp -> byte
+  offset table, and postings (value -> line offsets) for chosen fields such
+  as level or correlation_id. Queries skip segments outside their time
+  window and seek straight to the lines an indexed filter matches.
+
+Entries are expected to be appended in time order, each with an ISO 8601
+"timestamp".
+
+Usage:
+    store = LogStore(Path("audit.jsonl"), indexed_fields=("event_type",))
+    store.append({"timestamp": "...", "event_type": "user_create"})
+    recent = store.query(limit=20, event_type="user_create")
+"""
+
+import itertools
+import json
+import logging
+import logging.handlers
+import os
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per step when reading a file backwards
+BLOCK_SIZE = 64 * 1024
+
+# Seal the active file when its day ends...
+DEFAULT_BUCKET_SECONDS = 86400
+
+# ...or when it reaches this size
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Lines between entries of the sparse timestamp -> offset table
+SPARSE_INTERVAL = 256
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+_SEGMENT_SUFFIX = re.compile(r"^\d{8}T\d{6}(-\d+)?$")
+
+Timestamp = Union[datetime, float, None]
+
+
+def read_lines_reversed(
+    path: Path, start: int = 0, end: Optional[int] = None, block_size: int = BLOCK_SIZE
+) -> Iterator[str]:
+    """
+    Yield the lines of a file from last to first, reading backwards in blocks.
+
+    Args:
+        path: File to read
+        start: Byte offset of the first line to include
+        end: Byte offset after the last line to include (default: end of file)
+        block_size: Bytes read per step
+
+    Yields:
+        Non-empty lines without their newline
+    """
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END) if end is None else end
+        remainder = b""
+        while pos > start:
+            size = min(block_size, pos - start)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # The first piece may be the tail of a line in an earlier block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+        if remainder:
+            yield remainder.decode("utf-8", errors="replace")
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert an entry timestamp to epoch seconds.
+
+    Accepts ISO 8601 strings (with "Z", an offset, or naive UTC) and datetimes.
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    moment: datetime = value
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+@dataclass
+class SegmentIndex:
+    """Sidecar index of a sealed segment."""
+
+    start: Optional[float] = None
+    end: Optional[float] = None
+    count: int = 0
+    size: int = 0
+    # (timestamp, offset) every SPARSE_INTERVAL lines
+    sparse: List[Tuple[float, int]] = field(default_factory=list)
+    # field -> value -> line offsets
+    postings: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, path: Path, fields: Sequence[str]) -> "SegmentIndex":
+        """Index a segment with one forward pass."""
+        index = cls(postings={name: {} for name in fields})
+        offset = 0
+        with open(path, "rb") as f:
+            for raw in f:
+                line_offset, offset = offset, offset + len(raw)
+                try:
+                    entry = json.loads(raw)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+
+                ts = parse_timestamp(entry.get("timestamp"))
+                if ts is not None:
+                    if index.start is None:
+                        index.start = ts
+                    index.end = ts
+                    if index.count % SPARSE_INTERVAL == 0:
+                        index.sparse.append((ts, line_offset))
+                index.count += 1
+
+                for name in fields:
+                    value = entry.get(name)
+                    if isinstance(value, str):
+                        index.postings[name].setdefault(value, []).append(line_offset)
+        index.size = offset
+        return index
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SegmentIndex"]:
+        """Load an index file; None if missing, unreadable or outdated."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.pop("version", None) != INDEX_VERSION:
+            return None
+        data["sparse"] = [tuple(point) for point in data.get("sparse", [])]
+        return cls(**data)
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"version": INDEX_VERSION, **asdict(self)}, f)
+        os.replace(tmp, path)
+
+    def byte_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """Byte range of whole lines that covers [start, end]."""
+        times = [ts for ts, _ in self.sparse]
+        lo, hi = 0, self.size
+        if start is not None:
+            # Last point before start; entries at start may precede later points
+            i = bisect_left(times, start) - 1
+            if i > 0:
+                lo = self.sparse[i][1]
+        if end is not None:
+            # First point after end
+            i = bisect_right(times, end)
+            if i < len(self.sparse):
+                hi = self.sparse[i][1]
+        return lo, hi
+
+
+class LogStore:
+    """
+    Append-only JSON Lines log split into time-bucketed, indexed segments.
+
+    The active file keeps the configured path, so tools like tail -f keep
+    working; sealed segments sit next to it.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        indexed_fields: Sequence[str] = (),
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+        max_segments: Optional[int] = None,
+        file_mode: Optional[int] = None,
+    ):
+        """
+        Initialize store.
+
+        Args:
+            path: Active log file
+            indexed_fields: Entry fields to build postings for
+            bucket_seconds: Time bucket of a segment
+            max_segment_bytes: Seal the active file at this size
+            max_segments: Delete the oldest segments beyond this many (None keeps all)
+            file_mode: Permissions for newly created active files
+        """
+        self.path = Path(path)
+        self.indexed_fields = tuple(indexed_fields)
+        self.bucket_seconds = bucket_seconds
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segments = max_segments
+        self.file_mode = file_mode
+        self._lock = threading.Lock()
+        self._active_start: Optional[float] = None
+        self._active_size = 0
+
+    # Writing
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Append an entry, sealing the active file first if its bucket ended.
+
+        Raises:
+            OSError: If the log cannot be written
+        """
+        self.write_lines([json.dumps(entry) + "\n"])
+
+    def write_lines(self, lines: List[str], fsync: bool = False) -> None:
+        """
+        Append serialized entries with one write (used by batching writers).
+
+        Args:
+            lines: JSON lines, each ending with a newline
+            fsync: Sync the file to disk before returning
+
+        Raises:
+            OSError: If the log cannot be written
+        """
+        with self._lock:
+            if lines and self.needs_rotation():
+                self.rotate()
+            created = not self.path.exists()
+            with open(self.path, "a") as f:
+                f.write("".join(lines))
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if created and self.file_mode is not None:
+                try:
+                    os.chmod(self.path, self.file_mode)
+                except OSError:
+                    pass
+
+    def __repr__(self) -> str:
+        return str(self.path)
+
+    def needs_rotation(self, now: Optional[float] = None) -> bool:
+        """Check whether the active file should be sealed before the next write."""
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return False
+        if size == 0:
+            self._active_start = None
+            return False
+
+        # A smaller file than last seen was rotated by another process
+        if self._active_start is None or size < self._active_size:
+            self._active_start = self._first_timestamp(self.path)
+        self._active_size = size
+
+        if size >= self.max_segment_bytes:
+            return True
+        if self._active_start is None:
+            return False
+        now = time.time() if now is None else now
+        return self._bucket(self._active_start) != self._bucket(now)
+
+    def rotate(self) -> Optional[Path]:
+        """
+        Seal the active file into an indexed segment.
+
+        Returns:
+            Path of the new segment, or None if there was nothing to seal
+        """
+        started = self._first_timestamp(self.path)
+        if started is None:
+            try:
+                started = self.path.stat().st_mtime
+            except OSError:
+                return None
+
+        stamp = datetime.fromtimestamp(started, timezone.utc).strftime("%Y%m%dT%H%M%S")
+        segment = self.path.with_name(f"{self.path.name}.{stamp}")
+        suffix = 0
+        while segment.exists():
+            suffix += 1
+            segment = self.path.with_name(f"{self.path.name}.{stamp}-{suffix}")
+
+        try:
+            os.rename(self.path, segment)
+        except FileNotFoundError:
+            # Another process sealed it first
+            return None
+        self._active_start = None
+        self._active_size = 0
+
+        self._load_index(segment)
+        self._apply_retention()
+        return segment
+
+    def _apply_retention(self) -> None:
+        if self.max_segments is None:
+            return
+        segments = self.segments()
+        for segment in segments[: max(0, len(segments) - self.max_segments)]:
+            for path in (segment, self._index_path(segment)):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    # Reading
+
+    def segments(self) -> List[Path]:
+        """Sealed segments, oldest first."""
+        prefix = self.path.name + "."
+        try:
+            candidates = list(self.path.parent.iterdir())
+        except OSError:
+            return []
+        return sorted(
+            p
+            for p in candidates
+            if p.name.startswith(prefix) and _SEGMENT_SUFFIX.match(p.name[len(prefix) :])
+        )
+
+    def query(
+        self,
+        start: Timestamp = None,
+        end: Timestamp = None,
+        limit: Optional[int] = None,
+        **filters: Union[str, Iterable[str], None],
+    ) -> List[Dict[str, Any]]:
+        """
+        Find entries, newest first.
+
+        Args:
+            start: Oldest entry time to include
+            end: Newest entry time to include
+            limit: Maximum entries to return
+            **filters: Field values to match; an iterable matches any of its
+                values and None matches everything
+
+        Returns:
+            Matching entries, newest first
+        """
+        results: List[Dict[str, Any]] = []
+        if limit is not None and limit <= 0:
+            return results
+        for entry in self.iter_entries(start, end, **filters):
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def iter_entries(
+        self,
+        start: Timestamp = None,
+        end: Timestamp = None,
+        **filters: Union[str, Iterable[str], None],
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over matching entries, newest first (see query)."""
+        start_ts = parse_timestamp(start) if start is not None else None
+        end_ts = parse_timestamp(end) if end is not None else None
+        wanted = {
+            name: {value} if isinstance(value, str) else set(value)
+            for name, value in filters.items()
+            if value is not None
+        }
+
+        def matches(entry: Any) -> Optional[bool]:
+            # None once entries are older than the window
+            if not isinstance(entry, dict):
+                return False
+            if start_ts is not None or end_ts is not None:
+                ts = parse_timestamp(entry.get("timestamp"))
+                if ts is None:
+                    return False
+                if start_ts is not None and ts < start_ts:
+                    return None
+                if end_ts is not None and ts > end_ts:
+                    return False
+            return all(entry.get(name) in values for name, values in wanted.items())
+
+        # Active file
+        if self.path.exists():
+            for entry in self._parse(read_lines_reversed(self.path)):
+                found = matches(entry)
+                if found is None:
+                    return
+                if found:
+                    yield entry
+
+        # Sealed segments, newest first
+        for segment in reversed(self.segments()):
+            index = self._load_index(segment)
+            if index is None:
+                continue
+            if start_ts is not None and index.end is not None and index.end < start_ts:
+                # This and all older segments end before the window
+                return
+            if end_ts is not None and index.start is not None and index.start > end_ts:
+                continue
+
+            indexed = [name for name in wanted if name in index.postings]
+            if indexed:
+                lines = self._read_postings(segment, index, {n: wanted[n] for n in indexed})
+            else:
+                lines = read_lines_reversed(segment, *index.byte_range(start_ts, end_ts))
+
+            for entry in self._parse(lines):
+                found = matches(entry)
+                if found is None:
+                    break
+                if found:
+                    yield entry
+
+    def _read_postings(
+        self, segment: Path, index: SegmentIndex, wanted: Dict[str, Set[str]]
+    ) -> Iterator[str]:
+        """Read the lines that match all indexed filters, newest first."""
+        offsets: Optional[Set[int]] = None
+        for name, values in wanted.items():
+            postings = index.postings[name]
+            matching = {offset for value in values for offset in postings.get(value, ())}
+            offsets = matching if offsets is None else offsets & matching
+        if not offsets:
+            return
+
+        with open(segment, "rb") as f:
+            for offset in sorted(offsets, reverse=True):
+                f.seek(offset)
+                yield f.readline().decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _parse(lines: Iterable[str]) -> Iterator[Any]:
+        for line in lines:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+    def _index_path(self, segment: Path) -> Path:
+        return segment.with_name(segment.name + INDEX_SUFFIX)
+
+    def _load_index(self, segment: Path) -> Optional[SegmentIndex]:
+        """Load a segment's index, (re)building it if missing or stale."""
+        index_path = self._index_path(segment)
+        index = SegmentIndex.load(index_path)
+        try:
+            size = segment.stat().st_size
+        except OSError:
+            return None
+        if (
+            index is not None
+            and index.size == size
+            and set(self.indexed_fields) <= set(index.postings)
+        ):
+            return index
+
+        try:
+            index = SegmentIndex.build(segment, self.indexed_fields)
+        except OSError as e:
+            logger.warning(f"Could not index log segment {segment}: {e}")
+            return None
+        try:
+            index.save(index_path)
+        except OSError as e:
+            # Still usable for this query; rebuilt next time
+            logger.debug(f"Could not save log index {index_path}: {e}")
+        return index
+
+    def _bucket(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    @staticmethod
+    def _first_timestamp(path: Path) -> Optional[float]:
+        try:
+            with open(path, "rb") as f:
+                for raw in itertools.islice(f, 16):
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict):
+                        ts = parse_timestamp(entry.get("timestamp"))
+                        if ts is not None:
+                            return ts
+        except OSError:
+            pass
+        return None
+
+
+class SegmentedFileHandler(logging.handlers.BaseRotatingHandler):
+    """Logging handler that writes JSON lines into a LogStore's active file."""
+
+    def __init__(self, store: LogStore, encoding: str = "utf-8"):
+        super().__init__(str(store.path), "a", encoding=encoding, delay=True)
+        self.store = store
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:  # noqa: N802
+        return self.store.needs_rotation()
+
+    def doRollover(self) -> None:  # noqa: N802
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.store.rotate()
@@ -5,13 +5,16 @@ Provides Prometheus-compatible metrics for monitoring.
 """
 
 import json
+import math
 import threading
 import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
 
 
 class MetricType(Enum):
@@ -35,44 +38,251 @@ class Metric:
     timestamp: float = field(default_factory=time.time)
 
 
-class Counter:
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> _LabelKey:
+    """Hashable form of a label set."""
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(labels: Dict[str, str], **extra: str) -> str:
+    """Format labels as a Prometheus label set, e.g. {program="git"}."""
+    merged = {**labels, **extra}
+    if not merged:
+        return ""
+    pairs = []
+    for key, value in merged.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: Optional[float]) -> str:
+    """Format a sample value (NaN for unknown quantiles)."""
+    if value is None or math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(value)
+
+
+def _render_family(
+    name: str, metric_type: str, help_text: str, series: List[Any], openmetrics: bool
+) -> str:
+    """
+    Render one metric family in the text exposition format.
+
+    OpenMetrics names a counter family without the _total suffix that its
+    samples carry; otherwise the two formats are the same here.
+    """
+    family = name
+    if openmetrics and metric_type == "counter":
+        family = name[: -len("_total")] if name.endswith("_total") else name
+    help_text = help_text.replace("\\", "\\\\").replace("\n", "\\n")
+    lines = [f"# HELP {family} {help_text}", f"# TYPE {family} {metric_type}"]
+
+    for metric in series:
+        labels = _format_labels(metric.labels)
+
+        if metric_type == "counter":
+            sample = f"{family}_total" if openmetrics else name
+            lines.append(f"{sample}{labels} {_format_value(metric.get())}")
+
+        elif metric_type == "gauge":
+            lines.append(f"{name}{labels} {_format_value(metric.get())}")
+
+        elif metric_type == "histogram":
+            for le, count in metric.get_buckets().items():
+                bucket_labels = _format_labels(metric.labels, le=_format_value(float(le)))
+                lines.append(f"{name}_bucket{bucket_labels} {count}")
+            lines.append(f"{name}_sum{labels} {_format_value(metric.get_sum())}")
+            lines.append(f"{name}_count{labels} {metric.get_count()}")
+
+        elif metric_type == "summary":
+            for q, value in metric.get_quantiles().items():
+                quantile_labels = _format_labels(metric.labels, quantile=str(q))
+                lines.append(f"{name}{quantile_labels} {_format_value(value)}")
+            lines.append(f"{name}_sum{labels} {_format_value(metric.get_sum())}")
+            lines.append(f"{name}_count{labels} {metric.get_count()}")
+
+    return "\n".join(lines) + "\n"
+
+
+# Quantiles tracked for duration histograms
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so any
+    quantile is within relative_accuracy of the true value and two sketches
+    merge by adding their bucket counts. Memory grows with the log of the
+    value range, not with the number of observations: durations from 1ms to
+    1h at 1% accuracy need at most about 750 buckets.
+    """
+
+    __slots__ = ("relative_accuracy", "_gamma_log", "_buckets", "_zeros", "count")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma_log = math.log(gamma)
+        self._buckets: Dict[int, int] = {}
+        # Values <= 0 (durations and sizes never go below zero)
+        self._zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.count += 1
+        if value <= 0:
+            self._zeros += 1
+            return
+        key = math.ceil(math.log(value) / self._gamma_log)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the observations of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self._zeros += other._zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1 (e.g. 0.95)
+
+        Returns:
+            Estimated value, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+
+        rank = min(max(q, 0.0), 1.0) * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                break
+        # Midpoint of the bucket (gamma^(key-1), gamma^key], within the accuracy
+        return 2 * math.exp(key * self._gamma_log) / (1 + math.exp(self._gamma_log))
+
+
+class _Sharded(ABC):
+    """
+    Base for metrics updated without locks.
+
+    Each thread writes only to its own shard, created on its first update;
+    readers merge the shards. The lock guards only the list of shards.
+    Shards of threads that have exited are folded into a base shard, so
+    short-lived worker threads do not leave their shards behind.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        # (owning thread, shard) per thread that updated the metric
+        self._shards: List[Tuple[threading.Thread, Any]] = []
+        self._base: Any = None
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _new_shard(self) -> Any:
+        """Create an empty shard."""
+
+    @abstractmethod
+    def _merge(self, into: Any, shard: Any) -> None:
+        """Add the updates recorded in shard to into."""
+
+    def _shard(self) -> Any:
+        """Get this thread's shard."""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._new_shard()
+            with self._lock:
+                self._release_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _all_shards(self) -> List[Any]:
+        with self._lock:
+            self._release_dead_shards()
+            shards = [shard for _, shard in self._shards]
+            return shards if self._base is None else [self._base, *shards]
+
+    def _release_dead_shards(self) -> None:
+        """Merge shards of exited threads into the base shard (caller holds the lock)."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            if self._base is None:
+                self._base = self._new_shard()
+            self._merge(self._base, shard)
+        self._shards = live
+
+
+class Counter(_Sharded):
     """Counter metric - monotonically increasing value."""
 
-    def __init__(self, name: str, help_text: str):
+    def __init__(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None):
+        super().__init__()
         self.name = name
         self.help_text = help_text
-        self._value = 0.0
-        self._lock = threading.Lock()
+        self.labels = dict(labels or {})
+
+    def _new_shard(self) -> List[float]:
+        return [0.0]
+
+    def _merge(self, into: List[float], shard: List[float]) -> None:
+        into[0] += shard[0]
 
     def inc(self, amount: float = 1.0):
         """Increment counter."""
-        with self._lock:
-            self._value += amount
+        self._shard()[0] += amount
 
     def get(self) -> float:
         """Get current value."""
-        with self._lock:
-            return self._value
+        return sum((shard[0] for shard in self._all_shards()), 0.0)
+
+    def fingerprint(self) -> float:
+        """Value that changes whenever the exported samples change."""
+        return self.get()
 
     def reset(self):
         """Reset counter to zero."""
-        with self._lock:
-            self._value = 0.0
+        for shard in self._all_shards():
+            shard[0] = 0.0
 
 
 class Gauge:
-    """Gauge metric - value that can go up and down."""
+    """
+    Gauge metric - value that can go up and down.
 
-    def __init__(self, name: str, help_text: str):
+    set() is a plain assignment; only inc() and dec() take the lock.
+    """
+
+    def __init__(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None):
         self.name = name
         self.help_text = help_text
+        self.labels = dict(labels or {})
         self._value = 0.0
         self._lock = threading.Lock()
 
     def set(self, value: float):
         """Set gauge value."""
-        with self._lock:
-            self._value = value
+        self._value = value
 
     def inc(self, amount: float = 1.0):
         """Increment gauge."""
@@ -86,49 +296,123 @@ class Gauge:
 
     def get(self) -> float:
         """Get current value."""
-        with self._lock:
-            return self._value
+        return self._value
+
+    def fingerprint(self) -> float:
+        """Value that changes whenever the exported samples change."""
+        return self._value
+
+
+class _HistogramShard:
+    """One thread's observations of a histogram."""
 
+    __slots__ = ("counts", "sum", "count", "sketch")
 
-class Histogram:
-    """Histogram metric - distribution of values."""
+    def __init__(self, buckets: int, sketch: Optional[QuantileSketch]):
+        # Per bucket, not cumulative; the last slot is +Inf
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.sketch = sketch
 
-    def __init__(self, name: str, help_text: str, buckets: List[float] = None):
+
+class Histogram(_Sharded):
+    """
+    Histogram metric - distribution of values.
+
+    observe() finds the bucket with a binary search and counts it in the
+    calling thread's shard; cumulative bucket counts are computed when the
+    histogram is read. With quantiles set, a QuantileSketch per shard also
+    tracks those quantiles (e.g. p50/p95/p99) for export as a summary.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        buckets: List[float] = None,
+        labels: Optional[Dict[str, str]] = None,
+        quantiles: Optional[Sequence[float]] = None,
+    ):
+        super().__init__()
         self.name = name
         self.help_text = help_text
-        self.buckets = buckets or [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        self.labels = dict(labels or {})
+        self.buckets = sorted(
+            buckets or [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+        )
+        self.quantiles = tuple(quantiles or ())
 
-        self._counts = {b: 0 for b in self.buckets}
-        self._counts[float("inf")] = 0
-        self._sum = 0.0
-        self._count = 0
-        self._lock = threading.Lock()
+    def _new_shard(self) -> _HistogramShard:
+        return _HistogramShard(len(self.buckets), QuantileSketch() if self.quantiles else None)
+
+    def _merge(self, into: _HistogramShard, shard: _HistogramShard) -> None:
+        for i, count in enumerate(shard.counts):
+            into.counts[i] += count
+        into.sum += shard.sum
+        into.count += shard.count
+        if into.sketch is not None and shard.sketch is not None:
+            into.sketch.merge(shard.sketch)
 
     def observe(self, value: float):
         """Record an observation."""
-        with self._lock:
-            self._sum += value
-            self._count += 1
-
-            for bucket in self.buckets:
-                if value <= bucket:
-                    self._counts[bucket] += 1
-            self._counts[float("inf")] += 1
+        shard = self._shard()
+        # First bucket with value <= bound; len(buckets) is +Inf
+        shard.counts[bisect_left(self.buckets, value)] += 1
+        shard.sum += value
+        shard.count += 1
+        if shard.sketch is not None:
+            shard.sketch.add(value)
 
     def get_buckets(self) -> Dict[float, int]:
-        """Get bucket counts."""
-        with self._lock:
-            return self._counts.copy()
+        """Get cumulative bucket counts, including +Inf."""
+        counts = [0] * (len(self.buckets) + 1)
+        for shard in self._all_shards():
+            for i, count in enumerate(shard.counts):
+                counts[i] += count
+
+        cumulative = {}
+        total = 0
+        for bound, count in zip(self.buckets + [float("inf")], counts, strict=True):
+            total += count
+            cumulative[bound] = total
+        return cumulative
 
     def get_sum(self) -> float:
         """Get sum of all observations."""
-        with self._lock:
-            return self._sum
+        return sum((shard.sum for shard in self._all_shards()), 0.0)
 
     def get_count(self) -> int:
         """Get total number of observations."""
-        with self._lock:
-            return self._count
+        return sum(shard.count for shard in self._all_shards())
+
+    def fingerprint(self) -> Tuple[int, float]:
+        """Value that changes whenever the exported samples change."""
+        # Every observation bumps the count
+        return (self.get_count(), self.get_sum())
+
+    def get_sketch(self) -> Optional[QuantileSketch]:
+        """Get the merged quantile sketch (None without quantiles)."""
+        if not self.quantiles:
+            return None
+        merged = QuantileSketch()
+        for shard in self._all_shards():
+            merged.merge(shard.sketch)
+        return merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile of the observations (None if unavailable)."""
+        sketch = self.get_sketch()
+        return sketch.quantile(q) if sketch else None
+
+    def get_quantiles(self) -> Dict[float, Optional[float]]:
+        """Estimate the configured quantiles."""
+        sketch = self.get_sketch()
+        return {q: sketch.quantile(q) for q in self.quantiles} if sketch else {}
+
+
+# Metric series type, for helpers that return the series type they are given
+_Series = TypeVar("_Series", Counter, Gauge, Histogram)
 
 
 class MetricsCollector:
@@ -149,14 +433,25 @@ class MetricsCollector:
 
         # Export
         prometheus_format = metrics.export_prometheus()
+
+    Metrics with the same name and different labels are separate series:
+
+        metrics.histogram(
+            "vps_command_duration_seconds", "Command wall time", labels={"program": "git"}
+        ).observe(1.5)
     """
 
     def __init__(self):
-        self._counters: Dict[str, Counter] = {}
-        self._gauges: Dict[str, Gauge] = {}
-        self._histograms: Dict[str, Histogram] = {}
+        # Keyed by (name, sorted label items); looked up without the lock,
+        # which only serializes creating a series
+        self._counters: Dict[Tuple[str, _LabelKey], Counter] = {}
+        self._gauges: Dict[Tuple[str, _LabelKey], Gauge] = {}
+        self._histograms: Dict[Tuple[str, _LabelKey], Histogram] = {}
         self._lock = threading.Lock()
 
+        # (openmetrics, type, family name) -> (series fingerprints, rendered text)
+        self._render_cache: Dict[Tuple[bool, str, str], Tuple[Tuple[Any, ...], str]] = {}
+
         # Initialize standard metrics
         self._init_standard_metrics()
 
@@ -176,7 +471,9 @@ class MetricsCollector:
         )
 
         self.installation_duration = self.histogram(
-            "vps_installation_duration_seconds", "Installation duration in seconds"
+            "vps_installation_duration_seconds",
+            "Installation duration in seconds",
+            quantiles=DEFAULT_QUANTILES,
         )
 
         # Module metrics
@@ -189,7 +486,10 @@ class MetricsCollector:
         )
 
         self.module_duration = self.histogram(
-            "vps_module_duration_seconds", "Module execution duration"
+            "vps_module_duration_seconds",
+            "Module execution duration",
+            [1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 1800.0],
+            quantiles=DEFAULT_QUANTILES,
         )
 
         # Network metrics
@@ -221,26 +521,117 @@ class MetricsCollector:
 
         self.cpu_usage_percent = self.gauge("vps_cpu_usage_percent", "Current CPU usage percentage")
 
-    def counter(self, name: str, help_text: str) -> Counter:
+    def counter(
+        self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None
+    ) -> Counter:
         """Create or get a counter metric."""
-        with self._lock:
-            if name not in self._counters:
-                self._counters[name] = Counter(name, help_text)
-            return self._counters[name]
-
-    def gauge(self, name: str, help_text: str) -> Gauge:
+        key = (name, _label_key(labels))
+        metric = self._counters.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._counters.setdefault(key, Counter(name, help_text, labels))
+        return metric
+
+    def gauge(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> Gauge:
         """Create or get a gauge metric."""
-        with self._lock:
-            if name not in self._gauges:
-                self._gauges[name] = Gauge(name, help_text)
-            return self._gauges[name]
+        key = (name, _label_key(labels))
+        metric = self._gauges.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._gauges.setdefault(key, Gauge(name, help_text, labels))
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: List[float] = None,
+        labels: Optional[Dict[str, str]] = None,
+        quantiles: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        """
+        Create or get a histogram metric.
 
-    def histogram(self, name: str, help_text: str, buckets: List[float] = None) -> Histogram:
-        """Create or get a histogram metric."""
+        Histograms with quantiles are also exported as a <name>_summary
+        summary with those quantiles.
+        """
+        key = (name, _label_key(labels))
+        metric = self._histograms.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._histograms.setdefault(
+                    key, Histogram(name, help_text, buckets, labels, quantiles)
+                )
+        return metric
+
+    def record_module(self, duration_seconds: float, success: bool) -> None:
+        """Record one module execution."""
+        self.module_executions_total.inc()
+        if not success:
+            self.module_failures_total.inc()
+        self.module_duration.observe(duration_seconds)
+
+    def _series(self, metrics: Mapping[Tuple[str, _LabelKey], _Series]) -> List[_Series]:
+        """Snapshot of metric series, grouped by name."""
         with self._lock:
-            if name not in self._histograms:
-                self._histograms[name] = Histogram(name, help_text, buckets)
-            return self._histograms[name]
+            return sorted(metrics.values(), key=lambda m: (m.name, _label_key(m.labels)))
+
+    def _families(self) -> List[Tuple[str, str, str, List[Any]]]:
+        """Metric families in export order as (name, type, help, series)."""
+        families: Dict[Tuple[str, str], Tuple[str, List[Any]]] = {}
+        by_type: Tuple[Tuple[str, Sequence[Union[Counter, Gauge, Histogram]]], ...] = (
+            ("counter", self._series(self._counters)),
+            ("gauge", self._series(self._gauges)),
+            ("histogram", self._series(self._histograms)),
+        )
+        for metric_type, series in by_type:
+            for metric in series:
+                family = families.setdefault((metric.name, metric_type), (metric.help_text, []))
+                family[1].append(metric)
+
+        # Histogram quantiles are exported as summaries
+        for histogram in self._series(self._histograms):
+            if histogram.quantiles:
+                family = families.setdefault(
+                    (f"{histogram.name}_summary", "summary"),
+                    (f"{histogram.help_text} (quantiles)", []),
+                )
+                family[1].append(histogram)
+
+        return [
+            (name, kind, help_text, series)
+            for (name, kind), (help_text, series) in families.items()
+        ]
+
+    def render(self, openmetrics: bool = False) -> str:
+        """
+        Render the text exposition, re-rendering only changed families.
+
+        Each family's text is cached with the fingerprints of its series and
+        reused while they are unchanged, so frequent scrapes of a mostly idle
+        collector only compare values.
+
+        Args:
+            openmetrics: Render OpenMetrics 1.0 instead of Prometheus 0.0.4 text
+
+        Returns:
+            Text exposition
+        """
+        chunks = []
+        for name, metric_type, help_text, series in self._families():
+            # Fingerprints are taken before rendering, so a value that changes
+            # meanwhile only causes one extra re-render on the next call
+            fingerprint = tuple(metric.fingerprint() for metric in series)
+            key = (openmetrics, metric_type, name)
+            cached = self._render_cache.get(key)
+            if cached is None or cached[0] != fingerprint:
+                text = _render_family(name, metric_type, help_text, series, openmetrics)
+                cached = self._render_cache[key] = (fingerprint, text)
+            chunks.append(cached[1])
+
+        if openmetrics:
+            chunks.append("# EOF\n")
+        return "".join(chunks)
 
     def export_prometheus(self) -> str:
         """
@@ -249,48 +640,35 @@ class MetricsCollector:
         Returns:
             Prometheus-formatted metrics string
         """
-        lines = []
-
-        # Export counters
-        for counter in self._counters.values():
-            lines.append(f"# HELP {counter.name} {counter.help_text}")
-            lines.append(f"# TYPE {counter.name} counter")
-            lines.append(f"{counter.name} {counter.get()}")
-
-        # Export gauges
-        for gauge in self._gauges.values():
-            lines.append(f"# HELP {gauge.name} {gauge.help_text}")
-            lines.append(f"# TYPE {gauge.name} gauge")
-            lines.append(f"{gauge.name} {gauge.get()}")
-
-        # Export histograms
-        for histogram in self._histograms.values():
-            lines.append(f"# HELP {histogram.name} {histogram.help_text}")
-            lines.append(f"# TYPE {histogram.name} histogram")
+        return self.render(openmetrics=False)
 
-            buckets = histogram.get_buckets()
-            for le, count in sorted(buckets.items()):
-                le_str = "+Inf" if le == float("inf") else str(le)
-                lines.append(f'{histogram.name}_bucket{{le="{le_str}"}} {count}')
-
-            lines.append(f"{histogram.name}_sum {histogram.get_sum()}")
-            lines.append(f"{histogram.name}_count {histogram.get_count()}")
+    def export_openmetrics(self) -> str:
+        """
+        Export metrics in OpenMetrics text format.
 
-        return "\n".join(lines) + "\n"
+        Returns:
+            OpenMetrics-formatted metrics string, ending with "# EOF"
+        """
+        return self.render(openmetrics=True)
 
     def export_json(self) -> str:
         """Export metrics in JSON format."""
         data = {
             "timestamp": datetime.now().isoformat(),
-            "counters": {name: counter.get() for name, counter in self._counters.items()},
-            "gauges": {name: gauge.get() for name, gauge in self._gauges.items()},
+            "counters": {
+                c.name + _format_labels(c.labels): c.get() for c in self._series(self._counters)
+            },
+            "gauges": {
+                g.name + _format_labels(g.labels): g.get() for g in self._series(self._gauges)
+            },
             "histograms": {
-                name: {
-                    "sum": hist.get_sum(),
-                    "count": hist.get_count(),
-                    "buckets": {str(k): v for k, v in hist.get_buckets().items()},
+                h.name + _format_labels(h.labels): {
+                    "sum": h.get_sum(),
+                    "count": h.get_count(),
+                    "buckets": {str(k): v for k, v in h.get_buckets().items()},
+                    "quantiles": {str(q): v for q, v in h.get_quantiles().items()},
                 }
-                for name, hist in self._histograms.items()
+                for h in self._series(self._histograms)
             },
         }
 
@@ -302,6 +680,8 @@ class MetricsCollector:
 
         if format == "prometheus":
             content = self.export_prometheus()
+        elif format == "openmetrics":
+            content = self.export_openmetrics()
         elif format == "json":
             content = self.export_json()
         else:
@@ -310,7 +690,7 @@ class MetricsCollector:
         with open(filepath, "w") as f:
             f.write(content)
 
-    def update_resource_metrics(self):
+    def update_resource_metrics(self) -> None:
         """Update system resource metrics."""
         try:
             import psutil
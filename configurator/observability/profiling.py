@@ -0,0 +1,301 @@
+"""
+Command execution profiling.
+
+run_command reports every subprocess it runs to the global
+CommandProfiler. While enabled, the profiler tags each invocation with its
+program name and the module that ran it, records wall time, exit status and
+output size into labeled metrics histograms, and keeps the aggregates and
+slowest invocations for a "top slowest commands" report after an install.
+
+The module is taken from the current_module context variable, which the
+executors set while a module runs.
+"""
+
+import heapq
+import itertools
+import json
+import os
+import shlex
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from configurator.constants import LOG_DIR
+from configurator.observability.metrics import (
+    DEFAULT_QUANTILES,
+    Histogram,
+    MetricsCollector,
+    get_metrics,
+)
+
+# Module whose code is running on this thread or step
+current_module: ContextVar[Optional[str]] = ContextVar("current_module", default=None)
+
+# Where the installer saves the command profile of its last profiled run
+DEFAULT_PROFILE_FILE = LOG_DIR / "command-profile.json"
+
+# Slowest individual invocations kept for the report
+DEFAULT_TOP = 25
+
+# Command wall time buckets (seconds): from quick checks to long apt runs
+DURATION_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+
+# Output size buckets (bytes)
+OUTPUT_BUCKETS = [0.0, 256.0, 1024.0, 16384.0, 131072.0, 1048576.0, 8388608.0]
+
+# Wrappers skipped to find the program that does the work
+_WRAPPERS = {"sudo", "env", "nice", "ionice", "nohup", "stdbuf", "timeout", "exec"}
+
+# Wrapper options that take a value (e.g. sudo -u alice)
+_WRAPPER_VALUE_OPTIONS = {"-u", "-g", "-n", "-s", "-k"}
+
+# Wrappers that run their command from a -c argument (e.g. su - alice -c 'git ...')
+_SHELL_WRAPPERS = {"su", "runuser", "sh", "bash"}
+
+
+@contextmanager
+def module_context(module_name: str) -> Iterator[None]:
+    """Attribute commands run inside the block to module_name."""
+    token = current_module.set(module_name)
+    try:
+        yield
+    finally:
+        current_module.reset(token)
+
+
+def program_name(command: str) -> str:
+    """
+    Get the program a command line runs.
+
+    Skips environment assignments and wrappers such as sudo or timeout,
+    e.g. "DEBIAN_FRONTEND=noninteractive apt-get install -y git" -> "apt-get",
+    and looks inside "su - alice -c '...'".
+    """
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        tokens = command.split()
+
+    skip_value = False
+    for i, token in enumerate(tokens):
+        if skip_value:
+            skip_value = False
+            continue
+        if token.startswith("-"):
+            skip_value = token in _WRAPPER_VALUE_OPTIONS
+            continue
+        if "=" in token.split("/")[0]:
+            continue
+        name = os.path.basename(token)
+        if name in _WRAPPERS or name.replace(".", "").isdigit():
+            continue
+        if name in _SHELL_WRAPPERS and "-c" in tokens[i:]:
+            inner = tokens.index("-c", i) + 1
+            return program_name(tokens[inner]) if inner < len(tokens) else name
+        return name or "?"
+    return "?"
+
+
+@dataclass
+class CommandStats:
+    """Aggregate of the invocations of one program by one module."""
+
+    program: str
+    module: str
+    count: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    output_bytes: int = 0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+@dataclass
+class CommandSample:
+    """One profiled invocation."""
+
+    command: str
+    program: str
+    module: str
+    duration_seconds: float
+    return_code: Optional[int]
+    output_bytes: int
+
+
+class CommandProfiler:
+    """
+    Records run_command invocations while enabled.
+
+    Usage:
+        profiler = get_command_profiler()
+        profiler.enable()
+        ...  # install
+        for stats in profiler.report()["programs"]:
+            print(stats["program"], stats["total_seconds"])
+    """
+
+    def __init__(self, metrics: Optional[MetricsCollector] = None, top: int = DEFAULT_TOP):
+        """
+        Initialize profiler.
+
+        Args:
+            metrics: Collector for the command histograms (defaults to the global one)
+            top: Number of slowest invocations to keep
+        """
+        self.enabled = False
+        self.top = top
+        self._metrics = metrics
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], CommandStats] = {}
+        self._slowest: List[Tuple[float, int, CommandSample]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def metrics(self) -> MetricsCollector:
+        return self._metrics or get_metrics()
+
+    def enable(self) -> None:
+        """Start profiling, discarding earlier results."""
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop profiling; results are kept for the report."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Discard recorded results."""
+        with self._lock:
+            self._stats = {}
+            self._slowest = []
+
+    def record(
+        self,
+        command: str,
+        duration_seconds: float,
+        return_code: Optional[int],
+        output_bytes: int = 0,
+    ) -> None:
+        """
+        Record one command invocation.
+
+        Args:
+            command: Command line
+            duration_seconds: Wall time
+            return_code: Exit code, or None if the command timed out
+            output_bytes: Size of captured stdout and stderr
+        """
+        program = program_name(command)
+        module = current_module.get() or "-"
+        failed = return_code != 0
+        labels = {"program": program, "module": module}
+
+        metrics = self.metrics
+        self._duration_histogram(labels).observe(duration_seconds)
+        metrics.histogram(
+            "vps_command_output_bytes",
+            "Captured command output in bytes",
+            OUTPUT_BUCKETS,
+            labels,
+        ).observe(output_bytes)
+        if failed:
+            metrics.counter(
+                "vps_command_failures_total", "Commands that failed or timed out", labels
+            ).inc()
+
+        sample = CommandSample(
+            command=command if len(command) <= 300 else command[:297] + "...",
+            program=program,
+            module=module,
+            duration_seconds=duration_seconds,
+            return_code=return_code,
+            output_bytes=output_bytes,
+        )
+
+        with self._lock:
+            stats = self._stats.get((program, module))
+            if stats is None:
+                stats = self._stats[(program, module)] = CommandStats(program, module)
+            stats.count += 1
+            stats.failures += int(failed)
+            stats.total_seconds += duration_seconds
+            stats.max_seconds = max(stats.max_seconds, duration_seconds)
+            stats.output_bytes += output_bytes
+
+            # Min-heap of the slowest invocations
+            entry = (duration_seconds, next(self._sequence), sample)
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, entry)
+            elif duration_seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def _duration_histogram(self, labels: Dict[str, str]) -> Histogram:
+        return self.metrics.histogram(
+            "vps_command_duration_seconds",
+            "Command wall time in seconds",
+            DURATION_BUCKETS,
+            labels,
+            quantiles=DEFAULT_QUANTILES,
+        )
+
+    def report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Summarize recorded commands.
+
+        Args:
+            top: Limit both lists to this many entries
+
+        Returns:
+            Dict with "programs" (per program and module, by total time, with
+            p50/p95/p99 wall time) and "slowest" (individual invocations,
+            slowest first)
+        """
+        with self._lock:
+            stats = sorted(self._stats.values(), key=lambda s: -s.total_seconds)
+            slowest = [sample for _, _, sample in sorted(self._slowest, reverse=True)]
+
+        programs = []
+        for s in stats[:top] if top else stats:
+            quantiles = self._duration_histogram({"program": s.program, "module": s.module})
+            programs.append(
+                dict(
+                    asdict(s),
+                    mean_seconds=s.mean_seconds,
+                    **{
+                        f"p{round(q * 100)}_seconds": value
+                        for q, value in quantiles.get_quantiles().items()
+                    },
+                )
+            )
+        return {
+            "total_seconds": sum(s.total_seconds for s in stats),
+            "commands": sum(s.count for s in stats),
+            "programs": programs,
+            "slowest": [asdict(s) for s in (slowest[:top] if top else slowest)],
+        }
+
+    def save(self, path: Path) -> None:
+        """
+        Write the report as JSON.
+
+        Args:
+            path: Output file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+# Global profiler instance
+_profiler = CommandProfiler()
+
+
+def get_command_profiler() -> CommandProfiler:
+    """Get global command profiler."""
+    return _profiler
@@ -12,9 +12,14 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from configurator.observability.log_store import LogStore, SegmentedFileHandler
+
 # Thread-safe context variable for correlation ID
 correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
 
+# Fields indexed in sealed log segments
+INDEXED_FIELDS = ("level", "correlation_id")
+
 
 class StructuredLogger:
     """
@@ -45,9 +50,9 @@ class StructuredLogger:
         self.logger.setLevel(level)
         self.name = name
 
-        # Add JSON formatter
+        # Add JSON formatter; the file is sealed into indexed segments daily
         if log_file:
-            handler = logging.FileHandler(log_file)
+            handler = SegmentedFileHandler(LogStore(log_file, INDEXED_FIELDS))
             handler.setFormatter(JSONFormatter())
             self.logger.addHandler(handler)
 
@@ -145,7 +150,8 @@ class LogAggregator:
     """
     Aggregates logs from multiple sources.
 
-    Can parse and analyze log files.
+    Can parse and analyze log files. Queries go through a LogStore, so they
+    read the active file backwards and use the indexes of sealed segments.
     """
 
     def __init__(self, log_file: Any):
@@ -153,6 +159,7 @@ class LogAggregator:
         if isinstance(log_file, str):
             log_file = Path(log_file)
         self.log_file = log_file
+        self.store = LogStore(log_file, INDEXED_FIELDS)
 
     def get_logs(
         self,
@@ -169,33 +176,12 @@ class LogAggregator:
             limit: Maximum number of logs to return
 
         Returns:
-            List of log dictionaries
+            The most recent matching log dictionaries, oldest first
         """
-        logs = []
-
-        if not self.log_file.exists():
-            return logs
-
-        with open(self.log_file, "r") as f:
-            for line in f:
-                try:
-                    log_entry = json.loads(line)
-
-                    # Apply filters
-                    if level and log_entry.get("level") != level:
-                        continue
-                    if correlation_id and log_entry.get("correlation_id") != correlation_id:
-                        continue
-
-                    logs.append(log_entry)
-
-                    if len(logs) >= limit:
-                        break
-
-                except json.JSONDecodeError:
-                    continue
-
-        return logs
+        entries = self.store.query(
+            limit=limit, level=level or None, correlation_id=correlation_id or None
+        )
+        return list(reversed(entries))
 
     def get_logs_by_correlation_id(self, correlation_id: str) -> list[Dict[str, Any]]:
         """
@@ -224,33 +210,11 @@ class LogAggregator:
         cutoff = datetime.utcnow() - timedelta(hours=hours)
         error_counts: Dict[str, int] = {}
 
-        if not self.log_file.exists():
-            return error_counts
-
-        with open(self.log_file, "r") as f:
-            for line in f:
-                try:
-                    log_entry = json.loads(line)
-
-                    # Only errors
-                    if log_entry.get("level") not in ("ERROR", "CRITICAL"):
-                        continue
-
-                    # Check timestamp
-                    try:
-                        log_time = datetime.fromisoformat(log_entry["timestamp"].replace("Z", ""))
-                        if log_time < cutoff:
-                            continue
-                    except (ValueError, KeyError):
-                        continue
-
-                    # Count by message prefix
-                    message = log_entry.get("message", "Unknown")
-                    error_type = message.split(":")[0] if ":" in message else message[:50]
-
-                    error_counts[error_type] = error_counts.get(error_type, 0) + 1
+        for log_entry in self.store.iter_entries(start=cutoff, level=("ERROR", "CRITICAL")):
+            # Count by message prefix
+            message = log_entry.get("message", "Unknown")
+            error_type = message.split(":")[0] if ":" in message else message[:50]
 
-                except json.JSONDecodeError:
-                    continue
+            error_counts[error_type] = error_counts.get(error_type, 0) + 1
 
         return error_counts
@@ -0,0 +1,275 @@
+"""
+Tracing spans for installation runs.
+
+Records nested spans (installer phase -> batch -> module -> stage ->
+command) with the thread they ran on into a fixed-size ring buffer, and
+exports them as Chrome Trace Event JSON, which chrome://tracing and
+https://ui.perfetto.dev open directly.
+
+Tracing is disabled by default. A disabled tracer hands out one shared
+no-op span, so instrumented code pays only an attribute check per span.
+
+Usage:
+    tracer = get_tracer()
+    tracer.enable()
+
+    with tracer.span("docker", "module"):
+        with tracer.span("configure", "stage", module="docker") as span:
+            span.set(steps=3)
+
+    tracer.export_chrome(Path("trace.json"))
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from configurator.constants import LOG_DIR
+
+# Spans kept in the ring buffer; older spans are dropped first
+DEFAULT_CAPACITY = 65536
+
+# Where the installer saves the trace of its last traced run
+DEFAULT_TRACE_FILE = LOG_DIR / "trace.json"
+
+
+@dataclass
+class Span:
+    """A finished span."""
+
+    name: str
+    category: str
+    start_ns: int
+    end_ns: int
+    thread_id: int
+    thread_name: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds."""
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class _NoopSpan:
+    """Span handed out while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class ActiveSpan:
+    """Span being recorded; finishes when its with-block exits."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start_ns")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> "ActiveSpan":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+
+        thread = threading.current_thread()
+        self.tracer.record(
+            Span(
+                name=self.name,
+                category=self.category,
+                start_ns=self.start_ns,
+                end_ns=end_ns,
+                thread_id=threading.get_native_id(),
+                thread_name=thread.name,
+                args=self.args,
+            )
+        )
+
+    def set(self, **args: Any) -> None:
+        """Attach arguments to the span (shown in the trace viewer)."""
+        self.args.update(args)
+
+
+class Tracer:
+    """
+    Collects spans into a ring buffer.
+
+    Spans nest by time on each thread, which is how trace viewers draw
+    them; no parent bookkeeping is needed.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = False):
+        """
+        Initialize tracer.
+
+        Args:
+            capacity: Maximum spans kept
+            enabled: Start recording immediately
+        """
+        self.enabled = enabled
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._recorded = 0
+        self._epoch_ns = time.perf_counter_ns()
+        self._started_at = datetime.now()
+
+    def enable(self, capacity: Optional[int] = None) -> None:
+        """
+        Start recording spans, discarding earlier ones.
+
+        Args:
+            capacity: New ring buffer size (keeps the current size if None)
+        """
+        self._spans = deque(maxlen=capacity or self._spans.maxlen)
+        self._recorded = 0
+        self._epoch_ns = time.perf_counter_ns()
+        self._started_at = datetime.now()
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop recording spans; recorded spans are kept for export."""
+        self.enabled = False
+
+    def span(self, name: str, category: str = "", **args: Any) -> Any:
+        """
+        Create a span for a with-block.
+
+        Args:
+            name: Span name (e.g. module name or command)
+            category: Span category (phase, batch, module, stage, command)
+            **args: Arguments shown with the span
+
+        Returns:
+            Context manager; a shared no-op span while tracing is disabled
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        return ActiveSpan(self, name, category, args)
+
+    def record(self, span: Span) -> None:
+        """Add a finished span to the ring buffer."""
+        self._spans.append(span)
+        self._recorded += 1
+
+    @property
+    def dropped(self) -> int:
+        """Number of spans pushed out of the ring buffer."""
+        return max(0, self._recorded - len(self._spans))
+
+    def spans(self) -> List[Span]:
+        """Snapshot of recorded spans, oldest first."""
+        return list(self._spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Convert recorded spans to Chrome Trace Event format.
+
+        Returns:
+            Trace dictionary with complete ("X") events and thread names
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": 0,
+                "args": {"name": "vps-configurator"},
+            }
+        ]
+
+        threads: Dict[int, str] = {}
+        for span in self.spans():
+            threads.setdefault(span.thread_id, span.thread_name)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start_ns - self._epoch_ns) / 1000,
+                    "dur": (span.end_ns - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": span.args,
+                }
+            )
+
+        for thread_id, thread_name in threads.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": {"name": thread_name},
+                }
+            )
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "started_at": self._started_at.isoformat(),
+                "dropped_spans": self.dropped,
+            },
+        }
+
+    def export_chrome(self, path: Path) -> None:
+        """
+        Write recorded spans as Chrome Trace JSON.
+
+        Args:
+            path: Output file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+
+def load_chrome_trace(path: Path) -> List[Dict[str, Any]]:
+    """
+    Load the complete events of a Chrome Trace JSON file.
+
+    Args:
+        path: Trace file written by Tracer.export_chrome
+
+    Returns:
+        Span events ("ph": "X"), each with name, cat, ts, dur and args
+    """
+    with open(path) as f:
+        data = json.load(f)
+
+    events = data.get("traceEvents", []) if isinstance(data, dict) else data
+    return [event for event in events if event.get("ph") == "X"]
+
+
+# Global tracer instance
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get global tracer."""
+    return _tracer
@@ -0,0 +1,228 @@
+"""
+Keyed store of trusted download checksums.
+
+The checksum database records the SHA256 of every URL downloaded without a
+pinned checksum (trust on first use). It keeps its append-only
+``URL|CHECKSUM|TIMESTAMP`` line format, so existing databases and tools
+keep working, but lookups no longer scan the file:
+
+- The file is parsed once into a dict keyed by URL. Later calls only read
+  lines appended since (by this or another process); the file is parsed
+  again only if it was replaced.
+- The first checksum recorded for a URL is the trusted one. Duplicate
+  lines are dropped when the file is compacted, which writes do once the
+  duplicates outnumber the URLs.
+- import_entries() records many checksums with one write, e.g. pinned
+  checksums from tools/update_checksums.py.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from configurator.core.package_cache import file_fingerprint
+from configurator.utils.file_lock import file_lock
+
+# Compaction is not worth it for a handful of duplicates
+MIN_DUPLICATES_TO_COMPACT = 64
+
+
+@dataclass
+class ChecksumEntry:
+    """Trusted checksum of a URL."""
+
+    url: str
+    checksum: str
+    recorded_at: str
+
+    def to_line(self) -> str:
+        return f"{self.url}|{self.checksum}|{self.recorded_at}\n"
+
+
+class ChecksumStore:
+    """
+    URL -> checksum database with constant-time lookups.
+
+    Usage:
+        store = ChecksumStore(Path("/etc/vps-configurator/checksums.db"))
+        if store.get(url) is None:
+            store.add(url, checksum)
+    """
+
+    def __init__(self, path: Path, logger: Optional[logging.Logger] = None):
+        """
+        Initialize checksum store.
+
+        Args:
+            path: Database file (created on first write)
+            logger: Logger instance
+        """
+        self.path = Path(path)
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, ChecksumEntry] = {}
+        self._duplicates = 0
+        # Fingerprint of the file and how far it has been read
+        self._fingerprint: Optional[Tuple[int, int, int]] = None
+        self._inode: Optional[int] = None
+        self._offset = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Trusted checksum of a URL.
+
+        Args:
+            url: Source URL
+
+        Returns:
+            Checksum if recorded, None otherwise
+        """
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(url)
+            return entry.checksum if entry else None
+
+    def add(self, url: str, checksum: str) -> bool:
+        """
+        Record the checksum of a URL unless one is already recorded.
+
+        Args:
+            url: Source URL
+            checksum: SHA256 checksum
+
+        Returns:
+            True if recorded, False if the URL already had a checksum
+        """
+        return self.import_entries([(url, checksum)]) == 1
+
+    def import_entries(self, entries: Iterable[Tuple[str, str]], replace: bool = False) -> int:
+        """
+        Record many checksums at once.
+
+        Args:
+            entries: (url, checksum) pairs
+            replace: Overwrite checksums already recorded (for verified,
+                pinned checksums); otherwise the first recorded one is kept
+
+        Returns:
+            Number of checksums recorded or changed
+        """
+        recorded_at = datetime.now().isoformat()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, file_lock(str(self.path)):
+            self._refresh()
+
+            new = []
+            changed = False
+            for url, checksum in entries:
+                current = self._entries.get(url)
+                if current is not None and (not replace or current.checksum == checksum):
+                    continue
+                changed = changed or current is not None
+                entry = ChecksumEntry(url, checksum, recorded_at)
+                self._entries[url] = entry
+                new.append(entry)
+
+            if changed or self._duplicates >= max(len(self._entries), MIN_DUPLICATES_TO_COMPACT):
+                # Appending would leave a replaced checksum first in the file
+                self._rewrite()
+            elif new:
+                self._append(new)
+            return len(new)
+
+    def compact(self) -> int:
+        """
+        Rewrite the database with one line per URL.
+
+        Returns:
+            Number of duplicate lines removed
+        """
+        with self._lock, file_lock(str(self.path)):
+            self._refresh()
+            removed = self._duplicates
+            if removed:
+                self._rewrite()
+            return removed
+
+    def _refresh(self) -> None:
+        """Read lines appended since the last call (caller holds the lock)"""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            self._entries.clear()
+            self._duplicates = 0
+            self._fingerprint, self._inode, self._offset = None, None, 0
+            return
+
+        fingerprint = file_fingerprint(stat)
+        if fingerprint == self._fingerprint:
+            return
+        if stat.st_ino != self._inode or stat.st_size <= self._offset:
+            # New or replaced file
+            self._entries.clear()
+            self._duplicates = 0
+            self._offset = 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+
+        # Leave a partially written last line for the next read
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8", errors="replace").splitlines():
+            parts = line.strip().split("|")
+            if len(parts) < 2 or not parts[0]:
+                continue
+            if parts[0] in self._entries:
+                self._duplicates += 1
+                continue
+            self._entries[parts[0]] = ChecksumEntry(
+                parts[0], parts[1], parts[2] if len(parts) > 2 else ""
+            )
+
+        self._offset += len(complete)
+        self._inode = stat.st_ino
+        self._fingerprint = fingerprint if len(complete) == len(data) else None
+
+    def _append(self, entries: Iterable[ChecksumEntry]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = "".join(entry.to_line() for entry in entries).encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+        # Our own lines need not be read back
+        stat = self.path.stat()
+        if self._inode in (None, stat.st_ino) and self._offset + len(data) == stat.st_size:
+            self._inode = stat.st_ino
+            self._offset = stat.st_size
+            self._fingerprint = file_fingerprint(stat)
+
+    def _rewrite(self) -> None:
+        """Replace the file with one line per URL, first recorded first"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(entry.to_line() for entry in self._entries.values())
+            if self.path.exists():
+                os.chmod(tmp_path, self.path.stat().st_mode & 0o777)
+            os.replace(tmp_path, self.path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        removed, self._duplicates = self._duplicates, 0
+        stat = self.path.stat()
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+        self._fingerprint = file_fingerprint(stat)
+        if removed:
+            self.logger.debug(f"Compacted {self.path}: {removed} duplicate entries removed")
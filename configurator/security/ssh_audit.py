@@ -5,13 +5,14 @@ This module provides audit logging for SSH key operations,
 integrating with the core audit system.
 """
 
-import json
 import logging
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from configurator.core.audit_writer import get_audit_writer
+
 
 class SSHAuditEvent(Enum):
     """SSH-related audit event types."""
@@ -29,6 +30,10 @@ class SSHAuditEvent(Enum):
     EXPIRING_KEY_DETECTED = "ssh_expiring_key_detected"
 
 
+# Scan findings, which can be numerous; other events are written durably
+BATCHED_EVENTS = {SSHAuditEvent.STALE_KEY_DETECTED, SSHAuditEvent.EXPIRING_KEY_DETECTED}
+
+
 class SSHAuditLogger:
     """
     Audit logger for SSH key operations.
@@ -82,8 +87,8 @@ class SSHAuditLogger:
         }
 
         try:
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            # Key and configuration changes are durable; scan findings are batched
+            get_audit_writer().write(self.log_path, entry, durable=event_type not in BATCHED_EVENTS)
         except (PermissionError, OSError) as e:
             self.logger.warning(f"Cannot write to SSH audit log: {e}")
 
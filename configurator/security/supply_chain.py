@@ -20,10 +20,20 @@ import urllib.parse
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
+import requests
 import yaml
 
+from configurator.exceptions import NetworkError
+from configurator.security.checksum_store import ChecksumStore
+from configurator.utils.download import download
+from configurator.utils.network import fetch_file
+
+if TYPE_CHECKING:
+    from configurator.core.artifact_cache import ArtifactCacheManager
+    from configurator.core.git_cache import GitMirrorCache
+
 
 @dataclass
 class TrustedSource:
@@ -138,6 +148,8 @@ class SupplyChainValidator:
             )
         )
 
+        self._checksum_store: Optional[ChecksumStore] = None
+
         # Load YAML checksum database
         self.checksums = self._load_checksums()
 
@@ -282,17 +294,20 @@ class SupplyChainValidator:
         """
         sha256 = hashlib.sha256()
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
                 sha256.update(chunk)
         return sha256.hexdigest()
 
-    def verify_checksum(self, filepath: Path, expected_checksum: str) -> bool:
+    def verify_checksum(
+        self, filepath: Path, expected_checksum: str, actual_checksum: Optional[str] = None
+    ) -> bool:
         """
         Verify file checksum.
 
         Args:
             filepath: Path to file
             expected_checksum: Expected SHA256 hex digest
+            actual_checksum: SHA256 of the file if already known (skips rehashing)
 
         Returns:
             bool: True if checksum matches
@@ -305,7 +320,7 @@ class SupplyChainValidator:
             return True
 
         try:
-            actual = self.compute_checksum(filepath)
+            actual = actual_checksum or self.compute_checksum(filepath)
             matches = actual.lower() == expected_checksum.lower()
 
             if not matches:
@@ -483,22 +498,24 @@ class SupplyChainValidator:
             self.logger.error(f"Supply chain: Signature verification failed: {e}")
             return False
 
+    @property
+    def checksum_store(self) -> ChecksumStore:
+        """Keyed store of the checksum database at checksum_db_path"""
+        if self._checksum_store is None or self._checksum_store.path != self.checksum_db_path:
+            self._checksum_store = ChecksumStore(self.checksum_db_path, self.logger)
+        return self._checksum_store
+
     def store_checksum(self, url: str, checksum: str):
         """
         Store checksum in database.
 
+        The first checksum stored for a URL is kept.
+
         Args:
             url: Source URL
             checksum: SHA256 checksum
         """
-        if not self.checksum_db_path.exists():
-            self.checksum_db_path.parent.mkdir(parents=True, exist_ok=True)
-            self.checksum_db_path.touch()
-
-        # Simple append-based database (URL|CHECKSUM|TIMESTAMP)
-        with open(self.checksum_db_path, "a") as f:
-            timestamp = datetime.now().isoformat()
-            f.write(f"{url}|{checksum}|{timestamp}\n")
+        self.checksum_store.add(url, checksum)
 
     def lookup_checksum(self, url: str) -> Optional[str]:
         """
@@ -510,16 +527,7 @@ class SupplyChainValidator:
         Returns:
             Optional[str]: Checksum if found, None otherwise
         """
-        if not self.checksum_db_path.exists():
-            return None
-
-        with open(self.checksum_db_path, "r") as f:
-            for line in f:
-                parts = line.strip().split("|")
-                if len(parts) >= 2 and parts[0] == url:
-                    return parts[1]
-
-        return None
+        return self.checksum_store.get(url)
 
     def validate_download(
         self,
@@ -527,15 +535,20 @@ class SupplyChainValidator:
         filepath: Path,
         expected_checksum: Optional[str] = None,
         signature_path: Optional[Path] = None,
+        actual_checksum: Optional[str] = None,
     ) -> bool:
         """
         Validate downloaded file.
 
+        The file is hashed once; callers that hashed it while downloading
+        (such as the artifact cache) pass actual_checksum to skip hashing.
+
         Args:
             url: Source URL
             filepath: Downloaded file path
             expected_checksum: Expected SHA256 (optional, will lookup in DB)
             signature_path: Path to GPG signature (optional)
+            actual_checksum: SHA256 of the file if already known
 
         Returns:
             bool: True if validation passed
@@ -548,17 +561,17 @@ class SupplyChainValidator:
             return False
 
         # Compute checksum
-        actual_checksum = self.compute_checksum(filepath)
+        actual_checksum = actual_checksum or self.compute_checksum(filepath)
 
         # Verify checksum
         if expected_checksum:
-            if not self.verify_checksum(filepath, expected_checksum):
+            if not self.verify_checksum(filepath, expected_checksum, actual_checksum):
                 return False
         else:
             # Try lookup
             stored_checksum = self.lookup_checksum(url)
             if stored_checksum:
-                if not self.verify_checksum(filepath, stored_checksum):
+                if not self.verify_checksum(filepath, stored_checksum, actual_checksum):
                     return False
             else:
                 # First download, store checksum
@@ -620,19 +633,31 @@ class SecureDownloader:
     """
     Secure downloader with supply chain validation.
 
-    Wraps download operations with automatic validation.
+    Wraps download operations with automatic validation. With an artifact
+    cache, downloads are served from the cache and validated against the
+    hash recorded when they were first downloaded.
     """
 
-    def __init__(self, validator: SupplyChainValidator, logger: logging.Logger):
+    def __init__(
+        self,
+        validator: SupplyChainValidator,
+        logger: logging.Logger,
+        artifact_cache: Optional["ArtifactCacheManager"] = None,
+        git_cache: Optional["GitMirrorCache"] = None,
+    ):
         """
         Initialize secure downloader.
 
         Args:
             validator: Supply chain validator
             logger: Logger instance
+            artifact_cache: Cache for downloaded artifacts
+            git_cache: Local mirrors that git clones are served from
         """
         self.validator = validator
         self.logger = logger
+        self.artifact_cache = artifact_cache
+        self.git_cache = git_cache
 
     def download_file(
         self,
@@ -658,29 +683,15 @@ class SecureDownloader:
             self.logger.error(f"Secure download: URL validation failed: {url}")
             return False
 
-        # Download using curl/wget
+        if self.artifact_cache is not None and not verify_signature:
+            return self._fetch_cached(url, destination, expected_checksum) is not None
+
+        # Download in parallel ranges, resuming interrupted downloads
         try:
-            subprocess.run(
-                ["curl", "-L", "-o", str(destination), url],
-                check=True,
-                capture_output=True,
-                timeout=300,
-            )
-        except subprocess.CalledProcessError as e:
+            result = fetch_file(url, destination)
+        except NetworkError as e:
             self.logger.error(f"Secure download: Download failed: {e}")
             return False
-        except FileNotFoundError:
-            # Fallback to wget
-            try:
-                subprocess.run(
-                    ["wget", "-O", str(destination), url],
-                    check=True,
-                    capture_output=True,
-                    timeout=300,
-                )
-            except Exception as e:
-                self.logger.error(f"Secure download: Download failed (wget): {e}")
-                return False
 
         # Download signature if requested
         signature_path = None
@@ -688,18 +699,15 @@ class SecureDownloader:
             signature_url = f"{url}.asc"
             signature_path = destination.with_suffix(destination.suffix + ".asc")
             try:
-                subprocess.run(
-                    ["curl", "-L", "-o", str(signature_path), signature_url],
-                    check=True,
-                    capture_output=True,
-                    timeout=60,
-                )
-            except Exception:
+                download(signature_url, signature_path, segments=1)
+            except (requests.RequestException, OSError):
                 self.logger.warning(f"Secure download: Signature not available: {signature_url}")
                 signature_path = None
 
-        # Validate
-        if self.validator.validate_download(url, destination, expected_checksum, signature_path):
+        # Validate (the file was hashed while downloading)
+        if self.validator.validate_download(
+            url, destination, expected_checksum, signature_path, actual_checksum=result.sha256
+        ):
             self.logger.info(f"Secure download: Successfully downloaded and validated {url}")
             return True
         else:
@@ -708,6 +716,27 @@ class SecureDownloader:
             destination.unlink(missing_ok=True)
             return False
 
+    def _fetch_cached(
+        self, url: str, destination: Optional[Path], expected_checksum: Optional[str]
+    ) -> Optional[Path]:
+        """Fetch through the artifact cache; returns None if download or validation failed"""
+        from configurator.core.artifact_cache import ArtifactVerificationError
+
+        if self.artifact_cache is None:
+            return None
+
+        try:
+            path = self.artifact_cache.fetch(url, destination, expected_checksum, self.validator)
+        except ArtifactVerificationError as e:
+            self.logger.error(f"Secure download: Validation failed: {e}")
+            return None
+        except OSError as e:
+            self.logger.error(f"Secure download: Download failed: {e}")
+            return None
+
+        self.logger.info(f"Secure download: Successfully downloaded and validated {url}")
+        return path
+
     def download_script(
         self, url: str, destination: Path, expected_checksum: Optional[str] = None
     ) -> bool:
@@ -753,23 +782,31 @@ class SecureDownloader:
 
         self.logger.info(f"Cloning: {url}")
 
-        # Build git clone command
-        cmd = ["git", "clone"]
-        if depth:
-            cmd.extend(["--depth", str(depth)])
-        cmd.extend([url, str(dest_path)])
+        if self.git_cache is not None:
+            from configurator.core.git_cache import GitCacheError
 
-        try:
-            subprocess.run(cmd, check=True, capture_output=True, timeout=300)
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Git clone failed: {e.stderr.decode()}")
+            try:
+                self.git_cache.clone(url, dest_path, depth=depth or None, commit=commit)
+            except GitCacheError as e:
+                raise Exception(f"Git clone failed: {e}")
+        else:
+            # Build git clone command
+            cmd = ["git", "clone"]
+            if depth:
+                cmd.extend(["--depth", str(depth)])
+            cmd.extend([url, str(dest_path)])
+
+            try:
+                subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+            except subprocess.CalledProcessError as e:
+                raise Exception(f"Git clone failed: {e.stderr.decode()}")
 
         # Checkout and verify specific commit if provided
         if commit:
             self.logger.info(f"Checking out commit: {commit[:8]}...")
 
-            # Fetch if shallow clone
-            if depth:
+            # Fetch if shallow clone (mirrors already hold the pinned commit)
+            if depth and self.git_cache is None:
                 try:
                     subprocess.run(
                         ["git", "-C", str(dest_path), "fetch", "--depth=1", "origin", commit],
@@ -825,13 +862,20 @@ class SecureDownloader:
         Returns:
             Path: Path to extracted directory
         """
-        # Download to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".archive") as tmp:
-            tmp_path = Path(tmp.name)
+        tmp_path = None
+        if self.artifact_cache is not None:
+            # Extract straight from the cache instead of a temporary copy
+            archive_path = None
+            if self.validator.validate_url(url):
+                archive_path = self._fetch_cached(url, None, checksum)
+        else:
+            # Download to temp file
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".archive") as tmp:
+                tmp_path = Path(tmp.name)
+            archive_path = tmp_path if self.download_file(url, tmp_path, checksum) else None
 
         try:
-            # Download with verification
-            if not self.download_file(url, tmp_path, checksum):
+            if archive_path is None:
                 raise SecurityError(
                     what=f"Download verification failed for {url}",
                     why="Checksum mismatch or download error",
@@ -853,11 +897,15 @@ class SecureDownloader:
 
             if archive_type == "tar.gz":
                 subprocess.run(
-                    ["tar", "-xzf", str(tmp_path), "-C", str(dest_path)], check=True, timeout=120
+                    ["tar", "-xzf", str(archive_path), "-C", str(dest_path)],
+                    check=True,
+                    timeout=120,
                 )
             elif archive_type == "zip":
                 subprocess.run(
-                    ["unzip", "-q", str(tmp_path), "-d", str(dest_path)], check=True, timeout=120
+                    ["unzip", "-q", str(archive_path), "-d", str(dest_path)],
+                    check=True,
+                    timeout=120,
                 )
 
             self.logger.info(f"✅ Extracted to: {dest_path}")
@@ -865,5 +913,5 @@ class SecureDownloader:
 
         finally:
             # Clean up temp file
-            if tmp_path.exists():
+            if tmp_path is not None and tmp_path.exists():
                 tmp_path.unlink()
@@ -14,6 +14,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from configurator.core.audit_writer import get_audit_writer
+
 
 class UserStatus(Enum):
     """User account status."""
@@ -37,6 +39,15 @@ class LifecycleEvent(Enum):
     OFFBOARDED = "offboarded"
 
 
+# Events written to the audit log durably (fsynced before returning)
+DURABLE_LIFECYCLE_EVENTS = {
+    LifecycleEvent.ROLE_CHANGED,
+    LifecycleEvent.SUSPENDED,
+    LifecycleEvent.REACTIVATED,
+    LifecycleEvent.OFFBOARDED,
+}
+
+
 @dataclass
 class UserProfile:
     """Complete user profile with lifecycle metadata."""
@@ -760,7 +771,12 @@ class UserLifecycleManager:
     def _audit_log(
         self, event: LifecycleEvent, username: str, performed_by: str, details: Dict = None
     ):
-        """Log lifecycle event for audit."""
+        """
+        Log lifecycle event for audit.
+
+        Events that revoke or change access are written durably; the others
+        are batched by the shared audit writer.
+        """
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "event": event.value,
@@ -770,7 +786,8 @@ class UserLifecycleManager:
         }
 
         try:
-            with open(self.AUDIT_LOG, "a") as f:
-                f.write(json.dumps(log_entry) + "\n")
+            get_audit_writer().write(
+                self.AUDIT_LOG, log_entry, durable=event in DURABLE_LIFECYCLE_EVENTS
+            )
         except Exception as e:
             self.logger.error(f"Failed to write audit log: {e}")
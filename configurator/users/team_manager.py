@@ -12,6 +12,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from configurator.core.audit_writer import get_audit_writer
+
 
 class TeamStatus(Enum):
     """Team status."""
@@ -152,6 +154,9 @@ class TeamManager:
     SHARED_DIRS_BASE = Path("/var/projects")
     AUDIT_LOG = Path("/var/log/team-audit.log")
 
+    # Actions written to the audit log durably (fsynced before returning)
+    DURABLE_AUDIT_ACTIONS = {"remove_member", "delete_team"}
+
     def __init__(
         self,
         registry_file: Optional[Path] = None,
@@ -556,11 +561,12 @@ class TeamManager:
         return True
 
     def _audit_log(self, action: str, **details):
-        """Log team action for audit."""
+        """Log team action for audit (removals are written durably)."""
         log_entry = {"timestamp": datetime.now().isoformat(), "action": action, **details}
 
         try:
-            with open(self.AUDIT_LOG, "a") as f:
-                f.write(json.dumps(log_entry) + "\n")
+            get_audit_writer().write(
+                self.AUDIT_LOG, log_entry, durable=action in self.DURABLE_AUDIT_ACTIONS
+            )
         except Exception as e:
             self.logger.error(f"Failed to write audit log: {e}")
@@ -10,6 +10,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from configurator.core.audit_writer import get_audit_writer
+
 
 class AccessType(Enum):
     """Types of temporary access."""
@@ -150,6 +152,9 @@ class TempAccessManager:
     EXTENSIONS_FILE = Path("/var/lib/debian-vps-configurator/temp-access/extensions.json")
     AUDIT_LOG = Path("/var/log/temp-access-audit.log")
 
+    # Actions written to the audit log durably (fsynced before returning)
+    DURABLE_AUDIT_ACTIONS = {"grant_access", "revoke_access", "approve_extension"}
+
     def __init__(
         self,
         registry_file: Optional[Path] = None,
@@ -573,11 +578,12 @@ class TempAccessManager:
         return [e for e in self.extensions.values() if e.status == ExtensionStatus.PENDING]
 
     def _audit_log(self, action: str, **details):
-        """Log temporary access action."""
+        """Log temporary access action (grants and revocations are written durably)."""
         log_entry = {"timestamp": datetime.now().isoformat(), "action": action, **details}
 
         try:
-            with open(self.AUDIT_LOG, "a") as f:
-                f.write(json.dumps(log_entry) + "\n")
+            get_audit_writer().write(
+                self.AUDIT_LOG, log_entry, durable=action in self.DURABLE_AUDIT_ACTIONS
+            )
         except Exception as e:
             self.logger.error(f"Failed to write audit log: {e}")
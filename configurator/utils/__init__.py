@@ -3,7 +3,14 @@ Utility functions for the configurator.
 """
 
 from configurator.utils.command import CommandResult, run_command, run_command_with_output
-from configurator.utils.file import backup_file, ensure_dir, restore_file, write_file
+from configurator.utils.file import (
+    HashingWriter,
+    backup_file,
+    ensure_dir,
+    link_or_copy,
+    restore_file,
+    write_file,
+)
 from configurator.utils.network import check_internet, download_file, get_public_ip
 from configurator.utils.system import (
     get_architecture,
@@ -24,6 +31,8 @@ __all__ = [
     "restore_file",
     "write_file",
     "ensure_dir",
+    "link_or_copy",
+    "HashingWriter",
     # Network utilities
     "check_internet",
     "download_file",
@@ -3,11 +3,12 @@ Integration between PackageCacheManager and system APT cache.
 """
 
 import logging
-import shutil
 from pathlib import Path
 from typing import List, Optional
 
-from configurator.core.package_cache import PackageCacheManager
+from configurator.core.package_cache import PackageCacheManager, parse_deb_filename
+from configurator.utils.deb_prefetch import resolve_downloads
+from configurator.utils.file import link_or_copy
 
 
 class AptCacheIntegration:
@@ -24,7 +25,12 @@ class AptCacheIntegration:
 
     def prepare_apt_cache(self, package_names: List[str]) -> int:
         """
-        Copy cached packages to APT's archive directory to avoid re-downloading.
+        Link cached packages into APT's archive directory to avoid re-downloading.
+
+        APT resolves the exact archives (name, version, arch) it is about to
+        download and only those are restored, under the filename APT expects.
+        Packages are hardlinked (or reflinked) from the cache and only copied
+        when the cache lives on another filesystem.
 
         Args:
             package_names: List of package names to check in cache
@@ -36,33 +42,44 @@ class AptCacheIntegration:
             self.logger.warning(f"APT archives directory not found: {self.APT_ARCHIVES_DIR}")
             return 0
 
+        downloads = resolve_downloads(package_names, self.logger)
+        if downloads is None:
+            # APT could not resolve the set (e.g. a package from a repository
+            # that is not added yet), fall back to every cached version
+            return self._restore_cached_versions(package_names)
+
         restored_count = 0
 
-        # We need to find matching packages in our cache
-        # Since we only have names, we'll have to look for latest versions or
-        # just any version that matches.
-        # But APT is picky about versions. if we put the wrong version, APT will ignore it
-        # or error if it expects a specific version.
+        for download in downloads:
+            source_path = self.cache_manager.get_package(
+                download.package_name, download.version, download.arch
+            )
+            if not source_path:
+                continue
 
-        # Strategy:
-        # Ideally, we would know the exact version APT wants.
-        # Without querying `apt-cache policy`, we can't be sure what version will be installed.
-        # However, for a bandwidth optimization, we can try to restore what we have.
-        # If APT downloads a newer version, so be it.
+            if source_path.stat().st_size != download.size:
+                self.logger.debug(f"Cached {download.filename} differs from the repository")
+                continue
 
-        # We'll iterate through our cache and see if we have any of the requested packages
-        # This is a bit naive if there are multiple versions, but effective for exact matches.
+            try:
+                link_or_copy(source_path, self.APT_ARCHIVES_DIR / download.filename)
+                restored_count += 1
+                self.logger.debug(f"Restored to APT cache: {download.filename}")
+            except Exception as e:
+                self.logger.warning(f"Failed to restore {download.filename} to APT cache: {e}")
 
-        # Optimization: Create a lookup from simple package name to cached entries
-        # detailed lookup needed?
+        if restored_count > 0:
+            self.logger.info(f"Restored {restored_count} packages to APT cache")
 
-        # For now, let's just restore *all* versions we have for the requested packages.
-        # APT will pick the one it needs if the hash matches what it expects.
+        return restored_count
 
-        cached_packages = self.cache_manager.list_packages()
+    def _restore_cached_versions(self, package_names: List[str]) -> int:
+        """Restore all cached versions of the requested packages; APT picks what it needs."""
+        restored_count = 0
+        wanted = set(package_names)
 
-        for pkg in cached_packages:
-            if pkg.name in package_names:
+        for pkg in self.cache_manager.list_packages():
+            if pkg.name in wanted:
                 source_path = self.cache_manager.cache_dir / pkg.filename
                 dest_path = self.APT_ARCHIVES_DIR / pkg.original_filename
 
@@ -74,13 +91,11 @@ class AptCacheIntegration:
 
                 try:
                     if source_path.exists():
-                        shutil.copy2(source_path, dest_path)
-                        # Ensure root ownership if possible (running as root usually)
-                        # os.chown(dest_path, 0, 0)
+                        method = link_or_copy(source_path, dest_path)
                         restored_count += 1
-                        self.logger.debug(f"Restored to APT cache: {pkg.filename}")
+                        self.logger.debug(f"Restored to APT cache ({method}): {pkg.filename}")
                 except Exception as e:
-                    self.logger.warning(f"Failed to copy {pkg.filename} to APT cache: {e}")
+                    self.logger.warning(f"Failed to restore {pkg.filename} to APT cache: {e}")
 
         if restored_count > 0:
             self.logger.info(f"Restored {restored_count} packages to APT cache")
@@ -92,6 +107,8 @@ class AptCacheIntegration:
         Scan APT's archive directory for new .deb files and add them to cache.
         Should be called after apt-get install commands.
 
+        The archives are checked against the cache in one batch.
+
         Returns:
             Number of new packages cached
         """
@@ -100,44 +117,24 @@ class AptCacheIntegration:
 
         captured_count = 0
 
-        # Initial scan of .deb files in APT archives
-        # We exclude partial downloads
-        deb_files = list(self.APT_ARCHIVES_DIR.glob("*.deb"))
+        # name_version_arch.deb, with epochs escaped as %3a; partial downloads
+        # live in a subdirectory and are not matched
+        archives = {}
+        for deb_path in self.APT_ARCHIVES_DIR.glob("*.deb"):
+            parsed = parse_deb_filename(deb_path.name)
+            if parsed:
+                archives[parsed] = deb_path
 
-        for deb_path in deb_files:
+        for name, version, arch in self.cache_manager.missing_packages(list(archives)):
+            deb_path = archives[(name, version, arch)]
             try:
-                # We need to parse package name and version from filename
-                # Standard format: name_version_arch.deb
-                # Example: python3_3.8.2-1ubuntu1_amd64.deb
-                # But sometimes it varies (epoch, etc.)
-
-                # A robust way is to use `dpkg-deb --field` but that requires subprocess
-                # For a pure python approach, we can try filename parsing
-                # name is everything before the first underscore
-
-                filename = deb_path.name
-                parts = filename.split("_")
-
-                if len(parts) >= 2:
-                    name = parts[0]
-                    # version is parts[1] usually
-                    version = parts[1]
-                else:
-                    # Fallback for weird filenames?
-                    # Skip for now to be safe
-                    continue
-
-                # Check if we already have it
-                if self.cache_manager.has_package(name, version):
-                    continue
-
-                # Add to cache
                 # We don't know the original URL, so we put 'local-apt-cache'
                 success = self.cache_manager.add_package(
                     package_name=name,
                     version=version,
                     file_path=deb_path,
                     download_url="local-apt-cache",
+                    arch=arch,
                 )
 
                 if success:
@@ -0,0 +1,219 @@
+"""
+Freshness tracking for APT package indexes.
+
+Records when ``apt-get update`` last succeeded together with a fingerprint
+of the APT sources, so repeated update requests within a TTL can be skipped.
+Adding or changing a repository changes the fingerprint and forces the next
+update, and so does missing or older Release files in the APT lists directory
+(e.g. after ``apt-get clean`` or ``rm -rf /var/lib/apt/lists/*``).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+APT_UPDATE_STATE_FILE = Path("/var/lib/debian-vps-configurator/apt-update.json")
+APT_SOURCES = [Path("/etc/apt/sources.list"), Path("/etc/apt/sources.list.d")]
+APT_LISTS_DIR = Path("/var/lib/apt/lists")
+
+DEFAULT_TTL = 3600  # 1 hour
+
+
+class AptUpdateTracker:
+    """
+    Skips redundant ``apt-get update`` runs.
+
+    Freshness is kept in memory for the current process and in a state file
+    so later runs can reuse recent indexes. A TTL of 0 disables skipping.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        state_file: Path = APT_UPDATE_STATE_FILE,
+        sources: Optional[List[Path]] = None,
+        logger: Optional[logging.Logger] = None,
+        prepare_sources: Optional[Callable[[], None]] = None,
+        lists_dir: Path = APT_LISTS_DIR,
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            ttl: Seconds an update stays fresh
+            state_file: File persisting the last update
+            sources: APT source files and directories to fingerprint
+            logger: Logger instance
+            prepare_sources: Called once before the first update that runs,
+                e.g. to switch to the fastest mirror
+            lists_dir: Directory apt-get update downloads the indexes to
+        """
+        self.ttl = ttl
+        self.state_file = Path(state_file)
+        self.sources = sources if sources is not None else list(APT_SOURCES)
+        self.logger = logger or logging.getLogger(__name__)
+        self._prepare_sources = prepare_sources
+        self.lists_dir = Path(lists_dir)
+
+        self._lock = threading.RLock()
+        self._updated_at: Optional[float] = None
+        self._fingerprint: Optional[str] = None
+        self._lists_mtime: Optional[float] = None
+        self._load_state()
+
+    def sources_fingerprint(self) -> str:
+        """
+        Fingerprint the APT sources by path, size and modification time.
+
+        Directories contribute their own mtime (files added or removed) and
+        every file directly inside them.
+        """
+        digest = hashlib.sha256()
+
+        for source in self.sources:
+            paths = [source]
+            if source.is_dir():
+                paths.extend(sorted(p for p in source.iterdir() if p.is_file()))
+
+            for path in paths:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+        return digest.hexdigest()
+
+    def lists_mtime(self) -> Optional[float]:
+        """Get the newest mtime of the downloaded Release files (None if there are none)."""
+        try:
+            mtimes = [
+                path.stat().st_mtime
+                for path in self.lists_dir.iterdir()
+                if path.name.endswith(("_Release", "_InRelease"))
+            ]
+        except OSError:
+            return None
+        return max(mtimes, default=None)
+
+    def is_fresh(self) -> bool:
+        """
+        Check whether indexes were updated within the TTL from unchanged sources.
+
+        The downloaded indexes must also still be there: an emptied lists
+        directory or Release files older than at the last update are stale.
+        """
+        with self._lock:
+            if self.ttl <= 0 or self._updated_at is None:
+                return False
+            if time.time() - self._updated_at >= self.ttl:
+                return False
+            lists_mtime = self.lists_mtime()
+            if lists_mtime is None:
+                return False
+            if self._lists_mtime is not None and lists_mtime < self._lists_mtime:
+                return False
+            return self._fingerprint == self.sources_fingerprint()
+
+    def mark_updated(self) -> None:
+        """Record a successful update of the package indexes."""
+        with self._lock:
+            self._updated_at = time.time()
+            self._fingerprint = self.sources_fingerprint()
+            self._lists_mtime = self.lists_mtime()
+            self._save_state()
+
+    def invalidate(self) -> None:
+        """Force the next update, e.g. after changing APT configuration."""
+        with self._lock:
+            self._updated_at = None
+            self._fingerprint = None
+            self._lists_mtime = None
+            self._save_state()
+
+    def prepare_sources(self) -> None:
+        """Run the prepare_sources callback, once, ahead of an update."""
+        with self._lock:
+            prepare, self._prepare_sources = self._prepare_sources, None
+            if prepare is None:
+                return
+            try:
+                prepare()
+            except Exception as e:
+                self.logger.warning(f"Failed to prepare APT sources: {e}")
+
+    def update(self, run_update: Callable[[], bool], force: bool = False) -> bool:
+        """
+        Run an index update unless the indexes are still fresh.
+
+        Concurrent callers are serialized, so only the first one updates.
+
+        Args:
+            run_update: Performs the update and returns True on success
+            force: Update even if the indexes are fresh
+
+        Returns:
+            True if the indexes are fresh or the update succeeded
+        """
+        with self._lock:
+            if not force and self.is_fresh():
+                age = time.time() - (self._updated_at or 0)
+                self.logger.debug(f"APT package lists are fresh ({age:.0f}s old), skipping update")
+                return True
+
+            self.prepare_sources()
+            success = run_update()
+            if success:
+                self.mark_updated()
+            return success
+
+    def _load_state(self) -> None:
+        """Load the last update from the state file."""
+        try:
+            if self.state_file.exists():
+                data = json.loads(self.state_file.read_text())
+                self._updated_at = data.get("updated_at")
+                self._fingerprint = data.get("fingerprint")
+                self._lists_mtime = data.get("lists_mtime")
+        except Exception as e:
+            self.logger.debug(f"Failed to load APT update state: {e}")
+
+    def _save_state(self) -> None:
+        """Save the last update to the state file."""
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            state = {
+                "updated_at": self._updated_at,
+                "fingerprint": self._fingerprint,
+                "lists_mtime": self._lists_mtime,
+            }
+            self.state_file.write_text(json.dumps(state))
+        except Exception as e:
+            self.logger.debug(f"Failed to save APT update state: {e}")
+
+
+_apt_update_tracker: Optional[AptUpdateTracker] = None
+_apt_update_tracker_lock = threading.Lock()
+
+
+def get_apt_update_tracker() -> AptUpdateTracker:
+    """Get global APT update tracker."""
+    global _apt_update_tracker
+    with _apt_update_tracker_lock:
+        if _apt_update_tracker is None:
+            _apt_update_tracker = AptUpdateTracker()
+        return _apt_update_tracker
+
+
+def configure_apt_update_tracker(
+    ttl: float = DEFAULT_TTL, prepare_sources: Optional[Callable[[], None]] = None
+) -> AptUpdateTracker:
+    """Replace the global APT update tracker with one using the given settings."""
+    global _apt_update_tracker
+    with _apt_update_tracker_lock:
+        _apt_update_tracker = AptUpdateTracker(ttl=ttl, prepare_sources=prepare_sources)
+        return _apt_update_tracker
@@ -4,10 +4,12 @@ Command execution utilities with error handling.
 
 import shlex
 import subprocess
+import time
 from dataclasses import dataclass
 from typing import List, Optional, Union
 
 from configurator.exceptions import ModuleExecutionError
+from configurator.observability.profiling import get_command_profiler
 
 
 @dataclass
@@ -43,6 +45,8 @@ def run_command(
     """
     Run a shell command and return the result.
 
+    Invocations are reported to the command profiler while it is enabled.
+
     Args:
         command: Command to run (string or list of arguments)
         check: Raise exception on non-zero exit code
@@ -68,6 +72,8 @@ def run_command(
 
     # Build command string for logging
     cmd_str = command if isinstance(command, str) else " ".join(command)
+    profiler = get_command_profiler()
+    started = time.perf_counter()
 
     try:
         result = subprocess.run(
@@ -88,6 +94,14 @@ def run_command(
             stderr=result.stderr if capture_output else "",
         )
 
+        if profiler.enabled:
+            profiler.record(
+                cmd_str,
+                time.perf_counter() - started,
+                result.returncode,
+                len(cmd_result.stdout or "") + len(cmd_result.stderr or ""),
+            )
+
         if check and result.returncode != 0:
             raise ModuleExecutionError(
                 what=f"Command failed: {cmd_str}",
@@ -101,6 +115,8 @@ def run_command(
         return cmd_result
 
     except subprocess.TimeoutExpired:
+        if profiler.enabled:
+            profiler.record(cmd_str, time.perf_counter() - started, None)
         raise ModuleExecutionError(
             what=f"Command timed out: {cmd_str}",
             why=f"Command did not complete within {timeout} seconds",
@@ -0,0 +1,270 @@
+"""
+Parallel prefetch of .deb archives.
+
+APT downloads archives one after another inside ``apt-get install``. The
+prefetcher resolves the archives an install needs (``apt-get install
+--print-uris``), downloads them concurrently, verifies them against the
+size and hash from the Packages index, and places them in APT's archive
+directory and the package cache before the install starts.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from configurator.core.execution.resources import ResourceClass, get_resource_pool
+from configurator.core.package_cache import PackageCacheManager, parse_deb_filename
+from configurator.utils.command import run_command
+from configurator.utils.file import HashingWriter, link_or_copy
+from configurator.utils.retry import retry
+
+# 'URI' filename size hashtype:hash
+_PRINT_URIS_LINE = re.compile(
+    r"^'(?P<uri>[^']+)'\s+(?P<filename>\S+)\s+(?P<size>\d+)\s+(?P<hash>\S+)"
+)
+
+# APT hash names -> hashlib algorithms
+_HASH_ALGORITHMS = {
+    "SHA512": "sha512",
+    "SHA256": "sha256",
+    "SHA1": "sha1",
+    "MD5Sum": "md5",
+    "MD5": "md5",
+}
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class DebDownload:
+    """An archive APT needs for an install, as reported by --print-uris."""
+
+    uri: str
+    filename: str
+    size: int
+    hash_type: Optional[str] = None
+    hash_value: Optional[str] = None
+
+    @property
+    def package_name(self) -> str:
+        return self.filename.split("_")[0]
+
+    @property
+    def version(self) -> str:
+        # Epoch colons are escaped as %3a in archive filenames
+        parsed = parse_deb_filename(self.filename)
+        return parsed[1] if parsed else ""
+
+    @property
+    def arch(self) -> str:
+        parsed = parse_deb_filename(self.filename)
+        return parsed[2] if parsed else ""
+
+
+def resolve_downloads(
+    packages: List[str], logger: Optional[logging.Logger] = None
+) -> Optional[List[DebDownload]]:
+    """
+    Resolve the exact archives APT would download to install packages.
+
+    Archives already present in APT's archive directory are not listed.
+
+    Returns:
+        Archives to download, or None if APT could not resolve the packages
+    """
+    logger = logger or logging.getLogger(__name__)
+    if not packages:
+        return []
+
+    env = os.environ.copy()
+    env["DEBIAN_FRONTEND"] = "noninteractive"
+    try:
+        result = run_command(
+            ["apt-get", "install", "-y", "-qq", "--print-uris"] + list(packages),
+            check=False,
+            env=env,
+        )
+    except Exception as e:
+        logger.debug(f"Could not resolve archive URIs: {e}")
+        return None
+
+    if not result.success:
+        logger.debug(f"Could not resolve archive URIs: {result.stderr.strip()}")
+        return None
+
+    downloads = []
+    for line in result.stdout.splitlines():
+        match = _PRINT_URIS_LINE.match(line.strip())
+        if not match:
+            continue
+
+        hash_type, _, hash_value = match.group("hash").partition(":")
+        downloads.append(
+            DebDownload(
+                uri=match.group("uri"),
+                filename=match.group("filename"),
+                size=int(match.group("size")),
+                hash_type=hash_type if hash_value else None,
+                hash_value=hash_value or None,
+            )
+        )
+
+    return downloads
+
+
+class DebPrefetcher:
+    """
+    Downloads the archives of a package set concurrently.
+
+    Downloads hold the ``network`` resource class, so concurrency is also
+    bounded by its capacity across the whole process.
+    """
+
+    APT_ARCHIVES_DIR = Path("/var/cache/apt/archives")
+
+    def __init__(
+        self,
+        cache_manager: Optional[PackageCacheManager] = None,
+        max_workers: int = 4,
+        timeout: int = 600,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """
+        Initialize prefetcher.
+
+        Args:
+            cache_manager: Package cache receiving downloaded archives
+            max_workers: Maximum concurrent downloads
+            timeout: Timeout per download in seconds
+            logger: Logger instance
+        """
+        self.cache_manager = cache_manager
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+
+    def resolve(self, packages: List[str]) -> List[DebDownload]:
+        """Resolve the archives APT would download to install packages."""
+        return resolve_downloads(packages, self.logger) or []
+
+    def prefetch(self, packages: List[str]) -> int:
+        """
+        Download the archives for packages into APT's archive directory.
+
+        Failures are logged and left to apt-get, which downloads whatever
+        is still missing.
+
+        Returns:
+            Number of archives placed in the archive directory
+        """
+        downloads = self.resolve(packages)
+        if not downloads:
+            return 0
+
+        total_mb = sum(d.size for d in downloads) / 1024 / 1024
+        self.logger.info(f"Prefetching {len(downloads)} archives ({total_mb:.1f}MB)")
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(downloads)), thread_name_prefix="prefetch"
+        ) as executor:
+            results = list(executor.map(self._prefetch_one, downloads))
+
+        fetched = sum(1 for r in results if r)
+        if fetched < len(downloads):
+            self.logger.warning(f"Prefetched {fetched}/{len(downloads)} archives")
+        return fetched
+
+    def _prefetch_one(self, download: DebDownload) -> bool:
+        """Place one archive in APT's archive directory, from cache or network."""
+        dest = self.APT_ARCHIVES_DIR / download.filename
+
+        try:
+            if self._restore_from_cache(download, dest):
+                return True
+
+            sha256 = self._download(download, dest)
+        except Exception as e:
+            self.logger.warning(f"Prefetch failed for {download.filename}: {e}")
+            return False
+
+        if self.cache_manager:
+            try:
+                self.cache_manager.add_package(
+                    download.package_name,
+                    download.version,
+                    dest,
+                    download.uri,
+                    download.arch,
+                    file_hash=sha256,
+                )
+            except Exception as e:
+                self.logger.warning(f"Failed to cache {download.filename}: {e}")
+
+        return True
+
+    def _restore_from_cache(self, download: DebDownload, dest: Path) -> bool:
+        """Link a verified archive from the package cache."""
+        if not self.cache_manager:
+            return False
+
+        cached = self.cache_manager.get_package(
+            download.package_name, download.version, download.arch
+        )
+        if not cached or not self._verify(cached, download):
+            return False
+
+        link_or_copy(cached, dest)
+        return True
+
+    @retry(max_retries=3, base_delay=2.0, exceptions=(OSError,))
+    def _download(self, download: DebDownload, dest: Path) -> str:
+        """
+        Download an archive via a temporary file, verifying it as it streams.
+
+        Network errors are retried (without holding a network slot during the
+        backoff); a size or hash mismatch is raised at once.
+
+        Returns:
+            SHA256 of the archive (for the package cache)
+        """
+        partial = self.APT_ARCHIVES_DIR / "partial" / f"{download.filename}.prefetch"
+        partial.parent.mkdir(parents=True, exist_ok=True)
+        algorithm = _HASH_ALGORITHMS.get(download.hash_type or "")
+
+        try:
+            with get_resource_pool().acquire(ResourceClass.NETWORK):
+                with urllib.request.urlopen(download.uri, timeout=self.timeout) as response:
+                    with HashingWriter(partial, *{"sha256", algorithm or "sha256"}) as writer:
+                        shutil.copyfileobj(response, writer, CHUNK_SIZE)
+
+            if writer.size != download.size or (
+                algorithm and writer.hexdigest(algorithm) != download.hash_value
+            ):
+                raise ValueError(f"Size or hash mismatch for {download.filename}")
+
+            os.replace(partial, dest)
+            return writer.hexdigest()
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def _verify(self, path: Path, download: DebDownload) -> bool:
+        """Check an archive against the size and hash from the Packages index."""
+        if path.stat().st_size != download.size:
+            return False
+
+        algorithm = _HASH_ALGORITHMS.get(download.hash_type or "")
+        if not algorithm:
+            return True
+
+        digest = hashlib.new(algorithm)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest() == download.hash_value
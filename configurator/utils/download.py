@@ -0,0 +1,417 @@
+"""
+Segmented, resumable HTTP downloads.
+
+Artifacts such as Go tarballs and Neovim releases used to be fetched over
+a single connection, and a dropped connection restarted them from zero.
+
+- Files served with HTTP range support are split into segments that are
+  fetched in parallel over a shared connection pool.
+- The partial file (<destination>.part) and the progress of each segment
+  (<destination>.part.json) are kept when a download fails, so the next
+  attempt resumes where it stopped. If-Range makes sure the remaining
+  bytes come from the same version of the file.
+- The file is hashed while it is written, so callers can verify it
+  without reading it back.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from configurator.utils.file_lock import file_lock
+
+CHUNK_SIZE = 1024 * 1024
+DEFAULT_SEGMENTS = 4
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+# Progress is persisted after this many bytes (and whenever a download fails)
+CHECKPOINT_BYTES = 16 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class NotModified(Exception):
+    """Raised when a conditional request finds the local copy up to date."""
+
+
+class _ResourceChanged(requests.RequestException):
+    """The remote file changed since the partial download was started."""
+
+
+@dataclass
+class DownloadResult:
+    """A completed download."""
+
+    path: Path
+    sha256: str
+    size_bytes: int
+    resumed_bytes: int = 0
+    segments: int = 1
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int  # Exclusive; -1 if the size is unknown
+    pos: int  # Next byte to write
+
+    @property
+    def done(self) -> bool:
+        return 0 <= self.end <= self.pos
+
+
+def get_session() -> requests.Session:
+    """Session shared by all downloads, keeping connections to each host alive"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+class _OrderedHasher:
+    """
+    SHA256 of a file written out of order.
+
+    Bytes written at the hashed offset are hashed from memory. Bytes that
+    other segments wrote ahead of it are read back once the gap closes,
+    while they are still in the page cache.
+    """
+
+    def __init__(self, path: Path, segments: List[_Segment]):
+        self._path = path
+        self._segments = segments
+        self._sha256 = hashlib.sha256()
+        self._lock = threading.Lock()
+        self.offset = 0
+
+    def written(self, start: int, data: bytes) -> None:
+        with self._lock:
+            if start == self.offset:
+                self._sha256.update(data)
+                self.offset += len(data)
+            self._catch_up()
+
+    def hexdigest(self) -> str:
+        with self._lock:
+            self._catch_up()
+            return self._sha256.hexdigest()
+
+    def _catch_up(self) -> None:
+        while True:
+            segment = next(
+                (s for s in self._segments if s.start <= self.offset < s.pos),
+                None,
+            )
+            if segment is None:
+                return
+            with open(self._path, "rb") as f:
+                f.seek(self.offset)
+                while self.offset < segment.pos:
+                    data = f.read(min(CHUNK_SIZE, segment.pos - self.offset))
+                    if not data:
+                        return
+                    self._sha256.update(data)
+                    self.offset += len(data)
+
+
+class _Download:
+    """One download into <destination>.part, resumed from its saved state"""
+
+    def __init__(
+        self,
+        url: str,
+        destination: Path,
+        segments: int,
+        min_segment_size: int,
+        timeout: int,
+        headers: Optional[Dict[str, str]],
+        show_progress: bool,
+    ):
+        self.url = url
+        self.destination = destination
+        self.part_path = destination.with_name(destination.name + ".part")
+        self.state_path = destination.with_name(destination.name + ".part.json")
+        self.max_segments = max(1, segments)
+        self.min_segment_size = max(1, min_segment_size)
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.show_progress = show_progress
+        self.session = get_session()
+
+        self.size = -1
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.resumable = False
+        self.segments: List[_Segment] = []
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+    def run(self) -> DownloadResult:
+        state = self._load_state()
+        if state is not None:
+            try:
+                return self._resume(state)
+            except _ResourceChanged:
+                logger.info(f"{self.url} changed since the partial download, restarting")
+        return self._start()
+
+    def _request(self, headers: Dict[str, str]) -> requests.Response:
+        # Content-Length and byte ranges refer to the encoded body
+        headers = {"Accept-Encoding": "identity", **headers}
+        return self.session.get(
+            self.url, headers=headers, stream=True, timeout=self.timeout, allow_redirects=True
+        )
+
+    def _start(self) -> DownloadResult:
+        response = self._request(self.headers)
+        if response.status_code == 304:
+            response.close()
+            raise NotModified(self.url)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+
+        self.size = int(response.headers.get("Content-Length") or -1)
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        # If-Range needs a strong validator, otherwise resumed bytes could be
+        # from another version of the file
+        self.resumable = (
+            response.headers.get("Accept-Ranges", "").lower() == "bytes"
+            and self.size > 0
+            and bool(self.last_modified or (self.etag and not self.etag.startswith("W/")))
+        )
+
+        count = 1
+        if self.resumable:
+            count = max(1, min(self.max_segments, self.size // self.min_segment_size))
+        step = -(-self.size // count)
+        self.segments = [
+            _Segment(i * step, min(self.size, (i + 1) * step), i * step) for i in range(count)
+        ]
+
+        fd = os.open(self.part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if self.size > 0:
+                os.ftruncate(fd, self.size)
+        finally:
+            os.close(fd)
+
+        hasher = _OrderedHasher(self.part_path, self.segments)
+        self._save_state()
+
+        # The first segment reuses this response; the others request their range
+        return self._fetch(hasher, {0: response}, resumed_bytes=0)
+
+    def _resume(self, state: Dict[str, Any]) -> DownloadResult:
+        self.size = state["size"]
+        self.etag = state.get("etag")
+        self.last_modified = state.get("last_modified")
+        self.resumable = True
+        self.segments = [_Segment(*segment) for segment in state["segments"]]
+        hasher = _OrderedHasher(self.part_path, self.segments)
+
+        resumed_bytes = sum(s.pos - s.start for s in self.segments)
+        logger.info(f"Resuming {self.url} ({resumed_bytes / 1024 / 1024:.1f}MB already downloaded)")
+        return self._fetch(hasher, {}, resumed_bytes)
+
+    def _fetch(
+        self,
+        hasher: _OrderedHasher,
+        responses: Dict[int, requests.Response],
+        resumed_bytes: int,
+    ) -> DownloadResult:
+        pending = [i for i, segment in enumerate(self.segments) if not segment.done]
+        try:
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                    futures = [
+                        executor.submit(self._fetch_segment, hasher, i, responses.get(i))
+                        for i in pending
+                    ]
+                    for future in futures:
+                        future.exception()
+                    for future in futures:
+                        future.result()
+            elif pending:
+                self._fetch_segment(hasher, pending[0], responses.get(pending[0]))
+        except BaseException as e:
+            if self.resumable and not isinstance(e, _ResourceChanged):
+                self._save_state()
+            else:
+                self._discard()
+            raise
+        finally:
+            for response in responses.values():
+                response.close()
+
+        size = sum(s.pos - s.start for s in self.segments)
+        sha256 = hasher.hexdigest()
+        if hasher.offset != size:
+            self._discard()
+            raise OSError(f"Incomplete download of {self.url}: hashed {hasher.offset}/{size}")
+
+        os.replace(self.part_path, self.destination)
+        self.state_path.unlink(missing_ok=True)
+        return DownloadResult(
+            path=self.destination,
+            sha256=sha256,
+            size_bytes=size,
+            resumed_bytes=resumed_bytes,
+            segments=len(self.segments),
+            etag=self.etag,
+            last_modified=self.last_modified,
+        )
+
+    def _fetch_segment(
+        self, hasher: _OrderedHasher, index: int, response: Optional[requests.Response]
+    ) -> None:
+        segment = self.segments[index]
+        if response is None:
+            response = self._request_range(segment)
+
+        with response:
+            fd = os.open(self.part_path, os.O_WRONLY)
+            try:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if segment.end >= 0:
+                        chunk = chunk[: segment.end - segment.pos]
+                    start = segment.pos
+                    view = memoryview(chunk)
+                    while view:
+                        written = os.pwrite(fd, view, segment.pos)
+                        view = view[written:]
+                        segment.pos += written
+                    hasher.written(start, chunk)
+                    self._progress(len(chunk))
+                    if segment.done:
+                        break
+            finally:
+                os.close(fd)
+
+        if segment.end >= 0 and not segment.done:
+            raise requests.ConnectionError(
+                f"Connection closed at byte {segment.pos} of {self.url} (expected {segment.end})"
+            )
+
+    def _request_range(self, segment: _Segment) -> requests.Response:
+        end = segment.end - 1 if segment.end >= 0 else ""
+        headers = {"Range": f"bytes={segment.pos}-{end}"}
+        if self.etag and not self.etag.startswith("W/"):
+            headers["If-Range"] = self.etag
+        elif self.last_modified:
+            headers["If-Range"] = self.last_modified
+
+        response = self._request(headers)
+        if response.status_code != 206:
+            response.close()
+            response.raise_for_status()
+            # A full response to If-Range means the file changed
+            raise _ResourceChanged(self.url)
+        return response
+
+    def _progress(self, length: int) -> None:
+        with self._lock:
+            self._unsaved += length
+            if self._unsaved < CHECKPOINT_BYTES:
+                return
+            self._unsaved = 0
+            done = sum(s.pos - s.start for s in self.segments)
+
+        if self.resumable:
+            self._save_state()
+        if self.show_progress and self.size > 0:
+            logger.debug(f"Downloaded {done * 100 // self.size}% of {self.url}")
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        try:
+            state: Dict[str, Any] = json.loads(self.state_path.read_text())
+            part_size = self.part_path.stat().st_size
+        except (OSError, ValueError):
+            return None
+
+        if state.get("url") != self.url or part_size != state.get("size"):
+            self._discard()
+            return None
+        return state
+
+    def _save_state(self) -> None:
+        if not self.resumable:
+            return
+        with self._lock:
+            state = {
+                "url": self.url,
+                "size": self.size,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "segments": [[s.start, s.end, s.pos] for s in self.segments],
+            }
+            tmp_path = self.state_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(state))
+            os.replace(tmp_path, self.state_path)
+
+    def _discard(self) -> None:
+        self.part_path.unlink(missing_ok=True)
+        self.state_path.unlink(missing_ok=True)
+
+
+def download(
+    url: str,
+    destination: Union[str, Path],
+    segments: int = DEFAULT_SEGMENTS,
+    min_segment_size: int = MIN_SEGMENT_SIZE,
+    timeout: int = 60,
+    headers: Optional[Dict[str, str]] = None,
+    show_progress: bool = False,
+) -> DownloadResult:
+    """
+    Download a file, in parallel segments where the server supports ranges.
+
+    An interrupted download leaves <destination>.part behind and is resumed
+    by the next call for the same destination.
+
+    Args:
+        url: URL to download from
+        destination: Local path to save the file
+        segments: Maximum number of parallel connections
+        min_segment_size: Files are only split into segments of at least this size
+        timeout: Connect and read timeout in seconds
+        headers: Extra request headers (e.g. If-None-Match)
+        show_progress: Log progress of large downloads
+
+    Returns:
+        DownloadResult with the SHA256 computed while downloading
+
+    Raises:
+        NotModified: If a conditional request returned 304
+        requests.RequestException: If the download fails
+        OSError: If the file cannot be written
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    # Concurrent downloads of one destination would share the partial file
+    with file_lock(str(destination) + ".part"):
+        return _Download(
+            url, destination, segments, min_segment_size, timeout, headers, show_progress
+        ).run()
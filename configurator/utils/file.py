@@ -2,17 +2,23 @@
 File operation utilities with backup support.
 """
 
+import fcntl
+import hashlib
 import os
 import shutil
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 from configurator.exceptions import ModuleExecutionError
 
 # Default backup directory
 BACKUP_DIR = Path("/var/backups/debian-vps-configurator")
 
+# ioctl from linux/fs.h cloning a file's extents (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
 
 def ensure_dir(path: Union[str, Path], mode: int = 0o755) -> Path:
     """
@@ -30,6 +36,103 @@ def ensure_dir(path: Union[str, Path], mode: int = 0o755) -> Path:
     return path
 
 
+def link_or_copy(source: Union[str, Path], dest: Union[str, Path]) -> str:
+    """
+    Place a file at dest that shares the data of source where possible.
+
+    Tries a hardlink, then a reflink (copy-on-write clone), and only copies
+    when neither works, e.g. across filesystems. An existing dest is
+    replaced atomically.
+
+    Args:
+        source: Existing file
+        dest: Path to create
+
+    Returns:
+        How the file was placed: "hardlink", "reflink" or "copy"
+    """
+    source = Path(source)
+    dest = Path(dest)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        try:
+            os.link(source, tmp)
+            method = "hardlink"
+        except OSError:
+            if _reflink(source, tmp):
+                method = "reflink"
+            else:
+                shutil.copy2(source, tmp)
+                method = "copy"
+
+        os.replace(tmp, dest)
+        return method
+    finally:
+        # rename() is a no-op if tmp and dest are already links to the same file
+        tmp.unlink(missing_ok=True)
+
+
+def _reflink(source: Path, dest: Path) -> bool:
+    """Clone source to dest if the filesystem supports reflinks."""
+    try:
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(source, dest)
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+class HashingWriter:
+    """
+    Binary file writer that hashes bytes as they are written.
+
+    Lets a download be verified without reading the file back.
+
+    Usage:
+        with HashingWriter(path, "sha256", "sha512") as writer:
+            shutil.copyfileobj(response, writer, 1024 * 1024)
+        writer.hexdigest("sha512")
+    """
+
+    def __init__(self, path: Union[str, Path], *algorithms: str):
+        """
+        Open path for writing.
+
+        Args:
+            path: File to create (truncated if it exists)
+            algorithms: hashlib algorithm names (default: sha256)
+        """
+        self.path = Path(path)
+        self.size = 0
+        self._digests = {
+            algorithm: hashlib.new(algorithm) for algorithm in algorithms or ("sha256",)
+        }
+        self._file = open(self.path, "wb")
+
+    def write(self, data: bytes) -> int:
+        written = self._file.write(data)
+        for digest in self._digests.values():
+            digest.update(data)
+        self.size += written
+        return written
+
+    def hexdigest(self, algorithm: str = "sha256") -> str:
+        """Hex digest of everything written so far"""
+        return self._digests[algorithm].hexdigest()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "HashingWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
 def backup_file(
     path: Union[str, Path],
     backup_dir: Optional[Path] = None,
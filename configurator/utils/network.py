@@ -61,73 +61,77 @@ def check_url_reachable(url: str, timeout: int = 10) -> Tuple[bool, int]:
         return False, 0
 
 
+from configurator.utils.download import DEFAULT_SEGMENTS, DownloadResult, download
 from configurator.utils.retry import retry
 
 
 @retry(max_retries=3, base_delay=2.0)
-def download_file(
+def fetch_file(
     url: str,
     destination: Path,
     timeout: int = 60,
     show_progress: bool = True,
-) -> Path:
+    segments: int = DEFAULT_SEGMENTS,
+) -> DownloadResult:
     """
-    Download a file from URL.
+    Download a file from URL, resuming interrupted downloads.
+
+    Large files are fetched in parallel ranges when the server supports
+    them. A failed attempt keeps its partial file, so retries resume.
 
     Args:
         url: URL to download from
         destination: Local path to save file
-        timeout: Download timeout in seconds
+        timeout: Connect and read timeout in seconds
         show_progress: Show download progress (for large files)
+        segments: Maximum number of parallel connections
 
     Returns:
-        Path to downloaded file
+        DownloadResult with the SHA256 computed while downloading
 
     Raises:
         NetworkError if download fails
     """
     try:
-        # Create destination directory if needed
-        destination.parent.mkdir(parents=True, exist_ok=True)
-
-        # Download file
-        response = requests.get(url, stream=True, timeout=timeout)
-        response.raise_for_status()
-
-        total_size = int(response.headers.get("content-length", 0))
-
-        with open(destination, "wb") as f:
-            if show_progress and total_size > 1024 * 1024:  # > 1MB
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-                    downloaded += len(chunk)
-            else:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-        return destination
+        return download(
+            url, destination, segments=segments, timeout=timeout, show_progress=show_progress
+        )
 
     except requests.Timeout:
         raise NetworkError(
-            what=f"Download timed out: {url}",
-            why=f"Download did not complete within {timeout} seconds",
-            how="Check your internet connection and try again.\n"
-            "If the file is large, the download might need more time.",
+            url, f"No data received for {timeout} seconds (partial data is kept for resuming)"
         )
     except requests.HTTPError as e:
-        raise NetworkError(
-            what=f"Download failed: {url}",
-            why=f"HTTP error: {e.response.status_code}",
-            how="The URL might be invalid or temporarily unavailable.\n"
-            "Check if you can access the URL in a browser.",
-        )
-    except requests.RequestException as e:
-        raise NetworkError(
-            what=f"Download failed: {url}",
-            why=str(e),
-            how="Check your internet connection and try again.",
-        )
+        raise NetworkError(url, f"HTTP error: {e.response.status_code}")
+    except (requests.RequestException, OSError) as e:
+        raise NetworkError(url, str(e))
+
+
+def download_file(
+    url: str,
+    destination: Path,
+    timeout: int = 60,
+    show_progress: bool = True,
+    segments: int = DEFAULT_SEGMENTS,
+) -> Path:
+    """
+    Download a file from URL.
+
+    Args:
+        url: URL to download from
+        destination: Local path to save file
+        timeout: Connect and read timeout in seconds
+        show_progress: Show download progress (for large files)
+        segments: Maximum number of parallel connections
+
+    Returns:
+        Path to downloaded file
+
+    Raises:
+        NetworkError if download fails
+    """
+    result: DownloadResult = fetch_file(url, destination, timeout, show_progress, segments)
+    return result.path
 
 
 def get_public_ip() -> Optional[str]:
@@ -5,6 +5,7 @@ Validates that the system has internet connectivity.
 """
 
 import socket
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 
 from configurator.validators.base import (
@@ -37,23 +38,13 @@ class NetworkValidator(BaseValidator):
         Returns:
             ValidationResult indicating if internet is accessible
         """
-        successful_hosts = []
-        failed_hosts = []
+        # Probe all hosts at once, so unreachable ones do not add up their timeouts
+        with ThreadPoolExecutor(max_workers=len(self.TEST_HOSTS)) as executor:
+            reachable = list(executor.map(self._can_connect, self.TEST_HOSTS))
 
-        for host, port in self.TEST_HOSTS:
-            try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(self.TIMEOUT_SECONDS)
-                result = sock.connect_ex((host, port))
-                sock.close()
-
-                if result == 0:
-                    successful_hosts.append(host)
-                else:
-                    failed_hosts.append(host)
-            except Exception as e:
-                self.logger.debug(f"Connection to {host}:{port} failed: {e}")
-                failed_hosts.append(host)
+        successful_hosts = [
+            host for (host, _), ok in zip(self.TEST_HOSTS, reachable, strict=True) if ok
+        ]
 
         # If at least one host is reachable, consider it passing
         passed = len(successful_hosts) > 0
@@ -87,3 +78,16 @@ class NetworkValidator(BaseValidator):
                     "  4. Check firewall: sudo ufw status"
                 ),
             )
+
+    def _can_connect(self, address: Tuple[str, int]) -> bool:
+        """Check whether a TCP connection to host:port succeeds."""
+        host, port = address
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.settimeout(self.TIMEOUT_SECONDS)
+            result = sock.connect_ex((host, port))
+            sock.close()
+            return result == 0
+        except Exception as e:
+            self.logger.debug(f"Connection to {host}:{port} failed: {e}")
+            return False
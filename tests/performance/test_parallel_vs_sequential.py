@@ -15,6 +15,7 @@ import pytest
 
 from configurator.core.execution.base import ExecutionContext
 from configurator.core.execution.parallel import ParallelExecutor
+from configurator.core.execution.resources import ResourcePool
 
 
 def create_contexts(count: int, work_time: float = 0.0):
@@ -34,7 +35,9 @@ def create_contexts(count: int, work_time: float = 0.0):
 
             module.configure.side_effect = slow_configure
 
-        context = ExecutionContext(module_name=f"module_{i}", module_instance=module, dry_run=False)
+        context = ExecutionContext(
+            module_name=f"module_{i}", module_instance=module, config={}, dry_run=False
+        )
         contexts.append(context)
     return contexts
 
@@ -157,6 +160,69 @@ class TestMemoryUsagePatterns:
         assert thread_growth < 5, f"Thread leak detected: {thread_growth} new threads"
 
 
+def create_resource_contexts(pool: ResourcePool, declare: bool, apt_lock=None):
+    """
+    Create apt-heavy and download-heavy modules.
+
+    With apt_lock set, dpkg steps use that single lock instead of the pool,
+    reproducing the old global APT lock.
+    """
+    contexts = []
+
+    def step(resource: str, delay: float):
+        if resource == "dpkg" and apt_lock is not None:
+            with apt_lock:
+                time.sleep(delay)
+        elif apt_lock is not None:
+            time.sleep(delay)
+        else:
+            with pool.acquire(resource):
+                time.sleep(delay)
+
+    profiles = [("apt", [("dpkg", 0.08)], ["dpkg"])] * 4 + [
+        ("download", [("network", 0.15), ("dpkg", 0.01)], ["network"])
+    ] * 4
+
+    for i, (kind, steps, classes) in enumerate(profiles):
+        module = Mock()
+        module.validate.return_value = True
+        module.verify.return_value = True
+        module.resource_classes = classes if declare else None
+
+        def configure(steps=steps):
+            for resource, delay in steps:
+                step(resource, delay)
+            return True
+
+        module.configure.side_effect = configure
+        contexts.append(ExecutionContext(f"{kind}_{i}", module, {}))
+
+    return contexts
+
+
+@pytest.mark.slow
+class TestResourceClassConcurrency:
+    """Per-class semaphores vs the previous global APT lock."""
+
+    def test_downloads_overlap_dpkg_work(self):
+        """Download-heavy modules should run while apt-heavy modules hold dpkg."""
+        workers = 3
+
+        lock_executor = ParallelExecutor(max_workers=workers, logger=Mock())
+        start = time.time()
+        lock_executor.execute(create_resource_contexts(None, False, threading.Lock()))
+        lock_time = time.time() - start
+
+        pool = ResourcePool({"dpkg": 1, "network": 4})
+        executor = ParallelExecutor(max_workers=workers, logger=Mock(), resource_pool=pool)
+        start = time.time()
+        executor.execute(create_resource_contexts(pool, True))
+        resource_time = time.time() - start
+
+        speedup = lock_time / resource_time
+        assert speedup > 1.2, f"Expected speedup > 1.2x, got {speedup:.2f}x"
+
+
 class TestPerformanceRegression:
     """Tests to detect performance regressions."""
 
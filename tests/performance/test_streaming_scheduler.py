@@ -0,0 +1,133 @@
+"""
+Benchmark: streaming scheduler vs level-synchronous batches.
+
+Runs synthetic dependency graphs through both execution models and checks
+that launching modules as soon as their dependencies finish beats waiting
+for whole Kahn levels.
+"""
+
+import random
+import time
+from typing import Dict, List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from configurator.core.dependencies import COMPLETE_MODULE_DEPENDENCIES
+from configurator.core.dependency import DependencyGraph
+from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.hybrid import HybridExecutor
+from configurator.core.execution.scheduler import StreamingScheduler
+
+# Scale real-world minutes down to milliseconds
+TIME_SCALE = 0.001
+
+
+def create_module(duration: float):
+    """Create a mock module whose configure() takes duration seconds."""
+    module = Mock()
+    module.force_sequential = False
+    module.large_module = False
+    module.validate.return_value = True
+    module.verify.return_value = True
+
+    def configure():
+        time.sleep(duration)
+        return True
+
+    module.configure.side_effect = configure
+    return module
+
+
+def build_graph(dependencies: Dict[str, List[str]]) -> DependencyGraph:
+    graph = DependencyGraph(logger=Mock())
+    for name, deps in dependencies.items():
+        graph.add_module(name, deps)
+    return graph
+
+
+def run_batches(
+    dependencies: Dict[str, List[str]], durations: Dict[str, float], workers: int
+) -> float:
+    """Run the graph with the batch model used by Installer before streaming."""
+    graph = build_graph(dependencies)
+    executor = HybridExecutor(max_workers=workers, logger=Mock())
+
+    start = time.perf_counter()
+    for batch in graph.get_execution_batches():
+        contexts = [ExecutionContext(n, create_module(durations[n]), {}) for n in batch]
+        executor.execute(contexts)
+    return time.perf_counter() - start
+
+
+def run_streaming(
+    dependencies: Dict[str, List[str]], durations: Dict[str, float], workers: int
+) -> float:
+    """Run the graph with the streaming scheduler."""
+    graph = build_graph(dependencies)
+    executor = HybridExecutor(max_workers=workers, logger=Mock())
+    scheduler = StreamingScheduler(
+        runner=executor.execute_one, max_workers=workers, durations=durations, logger=Mock()
+    )
+
+    start = time.perf_counter()
+    scheduler.execute(graph, lambda n: ExecutionContext(n, create_module(durations[n]), {}))
+    return time.perf_counter() - start
+
+
+def synthetic_dag(seed: int, size: int = 20) -> Tuple[Dict[str, List[str]], Dict[str, float]]:
+    """Generate a random layered DAG with skewed module durations."""
+    rng = random.Random(seed)
+    dependencies: Dict[str, List[str]] = {}
+    durations: Dict[str, float] = {}
+
+    for i in range(size):
+        name = f"m{i}"
+        candidates = [f"m{j}" for j in range(i)]
+        dependencies[name] = rng.sample(candidates, k=min(len(candidates), rng.randint(0, 2)))
+        # Mostly short modules with a few heavy ones (desktop/docker-like)
+        durations[name] = rng.choice([0.02, 0.02, 0.03, 0.05, 0.2])
+
+    return dependencies, durations
+
+
+@pytest.mark.slow
+class TestStreamingVsBatch:
+    """Compare wall-clock time of streaming and batch execution."""
+
+    def test_full_profile_graph(self):
+        """Full 21-module profile with desktop/docker as slow modules."""
+        durations = {name: 60 * TIME_SCALE for name in COMPLETE_MODULE_DEPENDENCIES}
+        durations.update(
+            {
+                "system": 120 * TIME_SCALE,
+                "security": 60 * TIME_SCALE,
+                "desktop": 600 * TIME_SCALE,
+                "docker": 180 * TIME_SCALE,
+                "devops": 120 * TIME_SCALE,
+            }
+        )
+
+        batch_time = run_batches(COMPLETE_MODULE_DEPENDENCIES, durations, workers=4)
+        streaming_time = run_streaming(COMPLETE_MODULE_DEPENDENCIES, durations, workers=4)
+
+        speedup = batch_time / streaming_time
+        print(
+            f"\nFull profile: batch={batch_time:.3f}s streaming={streaming_time:.3f}s "
+            f"speedup={speedup:.2f}x"
+        )
+        assert speedup > 1.2, f"Expected speedup > 1.2x, got {speedup:.2f}x"
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_synthetic_dags(self, seed):
+        """Random DAGs should never be slower with streaming."""
+        dependencies, durations = synthetic_dag(seed)
+
+        batch_time = run_batches(dependencies, durations, workers=4)
+        streaming_time = run_streaming(dependencies, durations, workers=4)
+
+        print(
+            f"\nSeed {seed}: batch={batch_time:.3f}s streaming={streaming_time:.3f}s "
+            f"speedup={batch_time / streaming_time:.2f}x"
+        )
+        assert streaming_time <= batch_time * 1.1
@@ -6,11 +6,26 @@ Tests checksum verification, GPG validation, and download security.
 
 import hashlib
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
 from configurator.security.supply_chain import SecureDownloader, SecurityError, SupplyChainValidator
+from configurator.utils.download import DownloadResult
+
+
+def serve(content: bytes):
+    """fetch_file stand-in that 'downloads' content."""
+
+    def fetch_file(url, destination, *args, **kwargs):
+        Path(destination).write_bytes(content)
+        return DownloadResult(
+            path=Path(destination),
+            sha256=hashlib.sha256(content).hexdigest(),
+            size_bytes=len(content),
+        )
+
+    return fetch_file
 
 
 class TestChecksumVerification:
@@ -90,24 +105,13 @@ class TestChecksumVerification:
 class TestSecureDownloader:
     """Test SecureDownloader functionality."""
 
-    @patch("subprocess.run")
-    def test_download_with_valid_checksum(self, mock_run, tmp_path):
+    @patch("configurator.security.supply_chain.fetch_file")
+    def test_download_with_valid_checksum(self, mock_fetch, tmp_path):
         """Download with valid checksum should succeed."""
         # Mock successful download
         dest = tmp_path / "downloaded.txt"
 
-        def run_side_effect(*args, **kwargs):
-            # Simulate successful download
-            if "curl" in args[0]:
-                # Extract destination file from curl command
-                if "-o" in args[0]:
-                    idx = args[0].index("-o")
-                    dest_file = Path(args[0][idx + 1])
-                    dest_file.write_text("test content")
-                return MagicMock(returncode=0, stdout=b"", stderr=b"")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = run_side_effect
+        mock_fetch.side_effect = serve(b"test content")
 
         config = {
             "security_advanced": {
@@ -128,21 +132,12 @@ class TestSecureDownloader:
         assert result is True
         assert dest.exists()
 
-    @patch("subprocess.run")
-    def test_download_with_invalid_checksum_fails(self, mock_run, tmp_path):
+    @patch("configurator.security.supply_chain.fetch_file")
+    def test_download_with_invalid_checksum_fails(self, mock_fetch, tmp_path):
         """Download with invalid checksum should fail."""
         dest = tmp_path / "downloaded.txt"
 
-        def run_side_effect(*args, **kwargs):
-            if "curl" in args[0]:
-                if "-o" in args[0]:
-                    idx = args[0].index("-o")
-                    dest_file = Path(args[0][idx + 1])
-                    dest_file.write_text("different content")
-                return MagicMock(returncode=0, stdout=b"", stderr=b"")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = run_side_effect
+        mock_fetch.side_effect = serve(b"different content")
 
         config = {
             "security_advanced": {
@@ -247,21 +242,12 @@ class TestChecksumDatabase:
 class TestEndToEndSecurity:
     """End-to-end security integration tests."""
 
-    @patch("subprocess.run")
-    def test_full_secure_download_workflow(self, mock_run, tmp_path):
+    @patch("configurator.security.supply_chain.fetch_file")
+    def test_full_secure_download_workflow(self, mock_fetch, tmp_path):
         """Test complete secure download workflow."""
         dest = tmp_path / "safe-file.tar.gz"
 
-        def run_side_effect(*args, **kwargs):
-            if "curl" in args[0]:
-                if "-o" in args[0]:
-                    idx = args[0].index("-o")
-                    dest_file = Path(args[0][idx + 1])
-                    dest_file.write_text("downloaded content")
-                return MagicMock(returncode=0, stdout=b"", stderr=b"")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = run_side_effect
+        mock_fetch.side_effect = serve(b"downloaded content")
 
         config = {
             "security_advanced": {
@@ -2,6 +2,7 @@ from unittest.mock import Mock
 
 from configurator.core.execution.base import ExecutionContext
 from configurator.core.execution.parallel import ParallelExecutor
+from configurator.core.execution.resources import ResourceClass
 
 
 def test_parallel_executor_can_handle_multiple():
@@ -111,3 +112,18 @@ def test_parallel_executor_handles_failure():
 
     assert results["failing"].success is False
     assert results["failing"].error is not None
+
+
+def test_parallel_executor_prefers_modules_with_free_resources():
+    """Test a module whose resources are saturated is passed over."""
+    executor = ParallelExecutor(max_workers=1)
+
+    java = Mock()
+    java.resource_classes = ["dpkg"]
+    nodejs = Mock()
+    nodejs.resource_classes = ["network"]
+
+    pending = [ExecutionContext("java", java, {}), ExecutionContext("nodejs", nodejs, {})]
+
+    assert executor._next_context(pending, {}).module_name == "java"
+    assert executor._next_context(pending, {ResourceClass.DPKG: 1}).module_name == "nodejs"
@@ -1,7 +1,11 @@
+import logging
 from unittest.mock import Mock
 
 from configurator.core.execution.base import ExecutionContext
 from configurator.core.execution.pipeline import PipelineExecutor
+from configurator.core.execution.steps import ModuleStep
+from configurator.core.state.manager import StateManager
+from configurator.modules.base import ConfigurationModule
 
 
 def test_pipeline_executor_can_handle_single():
@@ -69,3 +73,75 @@ def test_pipeline_executor_with_hooks():
     # Verify hooks called
     mod.pre_configure.assert_called_once()
     mod.post_configure.assert_called_once()
+
+
+class SteppedModule:
+    """Module with three steps; 'install' fails until fixed."""
+
+    run_steps = ConfigurationModule.run_steps
+    step_workers = 1
+
+    def __init__(self):
+        self.logger = logging.getLogger("stepped")
+        self.calls = []
+        self.broken = True
+
+    def validate(self):
+        return True
+
+    def verify(self):
+        return True
+
+    def steps(self):
+        return [
+            ModuleStep("download", lambda: self._step("download")),
+            ModuleStep("install", self._install),
+            ModuleStep("tune", lambda: self._step("tune"), critical=False),
+        ]
+
+    def _step(self, name):
+        self.calls.append(name)
+        return True
+
+    def _install(self):
+        self.calls.append("install")
+        if self.broken:
+            raise RuntimeError("install failed")
+        return True
+
+
+def test_pipeline_executor_resumes_from_first_incomplete_step():
+    """Test completed steps are not rerun after a failure."""
+    state_manager = StateManager(db_path=":memory:")
+    executor = PipelineExecutor(state_manager=state_manager)
+    module = SteppedModule()
+    context = ExecutionContext("stepped", module, {"enabled": True})
+
+    assert executor.execute([context])["stepped"].success is False
+    assert module.calls == ["download", "install"]
+    assert state_manager.get_completed_steps("stepped", executor._config_hash(context)) == {
+        "download"
+    }
+
+    module.calls.clear()
+    module.broken = False
+    assert executor.execute([context])["stepped"].success is True
+    assert module.calls == ["install", "tune"]
+
+    # A successful run starts over next time
+    assert state_manager.get_completed_steps("stepped", executor._config_hash(context)) == set()
+
+
+def test_pipeline_executor_reruns_steps_after_config_change():
+    """Test steps completed with another config are rerun."""
+    state_manager = StateManager(db_path=":memory:")
+    executor = PipelineExecutor(state_manager=state_manager)
+    module = SteppedModule()
+
+    executor.execute([ExecutionContext("stepped", module, {"theme": "nordic"})])
+
+    module.calls.clear()
+    module.broken = False
+    executor.execute([ExecutionContext("stepped", module, {"theme": "arc"})])
+
+    assert module.calls == ["download", "install", "tune"]
@@ -0,0 +1,108 @@
+import threading
+import time
+
+from configurator.core.execution.resources import (
+    ResourceClass,
+    ResourcePool,
+    classify_command,
+    declared_resources,
+)
+
+
+def test_classify_apt_commands_as_dpkg():
+    """Test apt and dpkg commands need the dpkg class."""
+    assert classify_command("apt-get install -y git") == [ResourceClass.DPKG]
+    assert classify_command(["dpkg", "--configure", "-a"]) == [ResourceClass.DPKG]
+
+
+def test_classify_piped_installer_as_dpkg_and_network():
+    """Test curl | bash installers are treated as apt users too."""
+    classes = classify_command("curl -fsSL https://get.docker.com | sh")
+
+    assert classes == [ResourceClass.DPKG, ResourceClass.NETWORK]
+
+
+def test_classify_download_and_extract():
+    """Test downloads and archive extraction get network and disk."""
+    assert classify_command("git clone --depth 1 https://example.com/x.git") == [
+        ResourceClass.NETWORK
+    ]
+    assert classify_command("tar -C /usr/local -xzf /tmp/go.tar.gz") == [ResourceClass.DISK]
+
+
+def test_classify_read_only_commands_need_nothing():
+    """Test checks like systemctl or which do not take any class."""
+    assert classify_command("systemctl is-active docker") == []
+    assert classify_command("which git") == []
+
+
+def test_declared_resources_ignores_invalid_declarations():
+    """Test objects without a list declaration declare nothing."""
+
+    class Module:
+        resource_classes = ["network", "dpkg"]
+
+    class Other:
+        resource_classes = "dpkg"
+
+    assert declared_resources(Module()) == [ResourceClass.DPKG, ResourceClass.NETWORK]
+    assert declared_resources(Other()) == []
+    assert declared_resources(object()) == []
+
+
+def test_pool_capacities_from_config():
+    """Test capacities accept names and ignore unknown classes."""
+    pool = ResourcePool({"network": 8, "gpu": 2})
+
+    assert pool.capacities[ResourceClass.NETWORK] == 8
+    assert pool.capacities[ResourceClass.DPKG] == 1
+
+
+def test_pool_acquire_is_reentrant():
+    """Test a thread can re-acquire a class it already holds."""
+    pool = ResourcePool()
+
+    with pool.acquire("dpkg"):
+        with pool.acquire(ResourceClass.DPKG, "network"):
+            assert pool.holds("dpkg")
+            assert pool.holds("network")
+        assert pool.holds("dpkg")
+        assert not pool.holds("network")
+
+    assert not pool.holds("dpkg")
+
+
+def test_pool_serializes_dpkg_but_overlaps_network():
+    """Test dpkg holders are exclusive while network holders overlap."""
+    pool = ResourcePool({"dpkg": 1, "network": 4})
+    active = {"dpkg": 0, "network": 0}
+    peak = {"dpkg": 0, "network": 0}
+    lock = threading.Lock()
+
+    def work(resource):
+        with pool.acquire(resource):
+            with lock:
+                active[resource] += 1
+                peak[resource] = max(peak[resource], active[resource])
+            time.sleep(0.02)
+            with lock:
+                active[resource] -= 1
+
+    threads = [threading.Thread(target=work, args=(r,)) for r in ["dpkg", "network"] * 4]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak["dpkg"] == 1
+    assert peak["network"] > 1
+
+
+def test_pool_fits_checks_reservations():
+    """Test fits() reports saturated classes."""
+    pool = ResourcePool({"dpkg": 1, "network": 2})
+
+    assert pool.fits(["dpkg"], {}) is True
+    assert pool.fits(["dpkg"], {ResourceClass.DPKG: 1}) is False
+    assert pool.fits(["network"], {ResourceClass.DPKG: 1, ResourceClass.NETWORK: 1}) is True
+    assert pool.fits([], {ResourceClass.DPKG: 1}) is True
@@ -0,0 +1,179 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from configurator.core.dependency import DependencyGraph
+from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.hybrid import HybridExecutor
+from configurator.core.execution.scheduler import StreamingScheduler
+
+
+def make_module(delay: float = 0.0, success: bool = True):
+    """Create a mock module whose configure() sleeps for delay seconds."""
+    mod = Mock()
+    mod.force_sequential = False
+    mod.large_module = False
+    mod.validate.return_value = True
+    mod.verify.return_value = True
+
+    def configure():
+        time.sleep(delay)
+        return success
+
+    mod.configure.side_effect = configure
+    return mod
+
+
+def make_factory(modules):
+    return lambda name: ExecutionContext(name, modules[name], {})
+
+
+def test_scheduler_respects_dependencies():
+    """Test a module only starts after all of its dependencies completed."""
+    graph = DependencyGraph()
+    graph.add_module("system")
+    graph.add_module("security", ["system"])
+    graph.add_module("docker", ["system", "security"])
+
+    order = []
+    lock = threading.Lock()
+    executor = HybridExecutor(max_workers=4)
+
+    def runner(context, callback):
+        with lock:
+            order.append(context.module_name)
+        return executor.execute_one(context, callback)
+
+    modules = {name: make_module() for name in ["system", "security", "docker"]}
+    scheduler = StreamingScheduler(runner=runner, max_workers=4)
+
+    results = scheduler.execute(graph, make_factory(modules))
+
+    assert all(r.success for r in results.values())
+    assert order == ["system", "security", "docker"]
+
+
+def test_scheduler_does_not_wait_for_unrelated_slow_module():
+    """Test a ready module starts while an unrelated slow module is still running."""
+    graph = DependencyGraph()
+    graph.add_module("system")
+    graph.add_module("desktop", ["system"])
+    graph.add_module("python", ["system"])
+    graph.add_module("vscode", ["python"])
+
+    modules = {
+        "system": make_module(),
+        "desktop": make_module(0.4),
+        "python": make_module(0.05),
+        "vscode": make_module(),
+    }
+    executor = HybridExecutor(max_workers=4)
+    scheduler = StreamingScheduler(runner=executor.execute_one, max_workers=4)
+
+    results = scheduler.execute(graph, make_factory(modules))
+
+    assert results["vscode"].completed_at < results["desktop"].completed_at
+
+
+def test_scheduler_orders_ready_queue_by_critical_path():
+    """Test the module heading the longest chain is launched first."""
+    graph = DependencyGraph()
+    graph.add_module("short")
+    graph.add_module("long")
+    graph.add_module("after_long", ["long"])
+
+    scheduler = StreamingScheduler(
+        runner=Mock(), durations={"short": 10.0, "long": 5.0, "after_long": 20.0}
+    )
+
+    priorities = scheduler.compute_priorities(graph)
+
+    assert priorities["long"] == 25.0
+    assert priorities["short"] == 10.0
+
+    launched = []
+
+    def runner(context, callback):
+        launched.append(context.module_name)
+        return HybridExecutor().execute_one(context, callback)
+
+    modules = {name: make_module() for name in ["short", "long", "after_long"]}
+    scheduler.runner = runner
+    scheduler.max_workers = 1
+    scheduler.execute(graph, make_factory(modules))
+
+    assert launched[0] == "long"
+
+
+def test_scheduler_runs_force_sequential_module_alone():
+    """Test force_sequential modules never overlap with other modules."""
+    graph = DependencyGraph()
+    graph.add_module("a")
+    graph.add_module("b")
+    graph.add_module("netdata", force_sequential=True)
+
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def runner(context, callback):
+        with lock:
+            active.append(context.module_name)
+            if "netdata" in active and len(active) > 1:
+                overlaps.append(list(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(context.module_name)
+        return HybridExecutor().execute_one(context, callback)
+
+    modules = {name: make_module() for name in ["a", "b", "netdata"]}
+    scheduler = StreamingScheduler(runner=runner, max_workers=4)
+
+    results = scheduler.execute(graph, make_factory(modules))
+
+    assert len(results) == 3
+    assert overlaps == []
+
+
+def test_scheduler_skips_dependents_of_failed_module():
+    """Test dependents of a failed module are never started."""
+    graph = DependencyGraph()
+    graph.add_module("system")
+    graph.add_module("docker", ["system"])
+
+    modules = {"system": make_module(success=False), "docker": make_module()}
+    scheduler = StreamingScheduler(runner=HybridExecutor().execute_one)
+
+    results = scheduler.execute(graph, make_factory(modules))
+
+    assert results["system"].success is False
+    assert "docker" not in results
+    modules["docker"].configure.assert_not_called()
+
+
+def test_scheduler_converts_runner_exception_to_failure():
+    """Test unexpected runner errors are reported as failed results."""
+    graph = DependencyGraph()
+    graph.add_module("system")
+
+    runner = Mock(side_effect=RuntimeError("boom"))
+    scheduler = StreamingScheduler(runner=runner)
+
+    results = scheduler.execute(graph, make_factory({"system": make_module()}))
+
+    assert results["system"].success is False
+    assert isinstance(results["system"].error, RuntimeError)
+
+
+def test_scheduler_detects_cycles():
+    """Test circular dependencies raise ValueError."""
+    graph = DependencyGraph()
+    graph.add_module("a", ["b"])
+    graph.add_module("b", ["a"])
+
+    scheduler = StreamingScheduler(runner=Mock())
+
+    with pytest.raises(ValueError, match="Circular dependency"):
+        scheduler.execute(graph, Mock())
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+
+import pytest
+
+from configurator.core.execution.steps import ModuleStep, run_step_graph, step_dependencies
+
+logger = logging.getLogger("test")
+
+
+def recording_step(name, log, result=True, delay=0.0, **kwargs):
+    """Step that appends its name to log when it runs."""
+
+    def run():
+        time.sleep(delay)
+        log.append(name)
+        return result
+
+    return ModuleStep(name, run, **kwargs)
+
+
+def test_step_dependencies_default_to_previous_step():
+    """Test steps without depends_on depend on the step before them."""
+    steps = [
+        ModuleStep("a", lambda: True),
+        ModuleStep("b", lambda: True),
+        ModuleStep("c", lambda: True, depends_on=[]),
+    ]
+
+    assert step_dependencies(steps) == {"a": [], "b": ["a"], "c": []}
+
+
+def test_step_dependencies_reject_unknown_step():
+    """Test depending on an unknown step raises ValueError."""
+    steps = [ModuleStep("a", lambda: True, depends_on=["missing"])]
+
+    with pytest.raises(ValueError, match="missing"):
+        step_dependencies(steps)
+
+
+def test_run_step_graph_runs_independent_steps_concurrently():
+    """Test independent steps overlap up to max_workers."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wait_for_others():
+        barrier.wait()
+        return True
+
+    steps = [ModuleStep(name, wait_for_others, depends_on=[]) for name in ("a", "b", "c")]
+
+    results = run_step_graph(steps, logger, max_workers=3)
+
+    assert results == {"a": True, "b": True, "c": True}
+
+
+def test_run_step_graph_respects_dependencies():
+    """Test a step starts only after the steps it depends on."""
+    log = []
+    steps = [
+        recording_step("base", log, delay=0.05, depends_on=[]),
+        recording_step("left", log, depends_on=["base"]),
+        recording_step("right", log, depends_on=["base"]),
+        recording_step("join", log, depends_on=["left", "right"]),
+    ]
+
+    results = run_step_graph(steps, logger, max_workers=4)
+
+    assert all(results.values())
+    assert log[0] == "base"
+    assert log[-1] == "join"
+
+
+def test_run_step_graph_stops_after_critical_failure():
+    """Test no new steps start after a critical step fails."""
+    log = []
+    steps = [
+        recording_step("a", log, result=False, depends_on=[]),
+        recording_step("b", log, depends_on=["a"]),
+    ]
+
+    results = run_step_graph(steps, logger, max_workers=2)
+
+    assert results == {"a": False}
+    assert log == ["a"]
+
+
+def test_run_step_graph_continues_after_non_critical_failure():
+    """Test dependents still run when a non-critical step fails."""
+    log = []
+    steps = [
+        recording_step("a", log, result=False, critical=False),
+        recording_step("b", log),
+    ]
+
+    results = run_step_graph(steps, logger, max_workers=2)
+
+    assert results == {"a": False, "b": True}
+
+
+def test_run_step_graph_skips_completed_steps():
+    """Test skipped steps count as succeeded and do not run."""
+    log = []
+    completed = []
+    steps = [recording_step("a", log), recording_step("b", log)]
+
+    results = run_step_graph(
+        steps, logger, skip={"a"}, on_complete=lambda step: completed.append(step.name)
+    )
+
+    assert results == {"a": True, "b": True}
+    assert log == ["b"]
+    assert completed == ["b"]
+
+
+def test_run_step_graph_rejects_cycles():
+    """Test cyclic dependencies raise ValueError."""
+    steps = [
+        ModuleStep("a", lambda: True, depends_on=["b"]),
+        ModuleStep("b", lambda: True, depends_on=["a"]),
+    ]
+
+    with pytest.raises(ValueError, match="Cyclic"):
+        run_step_graph(steps, logger, max_workers=2)
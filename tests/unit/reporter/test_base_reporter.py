@@ -1,8 +1,19 @@
 import pytest
 
 from configurator.core.reporter.base import ReporterInterface
+from configurator.core.reporter.console import ConsoleReporter
 
 
 def test_reporter_interface_is_abstract():
     with pytest.raises(TypeError):
         ReporterInterface()
+
+
+def test_console_reporter_shows_eta_once_per_module(capsys):
+    reporter = ConsoleReporter()
+
+    reporter.show_eta(200.0, "docker", 45.0)
+    reporter.show_eta(190.0, "docker", 35.0)
+    reporter.show_eta(120.0, "python", 20.0)
+
+    assert capsys.readouterr().out.splitlines() == ["  ETA 3m 20s", "  ETA 2m 00s"]
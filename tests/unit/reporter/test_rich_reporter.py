@@ -1,5 +1,8 @@
+import io
 from unittest.mock import MagicMock, Mock
 
+from rich.console import Console
+
 from configurator.core.reporter.rich_reporter import RichProgressReporter
 
 
@@ -38,3 +41,15 @@ def test_rich_reporter_summary():
     reporter.show_summary({"mod1": True, "mod2": False})
     # Should print a table
     assert console.print.called
+
+
+def test_rich_reporter_show_eta():
+    reporter = RichProgressReporter(console=Console(file=io.StringIO()))
+    reporter.show_eta(200.0, "docker", 45.0)
+
+    task = reporter.progress.tasks[0]
+    assert task.fields["status"] == "ETA 3m 20s (docker: 45s)"
+
+    reporter.show_eta(30.0)
+    assert len(reporter.progress.tasks) == 1
+    assert reporter.progress.tasks[0].fields["status"] == "ETA 30s"
@@ -0,0 +1,111 @@
+"""
+Unit tests for module duration statistics and ETA estimation.
+"""
+
+from configurator.core.state.history import (
+    DurationStats,
+    EtaEstimator,
+    format_eta,
+    percentile,
+)
+from configurator.observability.dashboard import InstallationDashboard
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_percentile_interpolates():
+    values = [10.0, 20.0, 30.0, 40.0]
+
+    assert percentile(values, 0) == 10.0
+    assert percentile(values, 50) == 25.0
+    assert percentile(values, 100) == 40.0
+    assert percentile([], 50) == 0.0
+
+
+def test_duration_stats_from_recent_first():
+    stats = DurationStats.from_durations("docker", [30.0, 10.0, 20.0])
+
+    assert stats.last == 30.0
+    assert stats.mean == 20.0
+    assert stats.expected == 20.0
+    assert stats.p90 == 28.0
+
+
+def test_format_eta():
+    assert format_eta(45) == "45s"
+    assert format_eta(200) == "3m 20s"
+    assert format_eta(3720) == "1h 02m"
+    assert format_eta(-5) == "0s"
+
+
+def test_eta_follows_critical_path():
+    clock = FakeClock()
+    eta = EtaEstimator(
+        modules=["system", "docker", "desktop"],
+        expected={"system": 10.0, "docker": 30.0, "desktop": 100.0},
+        dependencies={"docker": ["system"], "desktop": ["system"]},
+        workers=4,
+        clock=clock,
+    )
+
+    # system, then desktop on the longest chain
+    assert eta.total_remaining() == 110.0
+
+    eta.start("system")
+    clock.now = 4.0
+    assert eta.module_remaining("system") == 6.0
+    assert eta.total_remaining() == 106.0
+
+    eta.finish("system")
+    eta.start("desktop")
+    clock.now = 50.0
+    assert eta.total_remaining() == 54.0
+
+
+def test_eta_limited_by_workers():
+    eta = EtaEstimator(
+        modules=["a", "b", "c"], expected={"a": 10.0, "b": 10.0}, workers=1, default_duration=40.0
+    )
+
+    assert eta.total_remaining() == 60.0
+
+
+def test_eta_overrun_module_counts_as_zero():
+    clock = FakeClock()
+    eta = EtaEstimator(modules=["a"], expected={"a": 10.0}, clock=clock)
+
+    eta.start("a")
+    clock.now = 25.0
+
+    assert eta.total_remaining() == 0.0
+
+
+def test_dashboard_shows_estimator_etas():
+    clock = FakeClock()
+    eta = EtaEstimator(
+        modules=["system", "docker"],
+        expected={"system": 10.0, "docker": 200.0},
+        dependencies={"docker": ["system"]},
+        clock=clock,
+    )
+    dashboard = InstallationDashboard()
+    dashboard.update_module("system", "success", 100, duration=9.0)
+    dashboard.update_module("docker", "running", 10)
+
+    eta.finish("system")
+    eta.start("docker")
+    clock.now = 20.0
+    dashboard.update_eta(eta)
+
+    assert dashboard.eta == 180.0
+    assert dashboard.modules["docker"]["eta"] == 180.0
+
+    with dashboard.console.capture() as capture:
+        dashboard.console.print(dashboard._render_modules())
+    assert "3m 00s" in capture.get()
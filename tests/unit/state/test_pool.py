@@ -0,0 +1,82 @@
+"""
+Unit tests for the state database connection pool.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from configurator.core.state.manager import StateManager
+from configurator.core.state.pool import ConnectionPool
+
+
+class TestConnectionPool:
+    """Tests for ConnectionPool."""
+
+    def test_file_database_uses_wal(self, tmp_path):
+        """Test file databases are opened in WAL mode."""
+        pool = ConnectionPool(tmp_path / "state.db")
+
+        mode = pool.connection().execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+        pool.close()
+
+    def test_connection_is_reused_per_thread(self, tmp_path):
+        """Test each thread gets its own persistent connection."""
+        pool = ConnectionPool(tmp_path / "state.db")
+        other = []
+
+        thread = threading.Thread(target=lambda: other.append(pool.connection()))
+        thread.start()
+        thread.join()
+
+        assert pool.connection() is pool.connection()
+        assert other[0] is not pool.connection()
+        pool.close()
+
+    def test_nested_transactions_commit_once(self, tmp_path):
+        """Test only the outermost transaction commits."""
+        pool = ConnectionPool(tmp_path / "state.db")
+        with pool.transaction() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        reader = sqlite3.connect(str(tmp_path / "state.db"))
+        with pool.transaction() as conn:
+            with pool.transaction() as inner:
+                inner.execute("INSERT INTO t VALUES (1)")
+            assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+        assert reader.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+        reader.close()
+        pool.close()
+
+    def test_transaction_rolls_back_on_error(self):
+        """Test a failing transaction leaves no writes behind."""
+        pool = ConnectionPool(":memory:")
+        with pool.transaction() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+        with pytest.raises(RuntimeError):
+            with pool.transaction() as conn:
+                conn.execute("INSERT INTO t VALUES (1)")
+                raise RuntimeError("boom")
+
+        assert pool.connection().execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_state_manager_batch_commits_together(tmp_path):
+    """Test writes inside StateManager.batch() are committed together."""
+    manager = StateManager(db_path=tmp_path / "state.db")
+    manager.start_installation(profile="advanced")
+    reader = sqlite3.connect(str(tmp_path / "state.db"))
+
+    with manager.batch():
+        manager.update_module("docker", progress=10)
+        manager.update_module("python", progress=20)
+        assert reader.execute("SELECT COUNT(*) FROM modules").fetchone()[0] == 0
+
+    assert reader.execute("SELECT COUNT(*) FROM modules").fetchone()[0] == 2
+    reader.close()
+    manager.close()
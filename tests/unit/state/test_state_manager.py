@@ -4,8 +4,9 @@ Unit tests for StateManager.
 
 import pytest
 
+from configurator.core.state.history import HISTORY_RETAIN
 from configurator.core.state.manager import StateManager
-from configurator.core.state.models import ModuleStatus
+from configurator.core.state.models import ModuleState, ModuleStatus
 
 
 class TestStateManager:
@@ -191,3 +192,73 @@ class TestStateManager:
 
         with pytest.raises(RuntimeError, match="No active installation"):
             manager.update_module("docker", status=ModuleStatus.RUNNING)
+
+    def test_get_module_durations_averages_completed_runs(self):
+        """Test historical durations only average completed module runs."""
+        manager = StateManager(db_path=":memory:")
+
+        for duration in (10.0, 20.0):
+            manager.start_installation(profile="advanced")
+            manager.current_state.modules["docker"] = ModuleState(
+                name="docker", status=ModuleStatus.COMPLETED, duration_seconds=duration
+            )
+            manager._persist_module_state("docker", manager.current_state.modules["docker"])
+            manager.current_state.modules["desktop"] = ModuleState(
+                name="desktop", status=ModuleStatus.FAILED, duration_seconds=99.0
+            )
+            manager._persist_module_state("desktop", manager.current_state.modules["desktop"])
+            manager.complete_installation(success=False)
+
+        durations = manager.get_module_durations()
+
+        assert durations == {"docker": 15.0}
+
+    def test_duration_history_uses_median_of_recent_runs(self):
+        """Test expected durations come from the duration history median."""
+        manager = StateManager(db_path=":memory:")
+        manager.start_installation(profile="advanced")
+
+        for duration in (10.0, 12.0, 100.0):
+            manager.record_duration("docker", duration)
+        manager.record_duration("docker", 500.0, success=False)
+
+        stats = manager.get_duration_stats()["docker"]
+        assert stats.samples == 3
+        assert stats.p50 == 12.0
+        assert stats.last == 100.0
+        assert manager.get_module_durations() == {"docker": 12.0}
+
+    def test_duration_history_falls_back_to_other_profiles(self):
+        """Test profiles without history use runs from other profiles on the same host."""
+        manager = StateManager(db_path=":memory:")
+        manager.record_duration("docker", 30.0, profile="beginner")
+        manager.record_duration("docker", 60.0, profile="advanced")
+        manager.record_duration("docker", 90.0, profile="advanced")
+
+        assert manager.get_duration_stats(profile="advanced")["docker"].scope == "exact"
+        assert manager.get_module_durations(profile="advanced")["docker"] == 75.0
+
+        stats = manager.get_duration_stats(profile="custom")["docker"]
+        assert stats.scope == "host"
+        assert stats.samples == 3
+
+    def test_duration_history_is_pruned(self):
+        """Test only the most recent runs are retained per module."""
+        manager = StateManager(db_path=":memory:")
+        for i in range(HISTORY_RETAIN + 5):
+            manager.record_duration("docker", float(i), profile="advanced")
+
+        with manager._get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM module_durations").fetchone()[0]
+
+        assert count == HISTORY_RETAIN
+
+    def test_update_module_records_duration(self):
+        """Test finished modules are added to the duration history."""
+        manager = StateManager(db_path=":memory:")
+        manager.start_installation(profile="advanced")
+
+        manager.update_module("docker", status=ModuleStatus.RUNNING)
+        manager.update_module("docker", status=ModuleStatus.COMPLETED)
+
+        assert "docker" in manager.get_duration_stats()
@@ -8,8 +8,13 @@ import unittest
 import unittest.mock
 from pathlib import Path
 
-from configurator.core.package_cache import CachedPackage, PackageCacheManager
+from configurator.core.package_cache import (
+    CachedPackage,
+    PackageCacheManager,
+    parse_deb_filename,
+)
 from configurator.utils.apt_cache import AptCacheIntegration
+from configurator.utils.deb_prefetch import DebDownload
 
 
 class TestAptCacheIntegration(unittest.TestCase):
@@ -31,9 +36,28 @@ class TestAptCacheIntegration(unittest.TestCase):
         # Patch the constant to point to our test dir
         self.integration.APT_ARCHIVES_DIR = self.apt_dir
 
+        # APT resolution unavailable unless a test provides it
+        patcher = unittest.mock.patch(
+            "configurator.utils.apt_cache.resolve_downloads", return_value=None
+        )
+        self.resolve_downloads = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def tearDown(self):
         shutil.rmtree(self.test_dir)
 
+    def real_cache(self) -> PackageCacheManager:
+        manager = PackageCacheManager(cache_dir=self.cache_dir, logger=unittest.mock.MagicMock())
+        self.integration.cache_manager = manager
+        return manager
+
+    def cache_archive(self, manager: PackageCacheManager, filename: str, content: bytes):
+        deb = Path(self.test_dir) / filename
+        deb.write_bytes(content)
+        name, version, _ = parse_deb_filename(filename)
+        manager.add_package(name, version, deb, "http://url")
+        deb.unlink()
+
     def test_prepare_apt_cache(self):
         """Test restoring packages to APT cache."""
         # Setup mock package in custom cache
@@ -95,6 +119,19 @@ class TestAptCacheIntegration(unittest.TestCase):
             self.assertEqual(count, 0)
             mock_copy.assert_not_called()
 
+    def test_prepare_apt_cache_links_cached_packages(self):
+        """Test that restores hardlink from a real cache instead of copying."""
+        manager = self.real_cache()
+        self.cache_archive(manager, "testpackage_1.0_amd64.deb", b"content" * 100)
+
+        with unittest.mock.patch("shutil.copy2") as mock_copy:
+            count = self.integration.prepare_apt_cache(["testpackage"])
+
+        self.assertEqual(count, 1)
+        mock_copy.assert_not_called()
+        restored = self.apt_dir / "testpackage_1.0_amd64.deb"
+        self.assertTrue(restored.samefile(manager.get_package("testpackage", "1.0")))
+
     def test_capture_new_packages(self):
         """Test capturing new packages from APT cache."""
         # Create a new deb file in APT dir
@@ -104,7 +141,7 @@ class TestAptCacheIntegration(unittest.TestCase):
             f.write(b"new content")
 
         # Mock manager says it doesn't have it
-        self.mock_manager.has_package.return_value = False
+        self.mock_manager.missing_packages.side_effect = lambda packages: packages
         self.mock_manager.add_package.return_value = True
 
         # Run capture
@@ -125,13 +162,48 @@ class TestAptCacheIntegration(unittest.TestCase):
             f.write(b"content")
 
         # Mock manager says it HAS it
-        self.mock_manager.has_package.return_value = True
+        self.mock_manager.missing_packages.return_value = []
 
         count = self.integration.capture_new_packages()
 
         self.assertEqual(count, 0)
         self.mock_manager.add_package.assert_not_called()
 
+    def test_prepare_apt_cache_restores_exact_versions(self):
+        """Test that only the versions APT resolves are restored, under APT's filenames."""
+        manager = self.real_cache()
+        self.cache_archive(manager, "git_1%3a2.39.2-1.1_amd64.deb", b"git 2.39" * 100)
+        self.cache_archive(manager, "git_1%3a2.30.2-1_amd64.deb", b"git 2.30" * 100)
+        self.cache_archive(manager, "curl_7.88.1-10_i386.deb", b"curl i386" * 100)
+
+        self.resolve_downloads.return_value = [
+            DebDownload("http://deb/git.deb", "git_1%3a2.39.2-1.1_amd64.deb", 800),
+            DebDownload("http://deb/curl.deb", "curl_7.88.1-10_amd64.deb", 900),
+        ]
+        count = self.integration.prepare_apt_cache(["git", "curl"])
+
+        self.assertEqual(count, 1)
+        self.assertEqual([p.name for p in self.apt_dir.iterdir()], ["git_1%3a2.39.2-1.1_amd64.deb"])
+        self.assertEqual(
+            (self.apt_dir / "git_1%3a2.39.2-1.1_amd64.deb").read_bytes(), b"git 2.39" * 100
+        )
+
+    def test_capture_parses_epochs_in_one_batch(self):
+        """Test capture of escaped epoch versions with a single cache lookup."""
+        (self.apt_dir / "git_1%3a2.39.2-1.1_amd64.deb").write_bytes(b"git")
+        (self.apt_dir / "lock").write_bytes(b"")
+        self.mock_manager.missing_packages.side_effect = lambda packages: packages
+        self.mock_manager.add_package.return_value = True
+
+        self.assertEqual(self.integration.capture_new_packages(), 1)
+
+        self.mock_manager.missing_packages.assert_called_once_with(
+            [("git", "1:2.39.2-1.1", "amd64")]
+        )
+        self.mock_manager.has_package.assert_not_called()
+        kwargs = self.mock_manager.add_package.call_args[1]
+        self.assertEqual((kwargs["version"], kwargs["arch"]), ("1:2.39.2-1.1", "amd64"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock, patch
+
+from configurator.core.apt_transaction import AptTransactionPlanner
+from configurator.modules.base import ConfigurationModule
+from configurator.utils.apt_update import AptUpdateTracker
+from configurator.utils.command import CommandResult
+
+POLICY_OUTPUT = """git:
+  Installed: (none)
+  Candidate: 1:2.39.2-1.1
+  Version table:
+curl:
+  Installed: 7.88.1-10
+  Candidate: 7.88.1-10
+caddy:
+  Installed: (none)
+  Candidate: (none)
+"""
+
+
+class PackagesModule(ConfigurationModule):
+    name = "Packages Module"
+
+    def __init__(self, packages, **kwargs):
+        super().__init__(config={}, **kwargs)
+        self.packages = packages
+
+    def planned_packages(self):
+        return self.packages
+
+    def validate(self):
+        return True
+
+    def configure(self):
+        return True
+
+    def verify(self):
+        return True
+
+
+def fake_apt(commands, fail_install=False):
+    def run(command, check=False, env=None):
+        commands.append(command)
+        if command.startswith("apt-cache policy"):
+            return CommandResult(command=command, return_code=0, stdout=POLICY_OUTPUT, stderr="")
+        failed = fail_install and command.startswith("apt-get install -y git")
+        return CommandResult(command=command, return_code=1 if failed else 0, stdout="", stderr="")
+
+    return run
+
+
+def test_plan_attributes_shared_packages_to_first_module():
+    planner = AptTransactionPlanner(rollback_manager=MagicMock())
+    modules = {
+        "git": PackagesModule(["git", "curl"]),
+        "web": PackagesModule(["curl", "caddy"]),
+        "mock": MagicMock(),
+    }
+    modules["git"].name = "Git"
+    modules["web"].name = "Web"
+
+    package_sets = planner.discover(modules)
+    transaction = planner.plan(package_sets)
+
+    assert package_sets == {"Git": ["git", "curl"], "Web": ["curl", "caddy"]}
+    assert transaction.packages == ["git", "curl", "caddy"]
+    assert transaction.packages_for("Git") == ["git", "curl"]
+    assert transaction.packages_for("Web") == ["caddy"]
+
+
+def test_execute_installs_batch_once_and_attributes_rollback(tmp_path):
+    rollback_manager = MagicMock()
+    tracker = AptUpdateTracker(ttl=0, state_file=tmp_path / "apt-update.json")
+    planner = AptTransactionPlanner(rollback_manager=rollback_manager, apt_update_tracker=tracker)
+    planner.plan({"Git": ["git"], "Web": ["curl", "caddy"]})
+
+    commands = []
+    with patch("configurator.core.apt_transaction.run_command", side_effect=fake_apt(commands)):
+        assert planner.execute() is True
+
+    assert commands == [
+        "apt-get update",
+        "apt-cache policy git curl caddy",
+        "apt-get install -y --download-only git curl",
+        "apt-get install -y git curl",
+    ]
+    # caddy has no candidate yet, its module installs it after adding the repository
+    assert planner.covered(["git", "curl", "caddy"]) == ["git", "curl"]
+
+    calls = rollback_manager.add_package_remove.call_args_list
+    assert [(c.args[0], c.kwargs["module"]) for c in calls] == [(["git"], "Git"), (["curl"], "Web")]
+
+
+def test_failed_transaction_falls_back_to_modules(tmp_path):
+    tracker = AptUpdateTracker(ttl=0, state_file=tmp_path / "apt-update.json")
+    planner = AptTransactionPlanner(rollback_manager=MagicMock(), apt_update_tracker=tracker)
+    planner.plan({"Git": ["git", "curl"]})
+
+    commands = []
+    with patch(
+        "configurator.core.apt_transaction.run_command",
+        side_effect=fake_apt(commands, fail_install=True),
+    ):
+        assert planner.execute() is False
+
+    assert planner.covered(["git", "curl"]) == []
+    planner.rollback_manager.add_package_remove.assert_not_called()
+
+
+def test_install_packages_skips_packages_from_transaction():
+    planner = AptTransactionPlanner(rollback_manager=MagicMock())
+    planner.plan({"Packages Module": ["git", "curl"]})
+    planner.transaction.installed = True
+
+    module = PackagesModule(["git", "curl"], apt_transaction_planner=planner)
+    module.run = MagicMock()
+
+    assert module.install_packages(["git", "curl"]) is True
+
+    module.run.assert_not_called()
+    assert module.installed_packages == ["git", "curl"]
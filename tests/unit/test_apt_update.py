@@ -0,0 +1,116 @@
+import logging
+import os
+import subprocess
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from configurator.core.network import NetworkOperationWrapper
+from configurator.utils.apt_update import AptUpdateTracker
+
+
+@pytest.fixture
+def sources(tmp_path):
+    sources_list = tmp_path / "sources.list"
+    sources_list.write_text("deb http://deb.debian.org/debian trixie main\n")
+    sources_dir = tmp_path / "sources.list.d"
+    sources_dir.mkdir()
+    return [sources_list, sources_dir]
+
+
+@pytest.fixture
+def lists(tmp_path):
+    lists_dir = tmp_path / "lists"
+    lists_dir.mkdir()
+    (lists_dir / "deb.debian.org_debian_dists_trixie_InRelease").write_text("Origin: Debian\n")
+    return lists_dir
+
+
+def make_tracker(tmp_path, sources, ttl=3600):
+    return AptUpdateTracker(
+        ttl=ttl, state_file=tmp_path / "state.json", sources=sources, lists_dir=tmp_path / "lists"
+    )
+
+
+def test_update_skipped_within_ttl(tmp_path, sources, lists):
+    tracker = make_tracker(tmp_path, sources)
+    run_update = MagicMock(return_value=True)
+
+    assert tracker.update(run_update) is True
+    assert tracker.update(run_update) is True
+    assert tracker.update(run_update, force=True) is True
+
+    assert run_update.call_count == 2
+
+
+def test_update_runs_after_ttl_expires(tmp_path, sources):
+    tracker = make_tracker(tmp_path, sources)
+    run_update = MagicMock(return_value=True)
+
+    tracker.update(run_update)
+    tracker._updated_at -= 3601
+    tracker.update(run_update)
+
+    assert run_update.call_count == 2
+
+
+def test_new_repository_forces_update(tmp_path, sources, lists):
+    tracker = make_tracker(tmp_path, sources)
+    tracker.mark_updated()
+    assert tracker.is_fresh()
+
+    (sources[1] / "docker.list").write_text(
+        "deb https://download.docker.com/linux/debian trixie stable\n"
+    )
+
+    assert not tracker.is_fresh()
+
+
+def test_freshness_persists_across_runs(tmp_path, sources, lists):
+    make_tracker(tmp_path, sources).mark_updated()
+
+    assert make_tracker(tmp_path, sources).is_fresh()
+    assert not make_tracker(tmp_path, sources, ttl=0).is_fresh()
+
+
+def test_failed_update_is_not_recorded(tmp_path, sources):
+    tracker = make_tracker(tmp_path, sources)
+
+    assert tracker.update(MagicMock(return_value=False)) is False
+    assert not tracker.is_fresh()
+
+
+def test_missing_lists_force_update(tmp_path, sources, lists):
+    tracker = make_tracker(tmp_path, sources)
+    tracker.mark_updated()
+    assert tracker.is_fresh()
+
+    release = next(lists.iterdir())
+    os.utime(release, (0, 0))
+    assert not tracker.is_fresh()
+
+    release.unlink()
+    assert not tracker.is_fresh()
+
+
+def test_concurrent_network_updates_run_once(tmp_path, sources, lists):
+    wrapper = NetworkOperationWrapper(
+        {}, logging.getLogger("test"), apt_update_tracker=make_tracker(tmp_path, sources)
+    )
+    calls = []
+
+    def apt_get_update(*args, **kwargs):
+        calls.append(args[0])
+        time.sleep(0.1)
+        return subprocess.CompletedProcess(args[0], 0, "", "")
+
+    with patch("configurator.core.network.subprocess.run", side_effect=apt_get_update):
+        threads = [threading.Thread(target=wrapper.apt_update_with_retry) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert calls == [["apt-get", "update"]]
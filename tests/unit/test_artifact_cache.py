@@ -0,0 +1,194 @@
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from configurator.core.artifact_cache import ArtifactCacheManager, ArtifactVerificationError
+from configurator.security.supply_chain import SecureDownloader, SupplyChainValidator
+
+
+class Origin:
+    """Local HTTP server serving artifacts with ETags."""
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                origin.requests.append((self.path, dict(self.headers)))
+                body = origin.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+
+@pytest.fixture
+def origin():
+    origin = Origin()
+    yield origin
+    origin.server.shutdown()
+    origin.server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCacheManager(cache_dir=tmp_path / "artifacts", max_size_gb=1.0)
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_second_fetch_served_from_cache(origin, cache, tmp_path):
+    """Test a cached artifact is not downloaded again."""
+    origin.files["/go.tar.gz"] = b"go" * 1000
+
+    for name in ("first", "second"):
+        dest = cache.fetch(origin.url("/go.tar.gz"), tmp_path / name)
+        assert dest.read_bytes() == b"go" * 1000
+
+    assert len(origin.requests) == 1
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_index_survives_restart(origin, cache, tmp_path):
+    """Test a new cache instance reuses artifacts cached by an earlier one."""
+    origin.files["/nvim"] = b"nvim"
+    cache.fetch(origin.url("/nvim"), tmp_path / "nvim")
+
+    reopened = ArtifactCacheManager(cache_dir=cache.cache_dir)
+    reopened.fetch(origin.url("/nvim"), tmp_path / "nvim2")
+
+    assert len(origin.requests) == 1
+
+
+def test_checksum_mismatch_not_cached(origin, cache, tmp_path):
+    """Test an artifact not matching its pinned checksum is rejected."""
+    origin.files["/font.ttf"] = b"tampered"
+
+    with pytest.raises(ArtifactVerificationError):
+        cache.fetch(origin.url("/font.ttf"), tmp_path / "font.ttf", sha256(b"original"))
+
+    assert cache.list_artifacts() == []
+    assert not (tmp_path / "font.ttf").exists()
+
+
+def test_pinned_artifact_never_revalidated(origin, tmp_path):
+    """Test artifacts pinned to a checksum are served without asking the origin."""
+    origin.files["/go.tar.gz"] = b"go"
+    cache = ArtifactCacheManager(cache_dir=tmp_path / "artifacts", revalidate_after=timedelta(0))
+
+    cache.fetch(origin.url("/go.tar.gz"), tmp_path / "a", sha256(b"go"))
+    cache.fetch(origin.url("/go.tar.gz"), tmp_path / "b", sha256(b"go"))
+
+    assert len(origin.requests) == 1
+
+
+def test_stale_artifact_revalidated_with_etag(origin, tmp_path):
+    """Test an unchanged unpinned artifact costs a 304, not a download."""
+    origin.files["/install.sh"] = b"#!/bin/sh\n"
+    cache = ArtifactCacheManager(cache_dir=tmp_path / "artifacts", revalidate_after=timedelta(0))
+
+    cache.fetch(origin.url("/install.sh"), tmp_path / "a")
+    dest = cache.fetch(origin.url("/install.sh"), tmp_path / "b")
+
+    assert dest.read_bytes() == b"#!/bin/sh\n"
+    assert "If-None-Match" in origin.requests[1][1]
+    assert cache.get_stats()["revalidated"] == 1
+
+
+def test_changed_artifact_downloaded_again(origin, tmp_path):
+    """Test revalidation replaces an artifact that changed upstream."""
+    origin.files["/install.sh"] = b"v1"
+    cache = ArtifactCacheManager(cache_dir=tmp_path / "artifacts", revalidate_after=timedelta(0))
+    cache.fetch(origin.url("/install.sh"), tmp_path / "a")
+
+    origin.files["/install.sh"] = b"v2"
+    dest = cache.fetch(origin.url("/install.sh"), tmp_path / "b")
+
+    assert dest.read_bytes() == b"v2"
+    assert len(cache.list_artifacts()) == 1
+
+
+def test_least_recently_used_evicted(origin, tmp_path):
+    """Test the least recently used artifact is evicted once the cache is full."""
+    for name in ("a", "b", "c"):
+        origin.files[f"/{name}"] = name.encode() * 400
+    cache = ArtifactCacheManager(cache_dir=tmp_path / "artifacts", max_size_gb=1000 / 1024**3)
+
+    cache.fetch(origin.url("/a"))
+    cache.fetch(origin.url("/b"))
+    cache.fetch(origin.url("/a"))  # a is now more recent than b
+    cache.fetch(origin.url("/c"))
+
+    assert [artifact.url[-2:] for artifact in cache.list_artifacts()] == ["/a", "/c"]
+    assert len(list((cache.cache_dir / "files").iterdir())) == 2
+
+
+def test_hits_rehash_only_when_fingerprint_changes(origin, cache):
+    """Test cached files are rehashed only after they change on disk."""
+    origin.files["/go.tar.gz"] = b"go"
+    path = cache.fetch(origin.url("/go.tar.gz"))
+
+    with patch.object(cache, "_hash_file", wraps=cache._hash_file) as hash_file:
+        cache.fetch(origin.url("/go.tar.gz"))
+        hash_file.assert_not_called()
+
+        path.write_bytes(b"corrupted")
+        cache.fetch(origin.url("/go.tar.gz"))
+        hash_file.assert_called_once()
+
+    # The corrupt copy was dropped and downloaded again
+    assert path.read_bytes() == b"go"
+    assert len(origin.requests) == 2
+
+
+def test_validator_reuses_download_hash(origin, cache, tmp_path):
+    """Test the supply chain validator never rehashes cached artifacts."""
+    origin.files["/meslo.zip"] = b"font"
+    validator = SupplyChainValidator({}, logging.getLogger("test"))
+    validator.checksum_db_path = tmp_path / "checksums.db"
+    downloader = SecureDownloader(validator, logging.getLogger("test"), artifact_cache=cache)
+
+    with (
+        patch.object(validator, "validate_url", return_value=True),
+        patch.object(validator, "compute_checksum") as compute_checksum,
+    ):
+        for name in ("first", "second"):
+            assert downloader.download_file(
+                origin.url("/meslo.zip"), tmp_path / name, sha256(b"font")
+            )
+
+    compute_checksum.assert_not_called()
+    assert [record.checksum_sha256 for record in validator.download_history] == [
+        sha256(b"font"),
+        sha256(b"font"),
+    ]
+    assert len(origin.requests) == 1
@@ -63,3 +63,13 @@ def test_permissions(tmp_path):
     with patch("os.chmod") as mock_chmod:
         AuditLogger(log_path=log_file)
         mock_chmod.assert_called()  # Should set permissions on init if file missing/folder created
+
+
+def test_query_reads_sealed_segments(audit_logger):
+    audit_logger.log_event(AuditEventType.USER_CREATE, "Yesterday")
+    audit_logger._store.rotate()
+    audit_logger.log_event(AuditEventType.PACKAGE_INSTALL, "Today")
+
+    events = audit_logger.query_events(event_type=AuditEventType.USER_CREATE)
+    assert [e["description"] for e in events] == ["Yesterday"]
+    assert len(audit_logger.query_events()) == 2
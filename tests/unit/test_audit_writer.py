@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from configurator.core.audit_writer import AuditWriter, FileSink
+
+
+@pytest.fixture
+def writer():
+    """Writer with a long flush interval, so only explicit triggers write."""
+    writer = AuditWriter(batch_lines=100, flush_interval=60)
+    yield writer
+    writer.close()
+
+
+def read_actions(path):
+    return [json.loads(line)["action"] for line in path.read_text().splitlines()]
+
+
+def test_buffered_entries_written_in_one_batch(tmp_path, writer):
+    """Test buffered entries are written together on flush."""
+    log = tmp_path / "team-audit.log"
+
+    with patch.object(
+        FileSink, "write_lines", autospec=True, side_effect=FileSink.write_lines
+    ) as w:
+        for i in range(10):
+            writer.write(log, {"action": f"add_member-{i}"})
+        assert writer.flush(timeout=5)
+
+    assert w.call_count == 1
+    assert read_actions(log) == [f"add_member-{i}" for i in range(10)]
+
+
+def test_durable_write_is_fsynced_before_returning(tmp_path, writer):
+    """Test a durable entry and everything queued before it are synced on return."""
+    log = tmp_path / "team-audit.log"
+
+    with patch("configurator.core.audit_writer.os.fsync") as fsync:
+        writer.write(log, {"action": "add_member"})
+        writer.write(log, {"action": "delete_team"}, durable=True)
+
+        fsync.assert_called_once()
+    assert read_actions(log) == ["add_member", "delete_team"]
+
+
+def test_batch_size_triggers_write(tmp_path):
+    """Test pending lines are written once the batch size is reached."""
+    log = tmp_path / "team-audit.log"
+    writer = AuditWriter(batch_lines=5, flush_interval=60)
+
+    try:
+        with patch.object(FileSink, "write_lines", autospec=True) as write_lines:
+            written = threading.Event()
+            write_lines.side_effect = lambda *args, **kwargs: written.set()
+            for i in range(5):
+                writer.write(log, {"action": f"add_member-{i}"})
+
+            assert written.wait(timeout=5)
+    finally:
+        writer.close()
+
+
+def test_flush_interval_triggers_write(tmp_path):
+    """Test buffered entries are written once they are flush_interval old."""
+    log = tmp_path / "team-audit.log"
+    writer = AuditWriter(flush_interval=0.05)
+
+    try:
+        writer.write(log, {"action": "add_member"})
+        deadline = time.monotonic() + 5
+        while not log.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert read_actions(log) == ["add_member"]
+    finally:
+        writer.close()
+
+
+def test_close_writes_pending_entries(tmp_path, writer):
+    """Test shutdown writes buffered entries."""
+    log = tmp_path / "team-audit.log"
+    writer.write(log, {"action": "create_team"})
+
+    writer.close()
+
+    assert read_actions(log) == ["create_team"]
+    assert not writer.running
+
+
+def test_durable_write_raises_on_failure(tmp_path, writer):
+    """Test durable callers see write errors."""
+    log = tmp_path / "missing" / "team-audit.log"
+
+    with pytest.raises(OSError):
+        writer.write(log, {"action": "delete_team"}, durable=True)
+
+
+def test_full_queue_blocks_instead_of_dropping(tmp_path):
+    """Test writers wait for room in a full queue rather than dropping entries."""
+    log = tmp_path / "team-audit.log"
+    writer = AuditWriter(max_pending=2, batch_lines=1000, flush_interval=60)
+
+    try:
+        for i in range(50):
+            writer.write(log, {"action": f"add_member-{i}"})
+        writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert len(read_actions(log)) == 50
+
+
+def test_concurrent_durable_writers(tmp_path, writer):
+    """Test concurrent durable writes all land, sharing writes where possible."""
+    log = tmp_path / "temp-access-audit.log"
+
+    with patch.object(
+        FileSink, "write_lines", autospec=True, side_effect=FileSink.write_lines
+    ) as w:
+        threads = [
+            threading.Thread(
+                target=writer.write, args=(log, {"action": f"revoke-{i}"}), kwargs={"durable": True}
+            )
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    assert sorted(read_actions(log)) == sorted(f"revoke-{i}" for i in range(20))
+    assert w.call_count <= 20
+
+
+def test_file_created_with_mode(tmp_path, writer):
+    """Test a new audit file gets the requested permissions."""
+    log = tmp_path / "audit.log"
+
+    writer.write(log, {"action": "x"}, durable=True, mode=0o600)
+
+    assert log.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,125 @@
+import hashlib
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from configurator.security.checksum_store import ChecksumStore
+from configurator.security.supply_chain import SupplyChainValidator
+from configurator.utils.file import HashingWriter
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "checksums.db"
+
+
+def test_first_checksum_is_trusted(db):
+    """Test a URL keeps the checksum it was first recorded with."""
+    store = ChecksumStore(db)
+
+    assert store.add("https://example.com/install.sh", "a" * 64)
+    assert not store.add("https://example.com/install.sh", "b" * 64)
+
+    assert store.get("https://example.com/install.sh") == "a" * 64
+    assert ChecksumStore(db).get("https://example.com/install.sh") == "a" * 64
+
+
+def test_legacy_database_format(db):
+    """Test existing URL|CHECKSUM|TIMESTAMP databases are read as before."""
+    db.write_text(
+        "https://example.com/a|aaa|2024-01-01T00:00:00\n"
+        "malformed line\n"
+        "https://example.com/b|bbb\n"
+        "https://example.com/a|zzz|2024-02-01T00:00:00\n"
+    )
+    store = ChecksumStore(db)
+
+    assert store.get("https://example.com/a") == "aaa"
+    assert store.get("https://example.com/b") == "bbb"
+    assert len(store) == 2
+
+
+def test_lookups_parse_file_once(db):
+    """Test repeated lookups do not read the database again."""
+    store = ChecksumStore(db)
+    store.import_entries([(f"https://example.com/{i}", f"{i:064x}") for i in range(100)])
+
+    with patch("builtins.open", side_effect=AssertionError("database read again")):
+        for i in range(100):
+            assert store.get(f"https://example.com/{i}") == f"{i:064x}"
+
+
+def test_lines_appended_elsewhere_are_seen(db):
+    """Test lines appended by another process are read incrementally."""
+    store = ChecksumStore(db)
+    store.add("https://example.com/a", "aaa")
+
+    with open(db, "a") as f:
+        f.write("https://example.com/b|bbb|2024-01-01T00:00:00\n")
+
+    assert store.get("https://example.com/b") == "bbb"
+    assert store.get("https://example.com/a") == "aaa"
+
+
+def test_compaction_removes_duplicates(db):
+    """Test compaction keeps one line per URL and the first checksum."""
+    db.write_text(
+        "".join(f"https://example.com/a|{c * 3}|2024-01-01T00:00:00\n" for c in "abc")
+        + "https://example.com/b|bbb|2024-01-01T00:00:00\n"
+    )
+    store = ChecksumStore(db)
+
+    assert store.compact() == 2
+
+    assert db.read_text().count("https://example.com/a|") == 1
+    assert ChecksumStore(db).get("https://example.com/a") == "aaa"
+
+
+def test_writes_compact_once_duplicates_dominate(db):
+    """Test a write compacts a database made mostly of duplicates."""
+    db.write_text("https://example.com/a|aaa|2024-01-01T00:00:00\n" * 100)
+    store = ChecksumStore(db)
+
+    store.add("https://example.com/b", "bbb")
+
+    assert len(db.read_text().splitlines()) == 2
+
+
+def test_batch_import_replaces_when_asked(db):
+    """Test pinned checksums can replace checksums trusted on first use."""
+    store = ChecksumStore(db)
+    store.add("https://example.com/a", "old")
+
+    imported = store.import_entries(
+        [("https://example.com/a", "new"), ("https://example.com/b", "bbb")], replace=True
+    )
+
+    assert imported == 2
+    assert ChecksumStore(db).get("https://example.com/a") == "new"
+    assert len(db.read_text().splitlines()) == 2
+
+
+def test_validator_uses_store(db):
+    """Test the validator records and looks up checksums through the store."""
+    validator = SupplyChainValidator({}, logging.getLogger("test"))
+    validator.checksum_db_path = db
+
+    validator.store_checksum("https://example.com/a", "aaa")
+
+    assert validator.lookup_checksum("https://example.com/a") == "aaa"
+    assert validator.checksum_store.path == db
+
+
+def test_hashing_writer(tmp_path):
+    """Test the writer hashes exactly the bytes written."""
+    path = tmp_path / "archive.deb"
+
+    with HashingWriter(path, "sha256", "sha512") as writer:
+        writer.write(b"deb")
+        writer.write(b"-data")
+
+    assert path.read_bytes() == b"deb-data"
+    assert writer.size == 8
+    assert writer.hexdigest() == hashlib.sha256(b"deb-data").hexdigest()
+    assert writer.hexdigest("sha512") == hashlib.sha512(b"deb-data").hexdigest()
@@ -0,0 +1,151 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from configurator.cli import main
+from configurator.core.execution.steps import ModuleStep, run_step_graph
+from configurator.observability.metrics import MetricsCollector
+from configurator.observability.profiling import (
+    CommandProfiler,
+    get_command_profiler,
+    module_context,
+    program_name,
+)
+from configurator.utils.command import run_command
+
+
+@pytest.fixture
+def profiler():
+    """Profiler with its own metrics collector."""
+    profiler = CommandProfiler(metrics=MetricsCollector(), top=3)
+    profiler.enable()
+    return profiler
+
+
+@pytest.fixture
+def global_profiler():
+    """Enable the global command profiler for one test."""
+    profiler = get_command_profiler()
+    profiler.enable()
+    yield profiler
+    profiler.disable()
+    profiler.reset()
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        ("apt-get install -y git", "apt-get"),
+        ("DEBIAN_FRONTEND=noninteractive apt-get install -y git", "apt-get"),
+        ("sudo -u alice /usr/bin/git clone repo", "git"),
+        ("timeout 30 curl -fsSL https://example.com", "curl"),
+        ("su - alice -c 'git clone --depth=1 repo dir'", "git"),
+        ("", "?"),
+    ],
+)
+def test_program_name(command, expected):
+    """Test the program is found behind env assignments and wrappers."""
+    assert program_name(command) == expected
+
+
+def test_report_aggregates_by_program_and_module(profiler):
+    """Test invocations are aggregated per program and module."""
+    with module_context("docker"):
+        profiler.record("apt-get install -y docker-ce", 4.0, 0, 2048)
+        profiler.record("apt-get update", 2.0, 100)
+    profiler.record("systemctl restart ssh", 0.5, 0)
+
+    report = profiler.report()
+
+    assert report["commands"] == 3
+    assert report["total_seconds"] == pytest.approx(6.5)
+    apt = report["programs"][0]
+    assert (apt["program"], apt["module"]) == ("apt-get", "docker")
+    assert (apt["count"], apt["failures"], apt["mean_seconds"]) == (2, 1, 3.0)
+    assert report["programs"][1]["module"] == "-"
+
+
+def test_report_keeps_slowest_invocations(profiler):
+    """Test only the slowest invocations are kept, slowest first."""
+    for seconds in (1.0, 5.0, 2.0, 4.0, 3.0):
+        profiler.record(f"sleep {seconds}", seconds, 0)
+
+    slowest = [s["duration_seconds"] for s in profiler.report()["slowest"]]
+
+    assert slowest == [5.0, 4.0, 3.0]
+
+
+def test_records_labeled_histograms(profiler):
+    """Test latency histograms are labeled by program and module."""
+    with module_context("python"):
+        profiler.record("pip install poetry", 12.0, 1)
+
+    output = profiler.metrics.export_prometheus()
+
+    assert 'vps_command_duration_seconds_count{program="pip",module="python"} 1' in output
+    assert 'vps_command_failures_total{program="pip",module="python"} 1' in output
+    assert output.count("# TYPE vps_command_duration_seconds histogram") == 1
+
+
+def test_run_command_is_profiled(global_profiler):
+    """Test run_command reports exit code and output size."""
+    with module_context("system"):
+        run_command("echo hello")
+        run_command("false", check=False)
+
+    report = global_profiler.report()
+    by_program = {s["program"]: s for s in report["programs"]}
+    assert by_program["echo"]["output_bytes"] == len("hello\n")
+    assert by_program["false"]["failures"] == 1
+    assert {s["module"] for s in report["slowest"]} == {"system"}
+
+
+def test_run_command_not_profiled_when_disabled():
+    """Test nothing is recorded while the profiler is disabled."""
+    profiler = get_command_profiler()
+    profiler.reset()
+
+    run_command("true")
+
+    assert profiler.report()["commands"] == 0
+
+
+def test_module_context_reaches_step_threads(global_profiler):
+    """Test steps running on worker threads are attributed to the module."""
+    steps = [
+        ModuleStep(f"step{i}", lambda: run_command("true").success, depends_on=[]) for i in range(3)
+    ]
+
+    with module_context("desktop"):
+        run_step_graph(steps, Mock(), max_workers=3)
+
+    (stats,) = global_profiler.report()["programs"]
+    assert (stats["module"], stats["count"]) == ("desktop", 3)
+
+
+def test_monitoring_commands_shows_report(tmp_path, profiler):
+    """Test 'monitoring commands' lists the slowest commands of a saved profile."""
+    with module_context("docker"):
+        profiler.record("apt-get install -y docker-ce", 42.0, 0)
+    profile_file = tmp_path / "command-profile.json"
+    profiler.save(profile_file)
+
+    result = CliRunner().invoke(
+        main, ["monitoring", "commands", "--file", str(profile_file)], obj={}
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "docker-ce" in result.output
+    assert json.loads(profile_file.read_text())["commands"] == 1
+
+
+def test_monitoring_commands_without_profile(tmp_path):
+    """Test 'monitoring commands' explains how to record a profile."""
+    result = CliRunner().invoke(
+        main, ["monitoring", "commands", "--file", str(tmp_path / "missing.json")], obj={}
+    )
+
+    assert result.exit_code == 1
+    assert "--profile-commands" in result.output
@@ -0,0 +1,208 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from configurator.config import ConfigManager
+from configurator.core.container import Container
+from configurator.core.convergence import ConvergenceTracker
+from configurator.core.installer import Installer
+from configurator.core.state.manager import StateManager
+from configurator.modules.base import ConfigurationModule
+from configurator.modules.docker import DockerModule
+from configurator.modules.git import GitModule
+from configurator.modules.security import SecurityModule
+
+
+class ConvergingModule:
+    name = "converging"
+    priority = 10
+    idempotent = True
+
+    def __init__(self, config=None, managed_file=None, **kwargs):
+        self.config = config or {"enabled": True}
+        self.managed_file = managed_file
+        self.verified = True
+        self.configure_calls = 0
+
+    def validate(self):
+        return True
+
+    def configure(self):
+        self.configure_calls += 1
+        return True
+
+    def verify(self):
+        return self.verified
+
+    def convergence_inputs(self):
+        files = [str(self.managed_file)] if self.managed_file else []
+        return {"config": self.config, "packages": ["git"], "files": files}
+
+
+class FileModule(ConfigurationModule):
+    name = "file"
+    idempotent = True
+    path = None
+
+    def __init__(self, config, **kwargs):
+        super().__init__(config, **kwargs)
+        self.configure_calls = 0
+
+    def validate(self):
+        return True
+
+    def configure(self):
+        self.configure_calls += 1
+        self.write_file(self.path, "setting = 1\n")
+        return True
+
+    def verify(self):
+        return True
+
+
+@pytest.fixture
+def versions():
+    installed = {"git": "1:2.39.2-1.1"}
+    with patch(
+        "configurator.core.convergence.installed_versions",
+        side_effect=lambda packages: {p: installed[p] for p in packages if p in installed},
+    ):
+        yield installed
+
+
+@pytest.fixture
+def tracker():
+    return ConvergenceTracker(StateManager(db_path=":memory:"))
+
+
+def test_unchanged_module_is_converged(tracker, versions, tmp_path):
+    managed = tmp_path / "app.conf"
+    managed.write_text("setting = 1\n")
+    module = ConvergingModule(managed_file=managed)
+
+    assert not tracker.is_converged("converging", module)
+    tracker.record("converging", module)
+
+    assert tracker.is_converged("converging", ConvergingModule(managed_file=managed))
+
+
+def test_changes_break_convergence(tracker, versions, tmp_path):
+    managed = tmp_path / "app.conf"
+    managed.write_text("setting = 1\n")
+    tracker.record("converging", ConvergingModule(managed_file=managed))
+
+    managed.write_text("setting = 2\n")
+    assert not tracker.is_converged("converging", ConvergingModule(managed_file=managed))
+    tracker.record("converging", ConvergingModule(managed_file=managed))
+
+    versions["git"] = "1:2.39.5-0+deb12u1"
+    assert not tracker.is_converged("converging", ConvergingModule(managed_file=managed))
+    tracker.record("converging", ConvergingModule(managed_file=managed))
+
+    changed_config = ConvergingModule(config={"enabled": True, "x": 1}, managed_file=managed)
+    assert not tracker.is_converged("converging", changed_config)
+
+
+def test_failed_verify_breaks_convergence(tracker, versions):
+    tracker.record("converging", ConvergingModule())
+
+    module = ConvergingModule()
+    module.verified = False
+
+    assert not tracker.is_converged("converging", module)
+
+
+def test_non_idempotent_modules_always_run(tracker, versions):
+    module = ConvergingModule()
+    module.idempotent = False
+    tracker.record("converging", module)
+
+    assert tracker.state_manager.get_fingerprint("converging") is None
+    assert not tracker.is_converged("converging", module)
+
+
+def test_installer_skips_converged_modules(versions):
+    config = MagicMock(spec=ConfigManager)
+    config.get_enabled_modules.return_value = ["converging"]
+    config.get.side_effect = lambda key, default=None: (
+        4 if key == "performance.max_workers" else default
+    )
+
+    instances = []
+
+    def make_module(container, config):
+        instances.append(ConvergingModule(config=config))
+        return instances[-1]
+
+    container = Container()
+    container.factory("converging", make_module)
+
+    installer = Installer(config=config, container=container)
+    installer.state_manager = StateManager(db_path=":memory:")
+    installer.convergence_tracker = ConvergenceTracker(installer.state_manager)
+    installer.plugin_manager.load_plugins = MagicMock()
+
+    assert installer.install(skip_validation=True)
+    assert sum(m.configure_calls for m in instances) == 1
+
+    assert installer.install(skip_validation=True)
+    assert sum(m.configure_calls for m in instances) == 1
+
+    assert installer.install(skip_validation=True, force=True)
+    assert sum(m.configure_calls for m in instances) == 2
+
+
+def test_modules_with_untracked_writes_are_not_idempotent():
+    assert ConfigurationModule.idempotent is False
+    assert DockerModule.idempotent is False
+    assert SecurityModule.idempotent is False
+    assert GitModule.idempotent is True
+
+
+def test_git_writes_are_fingerprinted(tracker, versions):
+    module = GitModule(config={})
+    module.run = MagicMock()
+
+    with patch("configurator.utils.file.write_file") as write:
+        module._configure_git()
+
+    write.assert_called_once()
+    files = module.convergence_inputs()["files"]
+    assert "/etc/gitignore" in files
+    assert "/etc/gitconfig" in files
+
+    tracker.record("docker", DockerModule(config={}))
+    assert not tracker.is_converged("docker", DockerModule(config={}))
+
+
+def test_edited_written_file_reruns_module(versions, tmp_path):
+    FileModule.path = str(tmp_path / "app.conf")
+    config = MagicMock(spec=ConfigManager)
+    config.get_enabled_modules.return_value = ["file"]
+    config.get.side_effect = lambda key, default=None: (
+        4 if key == "performance.max_workers" else default
+    )
+
+    instances = []
+
+    def make_module(container, config):
+        instances.append(FileModule(config={"enabled": True}))
+        return instances[-1]
+
+    container = Container()
+    container.factory("file", make_module)
+
+    installer = Installer(config=config, container=container)
+    installer.state_manager = StateManager(db_path=":memory:")
+    installer.convergence_tracker = ConvergenceTracker(installer.state_manager)
+    installer.plugin_manager.load_plugins = MagicMock()
+
+    assert installer.install(skip_validation=True)
+    assert installer.install(skip_validation=True)
+    assert sum(m.configure_calls for m in instances) == 1
+
+    (tmp_path / "app.conf").write_text("setting = 2\n")
+
+    assert installer.install(skip_validation=True)
+    assert sum(m.configure_calls for m in instances) == 2
+    assert (tmp_path / "app.conf").read_text() == "setting = 1\n"
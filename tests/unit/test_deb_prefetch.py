@@ -0,0 +1,95 @@
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from configurator.core.package_cache import PackageCacheManager
+from configurator.utils.command import CommandResult
+from configurator.utils.deb_prefetch import DebPrefetcher
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    """Local 'mirror' of .deb files served via file:// URIs."""
+    pool = tmp_path / "pool"
+    pool.mkdir()
+    (pool / "git_2.39.2-1.1_amd64.deb").write_bytes(b"git archive" * 100)
+    (pool / "curl_7.88.1-10_amd64.deb").write_bytes(b"curl archive" * 50)
+    # Local archive names carry the epoch (escaped), pool names do not
+    debs = {
+        "git_1%3a2.39.2-1.1_amd64.deb": pool / "git_2.39.2-1.1_amd64.deb",
+        "curl_7.88.1-10_amd64.deb": pool / "curl_7.88.1-10_amd64.deb",
+    }
+    return pool, debs
+
+
+@pytest.fixture
+def prefetcher(tmp_path):
+    archives = tmp_path / "archives"
+    archives.mkdir()
+    cache = PackageCacheManager(cache_dir=tmp_path / "cache")
+    prefetcher = DebPrefetcher(cache_manager=cache, max_workers=2)
+    prefetcher.APT_ARCHIVES_DIR = archives
+    return prefetcher
+
+
+def print_uris(pool, debs, corrupt=None):
+    lines = []
+    for name, path in debs.items():
+        content = path.read_bytes()
+        digest = hashlib.sha256(b"corrupt" if name == corrupt else content).hexdigest()
+        lines.append(f"'file://{path}' {name} {len(content)} SHA256:{digest}")
+    return CommandResult(command="apt-get", return_code=0, stdout="\n".join(lines), stderr="")
+
+
+def test_resolve_parses_print_uris(prefetcher, mirror):
+    pool, debs = mirror
+    with patch("configurator.utils.deb_prefetch.run_command", return_value=print_uris(pool, debs)):
+        downloads = prefetcher.resolve(["git", "curl"])
+
+    assert [d.package_name for d in downloads] == ["git", "curl"]
+    assert downloads[0].version == "1:2.39.2-1.1"
+    assert downloads[0].hash_type == "SHA256"
+    assert downloads[1].size == debs["curl_7.88.1-10_amd64.deb"].stat().st_size
+
+
+def test_prefetch_places_archives_and_caches_them(prefetcher, mirror):
+    pool, debs = mirror
+    with patch("configurator.utils.deb_prefetch.run_command", return_value=print_uris(pool, debs)):
+        assert prefetcher.prefetch(["git", "curl"]) == 2
+
+    for name, path in debs.items():
+        assert (prefetcher.APT_ARCHIVES_DIR / name).read_bytes() == path.read_bytes()
+    assert prefetcher.cache_manager.has_package("git", "1:2.39.2-1.1")
+    assert prefetcher.cache_manager.has_package("curl", "7.88.1-10")
+
+
+def test_prefetch_restores_from_cache_without_network(prefetcher, mirror):
+    pool, debs = mirror
+    with patch("configurator.utils.deb_prefetch.run_command", return_value=print_uris(pool, debs)):
+        prefetcher.prefetch(["git", "curl"])
+
+    uris = print_uris(pool, debs)
+    for path in list(prefetcher.APT_ARCHIVES_DIR.glob("*.deb")) + list(pool.iterdir()):
+        path.unlink()
+
+    with patch("configurator.utils.deb_prefetch.run_command", return_value=uris):
+        assert prefetcher.prefetch(["git", "curl"]) == 2
+
+    assert len(list(prefetcher.APT_ARCHIVES_DIR.glob("*.deb"))) == 2
+
+
+def test_prefetch_rejects_hash_mismatch(prefetcher, mirror):
+    pool, debs = mirror
+    uris = print_uris(pool, debs, corrupt="curl_7.88.1-10_amd64.deb")
+    with (
+        patch("configurator.utils.deb_prefetch.run_command", return_value=uris),
+        patch("configurator.utils.retry.time.sleep") as sleep,
+    ):
+        assert prefetcher.prefetch(["git", "curl"]) == 1
+
+    # A mismatch is not retried
+    sleep.assert_not_called()
+
+    assert not (prefetcher.APT_ARCHIVES_DIR / "curl_7.88.1-10_amd64.deb").exists()
+    assert not list((prefetcher.APT_ARCHIVES_DIR / "partial").iterdir())
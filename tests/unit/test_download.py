@@ -0,0 +1,220 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from configurator.exceptions import NetworkError
+from configurator.security.supply_chain import SecureDownloader, SupplyChainValidator
+from configurator.utils.download import NotModified, download
+from configurator.utils.network import download_file
+
+
+class RangeOrigin:
+    """Local HTTP server with byte range and If-Range support."""
+
+    def __init__(self):
+        self.files = {}
+        self.requests = []
+        self.ranges = True
+        # Responses are cut off after this many bytes while it is set
+        self.cut_after = None
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):  # noqa: N802
+                origin.requests.append(dict(self.headers))
+                body = origin.files.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                start, end, status = 0, len(body), 200
+                match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if origin.ranges and match and if_range in (None, etag):
+                    start = int(match.group(1))
+                    end = int(match.group(2)) + 1 if match.group(2) else len(body)
+                    status = 206
+
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(end - start))
+                if origin.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header("Content-Range", f"bytes {start}-{end - 1}/{len(body)}")
+                self.end_headers()
+
+                data = body[start:end]
+                if origin.cut_after is not None:
+                    self.wfile.write(data[: origin.cut_after])
+                    self.close_connection = True
+                    return
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+
+@pytest.fixture
+def origin():
+    origin = RangeOrigin()
+    yield origin
+    origin.server.shutdown()
+    origin.server.server_close()
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+BODY = os.urandom(1024 * 1024 + 123)
+
+
+def test_segmented_download(origin, tmp_path):
+    """Test a large file is fetched in parallel ranges and hashed in-stream."""
+    origin.files["/go.tar.gz"] = BODY
+
+    result = download(
+        origin.url("/go.tar.gz"), tmp_path / "go.tar.gz", segments=4, min_segment_size=64 * 1024
+    )
+
+    assert result.segments == 4
+    assert (tmp_path / "go.tar.gz").read_bytes() == BODY
+    assert result.sha256 == sha256(BODY)
+    assert sum("Range" in headers for headers in origin.requests) == 3
+    assert not (tmp_path / "go.tar.gz.part").exists()
+    assert not (tmp_path / "go.tar.gz.part.json").exists()
+
+
+def test_small_file_uses_one_connection(origin, tmp_path):
+    """Test files below the segment size are not split."""
+    origin.files["/install.sh"] = b"#!/bin/sh\n"
+
+    result = download(origin.url("/install.sh"), tmp_path / "install.sh")
+
+    assert result.segments == 1
+    assert result.sha256 == sha256(b"#!/bin/sh\n")
+    assert len(origin.requests) == 1
+
+
+def test_interrupted_download_resumes(origin, tmp_path):
+    """Test a dropped connection resumes from the partial file."""
+    origin.files["/nvim.tar.gz"] = BODY
+    dest = tmp_path / "nvim.tar.gz"
+
+    origin.cut_after = 100 * 1024
+    # Bytes of an unfinished read are lost, so read in pieces smaller than the cut
+    with (
+        patch("configurator.utils.download.CHUNK_SIZE", 16 * 1024),
+        pytest.raises(requests.RequestException),
+    ):
+        download(origin.url("/nvim.tar.gz"), dest, segments=2, min_segment_size=64 * 1024)
+    assert (tmp_path / "nvim.tar.gz.part").exists()
+
+    origin.cut_after = None
+    result = download(origin.url("/nvim.tar.gz"), dest, segments=2, min_segment_size=64 * 1024)
+
+    assert result.resumed_bytes > 0
+    assert dest.read_bytes() == BODY
+    assert result.sha256 == sha256(BODY)
+    assert all("If-Range" in headers for headers in origin.requests[-2:])
+
+
+def test_changed_file_restarts(origin, tmp_path):
+    """Test a partial download of an older version is discarded."""
+    origin.files["/nvim.tar.gz"] = BODY
+    dest = tmp_path / "nvim.tar.gz"
+
+    origin.cut_after = 100 * 1024
+    with (
+        patch("configurator.utils.download.CHUNK_SIZE", 16 * 1024),
+        pytest.raises(requests.RequestException),
+    ):
+        download(origin.url("/nvim.tar.gz"), dest, segments=2, min_segment_size=64 * 1024)
+    assert (tmp_path / "nvim.tar.gz.part.json").exists()
+
+    origin.cut_after = None
+    origin.files["/nvim.tar.gz"] = BODY[::-1]
+    result = download(origin.url("/nvim.tar.gz"), dest, segments=2, min_segment_size=64 * 1024)
+
+    assert result.resumed_bytes == 0
+    assert dest.read_bytes() == BODY[::-1]
+    assert result.sha256 == sha256(BODY[::-1])
+
+
+def test_server_without_ranges_not_resumed(origin, tmp_path):
+    """Test downloads from servers without range support restart cleanly."""
+    origin.ranges = False
+    origin.files["/font.zip"] = BODY
+    dest = tmp_path / "font.zip"
+
+    origin.cut_after = 100 * 1024
+    with pytest.raises(requests.RequestException):
+        download(origin.url("/font.zip"), dest, min_segment_size=64 * 1024)
+    assert not (tmp_path / "font.zip.part").exists()
+
+    origin.cut_after = None
+    result = download(origin.url("/font.zip"), dest, min_segment_size=64 * 1024)
+
+    assert result.segments == 1
+    assert dest.read_bytes() == BODY
+
+
+def test_conditional_request_not_modified(origin, tmp_path):
+    """Test a 304 response is reported to the caller."""
+    origin.files["/install.sh"] = b"v1"
+    etag = '"%s"' % sha256(b"v1")[:16]
+
+    with pytest.raises(NotModified):
+        download(
+            origin.url("/install.sh"), tmp_path / "install.sh", headers={"If-None-Match": etag}
+        )
+
+
+def test_download_file_raises_network_error(origin, tmp_path):
+    """Test HTTP errors surface as NetworkError."""
+    with pytest.raises(NetworkError):
+        download_file(origin.url("/missing"), tmp_path / "missing")
+
+
+def test_secure_downloader_validates_without_rehash(origin, tmp_path):
+    """Test SecureDownloader verifies the hash computed while downloading."""
+    origin.files["/go.tar.gz"] = BODY
+    validator = SupplyChainValidator({}, logging.getLogger("test"))
+    validator.checksum_db_path = tmp_path / "checksums.db"
+    downloader = SecureDownloader(validator, logging.getLogger("test"))
+
+    with (
+        patch.object(validator, "validate_url", return_value=True),
+        patch.object(validator, "compute_checksum") as compute_checksum,
+    ):
+        assert downloader.download_file(origin.url("/go.tar.gz"), tmp_path / "go", sha256(BODY))
+        assert not downloader.download_file(
+            origin.url("/go.tar.gz"), tmp_path / "bad", sha256(b"other")
+        )
+
+    compute_checksum.assert_not_called()
+    assert (tmp_path / "go").read_bytes() == BODY
+    assert not (tmp_path / "bad").exists()
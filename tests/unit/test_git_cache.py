@@ -0,0 +1,169 @@
+import os
+import pwd
+import shutil
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from configurator.core.git_cache import GitCacheError, GitMirrorCache
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(*args, cwd=None):
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME="test",
+        GIT_AUTHOR_EMAIL="test@example.com",
+        GIT_COMMITTER_NAME="test",
+        GIT_COMMITTER_EMAIL="test@example.com",
+    )
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, env=env, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def commit(repo, name):
+    (repo / name).write_text(name)
+    git("add", name, cwd=repo)
+    git("commit", "-q", "-m", name, cwd=repo)
+    return git("rev-parse", "HEAD", cwd=repo)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    repo = tmp_path / "upstream"
+    repo.mkdir()
+    git("init", "-q", "-b", "master", cwd=repo)
+    commit(repo, "one")
+    return repo
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GitMirrorCache(cache_dir=tmp_path / "git")
+
+
+def url(repo):
+    return f"file://{repo}"
+
+
+def test_clone_points_at_upstream(upstream, cache, tmp_path):
+    """Test clones come from the mirror but look like upstream clones."""
+    dest = cache.clone(url(upstream), tmp_path / "clone")
+
+    assert (dest / "one").read_text() == "one"
+    assert git("remote", "get-url", "origin", cwd=dest) == url(upstream)
+    assert cache.list_mirrors() == [cache.mirror_path(url(upstream))]
+
+
+def test_repeated_clones_fetch_once_per_run(upstream, cache, tmp_path):
+    """Test clones of the same repository in one run share a single fetch."""
+    cache.clone(url(upstream), tmp_path / "first")
+
+    with patch.object(cache, "_fetch", wraps=cache._fetch) as fetch:
+        cache.clone(url(upstream), tmp_path / "second")
+        cache.clone(url(upstream), tmp_path / "third")
+
+    fetch.assert_not_called()
+
+
+def test_next_run_fetches_new_commits(upstream, cache, tmp_path):
+    """Test a new run fetches only what changed upstream into the mirror."""
+    cache.clone(url(upstream), tmp_path / "first")
+    head = commit(upstream, "two")
+
+    rerun = GitMirrorCache(cache_dir=cache.cache_dir)
+    with patch.object(rerun, "_create") as create:
+        dest = rerun.clone(url(upstream), tmp_path / "second")
+
+    create.assert_not_called()
+    assert git("rev-parse", "HEAD", cwd=dest) == head
+
+
+def test_pinned_commit_checked_out(upstream, cache, tmp_path):
+    """Test a pinned commit outside the shallow mirror is fetched and checked out."""
+    pinned = git("rev-parse", "HEAD", cwd=upstream)
+    commit(upstream, "two")
+
+    dest = cache.clone(url(upstream), tmp_path / "clone", commit=pinned)
+
+    assert git("rev-parse", "HEAD", cwd=dest) == pinned
+    assert not (dest / "two").exists()
+
+
+def test_full_clone_unshallows_mirror(upstream, cache, tmp_path):
+    """Test a full-history clone converts a shallow mirror."""
+    commit(upstream, "two")
+    cache.clone(url(upstream), tmp_path / "shallow")
+    assert (cache.mirror_path(url(upstream)) / "shallow").exists()
+
+    dest = cache.clone(url(upstream), tmp_path / "full", depth=None)
+
+    assert git("rev-list", "--count", "HEAD", cwd=dest) == "2"
+    assert not (cache.mirror_path(url(upstream)) / "shallow").exists()
+
+
+def test_branch_clone_from_fresh_shallow_mirror(upstream, cache, tmp_path):
+    """Test a shallow mirror created by a branch clone holds that branch."""
+    git("checkout", "-q", "-b", "dev", cwd=upstream)
+    head = commit(upstream, "two")
+    git("checkout", "-q", "master", cwd=upstream)
+
+    dest = cache.clone(url(upstream), tmp_path / "clone", branch="dev")
+
+    assert git("rev-parse", "HEAD", cwd=dest) == head
+
+
+def test_owned_clone_does_not_share_objects(upstream, cache, tmp_path):
+    """Test clones handed to a user never hardlink the mirror's objects."""
+    cache.clone(url(upstream), tmp_path / "mirror-warmup", depth=None)
+    alice = pwd.struct_passwd(("alice", "x", 1001, 1002, "", "/home/alice", "/bin/sh"))
+
+    with (
+        patch.object(cache, "_git", wraps=cache._git) as run_git,
+        patch("configurator.core.git_cache.pwd.getpwnam", return_value=alice),
+        patch("configurator.core.git_cache.os.chown") as chown,
+    ):
+        cache.clone(url(upstream), tmp_path / "owned", depth=None, owner="alice")
+
+    clone_args = next(call.args for call in run_git.call_args_list if call.args[0] == "clone")
+    assert "--no-hardlinks" in clone_args
+    chown.assert_any_call(tmp_path / "owned", 1001, 1002, follow_symlinks=False)
+
+
+def test_owned_clone_does_not_follow_symlinks(upstream, cache, tmp_path):
+    """Test handing a clone over changes the owner of symlinks, not their targets."""
+    (upstream / "link").symlink_to("/etc/passwd")
+    git("add", "link", cwd=upstream)
+    git("commit", "-q", "-m", "link", cwd=upstream)
+
+    me = pwd.getpwuid(os.getuid())
+
+    with patch("configurator.core.git_cache.os.chown") as chown:
+        dest = cache.clone(url(upstream), tmp_path / "owned", owner=me.pw_name)
+
+    assert (dest / "link").is_symlink()
+    chown.assert_any_call(str(dest / "link"), me.pw_uid, me.pw_gid, follow_symlinks=False)
+    assert all(call.kwargs == {"follow_symlinks": False} for call in chown.call_args_list)
+
+
+def test_unknown_owner_raises(upstream, cache, tmp_path):
+    """Test cloning for a user that does not exist fails before cloning."""
+    with patch("configurator.core.git_cache.pwd.getpwnam", side_effect=KeyError("nobody")):
+        with pytest.raises(GitCacheError, match="Unknown user"):
+            cache.clone(url(upstream), tmp_path / "owned", owner="nobody")
+
+    assert not (tmp_path / "owned").exists()
+
+
+def test_unknown_repository_raises(cache, tmp_path):
+    """Test failed mirror creation raises and leaves no mirror behind."""
+    missing = tmp_path / "missing"
+
+    with pytest.raises(GitCacheError):
+        cache.clone(url(missing), tmp_path / "clone")
+
+    assert cache.list_mirrors() == []
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from configurator.core.audit_writer import get_audit_writer
 from configurator.users.lifecycle_manager import (
     LifecycleEvent,
     UserLifecycleManager,
@@ -386,7 +387,8 @@ def test_audit_logging(lifecycle_manager):
                 created_by="admin",
             )
 
-            # Verify audit log was created and has entry
+            # Verify audit log was created and has entry (creation is buffered)
+            get_audit_writer().flush()
             assert lifecycle_manager.AUDIT_LOG.exists()
 
             with open(lifecycle_manager.AUDIT_LOG, "r") as f:
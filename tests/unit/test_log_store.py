@@ -0,0 +1,195 @@
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from configurator.observability.log_store import (
+    LogStore,
+    SegmentedFileHandler,
+    SegmentIndex,
+    read_lines_reversed,
+)
+from configurator.observability.structured_logging import LogAggregator
+
+DAY = 86400
+T0 = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+
+
+def entry(ts, **fields):
+    iso = datetime.fromtimestamp(ts, timezone.utc).isoformat()
+    return {"timestamp": iso, **fields}
+
+
+def fill(store, days, per_day):
+    """Append per_day entries for each day, sealing a segment per day."""
+    for day in range(days):
+        for i in range(per_day):
+            ts = T0 + day * DAY + i * 60
+            with patch("time.time", return_value=ts):
+                store.append(
+                    entry(
+                        ts,
+                        level="ERROR" if i % 10 == 0 else "INFO",
+                        correlation_id=f"run-{day}",
+                        message=f"day {day} line {i}",
+                    )
+                )
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 4096])
+def test_read_lines_reversed(tmp_path, block_size):
+    """Test lines come back last to first for any block size."""
+    path = tmp_path / "log.jsonl"
+    path.write_text("first\nsecond line\n\nthird\n")
+
+    lines = list(read_lines_reversed(path, block_size=block_size))
+
+    assert lines == ["third", "second line", "first"]
+
+
+def test_active_file_sealed_when_day_ends(tmp_path):
+    """Test each day's entries end up in their own indexed segment."""
+    store = LogStore(tmp_path / "app.jsonl", indexed_fields=("level",))
+
+    fill(store, days=3, per_day=5)
+
+    segments = store.segments()
+    assert [s.name for s in segments] == ["app.jsonl.20260301T000000", "app.jsonl.20260302T000000"]
+    assert all(s.with_name(s.name + ".idx").exists() for s in segments)
+    assert len((tmp_path / "app.jsonl").read_text().splitlines()) == 5
+
+
+def test_query_newest_first_across_segments(tmp_path):
+    """Test queries return the newest entries first across segments."""
+    store = LogStore(tmp_path / "app.jsonl", indexed_fields=("level",))
+    fill(store, days=3, per_day=5)
+
+    messages = [e["message"] for e in store.query(limit=7)]
+
+    assert messages[:2] == ["day 2 line 4", "day 2 line 3"]
+    assert messages[5:] == ["day 1 line 4", "day 1 line 3"]
+
+
+def test_indexed_filter_reads_only_postings(tmp_path):
+    """Test indexed filters seek to matching lines instead of scanning."""
+    store = LogStore(tmp_path / "app.jsonl", indexed_fields=("level", "correlation_id"))
+    fill(store, days=3, per_day=50)
+
+    with patch.object(LogStore, "_parse", wraps=LogStore._parse) as parse:
+        errors = store.query(level="ERROR", correlation_id="run-0")
+    assert [e["message"] for e in errors][-1] == "day 0 line 0"
+    assert len(errors) == 5
+    # Active file (day 2) is scanned; sealed segments only yield their postings
+    assert parse.call_count == 3
+
+
+def test_time_window_skips_older_segments(tmp_path):
+    """Test segments entirely before the window are never opened."""
+    store = LogStore(tmp_path / "app.jsonl")
+    fill(store, days=4, per_day=5)
+    start = datetime.fromtimestamp(T0 + 2 * DAY, timezone.utc)
+
+    with patch.object(SegmentIndex, "build", wraps=SegmentIndex.build) as build:
+        entries = store.query(start=start)
+
+    assert {e["message"].split(" line")[0] for e in entries} == {"day 2", "day 3"}
+    build.assert_not_called()
+
+
+def test_time_window_within_segment_uses_sparse_index(tmp_path):
+    """Test a window inside a large segment returns exactly its entries."""
+    store = LogStore(tmp_path / "app.jsonl")
+    fill(store, days=2, per_day=1000)
+    start = T0 + 300 * 60
+    end = T0 + 309 * 60
+
+    entries = store.query(start=start, end=end)
+
+    assert [e["message"] for e in entries] == [f"day 0 line {i}" for i in range(309, 299, -1)]
+
+
+def test_missing_index_is_rebuilt(tmp_path):
+    """Test a segment without its sidecar index is indexed on demand."""
+    store = LogStore(tmp_path / "app.jsonl", indexed_fields=("level",))
+    fill(store, days=2, per_day=5)
+    (segment,) = store.segments()
+    segment.with_name(segment.name + ".idx").unlink()
+
+    assert len(store.query(level="ERROR")) == 2
+    assert segment.with_name(segment.name + ".idx").exists()
+
+
+def test_none_filter_matches_everything(tmp_path):
+    """Test a filter given as None does not restrict the results."""
+    store = LogStore(tmp_path / "app.jsonl", indexed_fields=("level",))
+    fill(store, days=2, per_day=5)
+
+    assert store.query(level=None) == store.query()
+
+
+def test_retention_deletes_oldest_segments(tmp_path):
+    """Test only max_segments sealed segments are kept."""
+    store = LogStore(tmp_path / "app.jsonl", max_segments=2)
+
+    fill(store, days=5, per_day=2)
+
+    assert [s.name[-15:] for s in store.segments()] == ["20260303T000000", "20260304T000000"]
+    assert len(list(tmp_path.glob("*.idx"))) == 2
+
+
+def test_size_limit_seals_segment(tmp_path):
+    """Test the active file is sealed once it reaches the size limit."""
+    store = LogStore(tmp_path / "app.jsonl", max_segment_bytes=500)
+
+    fill(store, days=1, per_day=20)
+
+    assert len(store.segments()) >= 2
+    assert len(store.query()) == 20
+
+
+def test_segmented_file_handler_rotates(tmp_path):
+    """Test the logging handler seals the file when the day changes."""
+    store = LogStore(tmp_path / "app.jsonl")
+    handler = SegmentedFileHandler(store)
+    handler.setFormatter(logging.Formatter('{"timestamp": "%(ts)s", "message": "%(message)s"}'))
+    log = logging.getLogger("test_segmented_file_handler")
+    log.addHandler(handler)
+
+    try:
+        for day in range(2):
+            ts = datetime.fromtimestamp(T0 + day * DAY, timezone.utc).isoformat()
+            with patch("time.time", return_value=T0 + day * DAY):
+                log.warning("hello", extra={"ts": ts})
+    finally:
+        log.removeHandler(handler)
+        handler.close()
+
+    assert len(store.segments()) == 1
+    assert len(store.query()) == 2
+
+
+def test_log_aggregator_error_summary(tmp_path):
+    """Test the error summary only counts recent errors."""
+    log_file = tmp_path / "structured.jsonl"
+    now = datetime.utcnow()
+    lines = [
+        {
+            "timestamp": (now - timedelta(hours=30)).isoformat() + "Z",
+            "level": "ERROR",
+            "message": "old: x",
+        },
+        {
+            "timestamp": (now - timedelta(hours=1)).isoformat() + "Z",
+            "level": "ERROR",
+            "message": "apt: lock",
+        },
+        {"timestamp": now.isoformat() + "Z", "level": "INFO", "message": "apt: done"},
+        {"timestamp": now.isoformat() + "Z", "level": "CRITICAL", "message": "apt: failed"},
+    ]
+    log_file.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    aggregator = LogAggregator(log_file)
+
+    assert aggregator.get_error_summary(hours=24) == {"apt": 2}
+    assert [e["message"] for e in aggregator.get_logs(level="ERROR")] == ["old: x", "apt: lock"]
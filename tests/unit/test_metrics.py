@@ -0,0 +1,126 @@
+import random
+import threading
+
+import pytest
+
+from configurator.observability.metrics import (
+    Counter,
+    Histogram,
+    MetricsCollector,
+    QuantileSketch,
+)
+
+
+def test_counter_sums_thread_shards():
+    """Test increments from many threads are all counted."""
+    counter = Counter("vps_test_total", "Test counter")
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.get() == 8000
+    counter.reset()
+    assert counter.get() == 0
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test bucket counts are cumulative with values on a bound counted in it."""
+    histogram = Histogram("vps_test_seconds", "Test histogram", [1.0, 5.0, 10.0])
+
+    for value in (0.5, 1.0, 3.0, 10.0, 60.0):
+        histogram.observe(value)
+
+    assert histogram.get_buckets() == {1.0: 2, 5.0: 3, 10.0: 4, float("inf"): 5}
+    assert histogram.get_sum() == pytest.approx(74.5)
+    assert histogram.get_count() == 5
+
+
+def test_histogram_merges_thread_shards():
+    """Test observations from several threads are merged when read."""
+    histogram = Histogram("vps_test_seconds", "Test histogram", [1.0], quantiles=[0.5])
+
+    def work(value):
+        for _ in range(100):
+            histogram.observe(value)
+
+    threads = [threading.Thread(target=work, args=(v,)) for v in (0.5, 2.0)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert histogram.get_buckets() == {1.0: 100, float("inf"): 200}
+    assert histogram.get_sketch().count == 200
+
+
+def test_shards_of_exited_threads_are_released():
+    """Test short-lived threads leave their counts but not their shards."""
+    counter = Counter("vps_test_total", "Test counter")
+    histogram = Histogram("vps_test_seconds", "Test histogram", [1.0], quantiles=[0.5])
+
+    def work():
+        counter.inc()
+        histogram.observe(2.0)
+
+    for _ in range(50):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    assert counter.get() == 50
+    assert histogram.get_buckets() == {1.0: 0, float("inf"): 50}
+    assert histogram.get_sketch().count == 50
+    assert counter._shards == [] and histogram._shards == []
+
+
+@pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+def test_sketch_quantiles_within_accuracy(q):
+    """Test sketch quantiles are within the relative accuracy of exact ones."""
+    rng = random.Random(42)
+    values = sorted(rng.lognormvariate(0, 2) for _ in range(10000))
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    exact = values[int(q * (len(values) - 1))]
+
+    assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+
+
+def test_sketches_merge():
+    """Test merged sketches answer like one sketch of all values."""
+    left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1, 1001):
+        (left if value % 2 else right).add(value)
+        combined.add(value)
+
+    left.merge(right)
+
+    assert left.count == 1000
+    assert left.quantile(0.9) == combined.quantile(0.9)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_export_includes_quantile_summary():
+    """Test histograms with quantiles are also exported as summaries."""
+    metrics = MetricsCollector()
+    metrics.record_module(12.0, success=False)
+
+    output = metrics.export_prometheus()
+
+    assert "# TYPE vps_module_duration_seconds_summary summary" in output
+    (p99,) = [
+        line
+        for line in output.splitlines()
+        if line.startswith('vps_module_duration_seconds_summary{quantile="0.99"}')
+    ]
+    assert float(p99.split()[-1]) == pytest.approx(12.0, rel=0.01)
+    assert "vps_module_failures_total 1.0" in output
+    assert '"quantiles"' in metrics.export_json()
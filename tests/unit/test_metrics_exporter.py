@@ -0,0 +1,87 @@
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+from configurator.observability import metrics as metrics_module
+from configurator.observability.exporter import (
+    OPENMETRICS_CONTENT_TYPE,
+    PROMETHEUS_CONTENT_TYPE,
+    MetricsExporter,
+)
+from configurator.observability.metrics import MetricsCollector
+
+
+@pytest.fixture
+def exporter():
+    """Exporter on a free loopback port."""
+    collector = MetricsCollector()
+    collector.installations_total.inc()
+    exporter = MetricsExporter(collector, port=0, refresh_resources=False)
+    exporter.start()
+    yield exporter
+    exporter.stop()
+
+
+def fetch(url, accept=None):
+    request = urllib.request.Request(url, headers={"Accept": accept} if accept else {})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.headers["Content-Type"], response.read().decode()
+
+
+def test_serves_openmetrics_when_accepted(exporter):
+    """Test scrapers asking for OpenMetrics get it."""
+    content_type, body = fetch(exporter.url, "application/openmetrics-text; version=1.0.0")
+
+    assert content_type == OPENMETRICS_CONTENT_TYPE
+    assert "# TYPE vps_installations counter" in body
+    assert "vps_installations_total 1.0" in body
+    assert body.endswith("# EOF\n")
+
+
+def test_serves_prometheus_text_by_default(exporter):
+    """Test other scrapers get the Prometheus text format."""
+    content_type, body = fetch(exporter.url)
+
+    assert content_type == PROMETHEUS_CONTENT_TYPE
+    assert "# TYPE vps_installations_total counter" in body
+    assert "# EOF" not in body
+
+
+def test_unknown_path_is_not_found(exporter):
+    """Test only /metrics and the index are served."""
+    with pytest.raises(urllib.error.HTTPError) as exc_info:
+        fetch(exporter.url.replace("/metrics", "/missing"))
+
+    assert exc_info.value.code == 404
+
+
+def test_stop_releases_port(exporter):
+    """Test a stopped exporter no longer serves."""
+    url = exporter.url
+    exporter.stop()
+
+    assert not exporter.running
+    with pytest.raises(urllib.error.URLError):
+        fetch(url)
+
+
+def test_render_reuses_unchanged_families():
+    """Test only families with changed values are re-rendered."""
+    collector = MetricsCollector()
+    collector.render()
+
+    with patch.object(
+        metrics_module, "_render_family", wraps=metrics_module._render_family
+    ) as render_family:
+        first = collector.render()
+        assert render_family.call_count == 0
+
+        collector.module_failures_total.inc()
+        second = collector.render()
+
+    (call,) = render_family.call_args_list
+    assert call.args[0] == "vps_module_failures_total"
+    assert first != second
+    assert "vps_module_failures_total 1.0" in second
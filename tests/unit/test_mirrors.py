@@ -0,0 +1,187 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from configurator.core.mirrors import MirrorProbe, MirrorSelector
+from configurator.utils.apt_update import AptUpdateTracker
+
+SOURCES_LIST = """\
+deb http://deb.debian.org/debian bookworm main contrib
+deb [arch=amd64] http://deb.debian.org/debian/ bookworm-updates main
+deb http://security.debian.org/debian-security bookworm-security main
+"""
+
+DEBIAN_SOURCES = """\
+Types: deb
+URIs: http://deb.debian.org/debian
+Suites: bookworm bookworm-updates
+Components: main
+
+Types: deb
+URIs: http://deb.debian.org/debian-security
+Suites: bookworm-security
+Components: main
+"""
+
+DOCKER_SOURCES = """\
+Types: deb
+URIs: https://download.docker.com/linux/debian
+Suites: bookworm
+Components: stable
+"""
+
+FAST = "http://ftp.de.debian.org/debian"
+CURRENT = "http://deb.debian.org/debian"
+
+
+@pytest.fixture
+def sources(tmp_path):
+    sources_list = tmp_path / "sources.list"
+    sources_list.write_text(SOURCES_LIST)
+    sources_d = tmp_path / "sources.list.d"
+    sources_d.mkdir()
+    (sources_d / "debian.sources").write_text(DEBIAN_SOURCES)
+    (sources_d / "docker.sources").write_text(DOCKER_SOURCES)
+    return [sources_list, sources_d]
+
+
+@pytest.fixture
+def selector(tmp_path, sources):
+    return MirrorSelector(
+        candidates=[CURRENT, FAST, "http://ftp.us.debian.org/debian"],
+        cache_file=tmp_path / "mirrors.json",
+        sources=sources,
+        backup_dir=tmp_path / "backups",
+    )
+
+
+def speeds(**throughput):
+    """Fake probe with the given throughput per mirror host (None = down)."""
+
+    def probe(url, probe_path):
+        host = url.split("/")[2].replace(".", "_")
+        bps = throughput.get(host)
+        return MirrorProbe(url, 10.0, bps, None if bps else "unreachable")
+
+    return probe
+
+
+def test_probe_measures_mirror(tmp_path):
+    """Test a probe times the connection and the Release file download."""
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            requested.append(self.path)
+            self.send_response(200)
+            self.send_header("Content-Length", "4096")
+            self.end_headers()
+            self.wfile.write(b"x" * 4096)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        port = server.server_address[1]
+        selector = MirrorSelector(cache_file=tmp_path / "mirrors.json")
+
+        result = selector.probe(f"http://127.0.0.1:{port}/debian", "dists/bookworm/Release")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result.healthy
+    assert result.connect_ms is not None
+    assert result.throughput_bps > 0
+    assert requested == ["/debian/dists/bookworm/Release"]
+
+
+def test_unreachable_mirror_is_unhealthy(tmp_path):
+    """Test a mirror refusing connections is reported, not raised."""
+    selector = MirrorSelector(cache_file=tmp_path / "mirrors.json", timeout=1)
+
+    result = selector.probe("http://127.0.0.1:1/debian", "dists/bookworm/Release")
+
+    assert not result.healthy
+    assert result.error
+
+
+def test_switches_archive_entries_to_fastest_mirror(selector, sources, tmp_path):
+    """Test only archive entries are rewritten and restores are registered."""
+    rollback_manager = MagicMock()
+
+    with patch.object(
+        selector, "probe", side_effect=speeds(deb_debian_org=100, ftp_de_debian_org=500)
+    ) as probe:
+        assert selector.apply(rollback_manager) == FAST
+
+    assert {call.args[1] for call in probe.call_args_list} == {"dists/bookworm/Release"}
+    sources_list, sources_d = sources
+    assert sources_list.read_text() == SOURCES_LIST.replace(
+        "http://deb.debian.org/debian/", FAST
+    ).replace("http://deb.debian.org/debian ", FAST + " ")
+    assert (sources_d / "debian.sources").read_text() == DEBIAN_SOURCES.replace(
+        "URIs: http://deb.debian.org/debian\n", f"URIs: {FAST}\n"
+    )
+    assert (sources_d / "docker.sources").read_text() == DOCKER_SOURCES
+
+    restored = {call.args[1] for call in rollback_manager.add_file_restore.call_args_list}
+    assert restored == {str(sources_list), str(sources_d / "debian.sources")}
+    backup = rollback_manager.add_file_restore.call_args_list[0].args[0]
+    assert open(backup).read() in (SOURCES_LIST, DEBIAN_SOURCES)
+
+
+def test_keeps_current_mirror_unless_clearly_faster(selector, sources):
+    """Test marginally faster mirrors do not trigger a switch."""
+    with patch.object(
+        selector, "probe", side_effect=speeds(deb_debian_org=100, ftp_de_debian_org=110)
+    ):
+        assert selector.apply() is None
+
+    assert sources[0].read_text() == SOURCES_LIST
+
+
+def test_unreachable_current_mirror_replaced(selector, sources):
+    """Test a dead mirror in use is replaced by any healthy one."""
+    with patch.object(selector, "probe", side_effect=speeds(ftp_us_debian_org=10)):
+        assert selector.apply() == "http://ftp.us.debian.org/debian"
+
+
+def test_no_healthy_mirror_leaves_sources(selector, sources):
+    """Test sources are untouched when no mirror responds."""
+    with patch.object(selector, "probe", side_effect=speeds()):
+        assert selector.apply() is None
+
+    assert sources[0].read_text() == SOURCES_LIST
+
+
+def test_ranking_cached_within_ttl(selector, tmp_path):
+    """Test a fresh ranking of the same mirrors is not probed again."""
+    mirrors = [CURRENT, FAST]
+    with patch.object(selector, "probe", side_effect=speeds(deb_debian_org=1, ftp_de_debian_org=2)):
+        first = selector.rank(mirrors, "dists/bookworm/Release")
+
+    rerun = MirrorSelector(cache_file=selector.cache_file)
+    with patch.object(rerun, "probe", side_effect=speeds()) as probe:
+        assert rerun.rank(mirrors, "dists/bookworm/Release") == first
+        rerun.rank(mirrors + ["http://ftp.us.debian.org/debian"], "dists/bookworm/Release")
+
+    assert [r.url for r in first] == [FAST, CURRENT]
+    assert probe.call_count == 3
+
+
+def test_tracker_prepares_sources_once_before_update(tmp_path):
+    """Test mirror selection runs before the first update only."""
+    prepare = MagicMock()
+    tracker = AptUpdateTracker(
+        state_file=tmp_path / "apt-update.json", sources=[], prepare_sources=prepare
+    )
+
+    assert tracker.update(lambda: True)
+    assert tracker.update(lambda: True, force=True)
+
+    prepare.assert_called_once()
@@ -2,6 +2,7 @@
 Unit tests for PackageCacheManager.
 """
 
+import os
 import shutil
 import tempfile
 import unittest
@@ -9,7 +10,7 @@ import unittest.mock
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from configurator.core.package_cache import PackageCacheManager
+from configurator.core.package_cache import PackageCacheManager, parse_deb_filename
 
 
 class TestPackageCacheManager(unittest.TestCase):
@@ -30,6 +31,11 @@ class TestPackageCacheManager(unittest.TestCase):
     def tearDown(self):
         shutil.rmtree(self.test_dir)
 
+    def make_package(self, name: str, content: bytes) -> Path:
+        path = Path(self.test_dir) / name
+        path.write_bytes(content)
+        return path
+
     def test_initialization(self):
         """Test cache initialization."""
         self.assertTrue(self.cache_dir.exists())
@@ -149,6 +155,131 @@ class TestPackageCacheManager(unittest.TestCase):
         self.assertFalse(self.manager.has_package("old-pkg", "1.0"))
         self.assertTrue(self.manager.has_package("new-pkg", "1.0"))
 
+    def test_eviction_follows_access_order(self):
+        """Test that a cache hit protects a package from eviction."""
+        for name in ("pkg-a", "pkg-b", "pkg-c"):
+            pkg = self.make_package(f"{name}.deb", name.encode() * 400)
+            self.manager.add_package(name, "1.0", pkg, "url")
+        self.manager.get_package("pkg-a", "1.0")
+
+        self.manager._evict_lru_packages(1)
+
+        self.assertFalse(self.manager.has_package("pkg-b", "1.0"))
+        self.assertTrue(self.manager.has_package("pkg-a", "1.0"))
+        self.assertTrue(self.manager.has_package("pkg-c", "1.0"))
+        self.assertEqual(self.manager.get_stats()["total_size_bytes"], 2 * 2000)
+
+    def test_journal_persists_changes(self):
+        """Test that journaled changes survive a restart without rewriting the index."""
+        index_file = self.cache_dir / "cache_index.json"
+        snapshot = index_file.read_text()
+
+        self.manager.add_package("pkg-a", "1.0", self.pkg_file, "url")
+        self.manager.add_package("pkg-b", "1.0", self.make_package("b.deb", b"b" * 1000), "url")
+        self.manager.get_package("pkg-a", "1.0")
+        self.assertEqual(index_file.read_text(), snapshot)
+
+        reloaded = PackageCacheManager(cache_dir=self.cache_dir, logger=unittest.mock.MagicMock())
+
+        self.assertEqual(list(reloaded._index), ["pkg-b_1.0", "pkg-a_1.0"])
+        self.assertEqual(reloaded._index["pkg-a_1.0"].access_count, 1)
+        stats = reloaded.get_stats()
+        self.assertEqual(stats["total_downloads"], 2)
+        self.assertEqual(stats["total_cache_hits"], 1)
+        self.assertEqual(stats["total_size_bytes"], 1200 + 1000)
+        self.assertFalse((self.cache_dir / "cache_index.journal").exists())
+
+    def test_journal_compaction(self):
+        """Test that the journal is folded into the snapshot once it grows."""
+        self.manager.COMPACT_MIN_ENTRIES = 3
+        self.manager.add_package("pkg-a", "1.0", self.pkg_file, "url")
+        self.manager.add_package("pkg-b", "1.0", self.pkg_file, "url")
+        for _ in range(3):
+            self.manager.get_package("pkg-a", "1.0")
+
+        journal = (self.cache_dir / "cache_index.journal").read_text().splitlines()
+        self.assertEqual(len(journal), 2)  # generation header + last hit
+
+        reloaded = PackageCacheManager(cache_dir=self.cache_dir, logger=unittest.mock.MagicMock())
+        self.assertEqual(len(reloaded._index), 2)
+        self.assertEqual(reloaded._index["pkg-a_1.0"].access_count, 3)
+        self.assertEqual(reloaded.get_stats()["total_cache_hits"], 3)
+
+    def test_hit_skips_rehash_for_unchanged_file(self):
+        """Test that hits only rehash files whose stat fingerprint changed."""
+        self.manager.add_package("test-pkg", "1.0.0", self.pkg_file, "http://url")
+
+        with unittest.mock.patch.object(
+            self.manager, "_calculate_file_hash", wraps=self.manager._calculate_file_hash
+        ) as calculate:
+            self.assertIsNotNone(self.manager.get_package("test-pkg", "1.0.0"))
+            self.assertEqual(calculate.call_count, 0)
+
+            self.manager.verify_policy = PackageCacheManager.VERIFY_ALWAYS
+            self.assertIsNotNone(self.manager.get_package("test-pkg", "1.0.0"))
+            self.assertEqual(calculate.call_count, 1)
+
+    def test_scrub_removes_corruption_hidden_from_fingerprint(self):
+        """Test that the scrubber catches corruption that keeps size and mtime."""
+        self.manager.add_package("test-pkg", "1.0.0", self.pkg_file, "http://url")
+        key = self.manager._make_cache_key("test-pkg", "1.0.0")
+        cached = self.cache_dir / self.manager._index[key].filename
+
+        stat = cached.stat()
+        with open(cached, "r+b") as f:
+            f.write(b"X")
+        os.utime(cached, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        # Recently verified entries are left alone
+        self.assertEqual(self.manager.scrub(), 0)
+        self.assertEqual(self.manager.scrub(max_age=timedelta(0)), 1)
+        self.assertFalse(self.manager.has_package("test-pkg", "1.0.0"))
+
+    def test_identical_packages_stored_once(self):
+        """Test that identical archives share one hardlinked blob."""
+        copy = self.make_package("renamed.deb", self.pkg_file.read_bytes())
+        self.manager.add_package("pkg-a", "1.0", self.pkg_file, "url")
+        self.manager.add_package("pkg-b", "2.0", copy, "url")
+
+        blobs = list((self.cache_dir / "blobs").glob("*/*"))
+        self.assertEqual(len(blobs), 1)
+        # The source archive itself is linked into the cache, not copied
+        self.assertTrue(blobs[0].samefile(self.pkg_file))
+        self.assertEqual(self.manager.get_stats()["total_size_bytes"], 1200)
+
+        # The blob is kept until the last entry referencing it is removed
+        key_a = self.manager._make_cache_key("pkg-a", "1.0")
+        self.manager._index[key_a].last_accessed = datetime.now() - timedelta(days=10)
+        self.assertEqual(self.manager.clear_cache(older_than_days=5), 1)
+        self.assertTrue(blobs[0].exists())
+        self.assertTrue(self.manager.get_package("pkg-b", "2.0").samefile(blobs[0]))
+
+        self.manager.clear_cache()
+        self.assertFalse(blobs[0].exists())
+        self.assertTrue(self.pkg_file.exists())
+
+    def test_architectures_cached_separately(self):
+        """Test lookups by (name, version, arch) with epochs in archive names."""
+        self.assertEqual(
+            parse_deb_filename("git_1%3a2.39.2-1.1_amd64.deb"), ("git", "1:2.39.2-1.1", "amd64")
+        )
+        self.assertIsNone(parse_deb_filename("test_pkg.deb"))
+
+        amd64 = self.make_package("libc6_2.36-9_amd64.deb", b"amd64")
+        i386 = self.make_package("libc6_2.36-9_i386.deb", b"i386")
+        self.manager.add_package("libc6", "2.36-9", amd64, "url")
+        self.manager.add_package("libc6", "2.36-9", i386, "url")
+
+        self.assertEqual(self.manager.get_package("libc6", "2.36-9", "i386").read_bytes(), b"i386")
+        self.assertTrue(self.manager.has_package("libc6", "2.36-9"))
+        self.assertFalse(self.manager.has_package("libc6", "2.36-9", "arm64"))
+        self.assertEqual(
+            self.manager.missing_packages(
+                [("libc6", "2.36-9", "amd64"), ("libc6", "2.36-9", "arm64")]
+            ),
+            [("libc6", "2.36-9", "arm64")],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ from pathlib import Path
 
 import pytest
 
+from configurator.core.audit_writer import get_audit_writer
 from configurator.users.team_manager import (
     MemberRole,
     ResourceQuota,
@@ -420,6 +421,8 @@ def test_audit_log_created(team_manager, temp_paths):
         skip_system_group=True,
     )
 
+    # Team creation is buffered by the audit writer
+    get_audit_writer().flush()
     assert temp_paths["audit_log"].exists()
 
     # Check content
@@ -0,0 +1,168 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+from click.testing import CliRunner
+
+from configurator.cli import main
+from configurator.core.execution.base import ExecutionContext
+from configurator.core.execution.parallel import ParallelExecutor
+from configurator.observability.tracing import (
+    NOOP_SPAN,
+    Tracer,
+    get_tracer,
+    load_chrome_trace,
+)
+
+
+@pytest.fixture
+def global_tracer():
+    """Enable the global tracer for one test."""
+    tracer = get_tracer()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+
+
+def test_disabled_tracer_records_nothing():
+    """Test a disabled tracer hands out the shared no-op span."""
+    tracer = Tracer()
+
+    with tracer.span("docker", "module") as span:
+        span.set(success=True)
+
+    assert tracer.span("docker") is NOOP_SPAN
+    assert tracer.spans() == []
+
+
+def test_spans_record_thread_and_args():
+    """Test spans record their thread and arguments."""
+    tracer = Tracer(enabled=True)
+
+    with tracer.span("docker", "module"):
+        with tracer.span("configure", "stage", module="docker") as span:
+            span.set(steps=3)
+
+    stage, module = tracer.spans()
+    assert (stage.name, stage.category) == ("configure", "stage")
+    assert stage.args == {"module": "docker", "steps": 3}
+    assert module.start_ns <= stage.start_ns <= stage.end_ns <= module.end_ns
+    assert module.thread_id == threading.get_native_id()
+
+
+def test_spans_from_worker_threads():
+    """Test spans of other threads carry their thread name."""
+    tracer = Tracer(enabled=True)
+
+    def work():
+        with tracer.span("git clone", "command"):
+            pass
+
+    worker = threading.Thread(target=work, name="step_0")
+    worker.start()
+    worker.join()
+
+    (span,) = tracer.spans()
+    assert span.thread_name == "step_0"
+    assert span.thread_id != threading.get_native_id()
+
+
+def test_span_records_exception():
+    """Test a span that raised is recorded with the error type."""
+    tracer = Tracer(enabled=True)
+
+    with pytest.raises(ValueError):
+        with tracer.span("apt-get install", "command"):
+            raise ValueError("boom")
+
+    assert tracer.spans()[0].args["error"] == "ValueError"
+
+
+def test_ring_buffer_drops_oldest_spans():
+    """Test only the most recent spans are kept."""
+    tracer = Tracer(capacity=3, enabled=True)
+
+    for i in range(5):
+        with tracer.span(f"span{i}"):
+            pass
+
+    assert [span.name for span in tracer.spans()] == ["span2", "span3", "span4"]
+    assert tracer.dropped == 2
+
+
+def test_chrome_trace_export(tmp_path):
+    """Test spans export as Chrome Trace complete events with thread names."""
+    tracer = Tracer(enabled=True)
+    with tracer.span("docker", "module"):
+        pass
+
+    trace = tracer.to_chrome_trace()
+    metadata = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert {e["name"] for e in metadata} == {"process_name", "thread_name"}
+
+    path = tmp_path / "trace.json"
+    tracer.export_chrome(path)
+    (event,) = load_chrome_trace(path)
+    assert event["name"] == "docker"
+    assert event["cat"] == "module"
+    assert event["dur"] >= 0
+
+
+def test_parallel_executor_records_module_and_stage_spans(global_tracer):
+    """Test module execution records module and stage spans."""
+    module = Mock()
+    module.validate.return_value = True
+    module.configure.return_value = True
+    module.verify.return_value = True
+
+    ParallelExecutor(max_workers=1, logger=Mock())._execute_module(
+        ExecutionContext("docker", module, {}), None
+    )
+
+    spans = {(span.category, span.name): span for span in global_tracer.spans()}
+    assert spans[("module", "docker")].args["success"] is True
+    for stage in ("validate", "configure", "verify"):
+        assert spans[("stage", stage)].args["module"] == "docker"
+
+
+def test_trace_command_summarizes_and_exports(tmp_path):
+    """Test 'trace' lists the slowest spans and exports the trace."""
+    tracer = Tracer(enabled=True)
+    with tracer.span("docker", "module"):
+        with tracer.span("apt-get install -y docker-ce", "command", module="docker"):
+            pass
+    trace_file = tmp_path / "trace.json"
+    tracer.export_chrome(trace_file)
+    output = tmp_path / "export.json"
+
+    result = CliRunner().invoke(
+        main, ["trace", "--file", str(trace_file), "--output", str(output)], obj={}
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "docker-ce" in result.output
+    assert len(load_chrome_trace(output)) == 2
+
+
+def test_trace_command_without_trace(tmp_path):
+    """Test 'trace' explains how to record a trace when none exists."""
+    result = CliRunner().invoke(main, ["trace", "--file", str(tmp_path / "missing.json")], obj={})
+
+    assert result.exit_code == 1
+    assert "install --trace" in result.output
+
+
+def test_trace_command_reads_configured_path(tmp_path):
+    """Test 'trace' defaults to observability.tracing.path."""
+    tracer = Tracer(enabled=True)
+    with tracer.span("docker", "module"):
+        pass
+    trace_file = tmp_path / "configured-trace.json"
+    tracer.export_chrome(trace_file)
+    config = tmp_path / "config.yaml"
+    config.write_text(f"observability:\n  tracing:\n    path: {trace_file}\n")
+
+    result = CliRunner().invoke(main, ["trace", "--config", str(config)], obj={})
+
+    assert result.exit_code == 0, result.output
+    assert "configured-trace.json" in result.output
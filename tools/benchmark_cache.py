@@ -3,9 +3,15 @@
 Benchmark Package Cache Performance.
 
 This script demonstrates the speed improvement of the Package Cache
-by simulating package "installation" (copying) with and without cache.
+by simulating package "installation" (copying) with and without cache,
+and measures index operations (add, hit, eviction, reload) on a cache
+with many entries.
+
+Usage:
+    python tools/benchmark_cache.py [--index-only] [--entries 50000]
 """
 
+import argparse
 import os
 import shutil
 import tempfile
@@ -23,6 +29,7 @@ def create_dummy_package(path: Path, size_mb: int):
 
 def benchmark():
     from configurator.core.package_cache import PackageCacheManager
+    from configurator.utils.file import link_or_copy
 
     print("=" * 60)
     print("Package Cache Benchmark")
@@ -82,7 +89,7 @@ def benchmark():
             # Find in cache (we know the name format we used)
             cached_path = manager.get_package(f"pkg_{pkg.name}", "1.0")
             if cached_path:
-                shutil.copy2(cached_path, apt_dir / pkg.name)
+                link_or_copy(cached_path, apt_dir / pkg.name)
                 cache_hits += 1
 
         warm_duration = time.time() - start_time
@@ -98,14 +105,96 @@ def benchmark():
             print("Benchmarks too fast to measure.")
 
 
+def benchmark_index(entries: int = 50000, samples: int = 2000):
+    """Measure per-operation cost of the cache index with many entries."""
+    import logging
+
+    from configurator.core.package_cache import PackageCacheManager
+    from configurator.utils.apt_cache import AptCacheIntegration
+
+    print("=" * 60)
+    print(f"Package Cache Index Benchmark ({entries} entries)")
+    print("=" * 60)
+
+    logger = logging.getLogger("benchmark_cache")
+    logger.setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as temp_dir_str:
+        temp_dir = Path(temp_dir_str)
+        cache_dir = temp_dir / "cache"
+        source_dir = temp_dir / "downloads"
+        source_dir.mkdir()
+
+        def fresh_package(i: int) -> Path:
+            # Unique name and content per entry, as apt-get would download it
+            pkg = source_dir / f"pkg-{i}_1.0_all.deb"
+            pkg.write_bytes(str(i).encode().ljust(1024, b"\0"))
+            return pkg
+
+        manager = PackageCacheManager(cache_dir=cache_dir, logger=logger)
+
+        def per_op(label: str, count: int, duration: float):
+            print(f"{label:<28} {count:>7} ops  {duration / count * 1e6:>9.1f} us/op")
+
+        start = time.perf_counter()
+        for i in range(entries - samples):
+            manager.add_package(f"pkg-{i}", "1.0", fresh_package(i), "http://fake")
+        per_op("Populate (add_package)", entries - samples, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(entries - samples, entries):
+            manager.add_package(f"pkg-{i}", "1.0", fresh_package(i), "http://fake")
+        per_op("add_package at full size", samples, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for i in range(samples):
+            manager.get_package(f"pkg-{i * (entries // samples)}", "1.0")
+        per_op("get_package (hit)", samples, time.perf_counter() - start)
+
+        # Shrink the limit so every add evicts the least recently used entry
+        manager.max_size_bytes = manager.get_stats()["total_size_bytes"]
+        start = time.perf_counter()
+        for i in range(samples):
+            manager.add_package(f"new-{i}", "1.0", fresh_package(-i - 1), "http://fake")
+        per_op("add_package with eviction", samples, time.perf_counter() - start)
+
+        apt_dir = temp_dir / "apt_archives"
+        apt_dir.mkdir()
+        integration = AptCacheIntegration(manager, logger=logger)
+        integration.APT_ARCHIVES_DIR = apt_dir
+        wanted = [f"pkg-{i}" for i in range(entries - 500, entries)]
+        start = time.perf_counter()
+        restored = integration.prepare_apt_cache(wanted)
+        restore_ms = (time.perf_counter() - start) * 1000
+        print(f"{'Restore to APT archives':<28} {restored:>7} pkgs {restore_ms:>9.1f} ms")
+
+        start = time.perf_counter()
+        reloaded = PackageCacheManager(cache_dir=cache_dir, logger=logger)
+        reload_duration = time.perf_counter() - start
+        print(
+            f"{'Reload index':<28} {len(reloaded.list_packages()):>7} pkgs {reload_duration:>9.2f} s"
+        )
+
+        index_mb = (cache_dir / PackageCacheManager.INDEX_FILE).stat().st_size / 1024 / 1024
+        print(f"Index snapshot size: {index_mb:.1f}MB")
+
+
 if __name__ == "__main__":
     # Setup path to module
     import sys
 
     sys.path.append(os.getcwd())
 
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--index-only", action="store_true", help="Only run the index benchmark")
+    parser.add_argument("--entries", type=int, default=50000, help="Cached entries")
+    args = parser.parse_args()
+
     try:
-        benchmark()
+        if not args.index_only:
+            benchmark()
+            print()
+        benchmark_index(args.entries)
     except ImportError:
         print("Error: Could not import configurator. Run from project root.")
     except Exception as e:
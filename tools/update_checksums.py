@@ -8,15 +8,17 @@ Usage:
     python3 tools/update_checksums.py --resource oh_my_zsh
     python3 tools/update_checksums.py --all
     python3 tools/update_checksums.py --verify-all
+    python3 tools/update_checksums.py --import-db /etc/vps-configurator/checksums.db
 """
 
 import argparse
-import hashlib
+import re
 import subprocess
 import sys
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from typing import Tuple
 
 try:
     import yaml
@@ -25,24 +27,19 @@ except ImportError:
     sys.exit(1)
 
 
-def calculate_sha256(file_path: Path) -> str:
-    """Calculate SHA256 checksum of file."""
-    sha256 = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+def download_file(url: str) -> Tuple[Path, str]:
+    """Download file to temp location and return its path and SHA256."""
+    from configurator.exceptions import NetworkError
+    from configurator.utils.network import fetch_file
 
-
-def download_file(url: str) -> Path:
-    """Download file to temp location and return path."""
     with tempfile.NamedTemporaryFile(delete=False) as tmp:
         tmp_path = Path(tmp.name)
 
     try:
-        subprocess.run(["curl", "-fsSL", url, "-o", str(tmp_path)], check=True, timeout=60)
-        return tmp_path
-    except subprocess.CalledProcessError as e:
+        # Hashed while downloading
+        result = fetch_file(url, tmp_path)
+        return tmp_path, result.sha256
+    except NetworkError as e:
         print(f"Error downloading {url}: {e}")
         tmp_path.unlink(missing_ok=True)
         raise
@@ -53,10 +50,9 @@ def update_oh_my_zsh_checksum():
     url = "https://raw.githubusercontent.com/ohmyzsh/ohmyzsh/master/tools/install.sh"
 
     print(f"Downloading Oh My Zsh installer from {url}...")
-    tmp_path = download_file(url)
+    tmp_path, checksum = download_file(url)
 
     try:
-        checksum = calculate_sha256(tmp_path)
         size = tmp_path.stat().st_size
 
         print("\nOh My Zsh Installer:")
@@ -159,9 +155,8 @@ def verify_all_checksums():
         install_script = data["oh_my_zsh"].get("install_script", {})
         if install_script.get("url") and install_script.get("sha256"):
             print("\nVerifying Oh My Zsh installer...")
-            tmp_path = download_file(install_script["url"])
+            tmp_path, actual = download_file(install_script["url"])
             try:
-                actual = calculate_sha256(tmp_path)
                 expected = install_script["sha256"]
                 if actual == expected:
                     print("  ✅ Checksum valid")
@@ -192,11 +187,47 @@ def verify_all_checksums():
     return all_valid
 
 
+def pinned_checksums(data) -> list:
+    """Collect (url, sha256) pairs from a checksums.yaml structure (skips placeholders)."""
+    entries = []
+    if isinstance(data, dict):
+        if data.get("url") and re.fullmatch(r"[0-9a-f]{64}", str(data.get("sha256", ""))):
+            entries.append((data["url"], data["sha256"]))
+        for value in data.values():
+            entries.extend(pinned_checksums(value))
+    return entries
+
+
+def import_to_database(db_path: Path) -> int:
+    """Record every pinned checksum from checksums.yaml in the checksum database."""
+    from configurator.security.checksum_store import ChecksumStore
+
+    checksums_file = Path(__file__).parent.parent / "configurator/security/checksums.yaml"
+    with open(checksums_file, "r") as f:
+        data = yaml.safe_load(f) or {}
+
+    store = ChecksumStore(db_path)
+    # Pinned checksums were verified, so they replace checksums trusted on first use
+    imported = store.import_entries(pinned_checksums(data), replace=True)
+    removed = store.compact()
+
+    print(f"\n✅ Imported {imported} checksums into {db_path} ({len(store)} URLs)")
+    if removed:
+        print(f"   Removed {removed} duplicate entries")
+    return imported
+
+
 def main():
     parser = argparse.ArgumentParser(description="Update checksum database")
     parser.add_argument("--resource", help="Resource to update (oh_my_zsh, powerlevel10k)")
     parser.add_argument("--all", action="store_true", help="Update all resources")
     parser.add_argument("--verify-all", action="store_true", help="Verify all existing checksums")
+    parser.add_argument(
+        "--import-db",
+        metavar="PATH",
+        type=Path,
+        help="Import the pinned checksums into a checksum database (after any updates)",
+    )
 
     args = parser.parse_args()
 
@@ -218,13 +249,18 @@ def main():
         elif args.resource:
             update_checksums_yaml(args.resource)
 
-        else:
+        elif not args.import_db:
             parser.print_help()
 
+        if args.import_db:
+            import_to_database(args.import_db)
+
     except Exception as e:
         print(f"\n❌ Error: {e}")
         sys.exit(1)
 
 
 if __name__ == "__main__":
+    # Make the configurator package importable when run from a checkout
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
     main()